@@ -1,12 +1,26 @@
 # Assuming you have not changed the general structure of the template no modification is needed in this file.
-from . import commands
+import time
+
+from . import commands, config
 from .lib import fusion360utils as futil
+from .lib.common import api_profiler, nnws_log
+
+log = nnws_log.getLogger(__name__)
 
 
 def run(context):
     try:
+        # Opt-in profiling of the Fusion API calls, patched before any command is created
+        if config.PROFILE_API:
+            api_profiler.enable()
+
+        # The NNWS logs are written through futil.log, the debug records only when an error is logged
+        nnws_log.configure(config.LOG_LEVEL, config.LOG_MODULE_LEVELS, futil.log)
+
         # This will run the start function in each of your commands as defined in commands/__init__.py
+        start = time.perf_counter()
         commands.start()
+        log.info("Add-in started in %.0f ms", (time.perf_counter() - start) * 1000)
 
     except:
         futil.handle_error("run")
@@ -20,5 +34,8 @@ def stop(context):
         # This will run the start function in each of your commands as defined in commands/__init__.py
         commands.stop()
 
+        # Restore the Fusion API classes, they are shared with the other add-ins
+        api_profiler.disable()
+
     except:
         futil.handle_error("stop")
@@ -0,0 +1,2 @@
+# Headless benchmarks of the add-in, run on the recording stand-in of the adsk API (fake_adsk).
+# See __main__.py for the command line.
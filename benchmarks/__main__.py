@@ -0,0 +1,94 @@
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+
+# Entry point of the benchmarks, run from the add-in folder with "python -m benchmarks".
+# The add-in uses relative imports, so it is imported as a package from its parent folder.
+if not __package__ or "." not in __package__:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.dirname(root))
+    generators = importlib.import_module(f"{os.path.basename(root)}.benchmarks.generators")
+    sessions = importlib.import_module(f"{os.path.basename(root)}.benchmarks.sessions")
+    log_overhead = importlib.import_module(f"{os.path.basename(root)}.benchmarks.log_overhead")
+    direct = importlib.import_module(f"{os.path.basename(root)}.benchmarks.direct")
+    exports = importlib.import_module(f"{os.path.basename(root)}.benchmarks.exports")
+    instancing = importlib.import_module(f"{os.path.basename(root)}.benchmarks.instancing")
+    tiling = importlib.import_module(f"{os.path.basename(root)}.benchmarks.tiling")
+    packing = importlib.import_module(f"{os.path.basename(root)}.benchmarks.packing")
+    parameters = importlib.import_module(f"{os.path.basename(root)}.benchmarks.parameters")
+else:
+    from . import direct, exports, generators, instancing, log_overhead, packing, parameters, sessions, tiling
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmarks of the NNWS generators and dialog previews")
+    parser.add_argument("suites", nargs="*", help=f"the generators to run, among {', '.join(generators.SUITES)}, all by default")
+    parser.add_argument("--quick", action="store_true", help="run the short size sweeps")
+    parser.add_argument("--output", default=os.path.join(tempfile.gettempdir(), "NNWS_benchmarks"), help="folder of the reports")
+    parser.add_argument("--baseline", default=generators.BASELINE_PATH, help="baseline file to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="write the runs as the new baseline")
+    parser.add_argument("--replay", nargs="*", metavar="SESSION", help="replay dialog sessions instead, the stored ones by default")
+    parser.add_argument("--logging", action="store_true", help="measure the overhead of the logs in a hot loop instead")
+    parser.add_argument("--direct", action="store_true", help="compare the parametric and direct modeling wall builds instead")
+    parser.add_argument("--exports", action="store_true", help="compare the STEP exports of the wall catalog instead")
+    parser.add_argument("--instancing", action="store_true", help="compare the patterned and instanced walls instead")
+    parser.add_argument("--tiling", action="store_true", help="time the print bed tiling plans of large walls instead")
+    parser.add_argument("--packing", action="store_true", help="time the print plate packing of accessory batches instead")
+    parser.add_argument("--parameters", action="store_true", help="compare the user parameter edits and regenerations instead")
+    args = parser.parse_args(argv)
+
+    if args.logging:
+        print(log_overhead.report(log_overhead.measure()))
+        return 0
+
+    if args.direct:
+        results = direct.measure(args.quick)
+        print(direct.report(results))
+        return 1 if any(result["differences"] for result in results) else 0
+
+    if args.exports:
+        print(exports.report(exports.measure(args.quick)))
+        return 0
+
+    if args.instancing:
+        print(instancing.report(instancing.measure(args.quick)))
+        return 0
+
+    if args.tiling:
+        print(tiling.report(tiling.measure()))
+        return 0
+
+    if args.packing:
+        print(packing.report(packing.measure()))
+        return 0
+
+    if args.parameters:
+        print(parameters.report(parameters.measure()))
+        return 0
+
+    if args.replay is not None:
+        sessions.replayFiles(args.replay)
+        return 0
+
+    unknown = [s for s in args.suites if s not in generators.SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    runs = generators.runSuites(args.suites, args.quick, print)
+    messages = generators.checkScaling(runs) + generators.compareBaseline(runs, generators.loadBaseline(args.baseline))
+    jsonPath, csvPath = generators.writeReport(runs, args.output, messages)
+    print(f"Reports written to {jsonPath} and {csvPath}")
+
+    if args.update_baseline:
+        generators.saveBaseline(runs, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+
+    for message in messages:
+        print(f"FLAGGED {message}")
+    return 1 if messages and not args.update_baseline else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import gc
+
+from .. import fake_adsk
+from . import generators
+
+# Parametric and direct modeling builds of the walls of a batch, compared body by body (volume and bounding box).
+# On the stand-in API the direct build only saves the timeline bookkeeping, the recompute of the history that Fusion
+# saves is not modeled: the speedup in Fusion is logged by the batch itself, on its sample wall.
+
+
+def _build(build, direct: bool) -> tuple:
+    direct_modeling = fake_adsk.importAddinModule("lib.common.direct_modeling")
+    design = fake_adsk.newDesign()
+    gc.collect()
+    seconds, signatures = direct_modeling.measuredBuild(design, build, direct)
+    return seconds, design.timeline.count, signatures
+
+
+def measure(quick: bool = False) -> list:
+    """
+    Builds every wall size of the benchmark with and without history.
+
+    Args:
+        quick (bool, optional): Runs the short size sweep. Defaults to False.
+
+    Returns:
+        list: A dict per size with the label, the parametric and direct measures and the body differences.
+    """
+    direct_modeling = fake_adsk.importAddinModule("lib.common.direct_modeling")
+    results = []
+    for label, _, build in generators.wallSweep(generators.WALL_SIZES_QUICK if quick else generators.WALL_SIZES):
+        parametric = _build(build, False)
+        direct = _build(build, True)
+        results.append(
+            {
+                "label": label,
+                "parametric": parametric[:2],
+                "direct": direct[:2],
+                "differences": direct_modeling.compareSignatures(parametric[2], direct[2]),
+            }
+        )
+    return results
+
+
+def report(results: list) -> str:
+    lines = [
+        "Wall batch, parametric vs direct modeling",
+        f"{'size':<10}{'param ms':>10}{'direct ms':>11}{'speedup':>9}{'timeline':>10}  bodies",
+    ]
+    for result in results:
+        (parametricSeconds, parametricTimeline), (directSeconds, directTimeline) = result["parametric"], result["direct"]
+        speedup = parametricSeconds / directSeconds if directSeconds > 0 else float("inf")
+        timeline = f"{parametricTimeline}->{directTimeline}"
+        bodies = "equivalent" if not result["differences"] else f"{len(result['differences'])} differences"
+        lines.append(
+            f"{result['label']:<10}{parametricSeconds * 1000:>10.1f}{directSeconds * 1000:>11.1f}{speedup:>8.2f}x{timeline:>10}  {bodies}"
+        )
+        lines.extend(f"    {difference}" for difference in result["differences"])
+    return "\n".join(lines)
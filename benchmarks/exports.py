@@ -0,0 +1,81 @@
+import gc
+import os
+import tempfile
+import time
+
+from .. import fake_adsk
+from . import generators
+
+# STEP files of the wall catalog written by the batch (every size up to 8x8, notched or not), the whole root component
+# compared with the explicit export set of the visible solid bodies. On the stand-in API the files only list the exported
+# bodies and occurrences, the sizes differ by the bodies left out, the size of real STEP files has to be measured in
+# Fusion. The times compare the cost of the two paths.
+
+CATALOG_SIZES = range(1, 9)
+
+
+def catalog(quick: bool = False) -> list:
+    """
+    Returns:
+        list: The width, height and notch of every wall of the catalog, the notched square walls only in quick mode.
+    """
+    if quick:
+        return [(size, size, True) for size in generators.WALL_SIZES_QUICK]
+    return [(w, h, notch) for notch in (True, False) for h in CATALOG_SIZES for w in CATALOG_SIZES]
+
+
+def _timedExport(export, path: str) -> tuple:
+    start = time.perf_counter()
+    export()
+    return time.perf_counter() - start, os.path.getsize(path)
+
+
+def measure(quick: bool = False, folder: str = None) -> list:
+    """
+    Builds every wall of the catalog and exports it both ways.
+
+    Args:
+        quick (bool, optional): Exports the short catalog. Defaults to False.
+        folder (str, optional): The folder of the files, a new temporary folder by default.
+
+    Returns:
+        list: A dict per wall with the label and the seconds and bytes of the root and export set files.
+    """
+    nnws_util = fake_adsk.importAddinModule("lib.common.nnws_util")
+    step_export = fake_adsk.importAddinModule("lib.common.step_export")
+    wall, _ = generators._addinModules()
+    folder = folder or tempfile.mkdtemp(prefix="NNWS_exports")
+
+    results = []
+    for w, h, notch in catalog(quick):
+        label = f"{w}x{h}{' notched' if notch else ''}"
+        design = fake_adsk.newDesign()
+        gc.collect()
+        wall.internalGenerateWall(w, h, notch)
+        rootPath = os.path.join(folder, f"wall_{w}x{h}_{notch}_root.step")
+        setPath = os.path.join(folder, f"wall_{w}x{h}_{notch}.step")
+        results.append(
+            {
+                "label": label,
+                "root": _timedExport(lambda: nnws_util.exportStepFile(design, rootPath), rootPath),
+                "set": _timedExport(lambda: step_export.exportVisibleBodies(design, setPath), setPath),
+            }
+        )
+    return results
+
+
+def report(results: list) -> str:
+    lines = [
+        "Wall catalog STEP exports, root component vs visible solid bodies",
+        f"{'wall':<14}{'root B':>9}{'set B':>9}{'saved':>8}{'root ms':>9}{'set ms':>8}",
+    ]
+    for result in results:
+        (rootSeconds, rootBytes), (setSeconds, setBytes) = result["root"], result["set"]
+        lines.append(
+            f"{result['label']:<14}{rootBytes:>9}{setBytes:>9}{1 - setBytes / rootBytes:>8.1%}"
+            f"{rootSeconds * 1000:>9.1f}{setSeconds * 1000:>8.1f}"
+        )
+    rootTotal = sum(result["root"][1] for result in results)
+    setTotal = sum(result["set"][1] for result in results)
+    lines.append(f"{'total':<14}{rootTotal:>9}{setTotal:>9}{1 - setTotal / rootTotal:>8.1%}")
+    return "\n".join(lines)
@@ -0,0 +1,307 @@
+import csv
+import dataclasses
+import gc
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator
+
+from .. import fake_adsk
+
+# Scaling benchmark of the generators, run headless on the recording stand-in of the adsk API. The counts (API calls,
+# timeline objects, bodies, faces) are the ones Fusion would see, the times are the Python cost of the generators plus
+# the stand-in, they are used to compare runs on the same machine, not as Fusion timings.
+
+# Wall sizes, the walls are square (size x size)
+WALL_SIZES = (1, 2, 3, 5, 8, 12, 20, 30)
+WALL_SIZES_QUICK = (1, 2, 4, 8)
+
+# Insert X and Y counts, every combination is run
+INSERT_COUNTS = (1, 2, 3, 4, 5)
+INSERT_COUNTS_QUICK = (1, 3)
+
+# Shelf insert counts, the shelf length is always the count in grid units
+SHELF_COUNTS = (1, 2, 3, 4, 5)
+SHELF_COUNTS_QUICK = (1, 3)
+
+# Wall size of the dialog spinner limit, the fitted curves are extrapolated to it
+WALL_SPINNER_MAX = 99
+
+# Log-log slope over which a metric is flagged as growing faster than the number of grid cells
+SCALING_TOLERANCE = 0.25
+
+# A run slower than the baseline by this ratio, and by more than the minimum, is flagged
+TIME_REGRESSION_RATIO = 1.5
+TIME_REGRESSION_MIN_SECONDS = 0.01
+
+METRICS = ("seconds", "apiCalls", "timelineObjects", "bodies", "faces")
+# The saved sketch recomputes are compared with the baseline, they are not a cost so their scaling is not checked
+COUNT_METRICS = METRICS[1:] + ("savedRecomputes",)
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class BenchmarkRun:
+    """
+    The measures of one generator run
+    generator: The name of the generator
+    label: The size of the run, e.g. "3x3"
+    size: The number of grid cells generated, used as the x axis of the scaling curves
+    seconds: The wall-clock time of the generation
+    apiCalls: The number of API calls made by the generator
+    timelineObjects: The number of timeline objects created
+    bodies: The number of bodies in the design
+    faces: The number of faces of these bodies
+    savedRecomputes: The number of sketch recomputes saved by deferring the compute of the sketches
+    """
+
+    generator: str
+    label: str
+    size: int
+    seconds: float
+    apiCalls: int
+    timelineObjects: int
+    bodies: int
+    faces: int
+    savedRecomputes: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.generator}/{self.label}"
+
+
+def _addinModules() -> tuple:
+    """
+    Returns:
+        tuple: The wall and accessories command modules, imported on the stand-in API.
+    """
+    wall = fake_adsk.importAddinModule("commands.commandWall.entry")
+    accessories = fake_adsk.importAddinModule("commands.commandAccessories.entry")
+    return wall, accessories
+
+
+def _dialogParameters(accessories, selected: str):
+    """
+    Reads the default parameters of an accessory from its dialog, so the benchmark follows the dialog defaults.
+    """
+    command = fake_adsk.core.Command(None)
+    accessories.command_created(fake_adsk.core.CommandCreatedEventArgs(command))
+    accessories.dialogGroups.show(selected)
+    return accessories.readParameters(command.commandInputs, selected)
+
+
+def wallSweep(sizes: tuple) -> Iterator[tuple]:
+    """
+    Yields:
+        tuple: The label, size and build function of every wall run.
+    """
+    wall, _ = _addinModules()
+    for size in sizes:
+        yield f"{size}x{size}", size * size, lambda size=size: wall.internalGenerateWall(size, size, True)
+
+
+def insertSweep(counts: tuple) -> Iterator[tuple]:
+    _, accessories = _addinModules()
+    params = _dialogParameters(accessories, accessories.MENU_INSERT)
+    for x in counts:
+        for y in counts:
+            insert = dataclasses.replace(params, xCount=x, yCount=y)
+            yield f"{x}x{y}", x * y, lambda insert=insert: accessories.generateInsertBase(accessories.MENU_INSERT, insert)
+
+
+def shelfSweep(counts: tuple) -> Iterator[tuple]:
+    _, accessories = _addinModules()
+    params = _dialogParameters(accessories, accessories.MENU_SHELF)
+    for count in counts:
+        length = count * accessories.GRIDFINITY_SIZE_CM
+        shelf = dataclasses.replace(params, insert=dataclasses.replace(params.insert, xCount=count), length=length)
+        yield f"{count}x{length:g}cm", count, lambda shelf=shelf: accessories.generateShelf(shelf)
+
+
+# name -> (sweep function, full sizes, quick sizes)
+SUITES = {
+    "wall": (wallSweep, WALL_SIZES, WALL_SIZES_QUICK),
+    "insert": (insertSweep, INSERT_COUNTS, INSERT_COUNTS_QUICK),
+    "shelf": (shelfSweep, SHELF_COUNTS, SHELF_COUNTS_QUICK),
+}
+
+
+def runGenerator(generator: str, label: str, size: int, build: Callable) -> BenchmarkRun:
+    """
+    Runs one generation in a new design and measures it.
+
+    Args:
+        generator (str): The name of the generator.
+        label (str): The label of the size.
+        size (int): The number of grid cells.
+        build (Callable): Generates the part in the active design.
+
+    Returns:
+        BenchmarkRun: The measures of the run.
+    """
+    design = fake_adsk.newDesign()
+    sketchStats = fake_adsk.importAddinModule("lib.common.nnws_util").sketchComputeStats
+    sketchStats.reset()
+    # the garbage of the previous runs is collected outside of the measure
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    seconds = time.perf_counter() - start
+    apiCalls = fake_adsk.RECORDER.count()
+
+    bodies = design.bodyList()
+    faces = sum(b.faces.count for b in bodies)
+    return BenchmarkRun(generator, label, size, seconds, apiCalls, design.timeline.count, len(bodies), faces, sketchStats.savedRecomputes)
+
+
+def runSuites(names: list = None, quick: bool = False, log: Callable = None) -> list:
+    """
+    Runs the size sweeps of the generators.
+
+    Args:
+        names (list, optional): The suites to run. Defaults to all of them.
+        quick (bool, optional): Runs the short sweeps. Defaults to False.
+        log (Callable, optional): Called with a line per run.
+
+    Returns:
+        list: The BenchmarkRun of every run.
+    """
+    runs = []
+    for name in names or SUITES:
+        sweep, sizes, quickSizes = SUITES[name]
+        for label, size, build in sweep(quickSizes if quick else sizes):
+            run = runGenerator(name, label, size, build)
+            runs.append(run)
+            if log:
+                counts = f"{run.apiCalls:>8} calls{run.timelineObjects:>6} timeline{run.bodies:>6} bodies{run.savedRecomputes:>6} saved"
+                log(f"{run.key:<24}{run.seconds * 1000:>10.1f} ms{counts}")
+    return runs
+
+
+def scalingExponent(runs: list, metric: str) -> float:
+    """
+    Fits metric = a * size^b over the runs of a generator, by least squares on the logarithms.
+
+    Returns:
+        float: The exponent b, None when there are not enough distinct sizes.
+    """
+    points = {}
+    for run in runs:
+        value = getattr(run, metric)
+        if value > 0 and run.size > 0:
+            points.setdefault(run.size, []).append(value)
+    if len(points) < 2:
+        return None
+
+    xs = [math.log(size) for size in points]
+    ys = [math.log(sum(values) / len(values)) for values in points.values()]
+    meanX, meanY = sum(xs) / len(xs), sum(ys) / len(ys)
+    return sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys)) / sum((x - meanX) ** 2 for x in xs)
+
+
+def extrapolate(runs: list, metric: str, size: int) -> float:
+    """
+    Returns:
+        float: The metric predicted by the fitted power curve at a size, None when it can't be fitted.
+    """
+    exponent = scalingExponent(runs, metric)
+    if exponent is None:
+        return None
+    largest = max(runs, key=lambda r: r.size)
+    return getattr(largest, metric) * (size / largest.size) ** exponent
+
+
+def _byGenerator(runs: list) -> dict:
+    grouped = {}
+    for run in runs:
+        grouped.setdefault(run.generator, []).append(run)
+    return grouped
+
+
+def checkScaling(runs: list) -> list:
+    """
+    Returns:
+        list: A message per generator metric growing faster than linearly with the number of grid cells.
+    """
+    messages = []
+    for generator, generatorRuns in _byGenerator(runs).items():
+        for metric in METRICS:
+            exponent = scalingExponent(generatorRuns, metric)
+            if exponent is not None and exponent > 1 + SCALING_TOLERANCE:
+                messages.append(f"{generator}: {metric} grows as size^{exponent:.2f}")
+    return messages
+
+
+def compareBaseline(runs: list, baseline: dict) -> list:
+    """
+    Compares the runs with the baseline runs of the same generator and size.
+
+    Args:
+        runs (list): The BenchmarkRun to check.
+        baseline (dict): The baseline document, as written by saveBaseline.
+
+    Returns:
+        list: A message per count that changed and per run slower than the baseline.
+    """
+    messages = []
+    reference = {f"{r['generator']}/{r['label']}": r for r in baseline.get("runs", [])}
+    for run in runs:
+        expected = reference.get(run.key)
+        if expected is None:
+            continue
+        for metric in COUNT_METRICS:
+            # a metric added after the baseline was written is not compared
+            if metric in expected and getattr(run, metric) != expected[metric]:
+                messages.append(f"{run.key}: {metric} {expected[metric]} -> {getattr(run, metric)}")
+        if run.seconds > expected["seconds"] * TIME_REGRESSION_RATIO and run.seconds - expected["seconds"] > TIME_REGRESSION_MIN_SECONDS:
+            messages.append(f"{run.key}: {expected['seconds'] * 1000:.1f} ms -> {run.seconds * 1000:.1f} ms")
+    return messages
+
+
+def summary(runs: list) -> dict:
+    """
+    Returns:
+        dict: The scaling exponents of every generator metric, and the wall metrics extrapolated to the spinner limit.
+    """
+    result = {}
+    for generator, generatorRuns in _byGenerator(runs).items():
+        result[generator] = {"exponents": {m: scalingExponent(generatorRuns, m) for m in METRICS}}
+    if "wall" in result:
+        wallRuns = _byGenerator(runs)["wall"]
+        size = WALL_SPINNER_MAX * WALL_SPINNER_MAX
+        result["wall"][f"extrapolated{WALL_SPINNER_MAX}x{WALL_SPINNER_MAX}"] = {m: extrapolate(wallRuns, m, size) for m in METRICS}
+    return result
+
+
+def writeReport(runs: list, outputDir: str, messages: list) -> tuple:
+    """
+    Writes the runs as JSON, with the summary and the flagged messages, and as CSV.
+
+    Returns:
+        tuple: The paths of the JSON and CSV reports.
+    """
+    os.makedirs(outputDir, exist_ok=True)
+    baseName = os.path.join(outputDir, f"{time.strftime('%Y%m%d_%H%M%S')}_generators")
+    with open(f"{baseName}.json", "w") as file:
+        json.dump({"runs": [asdict(r) for r in runs], "summary": summary(runs), "flagged": messages}, file, indent=2)
+    with open(f"{baseName}.csv", "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=[f.name for f in dataclasses.fields(BenchmarkRun)])
+        writer.writeheader()
+        writer.writerows(asdict(r) for r in runs)
+    return f"{baseName}.json", f"{baseName}.csv"
+
+
+def loadBaseline(path: str = BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def saveBaseline(runs: list, path: str = BASELINE_PATH):
+    with open(path, "w") as file:
+        json.dump({"runs": [asdict(r) for r in runs]}, file, indent=2)
+        file.write("\n")
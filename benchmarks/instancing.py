@@ -0,0 +1,82 @@
+import gc
+import os
+import tempfile
+import time
+
+from .. import fake_adsk
+from . import generators
+
+# Walls built by patterning the B-rep of the cell compared with walls of occurrences of the cell component, with their
+# STEP and 3MF files. The instanced walls go up to 99x99, the patterned ones stop at the largest size of the sweeps.
+
+INSTANCED_ONLY_SIZES = (99,)
+
+
+def _build(size: int, instanced: bool, folder: str) -> dict:
+    step_export = fake_adsk.importAddinModule("lib.common.step_export")
+    threemf_export = fake_adsk.importAddinModule("lib.common.threemf_export")
+    wall, _ = generators._addinModules()
+
+    design = fake_adsk.newDesign()
+    gc.collect()
+    start = time.perf_counter()
+    wall.internalGenerateWall(size, size, True, instanced=instanced)
+    seconds = time.perf_counter() - start
+    calls = fake_adsk.RECORDER.count()
+
+    name = os.path.join(folder, f"wall_{size}x{size}_{'instanced' if instanced else 'patterned'}")
+    if instanced:
+        step_export.exportInstances(design, f"{name}.step")
+    else:
+        step_export.exportVisibleBodies(design, f"{name}.step")
+    threemf_export.exportInstances3MF(design, f"{name}.3mf")
+    return {
+        "seconds": seconds,
+        "calls": calls,
+        "bodies": len(design.bodyList()),
+        "occurrences": design.rootComponent.allOccurrences.count,
+        "stepBytes": os.path.getsize(f"{name}.step"),
+        "threemfBytes": os.path.getsize(f"{name}.3mf"),
+    }
+
+
+def measure(quick: bool = False, folder: str = None) -> list:
+    """
+    Builds and exports every wall size of the benchmark patterned and instanced.
+
+    Args:
+        quick (bool, optional): Runs the short size sweep. Defaults to False.
+        folder (str, optional): The folder of the files, a new temporary folder by default.
+
+    Returns:
+        list: A dict per size with the label and the patterned (None when too large) and instanced measures.
+    """
+    folder = folder or tempfile.mkdtemp(prefix="NNWS_instancing")
+    sizes = generators.WALL_SIZES_QUICK if quick else generators.WALL_SIZES
+    results = []
+    for size in sizes + INSTANCED_ONLY_SIZES:
+        results.append(
+            {
+                "label": f"{size}x{size}",
+                "patterned": _build(size, False, folder) if size in sizes else None,
+                "instanced": _build(size, True, folder),
+            }
+        )
+    return results
+
+
+def report(results: list) -> str:
+    lines = [
+        "Walls patterned vs instanced",
+        f"{'size':<8}{'mode':<11}{'ms':>9}{'calls':>8}{'bodies':>8}{'occ':>7}{'STEP B':>10}{'3MF B':>9}",
+    ]
+    for result in results:
+        for mode in ("patterned", "instanced"):
+            run = result[mode]
+            if run is None:
+                continue
+            lines.append(
+                f"{result['label']:<8}{mode:<11}{run['seconds'] * 1000:>9.1f}{run['calls']:>8}{run['bodies']:>8}"
+                f"{run['occurrences']:>7}{run['stepBytes']:>10}{run['threemfBytes']:>9}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,72 @@
+import math
+import timeit
+
+from ..lib.common import nnws_log
+
+# Overhead of the NNWS logs in a hot geometry loop, measured on the offset branch of createHexPoint. The eager variant
+# is the cost of the f-strings alone, Fusion adds an app.log call per message on top of it when config.DEBUG is True.
+
+# Number of calls timed per variant, the best of the repeats is kept
+CALLS = 100000
+REPEATS = 5
+
+log = nnws_log.getLogger("benchmarks.log_overhead")
+
+
+def _hexPoint(index: int) -> tuple:
+    angle = 2 * math.pi * index / 6 + math.pi / 2
+    x = math.cos(angle) + 4.2
+    y = math.sin(angle)
+    return x, math.hypot(y, x), math.asin(y / math.hypot(y, x)), x
+
+
+def _eager(index: int):
+    new_x, hyp, angle, x = _hexPoint(index)
+    for message in (f"new_x: {new_x}", f"hyp: {hyp}", f"new angle: {angle}", f"final x: {x}"):
+        len(message)
+
+
+def _lazy(index: int):
+    new_x, hyp, angle, x = _hexPoint(index)
+    log.debug("new_x: %s", new_x)
+    log.debug("hyp: %s", hyp)
+    log.debug("new angle: %s", angle)
+    log.debug("final x: %s", x)
+
+
+def _guarded(index: int):
+    new_x, hyp, angle, x = _hexPoint(index)
+    if log.isDebug:
+        log.debug("new_x: %s, hyp: %s, new angle: %s, final x: %s", new_x, hyp, angle, x)
+
+
+def _nanoseconds(function) -> float:
+    timer = timeit.Timer(lambda: function(3))
+    return min(timer.repeat(REPEATS, CALLS)) / CALLS * 1e9
+
+
+def measure() -> dict:
+    """
+    Times a hex point computation without logs, with eager f-strings, with lazy debug calls and with the guarded call,
+    with the debug level off and on (buffered).
+
+    Returns:
+        dict: variant -> nanoseconds per point.
+    """
+    results = {"no logs": _nanoseconds(_hexPoint), "eager f-strings": _nanoseconds(_eager)}
+    for level in (nnws_log.INFO, nnws_log.DEBUG):
+        log.setLevel(level)
+        name = nnws_log.LEVEL_NAMES[level]
+        results[f"lazy debug, level {name}"] = _nanoseconds(_lazy)
+        results[f"guarded debug, level {name}"] = _nanoseconds(_guarded)
+    log.setLevel(nnws_log.INFO)
+    nnws_log.clear()
+    return results
+
+
+def report(results: dict) -> str:
+    baseline = results["no logs"]
+    lines = ["Log overhead per hex point", f"{'variant':<32}{'ns':>10}{'overhead ns':>14}"]
+    for name, nanoseconds in results.items():
+        lines.append(f"{name:<32}{nanoseconds:>10.0f}{nanoseconds - baseline:>14.0f}")
+    return "\n".join(lines)
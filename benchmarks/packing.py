@@ -0,0 +1,60 @@
+import time
+
+from .. import fake_adsk
+from ..lib.common import plate_packing
+from ..lib.common.nnws_constants import mmToCm
+from . import generators
+
+# Print plates of accessory batches. The footprints of the accessories are taken once on the stand-in API, the
+# packing of batches of their copies is plain Python and timed alone.
+
+PART_COUNTS = (100, 300, 1000)
+BED_SIZE_MM = (256, 256)
+SPACING_MM = 5
+
+# Runs of every batch, the fastest is kept
+REPEATS = 5
+
+
+def accessoryFootprints(hull: bool = True) -> list:
+    """
+    Returns:
+        list: The Footprint of every accessory of the dialog, with its default parameters.
+    """
+    plate_export = fake_adsk.importAddinModule("lib.common.plate_export")
+    _, accessories = generators._addinModules()
+    footprints = []
+    for selected in (accessories.MENU_MAIN_SCREW, accessories.MENU_INSERT, accessories.MENU_HOOK, accessories.MENU_ANCHOR):
+        params = generators._dialogParameters(accessories, selected)
+        design = fake_adsk.newDesign()
+        accessories.select(selected, params, instanced=False)
+        footprint, _ = plate_export.partFootprint(design.rootComponent.occurrences.item(0).component, hull)
+        footprints.append(footprint)
+    return footprints
+
+
+def measure(counts: tuple = PART_COUNTS, bedSizeMm: tuple = BED_SIZE_MM) -> list:
+    """
+    Returns:
+        list: A (label, seconds, plan) tuple per batch size, the accessories in turn, the seconds of the fastest plan.
+    """
+    bedWidth, bedDepth = (mmToCm(size) for size in bedSizeMm)
+    results = []
+    for hull in (False, True):
+        footprints = accessoryFootprints(hull)
+        for count in counts:
+            batch = [footprints[i % len(footprints)] for i in range(count)]
+            best = None
+            for _ in range(REPEATS):
+                start = time.perf_counter()
+                plan = plate_packing.packParts(batch, bedWidth, bedDepth, mmToCm(SPACING_MM))
+                seconds = time.perf_counter() - start
+                best = seconds if best is None else min(best, seconds)
+            results.append((f"{count} {'hull' if hull else 'box'}", best, plan))
+    return results
+
+
+def report(results: list) -> str:
+    lines = [f"Accessory plates on a {BED_SIZE_MM[0]} x {BED_SIZE_MM[1]} mm bed", f"{'parts':<10}{'ms':>8}  plan"]
+    lines.extend(f"{label:<10}{seconds * 1000:>8.2f}  {plan.summary()}" for label, seconds, plan in results)
+    return "\n".join(lines)
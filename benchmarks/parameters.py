@@ -0,0 +1,81 @@
+import math
+import time
+from dataclasses import replace
+
+from .. import fake_adsk
+from . import generators
+
+# Size tweaks of the accessories done as an edit of their driving user parameters compared with a regeneration, see
+# lib/common/accessory_user_parameters.py. The fake doesn't recompute the features when a parameter changes, the edit
+# measures the calls of the add-in only; scriptParameterEditTiming of the accessory command times both in Fusion.
+
+
+def _cases(accessories) -> list:
+    """
+    Returns:
+        list: The (label, accessory type, change of the default snapshot) of every driving parameter.
+    """
+    return [
+        ("shelf insert thickness", accessories.MENU_SHELF_INSERT, lambda p: replace(p, thickness=p.thickness + 0.2)),
+        ("hook stopper height", accessories.MENU_HOOK, lambda p: replace(p, stopperHeight=p.stopperHeight + 0.3)),
+        ("anchor hole diameter", accessories.MENU_ANCHOR, lambda p: replace(p, holeDiameter=p.holeDiameter + 0.05)),
+        ("anchor countersink angle", accessories.MENU_ANCHOR, lambda p: replace(p, countersinkAngle=math.radians(82))),
+    ]
+
+
+def _timed(build) -> tuple:
+    start = fake_adsk.RECORDER.count()
+    startSeconds = time.perf_counter()
+    build()
+    return time.perf_counter() - startSeconds, fake_adsk.RECORDER.count() - start
+
+
+def measure() -> list:
+    """
+    Generates every accessory with its defaults, then changes it by editing its user parameters and by regenerating it.
+
+    Returns:
+        list: A dict per case with the label and the seconds and calls of the edit and of the regeneration.
+    """
+    _, accessories = generators._addinModules()
+    accessory_parameters = fake_adsk.importAddinModule("lib.common.accessory_parameters")
+    accessory_user_parameters = fake_adsk.importAddinModule("lib.common.accessory_user_parameters")
+    results = []
+    for label, selected, change in _cases(accessories):
+        params = accessory_parameters.defaultParameters(selected)
+        changed = change(params)
+        edits = accessory_user_parameters.parameterEdit(selected, params, changed)
+
+        design = fake_adsk.newDesign()
+        prefix = accessories.select(selected, params)
+        editSeconds, editCalls = _timed(lambda: accessories.editUserParameters(prefix, edits))
+
+        def regenerate():
+            for occurrence in list(design.rootComponent.occurrences):
+                occurrence.deleteMe()
+            accessories.deleteUserParameters(prefix)
+            accessories.select(selected, changed)
+
+        regenerateSeconds, regenerateCalls = _timed(regenerate)
+        results.append(
+            {
+                "label": label,
+                "edit": {"seconds": editSeconds, "calls": editCalls},
+                "regenerate": {"seconds": regenerateSeconds, "calls": regenerateCalls},
+            }
+        )
+    return results
+
+
+def report(results: list) -> str:
+    lines = [
+        "Accessory changes as a user parameter edit vs a regeneration (the fake doesn't recompute the edited features)",
+        f"{'change':<26}{'edit ms':>9}{'calls':>7}{'regen ms':>10}{'calls':>7}",
+    ]
+    for result in results:
+        edit, regenerate = result["edit"], result["regenerate"]
+        lines.append(
+            f"{result['label']:<26}{edit['seconds'] * 1000:>9.3f}{edit['calls']:>7}"
+            f"{regenerate['seconds'] * 1000:>10.3f}{regenerate['calls']:>7}"
+        )
+    return "\n".join(lines)
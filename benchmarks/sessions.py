@@ -0,0 +1,62 @@
+import os
+import time
+
+from .. import fake_adsk
+from ..lib.common import dialog_sessions
+
+# Preview latency benchmark, replaying the recorded dialog sessions (config.RECORD_DIALOG_SESSIONS) on the stand-in API.
+# Every preview starts from an empty design, like a Fusion preview starts from the design before the command.
+
+SESSIONS_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
+
+
+def sessionFiles(paths: list = None) -> list:
+    """
+    Returns:
+        list: The session files to replay, the ones stored with the benchmarks by default.
+    """
+    if paths:
+        return list(paths)
+    return sorted(os.path.join(SESSIONS_FOLDER, f) for f in os.listdir(SESSIONS_FOLDER) if f.endswith(".jsonl"))
+
+
+def replayFile(path: str) -> list:
+    """
+    Opens the dialog of the recorded command on the stand-in API and replays the session through its handlers.
+
+    Args:
+        path (str): The session file.
+
+    Returns:
+        list: The ReplayLatency of every replayed event.
+    """
+    events = dialog_sessions.loadSession(path)
+    entry = fake_adsk.importAddinModule(f"commands.{events[0]['command']}.entry")
+    fake_adsk.newDesign()
+
+    # the dialog opening is measured as well, it is not part of the recorded session
+    command = fake_adsk.core.Command(None)
+    calls = fake_adsk.RECORDER.count()
+    start = time.perf_counter()
+    entry.command_created(fake_adsk.core.CommandCreatedEventArgs(command))
+    created = dialog_sessions.ReplayLatency("commandCreated", None, time.perf_counter() - start, None, fake_adsk.RECORDER.count() - calls)
+
+    handlers = {"inputChanged": entry.command_input_changed, "preview": entry.command_preview}
+    try:
+        return [created] + dialog_sessions.replaySession(events, command, handlers, fake_adsk.newDesign, fake_adsk.RECORDER.count)
+    finally:
+        entry.command_destroy(None)
+
+
+def replayFiles(paths: list = None, log=print) -> dict:
+    """
+    Replays the sessions and logs a latency report per session.
+
+    Returns:
+        dict: path -> ReplayLatency list.
+    """
+    results = {}
+    for path in sessionFiles(paths):
+        results[path] = replayFile(path)
+        log(dialog_sessions.latencyReport(results[path], os.path.basename(path)))
+    return results
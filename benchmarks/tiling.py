@@ -0,0 +1,36 @@
+import time
+
+from ..lib.common import wall_tiling
+from ..lib.common.nnws_constants import mmToCm
+
+# Tiling plans of square walls on a print bed, the planner is plain Python and runs without the stand-in API.
+
+TILING_SIZES = (8, 30, 99)
+BED_SIZE_MM = (256, 256)
+
+# Runs of every plan, the fastest is kept
+REPEATS = 5
+
+
+def measure(sizes: tuple = TILING_SIZES, bedSizeMm: tuple = BED_SIZE_MM) -> list:
+    """
+    Returns:
+        list: A (label, seconds, plan) tuple per wall size, the seconds of the fastest plan.
+    """
+    bedWidth, bedDepth = (mmToCm(size) for size in bedSizeMm)
+    results = []
+    for size in sizes:
+        best = None
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            plan = wall_tiling.planTiles([(size, 0)] * size, bedWidth, bedDepth)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        results.append((f"{size}x{size}", best, plan))
+    return results
+
+
+def report(results: list) -> str:
+    lines = [f"Wall tiling plans on a {BED_SIZE_MM[0]} x {BED_SIZE_MM[1]} mm bed", f"{'size':<8}{'ms':>8}  plan"]
+    lines.extend(f"{label:<8}{seconds * 1000:>8.2f}  {plan.summary()}" for label, seconds, plan in results)
+    return "\n".join(lines)
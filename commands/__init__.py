@@ -2,9 +2,10 @@
 
 # TODO Import the modules corresponding to the commands you created.
 # If you want to add an additional command, duplicate one of the existing directories and import it here.
-# You need to use aliases (import "entry" as "my_module") assuming you have the default module named "entry".
-from .commandAccessories import entry as commandAccessories
-from .commandWall import entry as commandWall
+# You need to use aliases (import "command" as "my_module") assuming you have the registration module named "command".
+# The registration modules only create the buttons, the "entry" modules are imported when their command is first created.
+from .commandAccessories import command as commandAccessories
+from .commandWall import command as commandWall
 
 # TODO add your imported modules to this list.
 # Fusion will automatically call the start() and stop() functions.
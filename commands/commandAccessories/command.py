@@ -0,0 +1,44 @@
+import os
+
+from ... import config
+from ...lib.common.lazy_command import LazyCommand
+
+# Registration of the accessories command, the dialog and the generators in entry.py are imported when the command is
+# first created
+
+CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_cmdAccessories"
+CMD_NAME = "NNWS Accessories"
+CMD_Description = "Create NNWS Accessories."
+
+# Specify that the command will be promoted to the panel.
+IS_PROMOTED = True
+WORKSPACE_ID = "FusionSolidEnvironment"
+PANEL_ID = "SolidCreatePanel"
+COMMAND_BESIDE_ID = ""
+
+# Resource location for command icons, here we assume a sub folder in this directory named "resources".
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+
+accessoriesCommand = LazyCommand(
+    __package__,
+    "entry",
+    "command_created",
+    CMD_ID,
+    CMD_NAME,
+    CMD_Description,
+    ICON_FOLDER,
+    WORKSPACE_ID,
+    PANEL_ID,
+    COMMAND_BESIDE_ID,
+    IS_PROMOTED,
+)
+
+
+# Executed when add-in is run.
+def start():
+    accessoriesCommand.start()
+
+
+# Executed when add-in is stopped.
+def stop():
+    accessoriesCommand.stop()
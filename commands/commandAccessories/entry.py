@@ -1,20 +1,27 @@
+import glob
 import math
 import os
+import time
 import traceback
 
 from adsk.core import (
     Application,
     CommandCreatedEventArgs,
     CommandEventArgs,
+    CommandInput,
+    CommandInputs,
     DropDownCommandInput,
     DropDownStyles,
     GroupCommandInput,
     HorizontalAlignments,
     InputChangedEventArgs,
+    Matrix3D,
     ObjectCollection,
     Point3D,
+    TableCommandInput,
     ValidateInputsEventArgs,
     ValueInput,
+    Vector3D,
 )
 from adsk.fusion import (
     BRepFace,
@@ -38,10 +45,48 @@ from adsk.fusion import (
 )
 
 from ... import config
-from ...commands.commandAccessories.screw_definitions import (
-    ScrewDefinitionsEnum,
-)
+from ...commands.commandAccessories.command import CMD_NAME
 from ...lib import fusion360utils as futil
+from ...lib.common import (
+    accessory_kit,
+    accessory_user_parameters,
+    direct_modeling,
+    nnws_log,
+    nnws_util,
+    plate_export,
+    shelf_sizing,
+    step_export,
+    threemf_export,
+)
+from ...lib.common import api_profiler as prof
+from ...lib.common.accessory_constraints import (
+    MAX_CLEARANCE_CM,
+    errors,
+    requireFeasible,
+    validate,
+)
+from ...lib.common.accessory_parameters import (
+    ACCESSORY_ANCHOR,
+    ACCESSORY_HOOK,
+    ACCESSORY_INSERT,
+    ACCESSORY_MAIN_SCREW,
+    ACCESSORY_OFFSET_ANCHOR,
+    ACCESSORY_SHELF,
+    ACCESSORY_SHELF_INSERT,
+    SHELF_DEFAULT_X_COUNT,
+    SHELF_MAX_X_COUNT,
+    AnchorParameters,
+    HookParameters,
+    InsertParameters,
+    MainScrewParameters,
+    ScrewDimensions,
+    ShelfInsertParameters,
+    ShelfParameters,
+    defaultParameters,
+)
+from ...lib.common.build_failures import BuildFailureCache, KnownBuildFailure, buildKey
+from ...lib.common.dialog_sessions import SessionRecorder
+from ...lib.common.hex_grid import WALL_NB_SIDES, HexPointIndex, calculateOffsetAngle
 
 # NNWS constants
 from ...lib.common.nnws_constants import (
@@ -57,7 +102,6 @@ from ...lib.common.nnws_constants import (
     GRIDFINITY_BASE_HEIGHT_MM,
     GRIDFINITY_SIZE_CM,
     GRIDFINITY_Z_OFFSET_CM,
-    H_NEW_CM,
     HEAD_OFFSET_CM,
     INTERNAL_WALL_CHAMFER_ANGLE,
     MAIN_SCREW_BODY_CLEARANCE_CM,
@@ -71,18 +115,20 @@ from ...lib.common.nnws_constants import (
     MIN_SHELF_SIZE_MM,
     MIN_SHELF_THICKNESS_CM,
     NOTCH_SIZE_RADIUS_CM,
-    THREAD_SIZE_D_MAJOR_CM,
     UNIT_DEG,
     UNIT_MM,
     WALL_INNER_SECTION_OFFSET_CM,
     WALL_INNER_WALL_OFFSET_CM,
     WALL_OUTER_WALL_THICKNESS_CM,
     WALL_THICKNESS_CM,
+    mmToCm,
 )
 from ...lib.common.nnws_util import (
+    FilletAccumulator,
     calculateChamferWidth,
     create2PointRectFromPoints,
     createAnchorChamfer,
+    createAnnulus,
     createCylinder,
     createCylinderFromPoint,
     createCylinderFromPointXYPlane,
@@ -91,30 +137,29 @@ from ...lib.common.nnws_util import (
     createNamedComponent,
     createOffsetPlane,
     createPolygon,
+    cutThreadOvershoot,
+    deferredCompute,
+    extrudeProfile,
     filletEdges,
     selectFaceAt,
     selectTopFace,
     valueInputMinMax,
+    valueOrExpression,
     wrapInCollection,
 )
+from ...lib.common.screw_definitions import ScrewDefinitionsEnum
 from ...lib.common.wall_pattern import (
-    WALL_NB_SIDES,
-    HexPointIndex,
-    calculateOffsetAngle,
     circPatternSketch,
     copyBodies,
     createDeltaVector,
+    instanceComponent,
+    latticeOffsets,
     patternBodies,
 )
 
-# TODO list
-# Add user parameters to the model with all the used values that can be changed and re-used.
-
 app = Application.get()
 ui = app.userInterface
-
-# clearance input as global variable to easily access the input for calculations
-global clearanceInput
+log = nnws_log.getLogger(__name__)
 
 # UI Constants
 MENU_ACC_GENERAL_SETTINGS = "acc_general_settings"
@@ -128,13 +173,13 @@ CLEARANCE_MENU_ID = "clearance_menu_id"
 CLEARANCE_MENU_INPUT = "clearance_menu_input"
 
 # Accessories Drop Down Options
-MENU_MAIN_SCREW = "Main Screw"
-MENU_INSERT = "Base Insert"
-MENU_SHELF = "Shelf Support"
-MENU_SHELF_INSERT = "Shelf Insert"
-MENU_HOOK = "Hook"
-MENU_ANCHOR = "Fastening Anchor"
-MENU_OFFSET_ANCHOR = "Offset Fastening Anchor Set"
+MENU_MAIN_SCREW = ACCESSORY_MAIN_SCREW
+MENU_INSERT = ACCESSORY_INSERT
+MENU_SHELF = ACCESSORY_SHELF
+MENU_SHELF_INSERT = ACCESSORY_SHELF_INSERT
+MENU_HOOK = ACCESSORY_HOOK
+MENU_ANCHOR = ACCESSORY_ANCHOR
+MENU_OFFSET_ANCHOR = ACCESSORY_OFFSET_ANCHOR
 
 # Main Screw Options
 MENU_MAIN_SCREW_GROUP = "main_screw_group"
@@ -187,103 +232,33 @@ MENU_ANCHOR_COUNTERSINK_ANGLE = "anchor_countersink_angle"
 MENU_ANCHOR_HOLE_DIAMETER = "anchor_hole_diameter"
 MENU_ANCHOR_SCREWTYPE_CUSTOM = "Custom"
 
-CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_cmdAccessories"
-CMD_NAME = "NNWS Accessories"
-CMD_Description = "Create NNWS Accessories."
-
-# Specify that the command will be promoted to the panel.
-IS_PROMOTED = True
-WORKSPACE_ID = "FusionSolidEnvironment"
-PANEL_ID = "SolidCreatePanel"
-COMMAND_BESIDE_ID = ""
-
-# Resource location for command icons, here we assume a sub folder in this directory named "resources".
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+MENU_KIT_GROUP = "kit_group"
+MENU_KIT_TEXT = "kit_text"
+MENU_KIT_TABLE = "kit_table"
+MENU_KIT_FILE = "kit_file"
 
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
 
+# Geometry steps known to fail, they expire when the generation code or the constants change. Every lib/common module
+# is hashed, a module the generators start to import can't be missed
+buildFailures = BuildFailureCache(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "build_failures.json"),
+    [__file__] + glob.glob(os.path.join(os.path.dirname(os.path.abspath(nnws_util.__file__)), "*.py")),
+)
 
-# Executed when add-in is run.
-def start():
-    # Create a command Definition.
-    cmd_def = ui.commandDefinitions.addButtonDefinition(CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER)
-
-    # Define an event handler for the command created event. It will be called when the button is clicked.
-    futil.add_handler(cmd_def.commandCreated, command_created)
-
-    # ******** Add a button into the UI so the user can run the command. ********
-    # Get the target workspace the button will be created in.
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-
-    # Get the panel the button will be created in.
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-
-    # Create the button command control in the UI after the specified existing command.
-    control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, False)
-
-    # Specify if the command is promoted to the main toolbar.
-    control.isPromoted = IS_PROMOTED
-
-
-# Executed when add-in is stopped.
-def stop():
-    # Get the various UI elements for this command
-
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-    command_control = panel.controls.itemById(CMD_ID)
-    command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-    # Delete the button command control
-    if command_control:
-        command_control.deleteMe()
-
-    # Delete the command definition
-    if command_definition:
-        command_definition.deleteMe()
+# Shelf sizes of the dialog, checked and suggested without building
+shelfSizing = shelf_sizing.ShelfSizingTable()
 
+# Opt-in recording of the dialog sessions, replayed by the preview latency benchmark
+sessionRecorder = SessionRecorder("commandAccessories", config.RECORD_DIALOG_SESSIONS, config.SESSION_OUTPUT_DIR)
 
-# Function that is called when a user clicks the corresponding button in the UI.
-# This defines the contents of the command dialog and connects to the command related events.
-def command_created(args: CommandCreatedEventArgs):
-    args.command.setDialogInitialSize(400, 600)
-
-    inputs = args.command.commandInputs
-    generalGroup = inputs.addGroupCommandInput(MENU_ACC_GENERAL_SETTINGS, "General Settings")
-    generalGroup.children.addBoolValueInput(MENU_GENERAL_PREVIEW, "Preview", True, "", True)
-    generalGroup.children.addTextBoxCommandInput(
-        CLEARANCE_MENU_ID,
-        "",
-        "The clearance setting applies to all accessories.\nDefault is " + str(MAIN_SCREW_BODY_CLEARANCE_MM) + " mm",
-        2,
-        True,
-    )
-    global clearanceInput
-    clearanceInput = valueInputMinMax(
-        generalGroup,
-        CLEARANCE_MENU_INPUT,
-        "Clearance",
-        UNIT_MM,
-        MAIN_SCREW_BODY_CLEARANCE_CM,
-        0,
-        0.025,
-    )
-
-    # to easily switch between the different accessories for testing as they are the main development focus
-    insertDefaultVisibility = True
-    accTypeDropdown = generalGroup.children.addDropDownCommandInput(
-        MENU_ACC_DROPDOWN, "Accessorie type", DropDownStyles.LabeledIconDropDownStyle
-    )
-    accTypeDropdown.listItems.add(MENU_MAIN_SCREW, False)
-    accTypeDropdown.listItems.add(MENU_INSERT, insertDefaultVisibility)
-    accTypeDropdown.listItems.add(MENU_SHELF, not insertDefaultVisibility)
-    accTypeDropdown.listItems.add(MENU_SHELF_INSERT, False)
-    accTypeDropdown.listItems.add(MENU_HOOK, False)
-    accTypeDropdown.listItems.add(MENU_ANCHOR, False)
-    accTypeDropdown.listItems.add(MENU_OFFSET_ANCHOR, False)
 
+def buildMainScrewGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the main screw options to the dialog.
+    """
     mainScrewGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_MAIN_SCREW_GROUP, "Main Screw Option")
     valueInputMinMax(
         mainScrewGroup,
@@ -293,16 +268,24 @@ def command_created(args: CommandCreatedEventArgs):
         MAIN_SCREW_HEIGHT_CM - MAIN_SCREW_BODY_END_CLEARANCE_CM,
         0.75,
     )
-    mainScrewGroup.isVisible = False
 
-    # Insert Group
+    return mainScrewGroup
+
+
+def buildInsertGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the base insert options to the dialog.
+    """
+    # default screw dimensions, used for the default trims
+    defaultScrew = ScrewDimensions()
+
     insertGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_INSERT_GROUP, "Base Insert Option")
     valueInputMinMax(
         insertGroup,
         MENU_INSERT_TRIM_TOP,
         "Top/Right Width (Trim)",
         UNIT_MM,
-        getScrewInnerRadius(),
+        defaultScrew.innerRadius,
         0,
     )
     trimMsg = (
@@ -332,19 +315,27 @@ def command_created(args: CommandCreatedEventArgs):
     insertGroup.children.addBoolValueInput(MENU_INSERT_INVERSE, "Invert the Trim direction", True, "", True)
     insertGroup.children.addIntegerSpinnerCommandInput(MENU_INSERT_X_COUNT, "Insert X Count", 1, 5, 1, 1)
     insertGroup.children.addIntegerSpinnerCommandInput(MENU_INSERT_Y_COUNT, "Insert Y Count", 1, 5, 1, 1)
-    insertGroup.isVisible = insertDefaultVisibility
+
+    return insertGroup
+
+
+def buildShelfGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the shelf options to the dialog.
+    """
+    # default screw dimensions, used for the default trims
+    defaultScrew = ScrewDimensions()
 
     insertDepthMsg = "Shelf Depth. min " + str(MIN_SHELF_SIZE_MM) + " mm"
     insertLengthMsg = "Shelf Length. min " + str(MIN_SHELF_SIZE_MM) + " mm"
 
-    # Shelf Group
     shelfGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_SHELF_GROUP, "Shelf Option")
     valueInputMinMax(
         shelfGroup,
         MENU_SHELF_TRIM_TOP,
         "Top/Right Width (Trim)",
         UNIT_MM,
-        getScrewInnerRadius(),
+        defaultScrew.innerRadius,
         0,
     )
     valueInputMinMax(
@@ -365,7 +356,9 @@ def command_created(args: CommandCreatedEventArgs):
     )
     shelfGroup.children.addBoolValueInput(MENU_SHELF_NOTCH, "Notch", True, "", True)
     shelfGroup.children.addBoolValueInput(MENU_SHELF_INVERSE, "Invert the Trim direction", True, "", True)
-    xCount = shelfGroup.children.addIntegerSpinnerCommandInput(MENU_SHELF_X_COUNT, "Insert X Count", 1, 5, 1, 2)
+    xCount = shelfGroup.children.addIntegerSpinnerCommandInput(
+        MENU_SHELF_X_COUNT, "Insert X Count", 1, SHELF_MAX_X_COUNT, 1, SHELF_DEFAULT_X_COUNT
+    )
     valueInputMinMax(
         shelfGroup,
         MENU_SHELF_DEPTH,
@@ -383,9 +376,17 @@ def command_created(args: CommandCreatedEventArgs):
         MIN_SHELF_SIZE_CM,
     )
     shelfGroup.children.addTextBoxCommandInput(MENU_SHELF_ERROR, "", "", 2, True)
-    shelfGroup.isVisible = not insertDefaultVisibility
 
-    # Shelf Insert Group
+    return shelfGroup
+
+
+def buildShelfInsertGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the shelf insert options to the dialog.
+    """
+    insertDepthMsg = "Shelf Depth. min " + str(MIN_SHELF_SIZE_MM) + " mm"
+    insertLengthMsg = "Shelf Length. min " + str(MIN_SHELF_SIZE_MM) + " mm"
+
     shelfInsertGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_SHELF_INSERT_GROUP, "Shelf Insert Option")
     shelfInsertGroup.children.addBoolValueInput(MENU_SHELF_INSERT_NOTCH, "Notch", True, "", True)
     insertThicknessMsg = "Shelf Thickness, min " + str(MIN_SHELF_THICKNESS_CM) + " mm"
@@ -410,12 +411,20 @@ def command_created(args: CommandCreatedEventArgs):
         MENU_SHELF_INSERT_LENGTH,
         insertLengthMsg,
         UNIT_MM,
-        xCount.value * (GRIDFINITY_SIZE_CM - ACC_LEDGER_WIDTH_CM),
+        SHELF_DEFAULT_X_COUNT * (GRIDFINITY_SIZE_CM - ACC_LEDGER_WIDTH_CM),
         MIN_SHELF_SIZE_CM,
     )
-    shelfInsertGroup.isVisible = False
 
-    # Hook group
+    return shelfInsertGroup
+
+
+def buildHookGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the hook options to the dialog.
+    """
+    # default screw dimensions, used for the default trims
+    defaultScrew = ScrewDimensions()
+
     hookGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_HOOK_GROUP, "Hook Option")
     hookGroup.children.addBoolValueInput(MENU_HOOK_NOTCH, "Notch", True, "", True)
     valueInputMinMax(
@@ -423,7 +432,7 @@ def command_created(args: CommandCreatedEventArgs):
         MENU_HOOK_TRIM_TOP,
         "Top/Right Width (Trim)",
         UNIT_MM,
-        getScrewInnerRadius(),
+        defaultScrew.innerRadius,
         0,
     )
     valueInputMinMax(
@@ -452,9 +461,14 @@ def command_created(args: CommandCreatedEventArgs):
     )
     hookGroup.children.addBoolValueInput(MENU_HOOK_STOPPER, "Stopper", True, "", True)
     valueInputMinMax(hookGroup, MENU_HOOK_STOPPER_HEIGHT, "Stopper Height", UNIT_MM, 0.5, 0)
-    hookGroup.isVisible = False
 
-    # Anchor Group
+    return hookGroup
+
+
+def buildAnchorGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the anchor options to the dialog, shared by the offset anchors.
+    """
     anchorGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_ANCHOR_GROUP, "Anchor Option")
     # for predefined screw selection
     valueInputMinMax(
@@ -466,18 +480,18 @@ def command_created(args: CommandCreatedEventArgs):
         0,
         WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - ACC_ANCHOR_TOP_OFFSET_CM,
     )
-    anchorGroup.children.addDropDownCommandInput(
+    screwTypeDropdown = anchorGroup.children.addDropDownCommandInput(
         MENU_ANCHOR_SCREWTYPE,
         "Screw/Bolt type",
         DropDownStyles.LabeledIconDropDownStyle,
     )
     defaultSelectedScrew = ScrewDefinitionsEnum.M5
     for screwType in ScrewDefinitionsEnum.list():
-        anchorGroup.children.itemById(MENU_ANCHOR_SCREWTYPE).listItems.add(
+        screwTypeDropdown.listItems.add(
             screwType.displayName,
             screwType.displayName == defaultSelectedScrew.value.displayName,
         )
-    anchorGroup.children.itemById(MENU_ANCHOR_SCREWTYPE).listItems.add(MENU_ANCHOR_SCREWTYPE_CUSTOM, False)
+    screwTypeDropdown.listItems.add(MENU_ANCHOR_SCREWTYPE_CUSTOM, False)
     # display the hole size for the selected screw and let custom selection
     valueInputMinMax(
         anchorGroup,
@@ -505,7 +519,154 @@ def command_created(args: CommandCreatedEventArgs):
         MAIN_SCREW_BODY_CLEARANCE_CM,
         10,
     )
-    anchorGroup.isVisible = False
+
+    return anchorGroup
+
+
+# accessory type -> (group id, builder of the group), the anchors share their group
+ACCESSORY_GROUPS = {
+    MENU_MAIN_SCREW: (MENU_MAIN_SCREW_GROUP, buildMainScrewGroup),
+    MENU_INSERT: (MENU_INSERT_GROUP, buildInsertGroup),
+    MENU_SHELF: (MENU_SHELF_GROUP, buildShelfGroup),
+    MENU_SHELF_INSERT: (MENU_SHELF_INSERT_GROUP, buildShelfInsertGroup),
+    MENU_HOOK: (MENU_HOOK_GROUP, buildHookGroup),
+    MENU_ANCHOR: (MENU_ANCHOR_GROUP, buildAnchorGroup),
+    MENU_OFFSET_ANCHOR: (MENU_ANCHOR_GROUP, buildAnchorGroup),
+}
+
+
+def buildKitGroup(inputs: CommandInputs) -> GroupCommandInput:
+    """
+    Adds the kit options to the dialog, the number of copies of every accessory type or a JSON kit file.
+    """
+    kitGroup: GroupCommandInput = inputs.addGroupCommandInput(MENU_KIT_GROUP, "Kit")
+    kitGroup.isExpanded = False
+    kitMsg = (
+        "Generates every accessory with copies in one go, each one with the options of its type. "
+        "A JSON kit file replaces the table, see lib/common/accessory_kit.py."
+    )
+    kitGroup.children.addTextBoxCommandInput(MENU_KIT_TEXT, "", kitMsg, 3, True)
+    kitTable: TableCommandInput = kitGroup.children.addTableCommandInput(MENU_KIT_TABLE, "Copies", 2, "2:1")
+    kitTable.maximumVisibleRows = len(ACCESSORY_GROUPS)
+    for row, accessory in enumerate(ACCESSORY_GROUPS):
+        nameInput = kitTable.commandInputs.addStringValueInput(f"kit_name {row}", "", accessory)
+        nameInput.isReadOnly = True
+        countInput = kitTable.commandInputs.addIntegerSpinnerCommandInput(f"kit_count {row}", "Copies", 0, 99, 1, 0)
+        countInput.isFullWidth = True
+        kitTable.addCommandInput(nameInput, row, 0)
+        kitTable.addCommandInput(countInput, row, 1)
+    kitGroup.children.addStringValueInput(MENU_KIT_FILE, "Kit File (JSON)", "")
+
+    return kitGroup
+
+
+class DialogGroups:
+    """
+    The accessory groups of the open dialog, each one is built the first time its accessory type is selected
+    inputs: The command inputs of the dialog
+    groups: group id -> GroupCommandInput, the groups built so far
+    visibleId: The id of the visible group, None before the first selection
+    """
+
+    def __init__(self, inputs: CommandInputs):
+        self.inputs = inputs
+        self.groups = {}
+        self.visibleId = None
+        self._items = {}
+
+    def show(self, selected: str) -> GroupCommandInput:
+        """
+        Shows the group of an accessory type, building it when needed, and hides the previously visible one.
+        """
+        groupId, _ = ACCESSORY_GROUPS[selected]
+        group = self.build(selected)
+        if self.visibleId != groupId:
+            if self.visibleId is not None:
+                self.groups[self.visibleId].isVisible = False
+            group.isVisible = True
+            self.visibleId = groupId
+        return group
+
+    def build(self, selected: str) -> GroupCommandInput:
+        """
+        Returns:
+            GroupCommandInput: The group of an accessory type, built hidden when needed.
+        """
+        groupId, build = ACCESSORY_GROUPS[selected]
+        group = self.groups.get(groupId)
+        if group is None:
+            group = self.groups[groupId] = build(self.inputs)
+            group.isVisible = False
+        return group
+
+    def isBuilt(self, selected: str) -> bool:
+        """
+        Returns:
+            bool: True when the group of an accessory type was shown, its inputs hold the options of the user.
+        """
+        groupId, _ = ACCESSORY_GROUPS[selected]
+        return groupId in self.groups
+
+    def item(self, inputId: str) -> CommandInput:
+        """
+        Returns:
+            CommandInput: The input with this id, looked up once per dialog.
+        """
+        item = self._items.get(inputId)
+        if item is None:
+            item = self._items[inputId] = self.inputs.itemById(inputId)
+        return item
+
+
+# The accessory groups of the open dialog
+dialogGroups: DialogGroups = None
+
+
+# Function that is called when a user clicks the corresponding button in the UI.
+# This defines the contents of the command dialog and connects to the command related events.
+def command_created(args: CommandCreatedEventArgs):
+    args.command.setDialogInitialSize(400, 600)
+
+    inputs = args.command.commandInputs
+    generalGroup = inputs.addGroupCommandInput(MENU_ACC_GENERAL_SETTINGS, "General Settings")
+    generalGroup.children.addBoolValueInput(MENU_GENERAL_PREVIEW, "Preview", True, "", True)
+    generalGroup.children.addTextBoxCommandInput(
+        CLEARANCE_MENU_ID,
+        "",
+        "The clearance setting applies to all accessories.\nDefault is " + str(MAIN_SCREW_BODY_CLEARANCE_MM) + " mm",
+        2,
+        True,
+    )
+    valueInputMinMax(
+        generalGroup,
+        CLEARANCE_MENU_INPUT,
+        "Clearance",
+        UNIT_MM,
+        MAIN_SCREW_BODY_CLEARANCE_CM,
+        0,
+        MAX_CLEARANCE_CM,
+    )
+
+    # to easily switch between the different accessories for testing as they are the main development focus
+    insertDefaultVisibility = True
+    accTypeDropdown = generalGroup.children.addDropDownCommandInput(
+        MENU_ACC_DROPDOWN, "Accessorie type", DropDownStyles.LabeledIconDropDownStyle
+    )
+    accTypeDropdown.listItems.add(MENU_MAIN_SCREW, False)
+    accTypeDropdown.listItems.add(MENU_INSERT, insertDefaultVisibility)
+    accTypeDropdown.listItems.add(MENU_SHELF, not insertDefaultVisibility)
+    accTypeDropdown.listItems.add(MENU_SHELF_INSERT, False)
+    accTypeDropdown.listItems.add(MENU_HOOK, False)
+    accTypeDropdown.listItems.add(MENU_ANCHOR, False)
+    accTypeDropdown.listItems.add(MENU_OFFSET_ANCHOR, False)
+
+    # the accessory groups are built the first time their type is selected
+    global dialogGroups
+    dialogGroups = DialogGroups(inputs)
+    dialogGroups.show(accTypeDropdown.selectedItem.name)
+    buildKitGroup(inputs)
+
+    sessionRecorder.start(inputs)
 
     futil.add_handler(args.command.execute, command_execute, local_handlers=local_handlers)
     futil.add_handler(args.command.inputChanged, command_input_changed, local_handlers=local_handlers)
@@ -522,25 +683,201 @@ def updateScrewDefinitionValues():
     pass
 
 
-def select(selected: DropDownCommandInput, args: CommandEventArgs):
+def select(selected: str, params, instanced: bool = None) -> str:
     """
     Calls the proper part geneartion base on selection for generation and preview
+
+    Args:
+        selected (str): The selected accessory type.
+        params: The parameter snapshot of the accessory.
+        instanced (bool, optional): Builds the insert plates from instanced cells. Defaults to config.INSTANCE_PATTERNS.
+
+    Returns:
+        str: The prefix of the user parameters of the accessory, None in direct modeling.
+    """
+
+    # never start building an accessory that can't be generated
+    requireFeasible(params)
+
+    with prof.profiledRun(selected, config.PROFILE_OUTPUT_DIR, futil.log):
+        prefix = addUserParameters(selected, params)
+        parameters = accessory_user_parameters.drivingParameters(selected, prefix) if prefix else {}
+        if MENU_MAIN_SCREW == selected:
+            generateMainScrew(params)
+        elif MENU_INSERT == selected:
+            generateInsertBase(MENU_INSERT, params, config.INSTANCE_PATTERNS if instanced is None else instanced)
+        elif MENU_SHELF == selected:
+            generateShelf(params)
+        elif MENU_SHELF_INSERT == selected:
+            generateShelfInsert(params, parameters)
+        elif MENU_HOOK == selected:
+            generateHook(params, parameters)
+        elif MENU_ANCHOR == selected or MENU_OFFSET_ANCHOR == selected:
+            generateAnchor(params, parameters)
+    return prefix
+
+
+def addUserParameters(selected: str, params) -> str:
+    """
+    Writes the values an accessory is built with to the design as user parameters, see
+    lib/common/accessory_user_parameters.py.
+
+    Args:
+        selected (str): The accessory type.
+        params: The parameter snapshot of the accessory.
+
+    Returns:
+        str: The prefix of the parameters, unique in the design, None in direct modeling where the design has none.
+    """
+    design = app.activeProduct
+    if direct_modeling.isDirect(design):
+        return None
+    userParameters = design.userParameters
+    prefix = accessory_user_parameters.parameterPrefix(selected, [parameter.name for parameter in userParameters])
+    for spec in accessory_user_parameters.ACCESSORY_USER_PARAMETERS.get(selected, ()):
+        expression = spec.expression(prefix)
+        value = ValueInput.createByString(expression) if expression else ValueInput.createByReal(spec.value(params))
+        userParameters.add(spec.name(prefix), value, spec.unit, spec.comment)
+    return prefix
+
+
+def editUserParameters(prefix: str, edits: dict):
     """
+    Changes the user parameters of a generated accessory, Fusion recomputes the features referencing them.
+
+    Args:
+        prefix (str): The prefix of the parameters of the accessory.
+        edits (dict): suffix -> value, see accessory_user_parameters.parameterEdit.
+    """
+    userParameters = app.activeProduct.userParameters
+    for suffix, value in edits.items():
+        userParameters.itemByName(accessory_user_parameters.parameterName(prefix, suffix)).value = value
+
+
+def deleteUserParameters(prefix: str):
+    """
+    Deletes the user parameters of an accessory, once its features are deleted. The derived parameters go first.
+    """
+    userParameters = app.activeProduct.userParameters
+    owned = [parameter for parameter in userParameters if parameter.name.startswith(accessory_user_parameters.parameterName(prefix, ""))]
+    for parameter in reversed(owned):
+        parameter.deleteMe()
+
+
+def readParameters(inputs: CommandInputs, selected: str):
+    """
+    Reads the parameters of the selected accessory from the command inputs in one pass.
+
+    Args:
+        inputs (CommandInputs): The command inputs.
+        selected (str): The selected accessory type.
+
+    Returns:
+        The parameter snapshot of the selected accessory, None if the type is unknown.
+    """
+    screw = ScrewDimensions(inputs.itemById(CLEARANCE_MENU_INPUT).value)
 
     if MENU_MAIN_SCREW == selected:
-        generateMainScrew(args)
+        return MainScrewParameters(screw, inputs.itemById(MAIN_SCREW_HEIGHT).value)
     elif MENU_INSERT == selected:
-        generateInsert(args)
+        return InsertParameters(
+            screw,
+            inputs.itemById(MENU_INSERT_TRIM_TOP).value,
+            inputs.itemById(MENU_INSERT_TRIM_BOTTOM).value,
+            inputs.itemById(MENU_INSERT_EXTRA_SPACING).value,
+            inputs.itemById(MENU_INSERT_NOTCH).value,
+            inputs.itemById(MENU_INSERT_INVERSE).value,
+            inputs.itemById(MENU_INSERT_X_COUNT).value,
+            inputs.itemById(MENU_INSERT_Y_COUNT).value,
+        )
     elif MENU_SHELF == selected:
-        generateShelf(args)
+        insert = InsertParameters(
+            screw,
+            inputs.itemById(MENU_SHELF_TRIM_TOP).value,
+            inputs.itemById(MENU_SHELF_TRIM_BOTTOM).value,
+            inputs.itemById(MENU_SHELF_EXTRA_SPACING).value,
+            inputs.itemById(MENU_SHELF_NOTCH).value,
+            inputs.itemById(MENU_SHELF_INVERSE).value,
+            inputs.itemById(MENU_SHELF_X_COUNT).value,
+        )
+        return ShelfParameters(insert, inputs.itemById(MENU_SHELF_DEPTH).value, inputs.itemById(MENU_SHELF_LENGTH).value)
     elif MENU_SHELF_INSERT == selected:
-        generateShelfInsert(args)
+        return ShelfInsertParameters(
+            screw,
+            inputs.itemById(MENU_SHELF_INSERT_NOTCH).value,
+            inputs.itemById(MENU_SHELF_INSERT_THICKNESS).value,
+            inputs.itemById(MENU_SHELF_INSERT_DEPTH).value,
+            inputs.itemById(MENU_SHELF_INSERT_LENGTH).value,
+        )
     elif MENU_HOOK == selected:
-        generateHook(args)
-    elif MENU_ANCHOR == selected:
-        generateAnchor(args)
-    elif MENU_OFFSET_ANCHOR == selected:
-        generateAnchor(args, True)
+        # the hook is always using an inverted insert without extra spacing
+        insert = InsertParameters(
+            screw,
+            inputs.itemById(MENU_HOOK_TRIM_TOP).value,
+            inputs.itemById(MENU_HOOK_TRIM_BOTTOM).value,
+            0,
+            inputs.itemById(MENU_HOOK_NOTCH).value,
+            True,
+        )
+        return HookParameters(
+            insert,
+            inputs.itemById(MENU_HOOK_SIZE).value,
+            inputs.itemById(MENU_HOOK_LENGTH).value,
+            inputs.itemById(MENU_HOOK_STOPPER).value,
+            inputs.itemById(MENU_HOOK_STOPPER_HEIGHT).value,
+        )
+    elif MENU_ANCHOR == selected or MENU_OFFSET_ANCHOR == selected:
+        return AnchorParameters(
+            screw,
+            inputs.itemById(MENU_ANCHOR_TOP_OFFSET).value,
+            inputs.itemById(MENU_ANCHOR_HEAD_DIAMETER).value,
+            inputs.itemById(MENU_ANCHOR_COUNTERSINK_ANGLE).value,
+            inputs.itemById(MENU_ANCHOR_HOLE_DIAMETER).value,
+            MENU_OFFSET_ANCHOR == selected,
+        )
+    return None
+
+
+def kitCountInputs(inputs: CommandInputs) -> list:
+    """
+    Returns:
+        list: The copies input of every accessory type of the kit table, in the order of ACCESSORY_GROUPS.
+    """
+    kitTable: TableCommandInput = inputs.itemById(MENU_KIT_TABLE)
+    return [kitTable.getInputAtPosition(row, 1) for row in range(len(ACCESSORY_GROUPS))]
+
+
+def readKit(inputs: CommandInputs) -> list:
+    """
+    Reads the kit of the dialog, the JSON kit file when one is given, else the copies of the kit table with the
+    options of every accessory type. The inputs are not built during the execute, the types never shown take the
+    defaults with the clearance of the dialog.
+
+    Args:
+        inputs (CommandInputs): The command inputs.
+
+    Raises:
+        ValueError: When the kit file is not valid.
+
+    Returns:
+        list: The KitItem of the kit, empty when no copy is asked for.
+    """
+    kitFile = inputs.itemById(MENU_KIT_FILE)
+    if kitFile is None:
+        return []
+    if kitFile.value.strip():
+        return accessory_kit.loadKit(kitFile.value.strip())
+
+    screw = ScrewDimensions(inputs.itemById(CLEARANCE_MENU_INPUT).value)
+    items = []
+    for accessory, countInput in zip(ACCESSORY_GROUPS, kitCountInputs(inputs)):
+        if countInput.value > 0:
+            if dialogGroups.isBuilt(accessory):
+                params = readParameters(inputs, accessory)
+            else:
+                params = defaultParameters(accessory, screw)
+            items.append(accessory_kit.KitItem(accessory, countInput.value, params))
+    return items
 
 
 # This event handler is called when the user clicks the OK button in the command dialog or
@@ -548,8 +885,19 @@ def select(selected: DropDownCommandInput, args: CommandEventArgs):
 def command_execute(args: CommandEventArgs):
     try:
         inputs = args.command.commandInputs
-        selected: DropDownCommandInput = inputs.itemById(MENU_ACC_DROPDOWN).selectedItem.name
-        select(selected, args)
+        selected = inputs.itemById(MENU_ACC_DROPDOWN).selectedItem.name
+        with sessionRecorder.timed("execute"):
+            kit = readKit(inputs)
+            if kit:
+                with prof.profiledRun("kit", config.PROFILE_OUTPUT_DIR, futil.log):
+                    reports = generateKit(kit)
+                futil.log(accessory_kit.kitReport(reports))
+            else:
+                select(selected, readParameters(inputs, selected))
+    except ValueError as e:
+        # an invalid kit file or infeasible parameters, nothing was built
+        if ui:
+            ui.messageBox(f"Failed:\n{e}")
     except RuntimeError:
         if ui:
             ui.messageBox("Failed:\n{}".format(traceback.format_exc()))
@@ -558,55 +906,20 @@ def command_execute(args: CommandEventArgs):
 # This event handler is called when the user changes anything in the command dialog
 # allowing you to modify values of other inputs based on that change.
 def command_input_changed(args: InputChangedEventArgs):
-    typeSelection = None
+    sessionRecorder.inputChanged(args.input)
+
     if args and isinstance(args.input, DropDownCommandInput):  # TODO classType would probably work here
+        # show the group of the selected accessory type, only the previous one is hidden
         if args.input.id == MENU_ACC_DROPDOWN:
-            typeSelection = args.input.selectedItem.name
+            dialogGroups.show(args.input.selectedItem.name)
         if args.input.id == MENU_ANCHOR_SCREWTYPE and args.input.selectedItem.name != MENU_ANCHOR_SCREWTYPE_CUSTOM:
             screwDefinition = ScrewDefinitionsEnum.byName(args.input.selectedItem.name)
-            args.input.parentCommandInput.commandInputs.itemById(MENU_ANCHOR_HEAD_DIAMETER).value = screwDefinition.headDiameter
-            args.input.parentCommandInput.commandInputs.itemById(MENU_ANCHOR_COUNTERSINK_ANGLE).value = math.radians(
-                screwDefinition.countersinkAngle
-            )
-            args.input.parentCommandInput.commandInputs.itemById(MENU_ANCHOR_HOLE_DIAMETER).value = screwDefinition.holeDiameter
-
-    # 2 steps implementation, first hide all the groups and then show the selected one
-    # this is also called when a value input is changed, so we need to check if the selected is not None
-    if typeSelection is not None:
-        for group in [
-            MENU_MAIN_SCREW_GROUP,
-            MENU_INSERT_GROUP,
-            MENU_SHELF_GROUP,
-            MENU_SHELF_INSERT_GROUP,
-            MENU_HOOK_GROUP,
-            MENU_ANCHOR_GROUP,
-        ]:
-            args.input.parentCommandInput.commandInputs.itemById(group).isVisible = False
-
-    # enable the group for the selected option
-    # Future, was trying ideas with screw height, but not pursuing it for now. Leaving the code here for future reference
-    # Still using the value from the input selection though
-    if MENU_MAIN_SCREW == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_MAIN_SCREW_GROUP).isVisible = True
-
-    if MENU_INSERT == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_INSERT_GROUP).isVisible = True
-
-    if MENU_SHELF == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_SHELF_GROUP).isVisible = True
-
-    if MENU_SHELF_INSERT == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_SHELF_INSERT_GROUP).isVisible = True
-
-    if MENU_HOOK == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_HOOK_GROUP).isVisible = True
+            dialogGroups.item(MENU_ANCHOR_HEAD_DIAMETER).value = screwDefinition.headDiameter
+            dialogGroups.item(MENU_ANCHOR_COUNTERSINK_ANGLE).value = math.radians(screwDefinition.countersinkAngle)
+            dialogGroups.item(MENU_ANCHOR_HOLE_DIAMETER).value = screwDefinition.holeDiameter
 
     if MENU_SHELF_X_COUNT == args.input.id:
-        xCount = args.input.parentCommandInput.commandInputs.itemById(MENU_SHELF_X_COUNT).value
-        args.input.parentCommandInput.commandInputs.itemById(MENU_SHELF_LENGTH).value = xCount * GRIDFINITY_SIZE_CM
-
-    if MENU_ANCHOR == typeSelection or MENU_OFFSET_ANCHOR == typeSelection:
-        args.input.parentCommandInput.commandInputs.itemById(MENU_ANCHOR_GROUP).isVisible = True
+        dialogGroups.item(MENU_SHELF_LENGTH).value = args.input.value * GRIDFINITY_SIZE_CM
 
     # select the Custom option when the user any of the screw inputs
     if (
@@ -614,17 +927,27 @@ def command_input_changed(args: InputChangedEventArgs):
         or MENU_ANCHOR_COUNTERSINK_ANGLE == args.input.id
         or MENU_ANCHOR_HOLE_DIAMETER == args.input.id
     ):
-        args.input.parentCommandInput.commandInputs.itemById(MENU_ANCHOR_SCREWTYPE).listItems[-1].isSelected = True
+        dialogGroups.item(MENU_ANCHOR_SCREWTYPE).listItems[-1].isSelected = True
 
 
 def command_preview(args: CommandEventArgs):
     try:
         inputs = args.command.commandInputs
-        preview = inputs.itemById(MENU_ACC_GENERAL_SETTINGS).children.itemById(MENU_GENERAL_PREVIEW)
+        preview = inputs.itemById(MENU_GENERAL_PREVIEW)
+
+        # the kits are only generated on OK
+        kitFile = inputs.itemById(MENU_KIT_FILE)
+        if kitFile and (kitFile.value.strip() or any(input.value for input in kitCountInputs(inputs))):
+            return
 
         if preview and preview.value:
-            selected: DropDownCommandInput = inputs.itemById(MENU_ACC_DROPDOWN).selectedItem.name
-            select(selected, args)
+            selected = inputs.itemById(MENU_ACC_DROPDOWN).selectedItem.name
+            with buildFailures.previewing(), sessionRecorder.timed("preview"):
+                select(selected, readParameters(inputs, selected))
+    except KnownBuildFailure as e:
+        # no need for the traceback, the step was not even attempted
+        if ui:
+            ui.messageBox(f"Failed:\n{e}")
     except RuntimeError:
         if ui:
             ui.messageBox("Failed:\n{}".format(traceback.format_exc()))
@@ -635,123 +958,227 @@ def command_preview(args: CommandEventArgs):
 def command_validate_input(args: ValidateInputsEventArgs):
     inputs = args.inputs
 
-    args.areInputsValid = clearanceInput.value >= 0 and clearanceInput.value <= 0.025
-    if not args.areInputsValid:
-        return
-
-    if inputs.itemById(MENU_INSERT_GROUP).isVisible:
-        topTrim = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_TRIM_TOP).value
-        bottomTrim = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_TRIM_BOTTOM).value
-        extraSpacing = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_EXTRA_SPACING).value
-        args.areInputsValid = topTrim > 0 and bottomTrim > 0 and extraSpacing >= 0
-
-    if inputs.itemById(MENU_SHELF_GROUP).isVisible:
-        topTrim = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_TRIM_TOP).value
-        bottomTrim = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_TRIM_BOTTOM).value
-        extraSpacing = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_EXTRA_SPACING).value
-        shelfDepth = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_DEPTH).value
-        shelfLength = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_LENGTH).value
-
-        #  checking if it's too tight with the number of inserts
-        xCount = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_X_COUNT).value
-        numFits = int(shelfLength // GRIDFINITY_SIZE_CM)
-        sideWidth = (shelfLength - max(xCount - 1, numFits - 1) * GRIDFINITY_SIZE_CM) / 2
-        if sideWidth < 0.75:
-            inputs.itemById(MENU_SHELF_GROUP).children.itemById(
-                MENU_SHELF_ERROR
-            ).text = "The shelf is too small for the number of inserts, could not calculate fillet."
-        else:  # clear the error
-            inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_ERROR).text = ""
-
-        args.areInputsValid = (
-            topTrim > 0 and bottomTrim > 0 and extraSpacing >= 0 and shelfDepth >= MIN_SHELF_SIZE_CM and shelfLength >= MIN_SHELF_SIZE_CM
-        )
+    selected = inputs.itemById(MENU_ACC_DROPDOWN).selectedItem.name
+    params = readParameters(inputs, selected)
+    violations = validate(params)
+    args.areInputsValid = not errors(violations)
 
-    if inputs.itemById(MENU_SHELF_INSERT_GROUP).isVisible:
-        shelfThickness = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_THICKNESS).value
-        shelfDepth = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_DEPTH).value
-        shelfLength = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_LENGTH).value
-        args.areInputsValid = (
-            shelfThickness >= MIN_SHELF_THICKNESS_CM and shelfDepth >= MIN_SHELF_SIZE_CM and shelfLength >= MIN_SHELF_SIZE_CM
-        )
-
-    if inputs.itemById(MENU_HOOK_GROUP).isVisible:
-        topTrim = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_TRIM_TOP).value
-        bottomTrim = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_TRIM_BOTTOM).value
-        length = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_LENGTH).value
-        size = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_SIZE).value
-        args.areInputsValid = topTrim > 0 and bottomTrim > 0 and length >= 0 and size <= (topTrim + bottomTrim) and size >= 0.75
-
-    if inputs.itemById(MENU_ANCHOR_GROUP).isVisible:
-        topOffset = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_TOP_OFFSET).value
-        headDiameter = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_HEAD_DIAMETER).value
-        countersinkAngle = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_COUNTERSINK_ANGLE).value
-        holeDiameter = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_HOLE_DIAMETER).value
-
-        args.areInputsValid = (
-            headDiameter > 0
-            and countersinkAngle > 0
-            and countersinkAngle < 180
-            and holeDiameter > 0
-            and holeDiameter < headDiameter
-            and topOffset < WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - ACC_ANCHOR_TOP_OFFSET_CM
-        )
+    if MENU_SHELF == selected:
+        # the frame problems and the nearest sizes without them, from the sizing table instead of a build
+        messages = [v.message for v in violations if v.name.startswith("shelf")]
+        if messages:
+            messages.append(shelfSizing.suggestion(params))
+        inputs.itemById(MENU_SHELF_ERROR).text = "\n".join(message for message in messages if message)
 
 
 # This event handler is called when the command terminates.
 def command_destroy(args: CommandEventArgs):
-    global local_handlers
+    global local_handlers, dialogGroups
     local_handlers = []
+    dialogGroups = None
+    sessionRecorder.stop()
 
 
-def generateShelf(args: CommandEventArgs):
+@prof.profiled()
+def generateKit(items: list) -> list:
     """
-    Generates a shelf, which is a base wall insert with a shelf insert that snap in it.
+    Generates the accessories of a kit in one command. An accessory is built once per set of parameters and hidden,
+    every copy is an occurrence of its component added at its position, like the plates place their parts. The lines
+    are laid out in rows along Y, their copies side by side along X.
+
+    Args:
+        items (list): The KitItem of the kit.
+
+    Raises:
+        InfeasibleParametersError: When an accessory can't be generated, before anything is built.
+
+    Returns:
+        list: The KitItemReport of every line.
+    """
+    for item in items:
+        requireFeasible(item.params)
+
+    rootComponent = app.activeProduct.rootComponent
+    occurrences = rootComponent.occurrences
+    spacing = mmToCm(config.PLATE_SPACING_MM)
+    # (accessory, parameter key) -> the components of the accessory and the footprint of the first one
+    built = {}
+    reports = []
+    y = 0.0
+    for item in items:
+        start = time.perf_counter()
+        key = (item.accessory, buildKey(item.params))
+        shared = key in built
+        if not shared:
+            first = occurrences.count
+            select(item.accessory, item.params)
+            generated = [occurrences.item(index) for index in range(first, occurrences.count)]
+            footprint, _ = plate_export.partFootprint(generated[0].component, hull=False)
+            # moving the generated occurrences isn't captured in a parametric design, the next generations would
+            # recompute them back to the origin, the copies are placed when they are added instead
+            for occurrence in generated:
+                occurrence.isLightBulbOn = False
+            built[key] = ([occurrence.component for occurrence in generated], footprint)
+        components, footprint = built[key]
+        minX, minY = footprint.corners[0]
+
+        for copy in range(item.count):
+            transform = Matrix3D.create()
+            transform.translation = Vector3D.create(copy * (footprint.width + spacing) - minX, y - minY, 0)
+            for component in components:
+                occurrences.addExistingComponent(component, transform)
+        y += footprint.depth + spacing
+
+        report = accessory_kit.KitItemReport(item.accessory, item.count, time.perf_counter() - start, shared)
+        log.info("Kit: %s x%d in %.0f ms%s", report.accessory, report.count, report.seconds * 1000, " (shared build)" if shared else "")
+        reports.append(report)
+    return reports
+
+
+def scriptGenerateKit(kitPath: str, exportPath: str = None) -> list:
     """
+    Not used by the add-in; meant to be called by an external script. Generates the accessories of a JSON kit file
+    and exports them to a single STEP file. The design keeps its timeline, the anchor holes roll it back.
 
-    inputs = args.command.commandInputs
-    xCount = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_X_COUNT).value
-    trimTop = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_TRIM_TOP).value
-    trimBottom = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_TRIM_BOTTOM).value
-    extraSpacing = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_EXTRA_SPACING).value
-    notch = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_NOTCH).value
-    shelfDepth = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_DEPTH).value
-    shelfLength = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_LENGTH).value
-    invertAxis = inputs.itemById(MENU_SHELF_GROUP).children.itemById(MENU_SHELF_INVERSE).value
-
-    internalGenerateShelf(
-        xCount,
-        trimTop,
-        trimBottom,
-        extraSpacing,
-        notch,
-        shelfDepth,
-        shelfLength,
-        invertAxis,
+    Args:
+        kitPath (str): The JSON kit file, see lib/common/accessory_kit.py.
+        exportPath (str, optional): The STEP file, nothing is exported by default.
+
+    Raises:
+        ValueError: When the kit file is not valid or an accessory can't be generated.
+
+    Returns:
+        list: The KitItemReport of every line.
+    """
+    items = accessory_kit.loadKit(kitPath)
+    design = app.activeProduct
+    with prof.profiledRun(os.path.basename(os.path.splitext(kitPath)[0]), config.PROFILE_OUTPUT_DIR, futil.log):
+        reports = generateKit(items)
+    futil.log(f"scriptGenerateKit: {accessory_kit.kitReport(reports)}")
+    if exportPath:
+        step_export.exportInstances(design, exportPath)
+        if config.BATCH_EXPORT_3MF:
+            threemf_export.exportInstances3MF(design, f"{os.path.splitext(exportPath)[0]}.3mf")
+    return reports
+
+
+def scriptExportAccessoryPlates(exportPath: str, parts: list, bedSizeMm: tuple = None, spacingMm: float = None) -> list:
+    """
+    Not used by the add-in; meant to be called by an external script. Generates every accessory once and exports
+    the copies packed on print plates, a file per plate.
+
+    Args:
+        exportPath (str): The folder of the files.
+        parts (list): A (selected, params, count) tuple per accessory, the accessory type as in select and its copies.
+        bedSizeMm (tuple, optional): The (width, depth) of the print bed in mm. Defaults to config.PRINT_BED_SIZE_MM.
+        spacingMm (float, optional): The space between the parts in mm. Defaults to config.PLATE_SPACING_MM.
+
+    Raises:
+        ValueError: When an accessory doesn't fit on the bed.
+
+    Returns:
+        list: The paths of the STEP files written.
+    """
+    bedWidth, bedDepth = (mmToCm(size) for size in bedSizeMm or config.PRINT_BED_SIZE_MM)
+    spacing = mmToCm(config.PLATE_SPACING_MM if spacingMm is None else spacingMm)
+    if not os.path.exists(exportPath):
+        os.makedirs(exportPath)
+
+    design = app.activeProduct
+    rootComponent = design.rootComponent
+    paths = []
+    prefixes = []
+    try:
+        components = []
+        for selected, params, _ in parts:
+            # the footprints are taken from the bodies of the part component, the inserts are not instanced
+            prefixes.append(select(selected, params, instanced=False))
+            occurrence = rootComponent.occurrences.item(rootComponent.occurrences.count - 1)
+            occurrence.isLightBulbOn = False
+            components.append(occurrence.component)
+
+        with prof.profiledRun("accessory_plates", config.PROFILE_OUTPUT_DIR, futil.log):
+            plan, placed = plate_export.packComponents(
+                components, [count for _, _, count in parts], bedWidth, bedDepth, spacing, config.PLATE_FOOTPRINT_HULL
+            )
+            futil.log(f"scriptExportAccessoryPlates: {plan.summary()}, exporting to '{exportPath}'")
+            for index, plate in enumerate(plate_export.buildPlates(design, plan, placed, "Accessory Plate")):
+                filename = f"{exportPath}/accessory_plate_{index + 1}"
+                paths.append(step_export.exportInstances(design, f"{filename}.step", plate.component))
+                if config.BATCH_EXPORT_3MF:
+                    threemf_export.exportInstances3MF(design, f"{filename}.3mf", plate.component)
+    finally:
+        # clean up the design, the parts go with their last occurrence, then their user parameters
+        for c in list(rootComponent.occurrences):
+            c.deleteMe()
+        for prefix in prefixes:
+            if prefix:
+                deleteUserParameters(prefix)
+    return paths
+
+
+def scriptParameterEditTiming(selected: str, params, changed) -> tuple:
+    """
+    Not used by the add-in; meant to be called by an external script. Generates an accessory, then times its change
+    to other parameters done as an edit of its user parameters, recomputed by Fusion, and as a full regeneration.
+
+    Args:
+        selected (str): The accessory type, as in select.
+        params: The parameter snapshot the accessory is generated with.
+        changed: The parameter snapshot it is changed to.
+
+    Raises:
+        ValueError: When the change needs a regeneration, a value that isn't driven by a user parameter changed, or
+            when the design is in direct modeling and has no parameters.
+
+    Returns:
+        tuple: The seconds of the parameter edit and of the regeneration.
+    """
+    edits = accessory_user_parameters.parameterEdit(selected, params, changed)
+    if edits is None:
+        raise ValueError(f"{selected}: the change is not driven by user parameters, the accessory has to be regenerated")
+    design = app.activeProduct
+    if direct_modeling.isDirect(design):
+        raise ValueError("The design is in direct modeling, it has no user parameters")
+
+    occurrences = design.rootComponent.occurrences
+    first = occurrences.count
+    prefix = select(selected, params)
+
+    start = time.perf_counter()
+    editUserParameters(prefix, edits)
+    editSeconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for occurrence in [occurrences.item(index) for index in range(first, occurrences.count)]:
+        occurrence.deleteMe()
+    deleteUserParameters(prefix)
+    select(selected, changed)
+    regenerateSeconds = time.perf_counter() - start
+
+    futil.log(
+        f"scriptParameterEditTiming: {selected} {', '.join(edits)} edited in {editSeconds * 1000:.0f} ms, "
+        f"regenerated in {regenerateSeconds * 1000:.0f} ms"
     )
+    return editSeconds, regenerateSeconds
 
 
-def internalGenerateShelf(
-    xCount: int,
-    trimTop: float,
-    trimBottom: float,
-    extraSpacing: float,
-    notch: bool,
-    shelfDepth: float,
-    shelfLength: float,
-    invertAxis: bool,
-):
+@prof.profiled()
+def generateShelf(params: ShelfParameters):
+    """
+    Generates a shelf, which is a base wall insert with a shelf insert that snap in it.
+
+    Args:
+        params (ShelfParameters): The shelf parameters.
+    """
+    insert = params.insert
+    xCount = insert.xCount
+    trimBottom = insert.trimBottom
+    shelfDepth = params.depth
+    shelfLength = params.length
+
     # start by genearing the insert
-    shelfBaseComponent = generateInsertBase(
-        MENU_SHELF,
-        trimTop,
-        trimBottom,
-        xCount,
-        1,
-        extraSpacing,
-        notch,
-        invertAxis,
-    )
+    shelfBaseComponent = generateInsertBase(MENU_SHELF, insert)
 
     planeInput: ConstructionPlaneInput = shelfBaseComponent.component.constructionPlanes.createInput()
     bottomOffset = trimBottom + GRIDFINITY_BASE_HEIGHT_CM / 2 + GRIDFINITY_Z_OFFSET_CM
@@ -765,9 +1192,9 @@ def internalGenerateShelf(
     offsetSketch: Sketch = sketches.add(offsetPlane)
     offsetSketch.name = "Shelf"
 
-    shelfThikness = ACC_EXTENSION_HEIGTH_CM / 2
-    numFits = int(shelfLength // GRIDFINITY_SIZE_CM)
-    sideWidth = (shelfLength - max(xCount - 1, numFits - 1) * GRIDFINITY_SIZE_CM) / 2
+    fit = shelfSizing.fit(xCount, shelfLength)
+    numFits = fit.numFits
+    sideWidth = fit.sideWidth
 
     xAxisOffset = (
         GRIDFINITY_SIZE_CM / 2
@@ -775,25 +1202,25 @@ def internalGenerateShelf(
     x1 = -sideWidth + xAxisOffset
     x2 = max(xCount - 1, numFits - 1) * GRIDFINITY_SIZE_CM + sideWidth + xAxisOffset
     y2 = shelfDepth
-    rectangle: SketchLineList = offsetSketch.sketchCurves.sketchLines.addTwoPointRectangle(
-        Point3D.create(x1, 0, 0), Point3D.create(x2, y2, 0)
-    )
-
-    ledgeOffset = ACC_LEDGER_WIDTH_CM
-    holeOffset = ledgeOffset + ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM
-    outterFilletRadius = ACC_INTERNAL_SKETCH_RADIUS_CM + holeOffset
-    for l in range(0, rectangle.count):
-        # the way the rect is created I need to filter by value here to prevent fillet on back side when can't fit on the front of the insert
-        # TODO check for extraHeight, if 0, values change
-        filletRadius = outterFilletRadius if l == 1 or l == 2 else min(outterFilletRadius, max(0, sideWidth - ACC_EXTENSION_WIDTH_CM / 2))
-        if filletRadius > 0.01:
-            offsetSketch.sketchCurves.sketchArcs.addFillet(
-                rectangle.item(l),
-                rectangle.item(l).startSketchPoint.geometry,
-                rectangle.item((l + 1) % rectangle.count),
-                rectangle.item((l + 1) % rectangle.count).endSketchPoint.geometry,
-                filletRadius,
-            )
+    ledgeOffset = shelf_sizing.SHELF_LEDGE_OFFSET_CM
+    holeOffset = shelf_sizing.SHELF_HOLE_OFFSET_CM
+    with deferredCompute(offsetSketch):
+        rectangle: SketchLineList = offsetSketch.sketchCurves.sketchLines.addTwoPointRectangle(
+            Point3D.create(x1, 0, 0), Point3D.create(x2, y2, 0)
+        )
+        for l in range(0, rectangle.count):
+            # the way the rect is created I need to filter by value here to prevent fillet on back side when can't fit on the
+            # front of the insert
+            # TODO check for extraHeight, if 0, values change
+            filletRadius = fit.outerFilletRadius if l == 1 or l == 2 else fit.sideFilletRadius
+            if filletRadius > 0:
+                offsetSketch.sketchCurves.sketchArcs.addFillet(
+                    rectangle.item(l),
+                    rectangle.item(l).startSketchPoint.geometry,
+                    rectangle.item((l + 1) % rectangle.count),
+                    rectangle.item((l + 1) % rectangle.count).endSketchPoint.geometry,
+                    filletRadius,
+                )
 
     shelfThikness = GRIDFINITY_BASE_HEIGHT_CM
     shelfBaseComponent.component.features.extrudeFeatures.addSimple(
@@ -811,7 +1238,7 @@ def internalGenerateShelf(
         x2 - holeOffset,
         y2 - holeOffset,
         0,
-        ACC_INTERNAL_SKETCH_RADIUS_CM,
+        shelf_sizing.SHELF_HOLE_FILLET_RADIUS_CM,
     )
     shelfBaseComponent.component.features.extrudeFeatures.addSimple(
         holeSketch.profiles.item(0),
@@ -821,7 +1248,7 @@ def internalGenerateShelf(
 
     ledgeSketch: Sketch = sketches.add(offsetPlane)
     ledgeSketch.name = "Shelf Ledge"
-    ledgeRadius = ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM + ACC_INTERNAL_SKETCH_RADIUS_CM
+    ledgeRadius = shelf_sizing.SHELF_LEDGE_FILLET_RADIUS_CM
     rectWithFillet(
         ledgeSketch,
         x1 + ledgeOffset,
@@ -861,11 +1288,12 @@ def internalGenerateShelf(
     plane = planes.add(plane_input)
 
     sketch_plane = sketches.add(plane)
-    circleCenter = sketch_plane.sketchCurves.sketchCircles.addByCenterRadius(startPoint.geometry.startPoint, notchOffset)
+    with deferredCompute(sketch_plane):
+        circleCenter = sketch_plane.sketchCurves.sketchCircles.addByCenterRadius(startPoint.geometry.startPoint, notchOffset)
 
-    projectedEdge = sketch_plane.project(startPoint)
-    constraints = sketch_plane.geometricConstraints
-    constraints.addCoincident(circleCenter.centerSketchPoint, projectedEdge.item(0))
+        projectedEdge = sketch_plane.project(startPoint)
+        constraints = sketch_plane.geometricConstraints
+        constraints.addCoincident(circleCenter.centerSketchPoint, projectedEdge.item(0))
 
     sweep = shelfBaseComponent.component.features.sweepFeatures
     sweepPath = shelfBaseComponent.component.features.createPath(ledgeLines.item(0))
@@ -886,8 +1314,14 @@ def internalGenerateShelf(
         toFillet.add(e)
     for e in bf.edges:
         toFillet.add(e)
-    if sideWidth >= 0.75:  # TODO: Need to exclude the edges that cause issues instead
-        filletEdges(shelfBaseComponent.component, toFillet, 0.1)
+    if fit.edgeFillet:  # TODO: Need to exclude the edges that cause issues instead
+        # still failing when the shelf length is just over the insert attachment, the shelf is then kept without fillet
+        buildFailures.attempt(
+            params,
+            "shelfFillet",
+            lambda: filletEdges(shelfBaseComponent.component, toFillet, shelf_sizing.SHELF_EDGE_FILLET_RADIUS_CM),
+            lambda: log.warning("%s Failed to fillet the shelf, generating it without fillet", CMD_NAME),
+        )
 
     # Emboss required shelf insert size
     bottomFace = selectFaceAt(shelfBaseComponent.component, offsetPlane, -bottomOffset)
@@ -920,6 +1354,7 @@ def internalGenerateShelf(
     )
 
 
+@prof.profiled()
 def embossText(
     targetOccurence: Occurrence,
     sketch: Sketch,
@@ -985,40 +1420,45 @@ def rectWithFillet(
     """
 
     lines = ObjectCollection.create()
-    rect: SketchLineList = sketch.sketchCurves.sketchLines.addTwoPointRectangle(Point3D.create(x1, y1, z1), Point3D.create(x2, y2, z2))
-
-    for l in sketch.sketchCurves.sketchLines:
-        lines.add(l)
-
-    for l in range(0, rect.count):
-        arc = sketch.sketchCurves.sketchArcs.addFillet(
-            rect.item(l),
-            rect.item(l).startSketchPoint.geometry,
-            rect.item((l + 1) % rect.count),
-            rect.item((l + 1) % rect.count).endSketchPoint.geometry,
-            filletRadius,
-        )
-        lines.add(arc)
+    with deferredCompute(sketch):
+        rect: SketchLineList = sketch.sketchCurves.sketchLines.addTwoPointRectangle(Point3D.create(x1, y1, z1), Point3D.create(x2, y2, z2))
+
+        for l in sketch.sketchCurves.sketchLines:
+            lines.add(l)
+
+        for l in range(0, rect.count):
+            arc = sketch.sketchCurves.sketchArcs.addFillet(
+                rect.item(l),
+                rect.item(l).startSketchPoint.geometry,
+                rect.item((l + 1) % rect.count),
+                rect.item((l + 1) % rect.count).endSketchPoint.geometry,
+                filletRadius,
+            )
+            lines.add(arc)
 
     return lines
 
 
-def generateShelfInsert(args: CommandEventArgs):
+@prof.profiled()
+def generateShelfInsert(params: ShelfInsertParameters, parameters: dict = None):
     """
-    Generates a shelf insert component based on the provided arguments.
+    Generates a shelf insert component based on the provided parameters.
 
     Args:
-        args (CommandEventArgs): The command arguments.
+        params (ShelfInsertParameters): The shelf insert parameters.
+        parameters (dict, optional): field -> the user parameter driving it, see lib/common/accessory_user_parameters.py.
+            Defaults to the values of the snapshot.
 
     Returns:
         None
     """
 
-    inputs = args.command.commandInputs
-    notch = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_NOTCH).value
-    thickness = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_THICKNESS).value
-    shelfDepth = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_DEPTH).value - EXTERNAL_TOLERANCE_CM
-    shelfLength = inputs.itemById(MENU_SHELF_INSERT_GROUP).children.itemById(MENU_SHELF_INSERT_LENGTH).value - EXTERNAL_TOLERANCE_CM
+    parameters = parameters or {}
+    notch = params.notch
+    thickness = params.thickness
+    shelfDepth = params.depth - EXTERNAL_TOLERANCE_CM
+    shelfLength = params.length - EXTERNAL_TOLERANCE_CM
+    clearance = params.screw.clearance
 
     design = app.activeProduct
     root: Component = Component.cast(design.rootComponent)
@@ -1033,14 +1473,14 @@ def generateShelfInsert(args: CommandEventArgs):
         0,
         0,
         0,
-        shelfLength - getClearance(),
-        shelfDepth - getClearance(),
+        shelfLength - clearance,
+        shelfDepth - clearance,
         0,
         ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM + ACC_INTERNAL_SKETCH_RADIUS_CM,
     )
     shelfInsertComponent.component.features.extrudeFeatures.addSimple(
         sketch.profiles.item(0),
-        ValueInput.createByReal(thickness),
+        valueOrExpression(parameters.get("thickness", thickness)),
         FeatureOperations.JoinFeatureOperation,
     )
 
@@ -1061,15 +1501,15 @@ def generateShelfInsert(args: CommandEventArgs):
 
         # notch
         notchSketchXZ: Sketch = sketches.add(shelfInsertComponent.component.xZConstructionPlane)
-        notchSketchCenter1 = Point3D.create(0, -NOTCH_SIZE_RADIUS_CM + getClearance(), 0.5)
+        notchSketchCenter1 = Point3D.create(0, -NOTCH_SIZE_RADIUS_CM + clearance, 0.5)
         notchSketchCenter2 = Point3D.create(
             0,
-            -NOTCH_SIZE_RADIUS_CM + getClearance(),
+            -NOTCH_SIZE_RADIUS_CM + clearance,
             shelfDepth - 0.5 - NOTCH_SIZE_RADIUS_CM * 2,
         )
         notchSketchXZ.name = "Notch"
 
-        notchSketchXZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter1, NOTCH_SIZE_RADIUS_CM - getClearance())
+        notchSketchXZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter1, NOTCH_SIZE_RADIUS_CM - clearance)
         circPatternSketch(
             shelfInsertComponent.component,
             FeatureOperations.JoinFeatureOperation,
@@ -1078,7 +1518,7 @@ def generateShelfInsert(args: CommandEventArgs):
             2,
             axisLine,
         )
-        notchSketchXZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter2, NOTCH_SIZE_RADIUS_CM - getClearance())
+        notchSketchXZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter2, NOTCH_SIZE_RADIUS_CM - clearance)
         circPatternSketch(
             shelfInsertComponent.component,
             FeatureOperations.JoinFeatureOperation,
@@ -1090,15 +1530,15 @@ def generateShelfInsert(args: CommandEventArgs):
 
         # notch
         notchSketchYZ: Sketch = sketches.add(shelfInsertComponent.component.yZConstructionPlane)
-        notchSketchCenter1 = Point3D.create(-NOTCH_SIZE_RADIUS_CM + getClearance(), 0, 0.5)
+        notchSketchCenter1 = Point3D.create(-NOTCH_SIZE_RADIUS_CM + clearance, 0, 0.5)
         notchSketchCenter2 = Point3D.create(
-            -NOTCH_SIZE_RADIUS_CM + getClearance(),
+            -NOTCH_SIZE_RADIUS_CM + clearance,
             0,
             shelfLength - 0.5 - NOTCH_SIZE_RADIUS_CM * 2,
         )
         notchSketchYZ.name = "Notch"
 
-        notchSketchYZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter1, NOTCH_SIZE_RADIUS_CM - getClearance())
+        notchSketchYZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter1, NOTCH_SIZE_RADIUS_CM - clearance)
         circPatternSketch(
             shelfInsertComponent.component,
             FeatureOperations.JoinFeatureOperation,
@@ -1107,7 +1547,7 @@ def generateShelfInsert(args: CommandEventArgs):
             2,
             axisLine,
         )
-        notchSketchYZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter2, NOTCH_SIZE_RADIUS_CM - getClearance())
+        notchSketchYZ.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter2, NOTCH_SIZE_RADIUS_CM - clearance)
         circPatternSketch(
             shelfInsertComponent.component,
             FeatureOperations.JoinFeatureOperation,
@@ -1122,72 +1562,32 @@ def generateShelfInsert(args: CommandEventArgs):
         # TODO add a hole generator? with patterns
 
 
-def generateInsert(args: CommandEventArgs):
-    """
-    Generates an wall insert based on the given command arguments.
-
-    Args:
-        args (CommandEventArgs): The command arguments.
-
-    Returns:
-        None
-    """
-    inputs = args.command.commandInputs
-    insertXCount = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_X_COUNT).value
-    insertYCount = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_Y_COUNT).value
-    trimTop = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_TRIM_TOP).value
-    trimBottom = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_TRIM_BOTTOM).value
-    extraSpacing = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_EXTRA_SPACING).value
-    notch = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_NOTCH).value
-    invertAxis = inputs.itemById(MENU_INSERT_GROUP).children.itemById(MENU_INSERT_INVERSE).value
-    generateInsertBase(
-        MENU_INSERT,
-        trimTop,
-        trimBottom,
-        insertXCount,
-        insertYCount,
-        extraSpacing,
-        notch,
-        invertAxis,
-    )
-
-
-def generateInsertBase(
-    name: str,
-    trimTop: float,
-    trimBottom: float,
-    insertXCount: int,
-    insertYCount: int,
-    extraSpacing: float,
-    generateNotch,
-    invertAxis: bool = False,
-) -> Occurrence:
+@prof.profiled()
+def generateInsertBase(name: str, params: InsertParameters, instanced: bool = False) -> Occurrence:
     """
     Generate the base insert for the accessories.
 
     Args:
         name (str): The name of the insert component.
-        trimTop (float): The amount to trim from the top of the insert.
-        trimBottom (float): The amount to trim from the bottom of the insert.
-        insertXCount (int): The number of inserts in the X direction.
-        insertYCount (int): The number of inserts in the Y direction.
-        extraSpacing (float): Extra spacing between inserts.
-        generateNotch: Whether to generate a notch in the insert.
-        invertAxis (bool, optional): Whether to invert the axis. Defaults to False.
+        params (InsertParameters): The insert parameters.
+        instanced (bool, optional): Places the other inserts of a plate as occurrences of the insert component instead
+            of patterning its body, only for a plate that isn't joined to another body. Defaults to False.
 
     Returns:
         Occurrence: The generated insert component.
     """
+    screw = params.screw
+    insertXCount = params.xCount
+    insertYCount = params.yCount
+    extraSpacing = params.extraSpacing
+    invertAxis = params.invertAxis
+    insertOuterRadius = params.outerRadius
+
     design = app.activeProduct
     root: Component = Component.cast(design.rootComponent)
 
-    insertOuterRadius = getScrewInnerRadius() - getClearance() - 0.05  # 0.5 to give some space
-
-    if trimTop > insertOuterRadius:
-        trimTop = insertOuterRadius
-
-    if trimBottom > insertOuterRadius:
-        trimBottom = insertOuterRadius
+    trimTop = min(params.trimTop, insertOuterRadius)
+    trimBottom = min(params.trimBottom, insertOuterRadius)
 
     insertComponent = createNamedComponent(root, name)
 
@@ -1262,13 +1662,14 @@ def generateInsertBase(
 
         # filletEdges(insertComponent.component, edgeToFillet, 0.1)
 
-    if generateNotch:
+    if params.notch:
         createNotch(
             insertComponent.component,
             insertOuterRadius,
             invertAxis,
             zAxisOffset,
             centerPoint,
+            screw.clearance,
         )
 
     # trimming the sides of the insert so it can be inserted in the screw
@@ -1280,6 +1681,7 @@ def generateInsertBase(
             MAIN_SCREW_THREAD_BODY_THICKNESS_CM + EXTERNAL_TOLERANCE_CM + offset + extraSpacing,
             xAxisOffset,
             yAxisOffset,
+            screw.innerRadius,
             False,
             invertAxis,
         )
@@ -1291,11 +1693,16 @@ def generateInsertBase(
             MAIN_SCREW_THREAD_BODY_THICKNESS_CM + EXTERNAL_TOLERANCE_CM + offset + extraSpacing,
             xAxisOffset,
             yAxisOffset,
+            screw.innerRadius,
             True,
             invertAxis,
         )
 
-    if insertXCount > 1 or insertYCount > 1:
+    if instanced and (insertXCount > 1 or insertYCount > 1):
+        # the insert is the first cell of the plate, the other cells are occurrences of its component
+        offsets = latticeOffsets(insertRowOrigins(insertYCount), [insertXCount] * insertYCount)
+        instanceComponent(root, insertComponent.component, offsets[1:])
+    elif insertXCount > 1 or insertYCount > 1:
         xAxis = insertComponent.component.xConstructionAxis
         patternInsertSection(
             insertComponent.component,
@@ -1304,45 +1711,62 @@ def generateInsertBase(
             insertXCount,
         )
 
-        offset_angle = calculateOffsetAngle(WALL_NB_SIDES)
-        r = GRIDFINITY_SIZE_CM / 2 / math.cos(math.pi / WALL_NB_SIDES)
+        rowBodies = wrapInCollection(insertComponent.bRepBodies.item(0))
         for rowIndex in range(1, insertYCount):
-            startPoint = createHexPoint(r, HexPointIndex.TOP.value, offset_angle)
-            toPoint = createHexPoint(
-                r,
-                HexPointIndex.BOTTOM_LEFT.value if rowIndex % 2 == 0 else HexPointIndex.BOTTOM_RIGHT.value,
-                offset_angle,
-            )
-            delta = createDeltaVector(startPoint, toPoint)
-            copyBodies(
-                insertComponent.component,
-                wrapInCollection(insertComponent.bRepBodies.item(0)),
-                delta,
-            )
-            patternBodies(
-                insertComponent.component,
-                xAxis,
-                wrapInCollection(insertComponent.bRepBodies.item(0)),
-                insertXCount,
-            )
+            rowBodies = copyBodies(insertComponent.component, rowBodies, insertRowDelta(rowIndex))
+            patternBodies(insertComponent.component, xAxis, rowBodies, insertXCount)
 
     return insertComponent
 
 
-def generateHook(args: CommandEventArgs):
-    inputs = args.command.commandInputs
+def insertRowDelta(rowIndex: int) -> Vector3D:
+    """
+    Returns:
+        Vector3D: The move from the previous row of inserts to the row, the rows alternate to the bottom left and bottom right.
+    """
+    offset_angle = calculateOffsetAngle(WALL_NB_SIDES)
+    r = GRIDFINITY_SIZE_CM / 2 / math.cos(math.pi / WALL_NB_SIDES)
+    startPoint = createHexPoint(r, HexPointIndex.TOP.value, offset_angle)
+    toPoint = createHexPoint(
+        r,
+        HexPointIndex.BOTTOM_LEFT.value if rowIndex % 2 == 0 else HexPointIndex.BOTTOM_RIGHT.value,
+        offset_angle,
+    )
+    return createDeltaVector(startPoint, toPoint)
+
+
+def insertRowOrigins(yCount: int) -> list:
+    """
+    Returns:
+        list: The Vector3D origin of every row of inserts, the first row at the origin.
+    """
+    origin = Vector3D.create(0, 0, 0)
+    origins = [origin]
+    for rowIndex in range(1, yCount):
+        origin = origin.copy()
+        origin.add(insertRowDelta(rowIndex))
+        origins.append(origin)
+    return origins
+
 
-    trimTop = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_TRIM_TOP).value
-    trimBottom = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_TRIM_BOTTOM).value
-    notch = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_NOTCH).value
-    length = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_LENGTH).value
-    size = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_SIZE).value
+@prof.profiled()
+def generateHook(params: HookParameters, parameters: dict = None):
+    """
+    Generates a hook on top of an inverted base insert.
 
-    addStopper = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_STOPPER).value
-    stopperHeight = inputs.itemById(MENU_HOOK_GROUP).children.itemById(MENU_HOOK_STOPPER_HEIGHT).value
+    Args:
+        params (HookParameters): The hook parameters.
+        parameters (dict, optional): field -> the user parameter driving it, see lib/common/accessory_user_parameters.py.
+            Defaults to the values of the snapshot.
+    """
+    parameters = parameters or {}
+    trimBottom = params.insert.trimBottom
+    length = params.length
+    size = params.size
+    stopperHeight = parameters.get("stopperHeight", params.stopperHeight)
 
     # start by genearing the insert
-    baseComponent = generateInsertBase(MENU_HOOK, trimTop, trimBottom, 1, 1, 0, notch, True)
+    baseComponent = generateInsertBase(MENU_HOOK, params.insert)
 
     planeInput: ConstructionPlaneInput = baseComponent.component.constructionPlanes.createInput()
     zAxisOffset = WALL_INNER_SECTION_OFFSET_CM - MAIN_SCREW_THREAD_BODY_THICKNESS_CM - MAIN_SCREW_THREAD_BODY_THICKNESS_CM
@@ -1369,7 +1793,9 @@ def generateHook(args: CommandEventArgs):
     extrude_input.setDistanceExtent(False, extrude_distance)
     hookExtrusion: ExtrudeFeature = extrudes.add(extrude_input)
 
-    if addStopper:
+    # the stopper and the hook edges are filleted together at the end
+    fillets = FilletAccumulator(baseComponent.component)
+    if params.stopper:
         stopperPlaneInput: ConstructionPlaneInput = baseComponent.component.constructionPlanes.createInput()
 
         if size > trimBottom * 2:
@@ -1394,13 +1820,11 @@ def generateHook(args: CommandEventArgs):
             stopperPlane,
         )
 
+        stopperEdges = ObjectCollection.create()
         for face in stopper.endFaces:
             for e in face.edges:
-                filletEdges(
-                    baseComponent.component,
-                    wrapInCollection(e),
-                    0.2 if size > 8 else 0.1,
-                )
+                stopperEdges.add(e)
+        fillets.add(stopperEdges, 0.2 if size > 8 else 0.1)
 
     # select the edges that match the length, so we know it's the side edges
     edges = ObjectCollection.create()
@@ -1413,8 +1837,9 @@ def generateHook(args: CommandEventArgs):
         for e in face.edges:
             edges.add(e)
 
-    # fillet the collection
-    filletEdges(baseComponent.component, edges, 0.1)
+    # fillet the collection, with the stopper edges
+    fillets.add(edges, 0.1)
+    fillets.apply()
 
 
 def createHexPoint(radius: float, index: int, offset_angle: float) -> Point3D:
@@ -1433,12 +1858,14 @@ def createHexPoint(radius: float, index: int, offset_angle: float) -> Point3D:
     return Point3D.create(math.cos(angle) * radius, 0, math.sin(angle) * radius)
 
 
+@prof.profiled()
 def createNotch(
     targetOccurence: Occurrence,
     insertOuterRadius: float,
     invertAxis: bool,
     offset: float,
     centerPoint: Point3D,
+    clearance: float,
 ):
     """
     Creates a notch on a target occurrence to "lock" to the wall. These notches are angles at 45 degrees.
@@ -1449,6 +1876,7 @@ def createNotch(
         invertAxis (bool): Flag indicating whether to invert the axis.
         offset (float): The offset value.
         centerPoint (Point3D): The center point of the notch.
+        clearance (float): The clearance removed from the notch radius.
 
     Returns:
         None
@@ -1477,7 +1905,7 @@ def createNotch(
 
     sketch: Sketch = sketches.add(plane)
     sketch.name = "Notch"
-    sketch.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter, NOTCH_SIZE_RADIUS_CM - getClearance())
+    sketch.sketchCurves.sketchCircles.addByCenterRadius(notchSketchCenter, NOTCH_SIZE_RADIUS_CM - clearance)
     circPatternSketch(
         targetOccurence,
         FeatureOperations.JoinFeatureOperation,
@@ -1489,6 +1917,7 @@ def createNotch(
     axisLine.deleteMe()  # gives warning
 
 
+@prof.profiled()
 def patternInsertSection(rootComponent: Component, xAxis, bodies: ObjectCollection, width: int) -> RectangularPatternFeatures:
     """
     Generates a rectangular an horizontal pattern of insert sections. This pattern match the wall grid and
@@ -1518,6 +1947,7 @@ def patternInsertSection(rootComponent: Component, xAxis, bodies: ObjectCollecti
     return rectangularPatterns.add(rectangularPatternInput)
 
 
+@prof.profiled()
 def cuttingInsertSide(
     targetOccurence: Occurrence,
     cuttingSketch,
@@ -1525,6 +1955,7 @@ def cuttingInsertSide(
     height: float,
     xOffset,
     yOffset,
+    screwInnerRadius: float,
     reverse: bool,
     invertAxis: bool = False,
 ):
@@ -1539,6 +1970,7 @@ def cuttingInsertSide(
         height (float): The height of the cutting feature.
         xOffset: The x-offset of the cutting feature.
         yOffset: The y-offset of the cutting feature.
+        screwInnerRadius (float): The inner radius of the main screw.
         reverse (bool): Determines whether to reverse the insert width and height.
         invertAxis (bool, optional): Determines whether to invert the x and y axes. Defaults to False.
     """
@@ -1546,13 +1978,13 @@ def cuttingInsertSide(
     if invertAxis:
         cuttingSketch.sketchCurves.sketchLines.addTwoPointRectangle(
             Point3D.create(
-                -getScrewInnerRadius() + xOffset,
+                -screwInnerRadius + xOffset,
                 insertWidth + yOffset if reverse else -insertWidth + yOffset,
                 0,
             ),
             Point3D.create(
-                getScrewInnerRadius() + xOffset,
-                getScrewInnerRadius() + yOffset if reverse else -getScrewInnerRadius() + yOffset,
+                screwInnerRadius + xOffset,
+                screwInnerRadius + yOffset if reverse else -screwInnerRadius + yOffset,
                 0,
             ),
         )
@@ -1560,12 +1992,12 @@ def cuttingInsertSide(
         cuttingSketch.sketchCurves.sketchLines.addTwoPointRectangle(
             Point3D.create(
                 insertWidth + xOffset if reverse else -insertWidth + xOffset,
-                -getScrewInnerRadius() + yOffset,
+                -screwInnerRadius + yOffset,
                 0,
             ),
             Point3D.create(
-                getScrewInnerRadius() + xOffset if reverse else -getScrewInnerRadius() - xOffset,
-                getScrewInnerRadius() + yOffset,
+                screwInnerRadius + xOffset if reverse else -screwInnerRadius - xOffset,
+                screwInnerRadius + yOffset,
                 0,
             ),
         )
@@ -1607,25 +2039,28 @@ def anchorCommonBase(anchorOccurrence: Occurrence, height: float, clearance: flo
     return anchorBase
 
 
-def generateAnchor(args: CommandEventArgs, offsetAnchor: bool = False):
+@prof.profiled()
+def generateAnchor(params: AnchorParameters, parameters: dict = None):
     """
-    Generates an anchor component based on the provided arguments.
+    Generates an anchor component based on the provided parameters.
 
     Args:
-        args (CommandEventArgs): The command arguments.
-        offsetAnchor (bool, optional): Whether to offset the anchor. Defaults to False.
+        params (AnchorParameters): The anchor parameters, params.offset generates the offset anchor set.
+        parameters (dict, optional): field -> the user parameter driving it, see lib/common/accessory_user_parameters.py.
+            Defaults to the values of the snapshot.
     """
 
+    parameters = parameters or {}
     design = app.activeProduct
     root: Component = Component.cast(design.rootComponent)
 
-    clearance = getClearance()
+    clearance = params.screw.clearance
     height = WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - clearance
 
     anchorComponent: Occurrence = createNamedComponent(root, MENU_ANCHOR)
     anchorBase: ExtrudeFeature = anchorCommonBase(anchorComponent, height, clearance)
 
-    if offsetAnchor:
+    if params.offset:
         # Offset insert curring and genration
         chamferWidth = height / math.tan(math.radians(INTERNAL_WALL_CHAMFER_ANGLE))
         innerCutRadius = MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2 * 0.65 + EXTERNAL_TOLERANCE_CM
@@ -1651,35 +2086,26 @@ def generateAnchor(args: CommandEventArgs, offsetAnchor: bool = False):
         input.operation = FeatureOperations.CutFeatureOperation
         combineFeatures.add(input)
 
-        # inner offset part
-        offsetAnchor = createCylinderFromPointXYPlane(
-            anchorComponent.component,
-            innerCutRadius,
-            height,
-            offsetLocation,
-            FeatureOperations.NewBodyFeatureOperation,
-        )
+        # inner offset part, from the sketch of the cutting one
+        offsetAnchor = extrudeProfile(anchorComponent.component, offsetAnchor.profile, height, FeatureOperations.NewBodyFeatureOperation)
         offsetAnchor.name = "Anchor Offset Insert"
         # no space as this is the body that will be exported to a file and I don't like spaces in file names
         anchorComponent.component.bRepBodies.item(1).name = "AnchorOffsetInsert"
 
         createAnchorChamfer(anchorComponent, offsetAnchor.faces.item(0).edges.item(1), height, True)
 
-    inputs = args.command.commandInputs
-    topOffset: float = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_TOP_OFFSET).value
-    headDiameter: float = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_HEAD_DIAMETER).value
-    countersinkAngle: int = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_COUNTERSINK_ANGLE).value
-    holeDiameter: float = inputs.itemById(MENU_ANCHOR_GROUP).children.itemById(MENU_ANCHOR_HOLE_DIAMETER).value
     createScrewHole(
         anchorComponent,
         anchorBase.endFaces.item(0),
-        headDiameter,
-        countersinkAngle,
-        holeDiameter,
-        topOffset,
+        params.headDiameter,
+        parameters.get("countersinkAngle", params.countersinkAngle),
+        parameters.get("holeDiameter", params.holeDiameter),
+        params.topOffset,
+        clearance,
     )
 
 
+@prof.profiled()
 def createScrewHole(
     anchorOccurrence: Occurrence,
     endFace: BRepFace,
@@ -1687,6 +2113,7 @@ def createScrewHole(
     countersinkAngle: float,
     holeDiameter: float,
     topOffset: float,
+    clearance: float,
 ):
     """
     Creates a screw hole on the given anchor occurrence.
@@ -1695,9 +2122,10 @@ def createScrewHole(
         anchorOccurrence (Occurrence): The anchor occurrence on which the screw hole will be created.
         endFace (BRepFace): The end face of the anchor occurrence.
         headDiameter (float): The diameter of the screw head.
-        countersinkAngle (float): The angle of the countersink.
-        holeDiameter (float): The diameter of the screw hole.
+        countersinkAngle (float): The angle of the countersink, or the expression of the user parameter driving it.
+        holeDiameter (float): The diameter of the screw hole, or the expression of the user parameter driving it.
         topOffset (float): The offset from the top of the anchor occurrence.
+        clearance (float): The clearance of the anchor.
 
     Returns:
         None
@@ -1711,7 +2139,7 @@ def createScrewHole(
         offsetPoint = Point3D.create(
             0,
             0,
-            WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - getClearance() - topOffset,
+            WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - clearance - topOffset,
         )
         createCylinderFromPointXYPlane(
             anchorOccurrence.component,
@@ -1726,22 +2154,23 @@ def createScrewHole(
     sPt0 = offsetSketchPoints.add(Point3D.create(0, 0, -topOffset))
 
     hole: HoleFeatures = anchorOccurrence.component.features.holeFeatures
-    holeInput = hole.createSimpleInput(ValueInput.createByReal(holeDiameter))
+    holeInput = hole.createSimpleInput(valueOrExpression(holeDiameter))
     holeInput.setPositionBySketchPoints(wrapInCollection(sPt0))
     distance = ValueInput.createByReal(WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM)
     holeInput.setDistanceExtent(distance)
     screwHole: HoleFeature = hole.add(holeInput)
     screwHole.timelineObject.rollTo(True)
-    screwHole.setToCountersink(ValueInput.createByReal(headDiameter), ValueInput.createByReal(countersinkAngle))
+    screwHole.setToCountersink(ValueInput.createByReal(headDiameter), valueOrExpression(countersinkAngle))
     screwHole.timelineObject.rollTo(False)
 
 
-def generateMainScrew(args: CommandEventArgs):
+@prof.profiled()
+def generateMainScrew(params: MainScrewParameters):
     """
     Generates the main screw component with body, thread, and head.
 
     Args:
-        args (CommandEventArgs): The command event arguments.
+        params (MainScrewParameters): The main screw parameters.
 
     Returns:
         None
@@ -1752,25 +2181,57 @@ def generateMainScrew(args: CommandEventArgs):
 
     mainScrewComponent = createNamedComponent(root, MENU_MAIN_SCREW)
 
-    mainScrewBodyRadius = getScrewOuterRadius()
+    mainScrewBodyRadius = params.screw.outerRadius
 
     # Screw Body
-    inputs = args.command.commandInputs
-    bodyHeight: float = inputs.itemById(MENU_MAIN_SCREW_GROUP).children.itemById(MAIN_SCREW_HEIGHT).value
+    bodyHeight = params.height
     createMainScrewBody(
         mainScrewComponent.component,
         mainScrewBodyRadius,
-        getScrewInnerRadius(),
+        params.screw.innerRadius,
         bodyHeight,
     )
 
     # Screw Thread
-    mainScrewThread = createExternalThread(
-        mainScrewComponent.component,
-        MAIN_SCREW_HEAD_THICKNESS_CM / 2,  # threadStartOffset
-        mainScrewBodyRadius,  # radius
-        bodyHeight,
+    threadStartOffset = MAIN_SCREW_HEAD_THICKNESS_CM / 2
+    buildFailures.attempt(
+        params,
+        "mainScrewThread",
+        lambda: createExternalThread(
+            mainScrewComponent.component,
+            threadStartOffset,  # threadStartOffset
+            mainScrewBodyRadius,  # radius
+            bodyHeight,
+        ),
     )
+    # the top edge and the screw head are filleted together once the head is cut
+    fillets = FilletAccumulator(mainScrewComponent.component, buildFailures, params)
+    buildFailures.attempt(
+        params,
+        "mainScrewThreadTrim",
+        lambda: trimMainScrewThread(mainScrewComponent, mainScrewBodyRadius, bodyHeight, threadStartOffset, fillets),
+    )
+
+    # Screw Head
+    createScrewHead(mainScrewComponent, fillets)
+    fillets.apply()
+
+
+@prof.profiled()
+def trimMainScrewThread(
+    mainScrewComponent: Occurrence, mainScrewBodyRadius: float, bodyHeight: float, threadStartOffset: float, fillets: FilletAccumulator
+):
+    """
+    Cuts the part of the thread going over the top of the screw body and adds the fillet of the top edge.
+
+    Args:
+        mainScrewComponent (Occurrence): The main screw component.
+        mainScrewBodyRadius (float): The radius of the screw body, the radius of the thread.
+        bodyHeight (float): The height of the screw body.
+        threadStartOffset (float): The offset of the thread start.
+        fillets (FilletAccumulator): The fillets of the main screw component.
+    """
+    cutThreadOvershoot(mainScrewComponent.component, mainScrewBodyRadius, bodyHeight, threadStartOffset)
 
     facesForFillet = None
     for b in mainScrewComponent.component.bRepBodies:
@@ -1778,26 +2239,18 @@ def generateMainScrew(args: CommandEventArgs):
             if math.isclose(f.pointOnFace.z, bodyHeight, abs_tol=0.01):
                 facesForFillet = f
 
-    # Create SplitBodyFeatureInput
-    splitBodyFeats = root.features.splitBodyFeatures
-    splitBodyInput = splitBodyFeats.createInput(mainScrewThread.bodies.item(0), facesForFillet, True)
-
-    # Create split body feature
-    splitedBodies = splitBodyFeats.add(splitBodyInput)
-    for s in splitedBodies.bodies:
-        if s.name == "Body2":
-            # just hides the body
-            s.isVisible = False
-
-    filletEdges(root, wrapInCollection(facesForFillet.edges.item(0)), 0.05)
-
-    # Screw Head
-    createScrewHead(mainScrewComponent)
+    fillets.add(
+        wrapInCollection(facesForFillet.edges.item(0)),
+        0.05,
+        "mainScrewTopFillet",
+        lambda: log.warning("%s Failed to fillet the top edge of the screw, generating it without fillet", CMD_NAME),
+    )
 
 
+@prof.profiled()
 def createMainScrewBody(targetOccurence: Occurrence, outerSize: float, innerSize: float, height: float) -> ExtrudeFeature:
     """
-    Creates a main screw body by extruding a cylinder with a hole.
+    Creates a main screw body by extruding the ring between the outer and inner circles.
 
     Args:
         targetOccurence (Occurrence): The target occurrence where the screw body will be created.
@@ -1809,42 +2262,17 @@ def createMainScrewBody(targetOccurence: Occurrence, outerSize: float, innerSize
         ExtrudeFeature: The created extrude feature representing the main screw body.
     """
 
-    sketches = targetOccurence.sketches
-    xy_plane = targetOccurence.xYConstructionPlane
-
-    # Create a sketch for the outer circle
-    outer_sketch = sketches.add(xy_plane)
-    outer_sketch.sketchCurves.sketchCircles.addByCenterRadius(Point3D.create(0, 0, 0), outerSize)
-
-    # Create a second sketch for the inner circle
-    inner_sketch = sketches.add(xy_plane)
-    inner_sketch.sketchCurves.sketchCircles.addByCenterRadius(Point3D.create(0, 0, 0), innerSize)
+    return createAnnulus(targetOccurence, targetOccurence.xYConstructionPlane, Point3D.create(0, 0, 0), outerSize, innerSize, height)
 
-    # Create a profile from the outer circle
-    outer_profile = outer_sketch.profiles.item(0)
 
-    # Create an extrusion for the cylinder
-    extrudes = targetOccurence.features.extrudeFeatures
-    extrude_input = extrudes.createInput(outer_profile, FeatureOperations.NewBodyFeatureOperation)
-    extrude_distance = ValueInput.createByReal(height)
-    extrude_input.setDistanceExtent(False, extrude_distance)
-    extrudes.add(extrude_input)
-
-    # Create a profile from the inner circle
-    inner_profile = inner_sketch.profiles.item(0)
-
-    # Create a second extrusion to remove material and create the hole
-    hole_extrude_input = extrudes.createInput(inner_profile, FeatureOperations.CutFeatureOperation)
-    hole_extrude_input.setDistanceExtent(False, extrude_distance)  # Use the same distance as the outer extrusion
-    return extrudes.add(hole_extrude_input)
-
-
-def createScrewHead(mainScrewComponent: Occurrence):
+@prof.profiled()
+def createScrewHead(mainScrewComponent: Occurrence, fillets: FilletAccumulator):
     """
     Creates a screw head for the given main screw component.
 
     Args:
         mainScrewComponent (Occurrence): The main screw component.
+        fillets (FilletAccumulator): The fillets of the main screw component, the head fillet is added to them.
 
     Returns:
         None
@@ -1863,27 +2291,28 @@ def createScrewHead(mainScrewComponent: Occurrence):
         MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2,
         0,
     )
-    internalScrewSide = lines.addByTwoPoints(startingPoint, Point3D.create(0, MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2, 0))
-    bottomLine = lines.addByTwoPoints(internalScrewSide.endSketchPoint, Point3D.create(0, exteriorScrewRadius, 0))
-    externalScrewSide = lines.addByTwoPoints(
-        bottomLine.endSketchPoint,
-        Point3D.create(-MAIN_SCREW_HEAD_THICKNESS_CM, bottomLine.endSketchPoint.geometry.y, 0),
-    )
-    topLine = lines.addByTwoPoints(
-        externalScrewSide.endSketchPoint,
-        Point3D.create(
-            -MAIN_SCREW_HEAD_THICKNESS_CM,
-            MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2 + MAIN_SCREW_THREAD_BODY_THICKNESS_CM,
-            0,
-        ),
-    )
-    lines.addByTwoPoints(topLine.endSketchPoint, startingPoint)
+    with deferredCompute(sketch):
+        internalScrewSide = lines.addByTwoPoints(startingPoint, Point3D.create(0, MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2, 0))
+        bottomLine = lines.addByTwoPoints(internalScrewSide.endSketchPoint, Point3D.create(0, exteriorScrewRadius, 0))
+        externalScrewSide = lines.addByTwoPoints(
+            bottomLine.endSketchPoint,
+            Point3D.create(-MAIN_SCREW_HEAD_THICKNESS_CM, bottomLine.endSketchPoint.geometry.y, 0),
+        )
+        topLine = lines.addByTwoPoints(
+            externalScrewSide.endSketchPoint,
+            Point3D.create(
+                -MAIN_SCREW_HEAD_THICKNESS_CM,
+                MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2 + MAIN_SCREW_THREAD_BODY_THICKNESS_CM,
+                0,
+            ),
+        )
+        lines.addByTwoPoints(topLine.endSketchPoint, startingPoint)
 
-    # revolve the sketch now
-    rotationAxis = lines.addByTwoPoints(
-        Point3D.create(0, 0, 0), Point3D.create(-1, 0, 0)
-    )  # we are working from yz plane, so rotation axis is on X, Y
-    rotationAxis.isConstruction = True
+        # revolve the sketch now
+        rotationAxis = lines.addByTwoPoints(
+            Point3D.create(0, 0, 0), Point3D.create(-1, 0, 0)
+        )  # we are working from yz plane, so rotation axis is on X, Y
+        rotationAxis.isConstruction = True
     rev_input = mainScrewComponent.component.features.revolveFeatures.createInput(
         sketch.profiles.item(0), rotationAxis, FeatureOperations.JoinFeatureOperation
     )
@@ -1900,19 +2329,20 @@ def createScrewHead(mainScrewComponent: Occurrence):
     hardCodedOffset = 0.015
     # the length needs to account for the arc at the end of end of the slot, twice, so removing slotsWidth ( 2 * slotsWidth / 2 = slotsWidth at radius in radian)
     slotLengthInRad = math.pi / 180 * angle - (slotsWidth / exteriorScrewRadius)
-    slot(
-        sketch,
-        hardCodedOffset + exteriorScrewRadius - slotsWidth,
-        slotLengthInRad,
-        slotsWidth,
-    )  # top slot
-    slot(
-        sketch,
-        hardCodedOffset + exteriorScrewRadius - bottomSlotWidth + 0.01,
-        slotLengthInRad * 3 / 4,
-        bottomSlotWidth,
-        MAIN_SCREW_HEAD_THICKNESS_CM / 2,
-    )  # bottom slot to loft
+    with deferredCompute(sketch):
+        slot(
+            sketch,
+            hardCodedOffset + exteriorScrewRadius - slotsWidth,
+            slotLengthInRad,
+            slotsWidth,
+        )  # top slot
+        slot(
+            sketch,
+            hardCodedOffset + exteriorScrewRadius - bottomSlotWidth + 0.01,
+            slotLengthInRad * 3 / 4,
+            bottomSlotWidth,
+            MAIN_SCREW_HEAD_THICKNESS_CM / 2,
+        )  # bottom slot to loft
     sketch.isVisible = False
 
     loftFeats = mainScrewComponent.component.features.loftFeatures
@@ -1933,10 +2363,12 @@ def createScrewHead(mainScrewComponent: Occurrence):
     for body in circularFeat.bodies:
         for edge in body.edges:
             edgesForFillet.add(edge)
-    try:
-        filletEdges(mainScrewComponent.component, edgesForFillet, 0.04)
-    except RuntimeError:
-        futil.log(f"{CMD_NAME} Failed to fillet the edges:\n{traceback.format_exc()}")
+    fillets.add(
+        edgesForFillet,
+        0.04,
+        "screwHeadFillet",
+        lambda: log.warning("%s Failed to fillet the screw head edges, generating it without fillet", CMD_NAME),
+    )
 
 
 def slot(
@@ -1962,21 +2394,22 @@ def slot(
 
     arcs = sketch.sketchCurves.sketchArcs
     startOffset = -slotLengthInRad / 2
-    internalArc = arcs.addByCenterStartSweep(
-        Point3D.create(0, 0, zOffset),
-        createPoint(innerRadius, startOffset, zOffset),
-        slotLengthInRad,
-    )
-    externalArc = arcs.addByCenterStartSweep(
-        Point3D.create(0, 0, zOffset),
-        createPoint(innerRadius + slotWidth, startOffset, zOffset),
-        slotLengthInRad,
-    )
+    with deferredCompute(sketch):
+        internalArc = arcs.addByCenterStartSweep(
+            Point3D.create(0, 0, zOffset),
+            createPoint(innerRadius, startOffset, zOffset),
+            slotLengthInRad,
+        )
+        externalArc = arcs.addByCenterStartSweep(
+            Point3D.create(0, 0, zOffset),
+            createPoint(innerRadius + slotWidth, startOffset, zOffset),
+            slotLengthInRad,
+        )
 
-    firstArcCenterPoint = createPoint(innerRadius + slotWidth / 2, startOffset, zOffset)
-    arcs.addByCenterStartSweep(firstArcCenterPoint, internalArc.startSketchPoint, math.pi)
-    secondArcCenterPoint = createPoint(innerRadius + slotWidth / 2, slotLengthInRad + startOffset, zOffset)
-    arcs.addByCenterStartSweep(secondArcCenterPoint, externalArc.endSketchPoint, math.pi)
+        firstArcCenterPoint = createPoint(innerRadius + slotWidth / 2, startOffset, zOffset)
+        arcs.addByCenterStartSweep(firstArcCenterPoint, internalArc.startSketchPoint, math.pi)
+        secondArcCenterPoint = createPoint(innerRadius + slotWidth / 2, slotLengthInRad + startOffset, zOffset)
+        arcs.addByCenterStartSweep(secondArcCenterPoint, externalArc.endSketchPoint, math.pi)
 
 
 def createPoint(radius: float, radian: float, offset: float = 0):
@@ -1992,41 +2425,3 @@ def createPoint(radius: float, radian: float, offset: float = 0):
         Point3D: The created 3D point.
     """
     return Point3D.create(radius * math.cos(radian), radius * math.sin(radian), offset)
-
-
-def getClearance():
-    """
-    Get the clearance value for the accessories.
-
-    If a custom clearance input is provided, it will be used instead of the default value.
-
-    Returns:
-        float: The clearance value in centimeters.
-    """
-    clearance = MAIN_SCREW_BODY_CLEARANCE_CM
-    global clearanceInput
-    if clearanceInput:
-        clearance = clearanceInput.value
-    return clearance
-
-
-def getScrewOuterRadius():
-    """
-    Calculate the outer radius of the main screw.
-
-    Returns:
-        float: The outer radius of the screw.
-    """
-    return (THREAD_SIZE_D_MAJOR_CM - H_NEW_CM - getClearance()) / 2
-
-
-def getScrewInnerRadius():
-    """
-    Calculate the inner radius of the main screw.
-
-    This function calculates the inner radius of the main screw by subtracting half of the main screw head thickness from the outer radius.
-
-    Returns:
-        float: The inner radius of the screw.
-    """
-    return getScrewOuterRadius() - MAIN_SCREW_HEAD_THICKNESS_CM / 2
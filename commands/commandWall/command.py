@@ -0,0 +1,51 @@
+import os
+
+from ... import config
+from ...lib.common.lazy_command import LazyCommand
+
+# NNWS constants
+from ...lib.common.nnws_constants import CALLBACK_NAME
+
+# Registration of the wall command, the dialog and the generator in entry.py are imported when the command is first created
+
+CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_cmdwall"
+CMD_NAME = "NNWS Wall"
+CMD_Description = "Create NNWS Wall."
+
+# Specify that the command will be promoted to the panel.
+IS_PROMOTED = True
+WORKSPACE_ID = "FusionSolidEnvironment"
+PANEL_ID = "SolidCreatePanel"
+COMMAND_BESIDE_ID = ""
+
+# Resource location for command icons, here we assume a sub folder in this directory named "resources".
+ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
+
+wallCommand = LazyCommand(
+    __package__,
+    "entry",
+    "command_created",
+    CMD_ID,
+    CMD_NAME,
+    CMD_Description,
+    ICON_FOLDER,
+    WORKSPACE_ID,
+    PANEL_ID,
+    COMMAND_BESIDE_ID,
+    IS_PROMOTED,
+)
+
+# this is the script handling code for stl automation generation, the command has no button
+scriptCommand = LazyCommand(__package__, "entry", "script_created", CALLBACK_NAME, "Wall System Automation", "Automate Wall Creation")
+
+
+# Executed when add-in is run.
+def start():
+    wallCommand.start()
+    scriptCommand.start()
+
+
+# Executed when add-in is stopped.
+def stop():
+    wallCommand.stop()
+    scriptCommand.stop()
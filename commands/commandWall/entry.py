@@ -1,3 +1,5 @@
+import json
+import math
 import os
 
 import adsk.cam
@@ -10,20 +12,35 @@ from adsk.core import (
     GroupCommandInput,
     InputChangedEventArgs,
     IntegerSpinnerCommandInput,
+    Matrix3D,
     ObjectCollection,
     Point3D,
     StringValueCommandInput,
     TableCommandInput,
     ValueInput,
+    Vector3D,
 )
-from adsk.fusion import Component, FeatureOperations, Occurrence, Sketch, SplitBodyFeature
+from adsk.fusion import Component, Design, ExtrudeFeature, FeatureOperations, Occurrence, Sketch
 
 from ... import config
 from ...lib import fusion360utils as futil
+from ...lib.common import api_profiler as prof
+from ...lib.common import (
+    accessory_kit,
+    direct_modeling,
+    job_queue,
+    material_estimate,
+    nnws_log,
+    step_export,
+    threemf_export,
+    wall_preview,
+    wall_tiling,
+)
+from ...lib.common.dialog_sessions import SessionRecorder
+from ...lib.common.hex_grid import WALL_NB_SIDES, calculateOffsetAngle, rowDeltaXY, rowOriginsXY
 
 # NNWS constants
 from ...lib.common.nnws_constants import (
-    CALLBACK_NAME,
     GRIDFINITY_SIZE_CM,
     NOTCH_SIZE_RADIUS_CM,
     THREAD_PITCH_CM,
@@ -33,12 +50,31 @@ from ...lib.common.nnws_constants import (
     WALL_INNER_WALL_OFFSET_CM,
     WALL_OUTER_WALL_THICKNESS_CM,
     WALL_THICKNESS_CM,
+    mmToCm,
+)
+from ...lib.common.nnws_util import (
+    createAnchorChamfer,
+    createHollowCylinder,
+    createInternalThread,
+    createNamedComponent,
+    cutThreadOvershoot,
+    deferredCompute,
+    filletEdges,
+    innerSideFace,
+    wrapInCollection,
+)
+from ...lib.common.wall_pattern import (
+    circPatternSketch,
+    copyBodies,
+    createHexPoint,
+    instanceComponent,
+    latticeOffsets,
+    patternBodies,
 )
-from ...lib.common.nnws_util import *
-from ...lib.common.wall_pattern import *
 
 app = adsk.core.Application.get()
 ui = app.userInterface
+log = nnws_log.getLogger(__name__)
 
 # UI Constants
 MENU_WALL_FEATURE = "wall_features"
@@ -46,6 +82,9 @@ MENU_WALL_DROPDOWN = "wall_dropdown"
 
 WALL = "Wall"
 
+# Wall built with and without history before a batch, a few rows so the row offsets and the patterns are compared
+BATCH_DIRECT_CHECK_SIZE = (3, 3)
+
 MENU_DIMENSION_GROUP = "dimension_group"
 MENU_DIMENSION_PREVIEW = "dimension_preview"
 MENU_DIMENSION_WIDTH = "dimension_width"
@@ -62,79 +101,15 @@ OPTION_RIGHT = "option_right"
 OPTION_BOTTOM = "option_bottom"
 OPTION_LEFT = "option_left"
 
-CMD_ID = f"{config.COMPANY_NAME}_{config.ADDIN_NAME}_cmdwall"
-CMD_NAME = "NNWS Wall"
-CMD_Description = "Create NNWS Wall."
-
-# Specify that the command will be promoted to the panel.
-IS_PROMOTED = True
-WORKSPACE_ID = "FusionSolidEnvironment"
-PANEL_ID = "SolidCreatePanel"
-COMMAND_BESIDE_ID = ""
-
-# Resource location for command icons, here we assume a sub folder in this directory named "resources".
-ICON_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "")
-
 # Local list of event handlers used to maintain a reference so
 # they are not released and garbage collected.
 local_handlers = []
 
+# Opt-in recording of the dialog sessions, replayed by the preview latency benchmark
+sessionRecorder = SessionRecorder("commandWall", config.RECORD_DIALOG_SESSIONS, config.SESSION_OUTPUT_DIR)
 
-# Executed when add-in is run.
-def start():
-    # Create a command Definition.
-    cmd_def = ui.commandDefinitions.addButtonDefinition(CMD_ID, CMD_NAME, CMD_Description, ICON_FOLDER)
-
-    # Define an event handler for the command created event. It will be called when the button is clicked.
-    futil.add_handler(cmd_def.commandCreated, command_created)
-
-    # ******** Add a button into the UI so the user can run the command. ********
-    # Get the target workspace the button will be created in.
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-
-    # Get the panel the button will be created in.
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-
-    # Create the button command control in the UI after the specified existing command.
-    control = panel.controls.addCommand(cmd_def, COMMAND_BESIDE_ID, False)
-
-    # Specify if the command is promoted to the main toolbar.
-    control.isPromoted = IS_PROMOTED
-
-    # this is the script handling code for stl automation generation
-    cmdDef = ui.commandDefinitions.itemById(CALLBACK_NAME)
-    if not cmdDef:
-        cmdDef = ui.commandDefinitions.addButtonDefinition(CALLBACK_NAME, "Wall System Automation", "Automate Wall Creation")
-        futil.add_handler(cmdDef.commandCreated, script_created)
-        design = app.activeProduct
-        userParams = design.userParameters
-        userParams.add("script_exportPath", ValueInput.createByString("path"), "", "")
-
-
-# Executed when add-in is stopped.
-def stop():
-    # Get the various UI elements for this command
-    workspace = ui.workspaces.itemById(WORKSPACE_ID)
-    panel = workspace.toolbarPanels.itemById(PANEL_ID)
-    command_control = panel.controls.itemById(CMD_ID)
-    command_definition = ui.commandDefinitions.itemById(CMD_ID)
-
-    script_definition = ui.commandDefinitions.itemById(CALLBACK_NAME)
-    if script_definition:
-        script_definition.deleteMe()
-        design = app.activeProduct
-        # deleting user's parameters created for the script automation
-        exportPath = design.userParameters.itemByName("script_exportPath")
-        if exportPath:
-            exportPath.deleteMe()
-
-    # Delete the button command control
-    if command_control:
-        command_control.deleteMe()
-
-    # Delete the command definition
-    if command_definition:
-        command_definition.deleteMe()
+# The section meshes drawn by the previews, kept while the dialog is open
+wallPreview = wall_preview.WallPreview()
 
 
 def script_created(args: CommandCreatedEventArgs):
@@ -159,6 +134,7 @@ def command_created(args: CommandCreatedEventArgs):
     equalSectionInput.isEnabled = heightInput.value > 1
 
     buildTable(inputs, not equalSectionInput.isEnabled)
+    sessionRecorder.start(inputs)
 
     # Future work for border generation
     # borderGroup = inputs.addGroupCommandInput(MENU_BORDER_GENERATION_GROUP, 'Border Generation')
@@ -177,7 +153,8 @@ def command_created(args: CommandCreatedEventArgs):
 # This event handler is called when the user clicks the OK button in the command dialog or
 # is immediately called after the created event not command inputs were created for the dialog.
 def command_execute(args: CommandEventArgs):
-    generateWall(args)
+    with sessionRecorder.timed("execute"):
+        generateWall(args)
 
 
 # This event handler is called when the command needs to compute a new preview in the graphics window.
@@ -186,18 +163,21 @@ def command_preview(args: CommandEventArgs):
     preview = inputs.itemById(MENU_DIMENSION_GROUP).children.itemById(MENU_DIMENSION_PREVIEW)
 
     if preview and preview.value == True:
-        generateWall(args)
+        with sessionRecorder.timed("preview"):
+            generateWall(args, config.WALL_PREVIEW_GRAPHICS)
 
 
 # This event handler is called when the user changes anything in the command dialog
 # allowing you to modify values of other inputs based on that change.
 def command_input_changed(args: InputChangedEventArgs):
+    sessionRecorder.inputChanged(args.input)
+
     if None == args.input.parentCommandInput:
         return
 
     # Button disabled for now, but keeping the condition for future use
     if args.input.id == WALL_PATTERN_RESET:
-        futil.log("Resetting the wall pattern")
+        log.info("Resetting the wall pattern")
         # buildTable() ? # need to delete the table and recreate it?
     elif args.input.id == MENU_DIMENSION_HEIGHT:  # chaning the height, enable the options for the wall pattern
         heightInput: IntegerSpinnerCommandInput = args.inputs.itemById(MENU_DIMENSION_HEIGHT)
@@ -244,6 +224,8 @@ def handleDimensionChange(table: TableCommandInput, height, width, visible: bool
 def command_destroy(args: CommandEventArgs):
     global local_handlers
     local_handlers = []
+    sessionRecorder.stop()
+    wallPreview.clear()
 
 
 def buildTable(inputs: CommandInput, visible: bool):
@@ -328,13 +310,14 @@ def addRow(table: TableCommandInput, rowIndex: int, countValue: int, offsetValue
     table.addCommandInput(offsetInput, rowIndex, 2)
 
 
-def generateWall(args: CommandEventArgs):
+def generateWall(args: CommandEventArgs, graphics: bool = False):
     """
     This is the main function that will generate the wall based on the inputs from the user.
     This is creating a 1 wall unit and patterning it based on the user inputs.
 
     Args:
         args (CommandEventArgs): The command arguments.
+        graphics (bool, optional): Draws the wall as custom graphics instead, for the preview. Defaults to False.
 
     Returns:
         None
@@ -357,30 +340,219 @@ def generateWall(args: CommandEventArgs):
     # bottomBorder = borderGeneartionGroup.children.itemById(OPTION_BOTTOM)
     # leftBorder = borderGeneartionGroup.children.itemById(OPTION_LEFT)
 
-    internalGenerateWall(widthInput.value, heightInput.value, notch.value, standardWallPattern, table)
+    with prof.profiledRun("Wall", config.PROFILE_OUTPUT_DIR, futil.log):
+        if graphics:
+            previewWall(widthInput.value, heightInput.value, notch.value, standardWallPattern, table)
+        else:
+            internalGenerateWall(widthInput.value, heightInput.value, notch.value, standardWallPattern, table, config.INSTANCE_PATTERNS)
+
+
+def exportDesign(design: Design, filename: str, instanced: bool):
+    """
+    Exports the visible parts of the design to a STEP file, and to a 3MF file next to it when BATCH_EXPORT_3MF is True.
+
+    Args:
+        design (Design): The design to export.
+        filename (str): The STEP file.
+        instanced (bool): Keeps the instances of the components, see step_export.exportInstances.
+    """
+    if instanced:
+        step_export.exportInstances(design, filename)
+    else:
+        step_export.exportVisibleBodies(design, filename, config.BATCH_EXPORT_ONE_FILE_PER_BODY)
+    if config.BATCH_EXPORT_3MF:
+        threemf_export.exportInstances3MF(design, f"{os.path.splitext(filename)[0]}.3mf")
 
 
 def scriptGenerateWall(exportPath: str):
-    """Not used by the add-in; meant to be called by an external script."""
+    """
+    Not used by the add-in; meant to be called by an external script. Runs the job queue of the folder when it has
+    one, see runJobQueue, else exports the catalog of walls.
+    """
+    queuePath = os.path.join(exportPath, job_queue.QUEUE_FILE_NAME)
+    if os.path.exists(queuePath):
+        runJobQueue(exportPath, job_queue.readQueue(queuePath))
+        return
 
     futil.log(f"scriptGenerateWall: exporting to step file to '{exportPath}'")
     notchedPath = f"{exportPath}/notched"
     if not os.path.exists(notchedPath):
         os.makedirs(notchedPath)
 
-    for notch in [True, False]:
-        for h in range(1, 9):
-            for w in range(1, 9):
-                design = internalGenerateWall(w, h, notch)
-                filename = f"{exportPath}/{'notched/' if notch else ''}wall_{w}x{h}{'_notched' if notch else ''}.step"
-                exportStepFile(design, filename)
+    design = app.activeProduct
+    instanced = config.INSTANCE_PATTERNS
+    useDirectModeling = config.BATCH_DIRECT_MODELING and direct_modeling.canSwitch(design)
+    if useDirectModeling:
+        check = direct_modeling.verifyDirectBuild(lambda: internalGenerateWall(*BATCH_DIRECT_CHECK_SIZE, True, instanced=instanced))
+        if check.isEquivalent:
+            log.info(
+                "Direct modeling: sample wall built in %.0f ms instead of %.0f ms (%.1fx)",
+                check.directSeconds * 1000,
+                check.parametricSeconds * 1000,
+                check.speedup,
+            )
+        else:
+            log.warning("Direct modeling: the sample wall differs from the parametric one, keeping the timeline: %s", check.differences)
+            useDirectModeling = False
 
-                # clean up the design
-                for c in design.rootComponent.allOccurrences:
-                    c.deleteMe()
+    with direct_modeling.directModeling(design, useDirectModeling):
+        for notch in [True, False]:
+            for h in range(1, 9):
+                for w in range(1, 9):
+                    filename = f"{exportPath}/{'notched/' if notch else ''}wall_{w}x{h}{'_notched' if notch else ''}.step"
+                    with prof.profiledRun(f"wall_{w}x{h}{'_notched' if notch else ''}", config.PROFILE_OUTPUT_DIR, futil.log):
+                        design = internalGenerateWall(w, h, notch, instanced=instanced)
+                        exportDesign(design, filename, instanced)
 
+                    # clean up the design
+                    for c in design.rootComponent.allOccurrences:
+                        c.deleteMe()
+
+
+def runJobQueue(exportPath: str, jobs: list):
+    """
+    Runs the jobs of a queue planned by the command line (python -m nnws --queue), in order, the design is cleaned
+    up after every job.
+
+    Args:
+        exportPath (str): The folder of the queue, the paths of the jobs are relative to it.
+        jobs (list): The jobs, see lib/common/job_queue.py.
+    """
+    # the accessories are loaded by the jobs that need them, like when their command is first created
+    from ...commands.commandAccessories import entry as accessories
 
-def internalGenerateWall(widthInput: int, heightInput: int, notch: bool, standardWallPattern: bool = True, table: TableCommandInput = None):
+    design = app.activeProduct
+    for index, job in enumerate(jobs):
+        path = os.path.join(exportPath, job["path"])
+        futil.log(f"runJobQueue: job {index + 1}/{len(jobs)}, {job['type']} to '{path}'")
+        if job["type"] in (job_queue.JOB_WALL, job_queue.JOB_KIT, job_queue.JOB_VOLUMES):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with prof.profiledRun(f"job_{index + 1}_{job['type']}", config.PROFILE_OUTPUT_DIR, futil.log):
+            if job["type"] == job_queue.JOB_WALL:
+                instanced = config.INSTANCE_PATTERNS
+                with direct_modeling.directModeling(design, config.BATCH_DIRECT_MODELING and direct_modeling.canSwitch(design)):
+                    internalGenerateWall(job["width"], job["height"], job["notch"], instanced=instanced)
+                    exportDesign(design, path, instanced)
+            elif job["type"] == job_queue.JOB_WALL_TILES:
+                scriptGenerateWallTiles(path, job["width"], job["height"], job["notch"], tuple(job["bedSizeMm"]))
+            elif job["type"] == job_queue.JOB_KIT:
+                accessories.generateKit(accessory_kit.parseKit(job["kit"]))
+                exportDesign(design, path, True)
+            elif job["type"] == job_queue.JOB_ACCESSORY_PLATES:
+                parts = [(item.accessory, item.params, item.count) for item in accessory_kit.parseKit(job["kit"])]
+                accessories.scriptExportAccessoryPlates(path, parts, tuple(job["bedSizeMm"]))
+            elif job["type"] == job_queue.JOB_VOLUMES:
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(measureVolumes(job["parts"]), file, indent=2)
+
+        for c in list(design.rootComponent.occurrences):
+            c.deleteMe()
+
+
+def measureVolumes(parts: list) -> dict:
+    """
+    Builds the parts of a reference set one at a time and measures them, to check the estimates of
+    lib/common/material_estimate.py. The walls and the insert plates are built without instancing, the volumes of the
+    bodies of the design are the volumes of the parts.
+
+    Args:
+        parts (list): The parts, see material_estimate.referenceSet.
+
+    Returns:
+        dict: name -> the volume of the visible bodies of the part, in cm3.
+    """
+    from ...commands.commandAccessories import entry as accessories
+
+    design = app.activeProduct
+    volumes = {}
+    for part in parts:
+        prefix = None
+        if "wall" in part:
+            wall = part["wall"]
+            internalGenerateWall(wall["width"], wall["height"], wall.get("notch", True))
+        else:
+            prefix = accessories.select(part["accessory"], material_estimate.referenceParameters(part), instanced=False)
+        volumes[part["name"]] = sum(body.volume for body in direct_modeling.bodySignatures(design) if body.isVisible)
+        for c in list(design.rootComponent.occurrences):
+            c.deleteMe()
+        if prefix:
+            accessories.deleteUserParameters(prefix)
+    return volumes
+
+
+def scriptGenerateWallTiles(exportPath: str, widthInput: int, heightInput: int, notch: bool = True, bedSizeMm: tuple = None):
+    """
+    Not used by the add-in; meant to be called by an external script. Generates a wall too large for the print bed
+    as tiles fitting the bed and exports a file per tile.
+
+    Args:
+        exportPath (str): The folder of the files.
+        widthInput (int): The number of cells of every row.
+        heightInput (int): The number of rows.
+        notch (bool, optional): Indicates whether to create a notch in the wall sections. Defaults to True.
+        bedSizeMm (tuple, optional): The (width, depth) of the print bed in mm. Defaults to config.PRINT_BED_SIZE_MM.
+    """
+    bedWidth, bedDepth = (mmToCm(size) for size in bedSizeMm or config.PRINT_BED_SIZE_MM)
+    plan = wall_tiling.planTiles([(widthInput, 0)] * heightInput, bedWidth, bedDepth)
+    futil.log(f"scriptGenerateWallTiles: {plan.summary()}, exporting to '{exportPath}'")
+    if not os.path.exists(exportPath):
+        os.makedirs(exportPath)
+
+    design = app.activeProduct
+    with direct_modeling.directModeling(design, config.BATCH_DIRECT_MODELING and direct_modeling.canSwitch(design)):
+        name = f"wall_{widthInput}x{heightInput}{'_notched' if notch else ''}"
+        with prof.profiledRun(f"{name}_tiles", config.PROFILE_OUTPUT_DIR, futil.log):
+            tiles = generateWallTiles(plan, notch)
+            for tile, occurrence in zip(plan.tiles, tiles):
+                filename = f"{exportPath}/{name}_tile_{tile.index + 1}"
+                step_export.exportInstances(design, f"{filename}.step", occurrence.component)
+                if config.BATCH_EXPORT_3MF:
+                    threemf_export.exportInstances3MF(design, f"{filename}.3mf", occurrence.component)
+
+        # clean up the design, the cells go with their tile
+        for c in list(design.rootComponent.occurrences):
+            c.deleteMe()
+
+
+@prof.profiled()
+def generateWallTiles(plan: wall_tiling.TilingPlan, notch: bool) -> list:
+    """
+    Generates the tiles of a wall, a component per tile placed at its position in the wall. The cell is built once,
+    hidden, the cells of the tiles are occurrences of its component placed from the origin of their tile.
+
+    Args:
+        plan (TilingPlan): The tiles of the wall.
+        notch (bool): Indicates whether to create a notch in the wall sections.
+
+    Returns:
+        list: The occurrence of every tile, in the order of the plan.
+    """
+    design = app.activeProduct
+    rootComponent: Component = Component.cast(design.rootComponent)
+
+    wallSection = createWallSection(rootComponent, notch)
+    wallSection.isLightBulbOn = False
+
+    occurrences = []
+    for tile in plan.tiles:
+        transform = Matrix3D.create()
+        transform.translation = Vector3D.create(*tile.origin, 0)
+        tileOccurrence = rootComponent.occurrences.addNewComponent(transform)
+        tileOccurrence.component.name = f"{WALL} Tile {tile.index + 1}"
+        instanceComponent(tileOccurrence.component, wallSection.component, [Vector3D.create(x, y, 0) for x, y in tile.offsets])
+        occurrences.append(tileOccurrence)
+    return occurrences
+
+
+def internalGenerateWall(
+    widthInput: int,
+    heightInput: int,
+    notch: bool,
+    standardWallPattern: bool = True,
+    table: TableCommandInput = None,
+    instanced: bool = False,
+):
     design = app.activeProduct
     rootComponent: Component = Component.cast(design.rootComponent)
 
@@ -394,35 +566,74 @@ def internalGenerateWall(widthInput: int, heightInput: int, notch: bool, standar
             visibleBodyCollection.add(body)
 
     xAxis = rootComponent.xConstructionAxis
-    wallPatternDefinition = {}
+    wallPatternDefinition = readWallPattern(widthInput, heightInput, standardWallPattern, table)
 
-    if table != None and standardWallPattern == False:
-        for rowIndex in range(1, table.rowCount):  # skipping first row, it's the title
-            wallPatternDefinition[rowIndex - 1] = [table.getInputAtPosition(rowIndex, 1).value, table.getInputAtPosition(rowIndex, 2).value]
-    else:
-        for i in range(heightInput):
-            wallPatternDefinition[i] = [widthInput, 0]
+    if instanced:
+        # the section is the first cell, the other cells are occurrences of its component
+        offsets = latticeOffsets(wallRowOrigins(wallPatternDefinition), [row[0] for row in wallPatternDefinition.values()])
+        instanceComponent(rootComponent, wallSection.component, offsets[1:])
+        return design
 
     # first/top row and going down to be easier to match the table for non standard wall pattern
     patternBodies(rootComponent, xAxis, visibleBodyCollection, wallPatternDefinition[0][0])
+    rowBodies = visibleBodyCollection
     for rowIndex in wallPatternDefinition:
         if rowIndex > 0:
             width = wallPatternDefinition[rowIndex][0]
             offset = wallPatternDefinition[rowIndex][1]
-            offset_angle = calculateOffsetAngle(WALL_NB_SIDES)
-            r = GRIDFINITY_SIZE_CM / 2 / math.cos(math.pi / WALL_NB_SIDES)
-
-            startPoint = createHexPoint(r, HexPointIndex.TOP.value, 0, offset_angle)
-            toPoint = createHexPoint(
-                r, HexPointIndex.BOTTOM_LEFT.value if rowIndex % 2 == 0 else HexPointIndex.BOTTOM_RIGHT.value, offset, offset_angle
-            )
-            delta = createDeltaVector(startPoint, toPoint)
-            copyBodies(rootComponent, visibleBodyCollection, delta)
-            patternBodies(rootComponent, xAxis, visibleBodyCollection, width)
+            # every row starts from a copy of the first cell of the previous one
+            rowBodies = copyBodies(rootComponent, rowBodies, Vector3D.create(*rowDeltaXY(rowIndex, offset), 0))
+            patternBodies(rootComponent, xAxis, rowBodies, width)
 
     return design
 
 
+def readWallPattern(widthInput: int, heightInput: int, standardWallPattern: bool = True, table: TableCommandInput = None) -> dict:
+    """
+    Returns:
+        dict: row index -> [number of cells, offset] of every row of the wall, from the table for a non standard pattern.
+    """
+    wallPatternDefinition = {}
+    if table != None and standardWallPattern == False:
+        for rowIndex in range(1, table.rowCount):  # skipping first row, it's the title
+            wallPatternDefinition[rowIndex - 1] = [table.getInputAtPosition(rowIndex, 1).value, table.getInputAtPosition(rowIndex, 2).value]
+    else:
+        for i in range(heightInput):
+            wallPatternDefinition[i] = [widthInput, 0]
+    return wallPatternDefinition
+
+
+def previewWall(widthInput: int, heightInput: int, notch: bool, standardWallPattern: bool = True, table: TableCommandInput = None):
+    """
+    Draws the wall as custom graphics, the mesh of the section at every cell, see lib/common/wall_preview.py. The section
+    is only built and meshed on the first preview of a notch option, the next ones redraw the kept mesh, a change of the
+    counts doesn't build any feature.
+
+    Returns:
+        CustomGraphicsGroup: The graphics of the cells.
+    """
+    rootComponent: Component = Component.cast(app.activeProduct.rootComponent)
+    wallPatternDefinition = readWallPattern(widthInput, heightInput, standardWallPattern, table)
+    offsets = latticeOffsets(wallRowOrigins(wallPatternDefinition), [row[0] for row in wallPatternDefinition.values()])
+
+    mesh = wallPreview.sectionMesh(notch)
+    if mesh is None:
+        # the section built for the mesh stays in this preview as the first cell
+        wallSection = createWallSection(rootComponent, notch)
+        mesh = wallPreview.keep(notch, [body for body in wallSection.bRepBodies if body.isVisible])
+        offsets = offsets[1:]
+    return wall_preview.drawCells(rootComponent, mesh, offsets)
+
+
+def wallRowOrigins(wallPatternDefinition: dict) -> list:
+    """
+    Returns:
+        list: The Vector3D origin of every row of the wall, the first row at the origin.
+    """
+    return [Vector3D.create(x, y, 0) for x, y in rowOriginsXY(list(wallPatternDefinition.values()))]
+
+
+@prof.profiled()
 def createWallSection(rootComponent: Component, notch: bool) -> Occurrence:
     """
     Create a wall section that will be patterned to create the wall
@@ -443,47 +654,40 @@ def createWallSection(rootComponent: Component, notch: bool) -> Occurrence:
     createHollowCylinder(wallComponent.component, outerRadius, WALL_INNER_WALL_OFFSET_CM, WALL_BOTTOM_THICKNESS_CM)
     outerRadius = GRIDFINITY_SIZE_CM / 2 - WALL_OUTER_WALL_THICKNESS_CM - WALL_INNER_WALL_OFFSET_CM
     internalSectionHeight = WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM
-    mainWallBodyPart3: ExtrudeFeatures = createHollowCylinder(
+    mainWallBodyPart3: ExtrudeFeature = createHollowCylinder(
         wallComponent.component, outerRadius, WALL_INNER_WALL_OFFSET_CM, internalSectionHeight
     )
 
     # Create the Inner Chamfer
     # the chamfer start at 1 mm from the bottom, so we need to calculate the height of the chamfer based on the internal section height and based on the angle of the chamfer
-    createAnchorChamfer(wallComponent, mainWallBodyPart3.faces.item(0).edges.item(0), internalSectionHeight - 0.1)
+    createAnchorChamfer(wallComponent, innerSideFace(mainWallBodyPart3).edges.item(0), internalSectionHeight - 0.1)
 
     if notch:
         createNotch(wallComponent.component, outerRadius, internalSectionHeight, FeatureOperations.CutFeatureOperation)
 
     threadStartOffset = WALL_BOTTOM_THICKNESS_CM + THREAD_PITCH_CM
-    internalThread = createInternalThread(
+    createInternalThread(
         wallComponent.component,
         threadStartOffset,  # threadStartOffset
         THREAD_SIZE_D_MAJOR_CM / 2,  # radius
         WALL_THICKNESS_CM,  # height
     )
 
+    # the thread going over the top of the wall is cut off, the section stays without leftover body
+    cutThreadOvershoot(wallComponent.component, THREAD_SIZE_D_MAJOR_CM / 2, WALL_THICKNESS_CM, threadStartOffset)
+
     facesForFillet = None
     for b in wallComponent.component.bRepBodies:
         for f in b.faces:
             if math.isclose(f.pointOnFace.z, WALL_THICKNESS_CM, abs_tol=0.01):
                 facesForFillet = f
 
-    # Create SplitBodyFeatureInput
-    splitBodyFeature: SplitBodyFeature = rootComponent.features.splitBodyFeatures
-    splitBodyInput = splitBodyFeature.createInput(internalThread.bodies.item(0), facesForFillet, True)
-
-    # Create split body feature
-    splitedBodies = splitBodyFeature.add(splitBodyInput)
-    for s in splitedBodies.bodies:
-        if s.name == "Body4":
-            # just hides the body
-            s.isVisible = False
-
-    filletEdges(rootComponent, wrapInCollection(facesForFillet.edges.item(0)), 0.05)
+    filletEdges(wallComponent.component, wrapInCollection(facesForFillet.edges.item(0)), 0.05)
 
     return wallComponent
 
 
+@prof.profiled()
 def createExteriorWallSection(targetOccurence: Occurrence, outerRadius: float, offset: float, height: float) -> Sketch:
     """
     Creates an exterior wall section that will connect to each other.
@@ -529,6 +733,7 @@ def createExteriorWallSection(targetOccurence: Occurrence, outerRadius: float, o
     return outer_sketch
 
 
+@prof.profiled()
 def createExteriorContainer(sketch: Sketch, radius: float):
     """
     Create a hexagon shape for the outer wall or a wall section
@@ -551,12 +756,14 @@ def createExteriorContainer(sketch: Sketch, radius: float):
         points.add(createHexPoint(r, i, 0, offset_angle))
 
     # Connect the points with lines to form the polygon
-    for i in range(nbSides):
-        start_point = points.item(i)
-        end_point = points.item((i + 1) % nbSides)
-        sketch.sketchCurves.sketchLines.addByTwoPoints(start_point, end_point)
+    with deferredCompute(sketch):
+        for i in range(nbSides):
+            start_point = points.item(i)
+            end_point = points.item((i + 1) % nbSides)
+            sketch.sketchCurves.sketchLines.addByTwoPoints(start_point, end_point)
 
 
+@prof.profiled()
 def createNotch(targetOccurence: Occurrence, outerRadius: float, height: float, operationType: FeatureOperations):
     """
     Notch the wall accessories backing so they are angled at predefined angle
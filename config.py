@@ -18,4 +18,54 @@ ADDIN_NAME = os.path.basename(os.path.dirname(__file__))
 COMPANY_NAME = 'TheWelder76'
 
 # Palettes
-sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
\ No newline at end of file
+sample_palette_id = f'{COMPANY_NAME}_{ADDIN_NAME}_palette_id'
+
+# Profiling of the Fusion API calls made by the generators. When True, a text report and a Chrome
+# trace file (chrome://tracing or Perfetto) are written for each generation, see lib/common/api_profiler.py
+PROFILE_API = False
+
+# Folder of the profiling reports, None uses NNWS_profiles in the temp folder
+PROFILE_OUTPUT_DIR = None
+
+# Recording of the accessory and wall dialog sessions (input changes and previews, with the values and
+# timings), replayed by "python -m benchmarks --replay", see lib/common/dialog_sessions.py
+RECORD_DIALOG_SESSIONS = False
+
+# Folder of the recorded sessions, None uses NNWS_sessions in the temp folder
+SESSION_OUTPUT_DIR = None
+
+# Level of the NNWS logs (DEBUG, INFO, WARNING, ERROR) and level per module, keyed by the end of the module
+# name, e.g. {"wall_pattern": "DEBUG"}. The debug records are kept in memory and only written to the Text
+# Command window when an error is logged, see lib/common/nnws_log.py
+LOG_LEVEL = "INFO"
+LOG_MODULE_LEVELS = {}
+
+# Batch generations (the generate_stl_files script) build the parts with direct modeling, without timeline history,
+# when the design has no history. A sample wall is first built both ways in new documents and compared (volumes and
+# bounding boxes), the batch keeps the timeline when they differ, see lib/common/direct_modeling.py
+BATCH_DIRECT_MODELING = True
+
+# Batch generations export the component holding the visible solid bodies. When True, a STEP file is written per body,
+# each body copied to a temporary component, see lib/common/step_export.py
+BATCH_EXPORT_ONE_FILE_PER_BODY = False
+
+# The walls and the insert plates are built as one cell component referenced by an occurrence per cell, instead of
+# a B-rep copy of the cell per position. The batch then exports the instances, see lib/common/step_export.py and
+# lib/common/threemf_export.py, and writes a 3MF file next to each STEP file when BATCH_EXPORT_3MF is True
+INSTANCE_PATTERNS = False
+BATCH_EXPORT_3MF = False
+
+# The wall preview draws a mesh of the section per cell as custom graphics, the section is meshed once per notch option
+# while the dialog is open and a size change doesn't rebuild any feature, see lib/common/wall_preview.py. Off, every
+# preview builds the B-rep wall like the execute
+WALL_PREVIEW_GRAPHICS = True
+
+# Print bed (width, depth) in mm of the wall tiles, a wall larger than the bed is generated as interlocking tiles by
+# the scriptGenerateWallTiles batch, see lib/common/wall_tiling.py
+PRINT_BED_SIZE_MM = (256, 256)
+
+# Space in mm between the accessories packed on the print plates of the scriptExportAccessoryPlates batch, their
+# footprints are the convex hull of their meshes when PLATE_FOOTPRINT_HULL is True, else their bounding boxes, see
+# lib/common/plate_packing.py
+PLATE_SPACING_MM = 5
+PLATE_FOOTPRINT_HULL = True
@@ -0,0 +1,101 @@
+import importlib
+import os
+import sys
+import types
+
+from . import cam, core, fusion
+from .recorder import RECORDER, Operation, Recorder, fakeOnly
+
+# Recording in-memory stand-in for the subset of the adsk API used by the add-in. install() registers it as the adsk
+# package, the add-in modules can then be imported and their generators run outside of Fusion. It is only used by the
+# tests and the benchmarks, it sits next to them and out of the lib folder of the add-in:
+#
+#   from .. import fake_adsk
+#   wall = fake_adsk.importAddinModule("commands.commandWall.entry")
+#   wall.internalGenerateWall(2, 2, True)
+#   assert fake_adsk.RECORDER.count("SweepFeatures.add") == 1
+
+__all__ = ["RECORDER", "Operation", "Recorder", "fakeOnly", "install", "uninstall", "newDesign", "importAddinModule"]
+
+_ADSK_MODULES = ("adsk", "adsk.core", "adsk.fusion", "adsk.cam")
+
+
+def install() -> types.ModuleType:
+    """
+    Registers the fake as the adsk package, does nothing when it is already installed.
+
+    Returns:
+        ModuleType: The fake adsk package.
+    """
+    adsk = sys.modules.get("adsk")
+    if adsk is not None and getattr(adsk, "__fake__", False):
+        return adsk
+
+    adsk = types.ModuleType("adsk")
+    adsk.__fake__ = True
+    adsk.__path__ = []
+    adsk.core = core
+    adsk.fusion = fusion
+    adsk.cam = cam
+    adsk.doEvents = lambda: None
+    adsk.autoTerminate = lambda terminate: None
+    sys.modules["adsk"] = adsk
+    sys.modules["adsk.core"] = core
+    sys.modules["adsk.fusion"] = fusion
+    sys.modules["adsk.cam"] = cam
+    return adsk
+
+
+def uninstall():
+    """
+    Removes the fake adsk package, the add-in modules imported with it are unloaded too.
+    """
+    adsk = sys.modules.get("adsk")
+    if adsk is None or not getattr(adsk, "__fake__", False):
+        return
+    for name in _ADSK_MODULES:
+        sys.modules.pop(name, None)
+    package = _addinPackage()
+    for name in [n for n in sys.modules if n.startswith(f"{package}.commands")]:
+        del sys.modules[name]
+
+
+def newDesign() -> fusion.Design:
+    """
+    Replaces the active design by an empty one and clears the recorded operations.
+
+    Returns:
+        Design: The new design.
+    """
+    design = fusion.Design()
+    core.Application.get().activeProduct = design
+    RECORDER.clear()
+    return design
+
+
+def _addinPackage() -> str:
+    """
+    Returns:
+        str: The name of the add-in package, importing it from its parent folder when it isn't loaded as a package.
+    """
+    if "." in __name__:
+        return __name__.rsplit(".", 1)[0]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    parent, package = os.path.split(root)
+    if parent not in sys.path:
+        sys.path.insert(0, parent)
+    return package
+
+
+def importAddinModule(name: str) -> types.ModuleType:
+    """
+    Installs the fake and imports a module of the add-in, e.g. "commands.commandWall.entry".
+
+    Args:
+        name (str): The module name, relative to the add-in folder.
+
+    Returns:
+        ModuleType: The imported module.
+    """
+    install()
+    return importlib.import_module(f"{_addinPackage()}.{name}")
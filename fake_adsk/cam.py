@@ -0,0 +1,7 @@
+from .recorder import ApiObject
+
+# Stand-in for adsk.cam, the add-in only imports it
+
+
+class CAM(ApiObject):
+    pass
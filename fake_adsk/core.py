@@ -0,0 +1,1391 @@
+import math
+
+from .recorder import RECORDER, ApiObject, fakeOnly
+
+# Stand-in for adsk.core: math types, collections, value inputs, the application, the user interface,
+# the command inputs and the events. Only the subset used by the add-in is implemented.
+
+TOLERANCE = 1e-6
+
+
+class LogLevels:
+    InfoLogLevel = 0
+    WarningLogLevel = 1
+    ErrorLogLevel = 2
+
+
+class LogTypes:
+    ConsoleLogType = 0
+    FileLogType = 1
+
+
+class DocumentTypes:
+    FusionDesignDocumentType = 0
+
+
+class DialogResults:
+    DialogError = -1
+    DialogOK = 0
+    DialogCancel = 1
+    DialogYes = 2
+    DialogNo = 3
+
+
+class DropDownStyles:
+    LabeledIconDropDownStyle = 0
+    CheckBoxDropDownStyle = 1
+    TextListDropDownStyle = 2
+
+
+class HorizontalAlignments:
+    LeftHorizontalAlignment = 0
+    CenterHorizontalAlignment = 1
+    RightHorizontalAlignment = 2
+
+
+class SurfaceTypes:
+    PlaneSurfaceType = 0
+    CylinderSurfaceType = 1
+    ConeSurfaceType = 2
+    SphereSurfaceType = 3
+    TorusSurfaceType = 4
+    EllipticalCylinderSurfaceType = 5
+    EllipticalConeSurfaceType = 6
+    NurbsSurfaceType = 7
+
+
+class Curve3DTypes:
+    Line3DCurveType = 0
+    Arc3DCurveType = 1
+    Circle3DCurveType = 2
+    Ellipse3DCurveType = 3
+    EllipticalArc3DCurveType = 4
+    InfiniteLine3DCurveType = 5
+    NurbsCurve3DCurveType = 6
+
+
+class ValueTypes:
+    RealValueType = 0
+    StringValueType = 1
+    ObjectValueType = 2
+
+
+############################################
+# Math
+############################################
+
+
+class Point3D(ApiObject):
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def create(x: float = 0.0, y: float = 0.0, z: float = 0.0) -> "Point3D":
+        return Point3D(x, y, z)
+
+    def copy(self) -> "Point3D":
+        return Point3D(self.x, self.y, self.z)
+
+    def distanceTo(self, point: "Point3D") -> float:
+        return math.dist(self.asArray(), point.asArray())
+
+    def isEqualTo(self, point: "Point3D") -> bool:
+        return self.distanceTo(point) < TOLERANCE
+
+    def vectorTo(self, point: "Point3D") -> "Vector3D":
+        return Vector3D(point.x - self.x, point.y - self.y, point.z - self.z)
+
+    def translateBy(self, vector: "Vector3D") -> bool:
+        self.x, self.y, self.z = self.x + vector.x, self.y + vector.y, self.z + vector.z
+        return True
+
+    def transformBy(self, matrix: "Matrix3D") -> bool:
+        self.x, self.y, self.z = matrix._apply(self.asArray(), 1.0)
+        return True
+
+    def asArray(self) -> tuple:
+        return (self.x, self.y, self.z)
+
+    def asVector(self) -> "Vector3D":
+        return Vector3D(self.x, self.y, self.z)
+
+
+class Point2D(ApiObject):
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.x = x
+        self.y = y
+
+    @staticmethod
+    def create(x: float = 0.0, y: float = 0.0) -> "Point2D":
+        return Point2D(x, y)
+
+
+class Vector3D(ApiObject):
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def create(x: float = 0.0, y: float = 0.0, z: float = 0.0) -> "Vector3D":
+        return Vector3D(x, y, z)
+
+    @property
+    def length(self) -> float:
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def copy(self) -> "Vector3D":
+        return Vector3D(self.x, self.y, self.z)
+
+    def normalize(self) -> bool:
+        length = self.length
+        if length < TOLERANCE:
+            return False
+        self.x, self.y, self.z = self.x / length, self.y / length, self.z / length
+        return True
+
+    def scaleBy(self, scale: float) -> bool:
+        self.x, self.y, self.z = self.x * scale, self.y * scale, self.z * scale
+        return True
+
+    def add(self, vector: "Vector3D") -> bool:
+        self.x, self.y, self.z = self.x + vector.x, self.y + vector.y, self.z + vector.z
+        return True
+
+    def dotProduct(self, vector: "Vector3D") -> float:
+        return self.x * vector.x + self.y * vector.y + self.z * vector.z
+
+    def crossProduct(self, vector: "Vector3D") -> "Vector3D":
+        return Vector3D(
+            self.y * vector.z - self.z * vector.y,
+            self.z * vector.x - self.x * vector.z,
+            self.x * vector.y - self.y * vector.x,
+        )
+
+    def isParallelTo(self, vector: "Vector3D") -> bool:
+        lengths = self.length * vector.length
+        return lengths > TOLERANCE and self.crossProduct(vector).length / lengths < 1e-9
+
+    def isPerpendicularTo(self, vector: "Vector3D") -> bool:
+        lengths = self.length * vector.length
+        return lengths > TOLERANCE and abs(self.dotProduct(vector)) / lengths < 1e-9
+
+    def angleTo(self, vector: "Vector3D") -> float:
+        lengths = self.length * vector.length
+        return math.acos(max(-1.0, min(1.0, self.dotProduct(vector) / lengths))) if lengths > TOLERANCE else 0.0
+
+    def transformBy(self, matrix: "Matrix3D") -> bool:
+        self.x, self.y, self.z = matrix._apply(self.asArray(), 0.0)
+        return True
+
+    def asArray(self) -> tuple:
+        return (self.x, self.y, self.z)
+
+    def asPoint(self) -> Point3D:
+        return Point3D(self.x, self.y, self.z)
+
+
+class Matrix3D(ApiObject):
+    """
+    4x4 transformation matrix, row major
+    """
+
+    def __init__(self):
+        self._data = [[1.0 if r == c else 0.0 for c in range(4)] for r in range(4)]
+
+    @staticmethod
+    def create() -> "Matrix3D":
+        return Matrix3D()
+
+    def copy(self) -> "Matrix3D":
+        matrix = Matrix3D()
+        matrix._data = [row[:] for row in self._data]
+        return matrix
+
+    @property
+    def translation(self) -> Vector3D:
+        return Vector3D(self._data[0][3], self._data[1][3], self._data[2][3])
+
+    @translation.setter
+    def translation(self, vector: Vector3D):
+        self._data[0][3], self._data[1][3], self._data[2][3] = vector.x, vector.y, vector.z
+
+    def setToIdentity(self) -> bool:
+        self._data = Matrix3D()._data
+        return True
+
+    def setToRotation(self, angle: float, axis: Vector3D, origin: Point3D) -> bool:
+        """
+        Rotation around the axis going through the origin, Rodrigues' formula.
+        """
+        u = axis.copy()
+        u.normalize()
+        c, s = math.cos(angle), math.sin(angle)
+        x, y, z = u.x, u.y, u.z
+        rotation = [
+            [c + x * x * (1 - c), x * y * (1 - c) - z * s, x * z * (1 - c) + y * s],
+            [y * x * (1 - c) + z * s, c + y * y * (1 - c), y * z * (1 - c) - x * s],
+            [z * x * (1 - c) - y * s, z * y * (1 - c) + x * s, c + z * z * (1 - c)],
+        ]
+        o = origin.asArray()
+        for r in range(3):
+            self._data[r][:3] = rotation[r]
+            self._data[r][3] = o[r] - sum(rotation[r][k] * o[k] for k in range(3))
+        self._data[3] = [0.0, 0.0, 0.0, 1.0]
+        return True
+
+    def transformBy(self, matrix: "Matrix3D") -> bool:
+        self._data = [[sum(matrix._data[r][k] * self._data[k][c] for k in range(4)) for c in range(4)] for r in range(4)]
+        return True
+
+    def getCell(self, row: int, column: int) -> float:
+        return self._data[row][column]
+
+    def setCell(self, row: int, column: int, value: float) -> bool:
+        self._data[row][column] = value
+        return True
+
+    def asArray(self) -> tuple:
+        return tuple(v for row in self._data for v in row)
+
+    def _apply(self, xyz: tuple, w: float) -> tuple:
+        return tuple(sum(self._data[r][k] * xyz[k] for k in range(3)) + self._data[r][3] * w for r in range(3))
+
+
+class BoundingBox3D(ApiObject):
+    def __init__(self, minPoint: Point3D, maxPoint: Point3D):
+        self.minPoint = minPoint
+        self.maxPoint = maxPoint
+
+    @staticmethod
+    def create(minPoint: Point3D, maxPoint: Point3D) -> "BoundingBox3D":
+        return BoundingBox3D(minPoint.copy(), maxPoint.copy())
+
+    def intersects(self, box: "BoundingBox3D") -> bool:
+        return all(
+            a0 <= b1 + TOLERANCE and b0 <= a1 + TOLERANCE
+            for a0, a1, b0, b1 in zip(self.minPoint.asArray(), self.maxPoint.asArray(), box.minPoint.asArray(), box.maxPoint.asArray())
+        )
+
+    def contains(self, point: Point3D) -> bool:
+        return all(
+            a - TOLERANCE <= p <= b + TOLERANCE for a, p, b in zip(self.minPoint.asArray(), point.asArray(), self.maxPoint.asArray())
+        )
+
+    def combine(self, box: "BoundingBox3D") -> bool:
+        self.minPoint = Point3D(*(min(a, b) for a, b in zip(self.minPoint.asArray(), box.minPoint.asArray())))
+        self.maxPoint = Point3D(*(max(a, b) for a, b in zip(self.maxPoint.asArray(), box.maxPoint.asArray())))
+        return True
+
+    def copy(self) -> "BoundingBox3D":
+        return BoundingBox3D(self.minPoint.copy(), self.maxPoint.copy())
+
+    @staticmethod
+    @fakeOnly
+    def ofPoints(points) -> "BoundingBox3D":
+        points = list(points)
+        return BoundingBox3D(
+            Point3D(*(min(p[i] for p in points) for i in range(3))),
+            Point3D(*(max(p[i] for p in points) for i in range(3))),
+        )
+
+
+############################################
+# Geometry
+############################################
+
+
+class Plane(ApiObject):
+    surfaceType = SurfaceTypes.PlaneSurfaceType
+
+    def __init__(self, origin: Point3D, normal: Vector3D, uDirection: Vector3D = None, vDirection: Vector3D = None):
+        self.origin = origin
+        self.normal = normal
+        if uDirection is None:
+            # any direction perpendicular to the normal
+            helper = Vector3D(1, 0, 0) if abs(normal.x) < 0.9 else Vector3D(0, 1, 0)
+            uDirection = helper.crossProduct(normal).crossProduct(normal)
+            uDirection.scaleBy(-1)
+            uDirection.normalize()
+        self.uDirection = uDirection
+        self.vDirection = vDirection or normal.crossProduct(uDirection)
+
+    @staticmethod
+    def create(origin: Point3D, normal: Vector3D) -> "Plane":
+        return Plane(origin.copy(), normal.copy())
+
+    def copy(self) -> "Plane":
+        return Plane(self.origin.copy(), self.normal.copy(), self.uDirection.copy(), self.vDirection.copy())
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        for v in (self.origin, self.normal, self.uDirection, self.vDirection):
+            v.transformBy(matrix)
+        return True
+
+
+class Cylinder(ApiObject):
+    surfaceType = SurfaceTypes.CylinderSurfaceType
+
+    def __init__(self, origin: Point3D, axis: Vector3D, radius: float):
+        self.origin = origin
+        self.axis = axis
+        self.radius = radius
+
+    def copy(self) -> "Cylinder":
+        return Cylinder(self.origin.copy(), self.axis.copy(), self.radius)
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        self.origin.transformBy(matrix)
+        self.axis.transformBy(matrix)
+        return True
+
+
+class Cone(ApiObject):
+    surfaceType = SurfaceTypes.ConeSurfaceType
+
+    def __init__(self, origin: Point3D, axis: Vector3D, radius: float, halfAngle: float):
+        self.origin = origin
+        self.axis = axis
+        self.radius = radius
+        self.halfAngle = halfAngle
+
+    def copy(self) -> "Cone":
+        return Cone(self.origin.copy(), self.axis.copy(), self.radius, self.halfAngle)
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        self.origin.transformBy(matrix)
+        self.axis.transformBy(matrix)
+        return True
+
+
+class NurbsSurface(ApiObject):
+    surfaceType = SurfaceTypes.NurbsSurfaceType
+
+    def __init__(self, origin: Point3D):
+        self.origin = origin
+
+    def copy(self) -> "NurbsSurface":
+        return NurbsSurface(self.origin.copy())
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        return self.origin.transformBy(matrix)
+
+
+class Line3D(ApiObject):
+    curveType = Curve3DTypes.Line3DCurveType
+
+    def __init__(self, startPoint: Point3D, endPoint: Point3D):
+        self.startPoint = startPoint
+        self.endPoint = endPoint
+
+    @staticmethod
+    def create(startPoint: Point3D, endPoint: Point3D) -> "Line3D":
+        return Line3D(startPoint.copy(), endPoint.copy())
+
+    def copy(self) -> "Line3D":
+        return Line3D(self.startPoint.copy(), self.endPoint.copy())
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        self.startPoint.transformBy(matrix)
+        return self.endPoint.transformBy(matrix)
+
+
+class InfiniteLine3D(ApiObject):
+    curveType = Curve3DTypes.InfiniteLine3DCurveType
+
+    def __init__(self, origin: Point3D, direction: Vector3D):
+        self.origin = origin
+        self.direction = direction
+
+    @staticmethod
+    def create(origin: Point3D, direction: Vector3D) -> "InfiniteLine3D":
+        return InfiniteLine3D(origin.copy(), direction.copy())
+
+    def copy(self) -> "InfiniteLine3D":
+        return InfiniteLine3D(self.origin.copy(), self.direction.copy())
+
+
+class Circle3D(ApiObject):
+    curveType = Curve3DTypes.Circle3DCurveType
+
+    def __init__(self, center: Point3D, normal: Vector3D, radius: float):
+        self.center = center
+        self.normal = normal
+        self.radius = radius
+
+    @staticmethod
+    def createByCenter(center: Point3D, normal: Vector3D, radius: float) -> "Circle3D":
+        return Circle3D(center.copy(), normal.copy(), radius)
+
+    def copy(self) -> "Circle3D":
+        return Circle3D(self.center.copy(), self.normal.copy(), self.radius)
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        self.center.transformBy(matrix)
+        return self.normal.transformBy(matrix)
+
+
+class Arc3D(ApiObject):
+    curveType = Curve3DTypes.Arc3DCurveType
+
+    def __init__(self, center: Point3D, normal: Vector3D, radius: float, startAngle: float, endAngle: float):
+        self.center = center
+        self.normal = normal
+        self.radius = radius
+        self.startAngle = startAngle
+        self.endAngle = endAngle
+
+    def copy(self) -> "Arc3D":
+        return Arc3D(self.center.copy(), self.normal.copy(), self.radius, self.startAngle, self.endAngle)
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        self.center.transformBy(matrix)
+        return self.normal.transformBy(matrix)
+
+
+class NurbsCurve3D(ApiObject):
+    curveType = Curve3DTypes.NurbsCurve3DCurveType
+
+    def __init__(self, points: list):
+        self.points = points
+
+    def copy(self) -> "NurbsCurve3D":
+        return NurbsCurve3D([p.copy() for p in self.points])
+
+    def transformBy(self, matrix: Matrix3D) -> bool:
+        for p in self.points:
+            p.transformBy(matrix)
+        return True
+
+
+############################################
+# Collections and values
+############################################
+
+
+class ObjectCollection(ApiObject):
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    @staticmethod
+    def create() -> "ObjectCollection":
+        return ObjectCollection()
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def add(self, item) -> bool:
+        self._items.append(item)
+        return True
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def contains(self, item) -> bool:
+        return any(i is item for i in self._items)
+
+    def find(self, item, startIndex: int = 0) -> int:
+        for index in range(startIndex, len(self._items)):
+            if self._items[index] is item:
+                return index
+        return -1
+
+    def removeByIndex(self, index: int) -> bool:
+        if 0 <= index < len(self._items):
+            del self._items[index]
+            return True
+        return False
+
+    def removeByItem(self, item) -> bool:
+        return self.removeByIndex(self.find(item))
+
+    def clear(self) -> bool:
+        self._items = []
+        return True
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int):
+        return self._items[index]
+
+
+class ReadOnlyCollection(ApiObject):
+    """
+    Base of the read only API collections (faces, edges, bodies, profiles, ...)
+    """
+
+    def __init__(self, items=None):
+        self._items = list(items or [])
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int):
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int):
+        return self._items[index]
+
+
+class ValueInput(ApiObject):
+    def __init__(self, valueType: int, value):
+        self.valueType = valueType
+        self._value = value
+
+    @staticmethod
+    def createByReal(value: float) -> "ValueInput":
+        return ValueInput(ValueTypes.RealValueType, value)
+
+    @staticmethod
+    def createByString(value: str) -> "ValueInput":
+        return ValueInput(ValueTypes.StringValueType, value)
+
+    @staticmethod
+    def createByObject(value) -> "ValueInput":
+        return ValueInput(ValueTypes.ObjectValueType, value)
+
+    @property
+    def realValue(self) -> float:
+        if self.valueType == ValueTypes.StringValueType:
+            # an expression, evaluated with the user parameters of the active design like Fusion does for the features
+            return Application.get().activeProduct.userParameters._evaluate(self._value)
+        return self._value if self.valueType == ValueTypes.RealValueType else 0.0
+
+    @property
+    def stringValue(self) -> str:
+        return self._value if self.valueType == ValueTypes.StringValueType else ""
+
+    @property
+    def objectValue(self):
+        return self._value if self.valueType == ValueTypes.ObjectValueType else None
+
+
+class Color(ApiObject):
+    def __init__(self, red: int, green: int, blue: int, opacity: int):
+        self.red = red
+        self.green = green
+        self.blue = blue
+        self.opacity = opacity
+
+    @staticmethod
+    def create(red: int, green: int, blue: int, opacity: int) -> "Color":
+        return Color(red, green, blue, opacity)
+
+
+class Property(ApiObject):
+    def __init__(self, name: str, value=None):
+        self._name = name
+        self._value = value
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+
+
+class ColorProperty(Property):
+    pass
+
+
+class Properties(ReadOnlyCollection):
+    def itemByName(self, name: str) -> Property:
+        return next((p for p in self._items if p.name == name), None)
+
+    def itemById(self, id: str) -> Property:
+        return self.itemByName(id)
+
+
+class Appearance(ApiObject):
+    def __init__(self, name: str):
+        self._name = name
+        self.appearanceProperties = Properties([ColorProperty("Color", Color(255, 255, 255, 0))])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+
+class Appearances(ReadOnlyCollection):
+    def itemByName(self, name: str) -> Appearance:
+        return next((a for a in self._items if a.name == name), None)
+
+    def addByCopy(self, appearanceToCopy: Appearance, name: str) -> Appearance:
+        appearance = Appearance(name)
+        self._items.append(appearance)
+        return appearance
+
+
+class MaterialLibrary(ApiObject):
+    def __init__(self, name: str):
+        self.name = name
+        self.appearances = Appearances([Appearance("Oak")])
+
+
+class MaterialLibraries(ReadOnlyCollection):
+    def itemByName(self, name: str) -> MaterialLibrary:
+        return next((m for m in self._items if m.name == name), None)
+
+
+############################################
+# Events
+############################################
+
+
+class EventHandler(ApiObject):
+    def notify(self, args):
+        pass
+
+
+class CommandCreatedEventHandler(EventHandler):
+    pass
+
+
+class CommandEventHandler(EventHandler):
+    pass
+
+
+class InputChangedEventHandler(EventHandler):
+    pass
+
+
+class ValidateInputsEventHandler(EventHandler):
+    pass
+
+
+class Event(ApiObject):
+    """
+    Base of the events. The handler type is read by futil.add_handler from the annotation of add().
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._handlers = []
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @fakeOnly
+    def fire(self, args):
+        """
+        Notifies all the handlers, the way Fusion does when the event happens.
+        """
+        # the calls made by the handlers are made by the add-in, even when the event is fired from a fake call
+        depth, RECORDER.depth = RECORDER.depth, 0
+        try:
+            for handler in list(self._handlers):
+                handler.notify(args)
+        finally:
+            RECORDER.depth = depth
+        return args
+
+    def remove(self, handler) -> bool:
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+            return True
+        return False
+
+
+class CommandCreatedEvent(Event):
+    def add(self, handler: "CommandCreatedEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class CommandEvent(Event):
+    def add(self, handler: "CommandEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class InputChangedEvent(Event):
+    def add(self, handler: "InputChangedEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class ValidateInputsEvent(Event):
+    def add(self, handler: "ValidateInputsEventHandler") -> bool:
+        self._handlers.append(handler)
+        return True
+
+
+class EventArgs(ApiObject):
+    def __init__(self, firingEvent: Event = None):
+        self.firingEvent = firingEvent
+
+
+class CommandCreatedEventArgs(EventArgs):
+    def __init__(self, command: "Command", firingEvent: Event = None):
+        super().__init__(firingEvent)
+        self.command = command
+
+
+class CommandEventArgs(EventArgs):
+    def __init__(self, command: "Command", firingEvent: Event = None):
+        super().__init__(firingEvent)
+        self.command = command
+        self.isValidResult = False
+        self.executeFailed = False
+        self.executeFailedMessage = ""
+
+
+class InputChangedEventArgs(EventArgs):
+    def __init__(self, input: "CommandInput", inputs: "CommandInputs", firingEvent: Event = None):
+        super().__init__(firingEvent)
+        self.input = input
+        self.inputs = inputs
+
+
+class ValidateInputsEventArgs(EventArgs):
+    def __init__(self, inputs: "CommandInputs", firingEvent: Event = None):
+        super().__init__(firingEvent)
+        self.inputs = inputs
+        self.areInputsValid = True
+
+
+############################################
+# Command inputs
+############################################
+
+
+class CommandInput(ApiObject):
+    def __init__(self, commandInputs: "CommandInputs", id: str, name: str):
+        self._id = id
+        self._name = name
+        self._commandInputs = commandInputs
+        self.isVisible = True
+        self.isEnabled = True
+        self.isFullWidth = False
+        self.tooltip = ""
+        self.tooltipDescription = ""
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def commandInputs(self) -> "CommandInputs":
+        return self._commandInputs
+
+    @property
+    def parentCommandInput(self) -> "CommandInput":
+        return self._commandInputs._parentInput
+
+    @property
+    def parentCommand(self) -> "Command":
+        return self._commandInputs.command
+
+    def deleteMe(self) -> bool:
+        self._commandInputs._remove(self)
+        return True
+
+
+class BoolValueCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, isCheckBox: bool, resourceFolder: str, initialValue: bool):
+        super().__init__(commandInputs, id, name)
+        self.isCheckBox = isCheckBox
+        self.resourceFolder = resourceFolder
+        self._value = initialValue
+
+    @property
+    def value(self) -> bool:
+        return self._value
+
+    @value.setter
+    def value(self, value: bool):
+        self._value = value
+
+
+class IntegerSpinnerCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, minimumValue: int, maximumValue: int, spinStep: int, initialValue: int):
+        super().__init__(commandInputs, id, name)
+        self.minimumValue = minimumValue
+        self.maximumValue = maximumValue
+        self.spinStep = spinStep
+        self._value = initialValue
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @value.setter
+    def value(self, value: int):
+        self._value = value
+
+
+class FloatSpinnerCommandInput(CommandInput):
+    def __init__(
+        self, commandInputs, id, name, unitType: str, minimumValue: float, maximumValue: float, spinStep: float, initialValue: float
+    ):
+        super().__init__(commandInputs, id, name)
+        self.unitType = unitType
+        self.minimumValue = minimumValue
+        self.maximumValue = maximumValue
+        self.spinStep = spinStep
+        self._value = initialValue
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        self._value = value
+
+
+class ValueCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, unitType: str, initialValue: ValueInput):
+        super().__init__(commandInputs, id, name)
+        self.unitType = unitType
+        self._value = initialValue.realValue
+        self.minimumValue = None
+        self.maximumValue = None
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        self._value = value
+
+    @property
+    def expression(self) -> str:
+        return f"{self._value:g}"
+
+    @expression.setter
+    def expression(self, expression: str):
+        self._value = float(expression.split()[0])
+
+    @property
+    def isValidExpression(self) -> bool:
+        return True
+
+
+class StringValueCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, initialValue: str):
+        super().__init__(commandInputs, id, name)
+        self._value = initialValue
+        self.isReadOnly = False
+        self.isPassword = False
+
+    @property
+    def value(self) -> str:
+        return self._value
+
+    @value.setter
+    def value(self, value: str):
+        self._value = value
+
+
+class TextBoxCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, formattedText: str, numRows: int, isReadOnly: bool):
+        super().__init__(commandInputs, id, name)
+        self._text = formattedText
+        self.numRows = numRows
+        self.isReadOnly = isReadOnly
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        self._text = value
+
+    @property
+    def formattedText(self) -> str:
+        return self._text
+
+    @formattedText.setter
+    def formattedText(self, value: str):
+        self._text = value
+
+
+class ListItem(ApiObject):
+    def __init__(self, listItems: "ListItems", name: str, isSelected: bool, icon: str):
+        self._listItems = listItems
+        self._name = name
+        self._isSelected = isSelected
+        self.icon = icon
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def index(self) -> int:
+        return self._listItems._items.index(self)
+
+    @property
+    def isSelected(self) -> bool:
+        return self._isSelected
+
+    @isSelected.setter
+    def isSelected(self, value: bool):
+        if value:
+            # single selection drop down
+            for item in self._listItems._items:
+                item._isSelected = False
+        self._isSelected = value
+
+    def deleteMe(self) -> bool:
+        self._listItems._items.remove(self)
+        return True
+
+
+class ListItems(ReadOnlyCollection):
+    def add(self, name: str, isSelected: bool, icon: str = "", beforeIndex: int = -1) -> ListItem:
+        item = ListItem(self, name, False, icon)
+        if beforeIndex < 0:
+            self._items.append(item)
+        else:
+            self._items.insert(beforeIndex, item)
+        if isSelected:
+            item._isSelected = True
+            for other in self._items:
+                if other is not item:
+                    other._isSelected = False
+        return item
+
+    def addSeparator(self, beforeIndex: int = -1) -> bool:
+        return True
+
+    def clear(self) -> bool:
+        self._items = []
+        return True
+
+
+class DropDownCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, dropDownStyle: int):
+        super().__init__(commandInputs, id, name)
+        self.dropDownStyle = dropDownStyle
+        self.listItems = ListItems()
+        self.maxVisibleItems = 10
+
+    @property
+    def selectedItem(self) -> ListItem:
+        return next((i for i in self.listItems if i.isSelected), None)
+
+
+class GroupCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name):
+        super().__init__(commandInputs, id, name)
+        self.children = CommandInputs(commandInputs.command, self)
+        self.isExpanded = True
+        self.isEnabledCheckBoxDisplayed = False
+
+
+class TableCommandInput(CommandInput):
+    def __init__(self, commandInputs, id, name, numberOfColumns: int, columnRatio: str):
+        super().__init__(commandInputs, id, name)
+        self.numberOfColumns = numberOfColumns
+        self.columnRatio = columnRatio
+        self.maximumVisibleRows = 4
+        self.minimumVisibleRows = 2
+        self._table = CommandInputs(commandInputs.command, self)
+        self._cells = {}
+        self._toolbarInputs = []
+
+    @property
+    def commandInputs(self) -> "CommandInputs":
+        # the inputs added in a table are created from its own collection
+        return self._table
+
+    @property
+    def rowCount(self) -> int:
+        return max((r for r, _ in self._cells), default=-1) + 1
+
+    def addCommandInput(self, input: CommandInput, row: int, column: int, rowSpan: int = 0, columnSpan: int = 0) -> bool:
+        self._cells[(row, column)] = input
+        return True
+
+    def addToolbarCommandInput(self, input: CommandInput) -> bool:
+        self._toolbarInputs.append(input)
+        return True
+
+    def getInputAtPosition(self, row: int, column: int) -> CommandInput:
+        return self._cells.get((row, column))
+
+    def deleteRow(self, row: int) -> bool:
+        for (r, c), input in list(self._cells.items()):
+            if r == row:
+                del self._cells[(r, c)]
+                self._table._remove(input)
+        self._cells = {(r - 1 if r > row else r, c): i for (r, c), i in self._cells.items()}
+        return True
+
+    def clear(self) -> bool:
+        for input in self._cells.values():
+            self._table._remove(input)
+        self._cells = {}
+        return True
+
+
+class CommandInputs(ApiObject):
+    """
+    The inputs of a command or of a group. itemById finds the inputs of the whole sub tree.
+    """
+
+    def __init__(self, command: "Command", parentInput: CommandInput = None):
+        self.command = command
+        self._parentInput = parentInput
+        self._items = []
+
+    @property
+    def count(self) -> int:
+        return len(self._items)
+
+    def item(self, index: int) -> CommandInput:
+        return self._items[index] if 0 <= index < len(self._items) else None
+
+    def itemById(self, id: str) -> CommandInput:
+        for input in self._items:
+            if input.id == id:
+                return input
+        for input in self._items:
+            children = input.children if isinstance(input, GroupCommandInput) else getattr(input, "_table", None)
+            found = children.itemById(id) if children is not None else None
+            if found is not None:
+                return found
+        return None
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def _add(self, input: CommandInput) -> CommandInput:
+        self._items.append(input)
+        return input
+
+    def _remove(self, input: CommandInput):
+        if input in self._items:
+            self._items.remove(input)
+
+    def addGroupCommandInput(self, id: str, name: str) -> GroupCommandInput:
+        return self._add(GroupCommandInput(self, id, name))
+
+    def addBoolValueInput(self, id: str, name: str, isCheckBox: bool, resourceFolder: str = "", initialValue: bool = False):
+        return self._add(BoolValueCommandInput(self, id, name, isCheckBox, resourceFolder, initialValue))
+
+    def addIntegerSpinnerCommandInput(self, id: str, name: str, min: int, max: int, spinStep: int, initialValue: int):
+        return self._add(IntegerSpinnerCommandInput(self, id, name, min, max, spinStep, initialValue))
+
+    def addFloatSpinnerCommandInput(self, id: str, name: str, unitType: str, min: float, max: float, spinStep: float, initialValue: float):
+        return self._add(FloatSpinnerCommandInput(self, id, name, unitType, min, max, spinStep, initialValue))
+
+    def addValueInput(self, id: str, name: str, unitType: str, initialValue: ValueInput) -> ValueCommandInput:
+        return self._add(ValueCommandInput(self, id, name, unitType, initialValue))
+
+    def addStringValueInput(self, id: str, name: str, initialValue: str = "") -> StringValueCommandInput:
+        return self._add(StringValueCommandInput(self, id, name, initialValue))
+
+    def addTextBoxCommandInput(self, id: str, name: str, formattedText: str, numRows: int, isReadOnly: bool) -> TextBoxCommandInput:
+        return self._add(TextBoxCommandInput(self, id, name, formattedText, numRows, isReadOnly))
+
+    def addDropDownCommandInput(self, id: str, name: str, dropDownStyle: int) -> DropDownCommandInput:
+        return self._add(DropDownCommandInput(self, id, name, dropDownStyle))
+
+    def addTableCommandInput(self, id: str, name: str, numberOfColumns: int, columnRatio: str) -> TableCommandInput:
+        return self._add(TableCommandInput(self, id, name, numberOfColumns, columnRatio))
+
+
+############################################
+# Commands and user interface
+############################################
+
+
+class Command(ApiObject):
+    def __init__(self, commandDefinition: "CommandDefinition"):
+        self.parentCommandDefinition = commandDefinition
+        self.commandInputs = CommandInputs(self)
+        self.execute = CommandEvent("execute")
+        self.executePreview = CommandEvent("executePreview")
+        self.destroy = CommandEvent("destroy")
+        self.activate = CommandEvent("activate")
+        self.deactivate = CommandEvent("deactivate")
+        self.inputChanged = InputChangedEvent("inputChanged")
+        self.validateInputs = ValidateInputsEvent("validateInputs")
+        self.isOKButtonVisible = True
+        self.okButtonText = "OK"
+        self.isExecutedWhenPreEmpted = True
+        self.dialogSize = None
+
+    def setDialogInitialSize(self, width: int, height: int) -> bool:
+        self.dialogSize = (width, height)
+        return True
+
+    def setDialogMinimumSize(self, width: int, height: int) -> bool:
+        return True
+
+    def doExecute(self, terminate: bool) -> bool:
+        self.simulateExecute()
+        return True
+
+    @fakeOnly
+    def simulateInputChanged(self, input: CommandInput) -> InputChangedEventArgs:
+        """
+        Fires inputChanged the way the dialog does after the user changed an input.
+        """
+        return self.inputChanged.fire(InputChangedEventArgs(input, input.commandInputs, self.inputChanged))
+
+    @fakeOnly
+    def simulateValidate(self) -> ValidateInputsEventArgs:
+        return self.validateInputs.fire(ValidateInputsEventArgs(self.commandInputs, self.validateInputs))
+
+    @fakeOnly
+    def simulatePreview(self) -> CommandEventArgs:
+        return self.executePreview.fire(CommandEventArgs(self, self.executePreview))
+
+    @fakeOnly
+    def simulateExecute(self) -> CommandEventArgs:
+        return self.execute.fire(CommandEventArgs(self, self.execute))
+
+    @fakeOnly
+    def simulateDestroy(self) -> CommandEventArgs:
+        return self.destroy.fire(CommandEventArgs(self, self.destroy))
+
+
+class CommandDefinition(ApiObject):
+    def __init__(self, commandDefinitions: "CommandDefinitions", id: str, name: str, tooltip: str, resourceFolder: str):
+        self._commandDefinitions = commandDefinitions
+        self._id = id
+        self._name = name
+        self.tooltip = tooltip
+        self.resourceFolder = resourceFolder
+        self.commandCreated = CommandCreatedEvent("commandCreated")
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def execute(self, input=None) -> bool:
+        """
+        Runs the command without dialog: created, then execute and destroy.
+        """
+        command = self.simulateCreated()
+        command.simulateExecute()
+        command.simulateDestroy()
+        return True
+
+    def deleteMe(self) -> bool:
+        self._commandDefinitions._items.remove(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+    @fakeOnly
+    def simulateCreated(self) -> Command:
+        """
+        Creates the command and fires commandCreated, the way Fusion does when the user clicks the button.
+        The dialog then stays "open" until simulateExecute/simulateDestroy are called on the returned command.
+        """
+        command = Command(self)
+        self.commandCreated.fire(CommandCreatedEventArgs(command, self.commandCreated))
+        return command
+
+
+class CommandDefinitions(ReadOnlyCollection):
+    def addButtonDefinition(self, id: str, name: str, tooltip: str, resourceFolder: str = "") -> CommandDefinition:
+        if self.itemById(id) is not None:
+            raise RuntimeError(f"3 : A command definition with the id '{id}' already exists")
+        commandDefinition = CommandDefinition(self, id, name, tooltip, resourceFolder)
+        self._items.append(commandDefinition)
+        return commandDefinition
+
+    def itemById(self, id: str) -> CommandDefinition:
+        return next((c for c in self._items if c.id == id), None)
+
+
+class CommandControl(ApiObject):
+    def __init__(self, controls: "ToolbarControls", commandDefinition: CommandDefinition):
+        self._controls = controls
+        self.commandDefinition = commandDefinition
+        self.isPromoted = False
+        self.isPromotedByDefault = False
+        self.isVisible = True
+
+    @property
+    def id(self) -> str:
+        return self.commandDefinition.id
+
+    def deleteMe(self) -> bool:
+        self._controls._items.remove(self)
+        return True
+
+
+class ToolbarControls(ReadOnlyCollection):
+    def addCommand(self, commandDefinition: CommandDefinition, positionID: str = "", isBefore: bool = False) -> CommandControl:
+        control = CommandControl(self, commandDefinition)
+        self._items.append(control)
+        return control
+
+    def itemById(self, id: str) -> CommandControl:
+        return next((c for c in self._items if c.id == id), None)
+
+
+class ToolbarPanel(ApiObject):
+    def __init__(self, id: str):
+        self.id = id
+        self.controls = ToolbarControls()
+
+
+class ToolbarPanels(ReadOnlyCollection):
+    def itemById(self, id: str) -> ToolbarPanel:
+        panel = next((p for p in self._items if p.id == id), None)
+        if panel is None:
+            # every panel exists in the fake
+            panel = ToolbarPanel(id)
+            self._items.append(panel)
+        return panel
+
+
+class Workspace(ApiObject):
+    def __init__(self, id: str):
+        self.id = id
+        self.toolbarPanels = ToolbarPanels()
+
+
+class Workspaces(ReadOnlyCollection):
+    def itemById(self, id: str) -> Workspace:
+        workspace = next((w for w in self._items if w.id == id), None)
+        if workspace is None:
+            workspace = Workspace(id)
+            self._items.append(workspace)
+        return workspace
+
+
+class FolderDialog(ApiObject):
+    def __init__(self):
+        self.title = ""
+        self.isMultiSelectEnabled = False
+        self.initialDirectory = ""
+        self.folder = ""
+
+    def showDialog(self) -> int:
+        return DialogResults.DialogOK if self.folder else DialogResults.DialogCancel
+
+
+class UserInterface(ApiObject):
+    def __init__(self):
+        self.commandDefinitions = CommandDefinitions()
+        self.workspaces = Workspaces()
+        self.messages = []
+
+    def messageBox(self, text: str, title: str = "", buttons: int = 0, icon: int = 0) -> int:
+        self.messages.append(text)
+        return DialogResults.DialogOK
+
+    def createFolderDialog(self) -> FolderDialog:
+        return FolderDialog()
+
+
+class Document(ApiObject):
+    def __init__(self, documents: "Documents", product):
+        self._documents = documents
+        self._product = product
+
+    @property
+    def design(self):
+        return self._product
+
+    @property
+    def isActive(self) -> bool:
+        return Application.get().activeProduct is self._product
+
+    def activate(self) -> bool:
+        Application.get().activeProduct = self._product
+        return True
+
+    def close(self, saveChanges: bool) -> bool:
+        if self in self._documents._items:
+            self._documents._items.remove(self)
+        return True
+
+
+class Documents(ReadOnlyCollection):
+    def add(self, documentType: int, visible: bool = True, options=None) -> Document:
+        # the fusion module depends on this one, not the other way around
+        from .fusion import Design
+
+        document = Document(self, Design())
+        self._items.append(document)
+        document.activate()
+        return document
+
+    def _documentOf(self, product) -> Document:
+        document = next((d for d in self._items if d._product is product), None)
+        if document is None:
+            document = Document(self, product)
+            self._items.append(document)
+        return document
+
+
+class Application(ApiObject):
+    _instance = None
+
+    def __init__(self):
+        self.userInterface = UserInterface()
+        self.materialLibraries = MaterialLibraries([MaterialLibrary(f"Library {i}") for i in range(4)])
+        self.documents = Documents()
+        self.logs = []
+        self._activeProduct = None
+
+    @property
+    def activeDocument(self) -> Document:
+        return self.documents._documentOf(self.activeProduct)
+
+    @staticmethod
+    def get() -> "Application":
+        if Application._instance is None:
+            Application._instance = Application()
+        return Application._instance
+
+    @property
+    def activeProduct(self):
+        if self._activeProduct is None:
+            # the fusion module depends on this one, not the other way around
+            from .fusion import Design
+
+            self._activeProduct = Design()
+        return self._activeProduct
+
+    @activeProduct.setter
+    def activeProduct(self, product):
+        self._activeProduct = product
+
+    def log(self, message: str, level: int = LogLevels.InfoLogLevel, type: int = LogTypes.ConsoleLogType) -> bool:
+        self.logs.append((level, type, message))
+        return True
@@ -0,0 +1,2848 @@
+import math
+import os
+
+from .core import (
+    Appearances,
+    Arc3D,
+    BoundingBox3D,
+    Circle3D,
+    Cone,
+    Cylinder,
+    InfiniteLine3D,
+    Line3D,
+    Matrix3D,
+    NurbsCurve3D,
+    NurbsSurface,
+    ObjectCollection,
+    Plane,
+    Point3D,
+    ReadOnlyCollection,
+    ValueInput,
+    Vector3D,
+)
+from .recorder import ApiObject, fakeOnly
+
+# Stand-in for adsk.fusion. The B-rep is "geometry-lite": features create faces and edges with the right type,
+# position, area and length, which is what the generators select on, but the booleans don't compute intersections.
+# A join, cut or split only attaches or moves faces between the bodies whose bounding boxes overlap the tool.
+
+# Tolerance used to merge the sketch points into loops
+SKETCH_TOLERANCE = 1e-4
+
+# Number of points used to sample the circles and arcs
+CURVE_SAMPLES = 24
+
+
+class FeatureOperations:
+    JoinFeatureOperation = 0
+    CutFeatureOperation = 1
+    IntersectFeatureOperation = 2
+    NewBodyFeatureOperation = 3
+    NewComponentFeatureOperation = 4
+
+
+class PatternDistanceType:
+    ExtentPatternDistanceType = 0
+    SpacingPatternDistanceType = 1
+
+
+class TextStyles:
+    TextStyleBold = 1
+    TextStyleItalic = 2
+    TextStyleUnderline = 4
+
+
+class FeatureHealthStates:
+    HealthyFeatureHealthState = 0
+    WarningFeatureHealthState = 1
+    ErrorFeatureHealthState = 2
+    UnknownFeatureHealthState = 3
+
+
+class DesignTypes:
+    DirectDesignType = 0
+    ParametricDesignType = 1
+
+
+class MeshRefinementSettings:
+    MeshRefinementHigh = 0
+    MeshRefinementMedium = 1
+    MeshRefinementLow = 2
+    MeshRefinementCustom = 3
+
+
+class TriangleMeshQualityOptions:
+    LowQualityTriangleMesh = 8
+    NormalQualityTriangleMesh = 11
+    HighQualityTriangleMesh = 13
+    VeryHighQualityTriangleMesh = 15
+
+
+############################################
+# Vector helpers, on (x, y, z) tuples
+############################################
+
+
+def _add(a: tuple, b: tuple) -> tuple:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def _sub(a: tuple, b: tuple) -> tuple:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
+
+
+def _scale(a: tuple, s: float) -> tuple:
+    return (a[0] * s, a[1] * s, a[2] * s)
+
+
+def _dot(a: tuple, b: tuple) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a: tuple, b: tuple) -> tuple:
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+def _norm(a: tuple) -> float:
+    return math.sqrt(_dot(a, a))
+
+
+def _unit(a: tuple) -> tuple:
+    length = _norm(a)
+    return _scale(a, 1 / length) if length > 1e-12 else (0.0, 0.0, 0.0)
+
+
+def _point(a: tuple) -> Point3D:
+    return Point3D(*a)
+
+
+def _vector(a: tuple) -> Vector3D:
+    return Vector3D(*a)
+
+
+def _polylineLength(points: list) -> float:
+    return sum(math.dist(a, b) for a, b in zip(points, points[1:]))
+
+
+def _xyz(value) -> tuple:
+    """
+    Sketch space coordinates of a Point3D or a SketchPoint.
+    """
+    if isinstance(value, SketchPoint):
+        value = value.geometry
+    return (value.x, value.y, value.z)
+
+
+############################################
+# B-rep
+############################################
+
+
+class BRepVertex(ApiObject):
+    def __init__(self, point: tuple):
+        self._point = point
+
+    @property
+    def geometry(self) -> Point3D:
+        return _point(self._point)
+
+
+class BRepEdge(ApiObject):
+    """
+    An edge, its points are sampled in world space
+    """
+
+    def __init__(self, kind: str, points: list, length: float = None, closed: bool = False):
+        self._kind = kind
+        self._points = points
+        self._length = _polylineLength(points + ([points[0]] if closed else [])) if length is None else length
+        self._closed = closed
+        self._faces = []
+        self._body = None
+
+    @property
+    def length(self) -> float:
+        return self._length
+
+    @property
+    def pointOnEdge(self) -> Point3D:
+        return _point(self._points[len(self._points) // 2])
+
+    @property
+    def isDegenerate(self) -> bool:
+        return self._length < 1e-9
+
+    @property
+    def geometry(self):
+        if self._kind == "line":
+            return Line3D(_point(self._points[0]), _point(self._points[-1]))
+        if self._kind == "circle":
+            center = _scale(tuple(map(sum, zip(*self._points))), 1 / len(self._points))
+            return Circle3D(_point(center), Vector3D(0, 0, 1), math.dist(center, self._points[0]))
+        return NurbsCurve3D([_point(p) for p in self._points])
+
+    @property
+    def faces(self) -> "BRepFaces":
+        return BRepFaces(self._faces)
+
+    @property
+    def body(self) -> "BRepBody":
+        return self._faces[0]._body if self._faces else None
+
+    @property
+    def startVertex(self) -> BRepVertex:
+        return BRepVertex(self._points[0])
+
+    @property
+    def endVertex(self) -> BRepVertex:
+        return BRepVertex(self._points[-1])
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.ofPoints(self._points)
+
+    def _transformed(self, matrix: Matrix3D) -> "BRepEdge":
+        return BRepEdge(self._kind, [matrix._apply(p, 1.0) for p in self._points], self._length, self._closed)
+
+
+class BRepEdges(ReadOnlyCollection):
+    pass
+
+
+class BRepFace(ApiObject):
+    """
+    A face, with its analytic geometry, its area and its edges
+    """
+
+    def __init__(self, geometry, area: float, pointOnFace: tuple, edges: list):
+        self._geometry = geometry
+        self._area = area
+        self._pointOnFace = pointOnFace
+        self._edges = []
+        self._body = None
+        for edge in edges:
+            self._addEdge(edge)
+
+    def _addEdge(self, edge: BRepEdge):
+        if edge not in self._edges:
+            self._edges.append(edge)
+            edge._faces.append(self)
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def area(self) -> float:
+        return self._area
+
+    @property
+    def pointOnFace(self) -> Point3D:
+        return _point(self._pointOnFace)
+
+    @property
+    def edges(self) -> BRepEdges:
+        return BRepEdges(self._edges)
+
+    @property
+    def body(self) -> "BRepBody":
+        return self._body
+
+    @property
+    def isParamReversed(self) -> bool:
+        return False
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        points = [p for e in self._edges for p in e._points] or [self._pointOnFace]
+        return BoundingBox3D.ofPoints(points)
+
+    def _transformed(self, matrix: Matrix3D, edgeMap: dict) -> "BRepFace":
+        geometry = self._geometry.copy()
+        geometry.transformBy(matrix)
+        edges = []
+        for edge in self._edges:
+            if edge not in edgeMap:
+                edgeMap[edge] = edge._transformed(matrix)
+            edges.append(edgeMap[edge])
+        return BRepFace(geometry, self._area, matrix._apply(self._pointOnFace, 1.0), edges)
+
+
+class BRepFaces(ReadOnlyCollection):
+    pass
+
+
+class BRepBody(ApiObject):
+    def __init__(self, component: "Component", name: str):
+        self._component = component
+        self._name = name
+        self._faces = []
+        self._volume = 0.0
+        # [faces, volume] of the tool bodies the body is made of, a cut only removes material from the ones it reaches
+        self._pieces = []
+        self.isVisible = True
+        self.isLightBulbOn = True
+        self.isSelectable = True
+        self.appearance = None
+        self.material = None
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def parentComponent(self) -> "Component":
+        return self._component
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(self._faces)
+
+    @property
+    def edges(self) -> BRepEdges:
+        edges = []
+        seen = set()
+        for face in self._faces:
+            for edge in face._edges:
+                if id(edge) not in seen:
+                    seen.add(id(edge))
+                    edges.append(edge)
+        return BRepEdges(edges)
+
+    @property
+    def vertices(self) -> ReadOnlyCollection:
+        return ReadOnlyCollection([e.startVertex for e in self.edges])
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    @property
+    def area(self) -> float:
+        return sum(f.area for f in self._faces)
+
+    @property
+    def isSolid(self) -> bool:
+        return True
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        box = None
+        for face in self._faces:
+            if box is None:
+                box = face.boundingBox
+            else:
+                box.combine(face.boundingBox)
+        return box or BoundingBox3D(Point3D(), Point3D())
+
+    @property
+    def meshManager(self) -> "MeshManager":
+        return MeshManager(self)
+
+    @property
+    def physicalProperties(self) -> "PhysicalProperties":
+        return PhysicalProperties(self._volume, self.area)
+
+    def deleteMe(self) -> bool:
+        self._component._removeBody(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+    def _addFaces(self, faces: list):
+        for face in faces:
+            face._body = self
+            self._faces.append(face)
+
+    def _addPiece(self, faces: list, volume: float):
+        if self._volume > 0 and not self._pieces:
+            self._resetPieces()
+        self._pieces.append([list(faces), volume])
+        self._volume += volume
+
+    def _join(self, other: "BRepBody"):
+        if self._volume > 0 and not self._pieces:
+            self._resetPieces()
+        self._addFaces(other._faces)
+        self._pieces.extend(other._pieces or [[list(other._faces), other._volume]])
+        self._volume += other._volume
+
+    def _setVolume(self, volume: float):
+        # the pieces keep their share of the material
+        ratio = volume / self._volume if self._volume > 0 else 0.0
+        for piece in self._pieces:
+            piece[1] *= ratio
+        self._volume = volume
+
+    def _resetPieces(self):
+        self._pieces = [[list(self._faces), self._volume]]
+
+    def _cut(self, toolBox: BoundingBox3D, toolVolume: float):
+        """
+        Removes the material of a cutting tool. A piece loses the part of the tool box inside its own box, at most its
+        volume, so a tool only touching a piece, like a cutter on the top face of a part, removes nothing from it.
+        """
+        pieces = self._pieces or [[list(self._faces), self._volume]]
+        removed = [min(volume, toolVolume * _overlapRatio(toolBox, _facesBox(faces))) if faces else 0.0 for faces, volume in pieces]
+        # overlapping pieces don't lose the same material twice
+        total = min(sum(removed), toolVolume * _overlapRatio(toolBox, self.boundingBox))
+        scale = total / sum(removed) if sum(removed) > 0 else 0.0
+        for piece, amount in zip(pieces, removed):
+            piece[1] = max(0.0, piece[1] - amount * scale)
+        self._pieces = pieces
+        self._volume = max(0.0, self._volume - total)
+
+    def _mappedPieces(self, faces: list) -> list:
+        # the pieces on the transformed faces, in the order of the faces of the body
+        mapped = {id(face): transformed for face, transformed in zip(self._faces, faces)}
+        return [[[mapped[id(f)] for f in pieceFaces if id(f) in mapped], volume] for pieceFaces, volume in self._pieces]
+
+    def _copy(self, matrix: Matrix3D, component: "Component" = None) -> "BRepBody":
+        component = component or self._component
+        body = component._newBody()
+        edgeMap = {}
+        faces = [f._transformed(matrix, edgeMap) for f in self._faces]
+        body._addFaces(faces)
+        body._pieces = self._mappedPieces(faces)
+        body._volume = self._volume
+        body.isVisible = self.isVisible
+        return body
+
+    def copyToComponent(self, target) -> "BRepBody":
+        component = target.component if isinstance(target, Occurrence) else target
+        body = self._copy(Matrix3D.create(), component)
+        body.name = self._name
+        return body
+
+    def _transform(self, matrix: Matrix3D):
+        edgeMap = {}
+        faces = [f._transformed(matrix, edgeMap) for f in self._faces]
+        self._pieces = self._mappedPieces(faces)
+        self._faces = []
+        self._addFaces(faces)
+
+
+class BRepBodies(ReadOnlyCollection):
+    def itemByName(self, name: str) -> BRepBody:
+        return next((b for b in self._items if b.name == name), None)
+
+
+class TriangleMesh(ApiObject):
+    """
+    The mesh of a body is the mesh of its bounding box, 8 nodes and 12 triangles.
+    """
+
+    # the triangles of the box, on the corner indices (x, y, z bits)
+    _BOX_TRIANGLES = (0, 2, 1, 1, 2, 3, 4, 5, 6, 5, 7, 6, 0, 1, 4, 1, 5, 4, 2, 6, 3, 3, 6, 7, 0, 4, 2, 2, 4, 6, 1, 3, 5, 3, 7, 5)
+
+    def __init__(self, box: BoundingBox3D):
+        low, high = box.minPoint.asArray(), box.maxPoint.asArray()
+        self._coordinates = [high[axis] if corner >> axis & 1 else low[axis] for corner in range(8) for axis in range(3)]
+
+    @property
+    def nodeCoordinatesAsDouble(self) -> list:
+        return list(self._coordinates)
+
+    @property
+    def nodeIndices(self) -> list:
+        return list(self._BOX_TRIANGLES)
+
+    @property
+    def normalVectorsAsDouble(self) -> list:
+        # a normal per node, along the diagonal of the box through its corner
+        return [(1.0 if corner >> axis & 1 else -1.0) / math.sqrt(3) for corner in range(8) for axis in range(3)]
+
+    @property
+    def normalIndices(self) -> list:
+        return list(self._BOX_TRIANGLES)
+
+    @property
+    def nodeCount(self) -> int:
+        return 8
+
+    @property
+    def triangleCount(self) -> int:
+        return 12
+
+
+class TriangleMeshCalculator(ApiObject):
+    def __init__(self, body: "BRepBody"):
+        self._body = body
+        self.surfaceTolerance = 0.0
+
+    def setQuality(self, quality: int) -> bool:
+        return True
+
+    def calculate(self) -> TriangleMesh:
+        return TriangleMesh(self._body.boundingBox)
+
+
+class MeshManager(ApiObject):
+    def __init__(self, body: "BRepBody"):
+        self._body = body
+
+    def createMeshCalculator(self) -> TriangleMeshCalculator:
+        return TriangleMeshCalculator(self._body)
+
+
+class CustomGraphicsCoordinates(ApiObject):
+    def __init__(self, coordinates: list):
+        self.coordinateCount = len(coordinates) // 3
+        self._coordinates = list(coordinates)
+
+    @staticmethod
+    def create(coordinates: list) -> "CustomGraphicsCoordinates":
+        return CustomGraphicsCoordinates(coordinates)
+
+
+class CustomGraphicsMesh(ApiObject):
+    def __init__(self, group: "CustomGraphicsGroup", coordinates: CustomGraphicsCoordinates, indexList: list):
+        self._group = group
+        self.coordinates = coordinates
+        self.nodeIndexList = list(indexList)
+        self.transform = Matrix3D.create()
+        self.isVisible = True
+
+    def deleteMe(self) -> bool:
+        self._group._items.remove(self)
+        return True
+
+
+class CustomGraphicsGroup(ReadOnlyCollection):
+    def __init__(self, groups: "CustomGraphicsGroups"):
+        super().__init__([])
+        self._groups = groups
+
+    def addMesh(self, coordinates: CustomGraphicsCoordinates, coordinateIndexList: list, normalVectors: list, normalIndexList: list):
+        mesh = CustomGraphicsMesh(self, coordinates, coordinateIndexList)
+        self._items.append(mesh)
+        return mesh
+
+    def deleteMe(self) -> bool:
+        self._groups._items.remove(self)
+        return True
+
+
+class CustomGraphicsGroups(ReadOnlyCollection):
+    def add(self) -> CustomGraphicsGroup:
+        group = CustomGraphicsGroup(self)
+        self._items.append(group)
+        return group
+
+
+class PhysicalProperties(ApiObject):
+    def __init__(self, volume: float, area: float):
+        self.volume = volume
+        self.area = area
+        self.mass = volume
+
+
+############################################
+# Construction geometry
+############################################
+
+
+class ConstructionPlaneInput(ApiObject):
+    def __init__(self):
+        self._plane = None
+        self._definition = None
+
+    def setByOffset(self, planarEntity, offset: ValueInput) -> bool:
+        plane = _planeOf(planarEntity)
+        origin = _add(plane.origin.asArray(), _scale(plane.normal.asArray(), offset.realValue))
+        self._plane = Plane(_point(origin), plane.normal.copy(), plane.uDirection.copy(), plane.vDirection.copy())
+        self._definition = ("offset", planarEntity, offset.realValue)
+        return True
+
+    def setByDistanceOnPath(self, pathEntity, distance: ValueInput) -> bool:
+        points = _curveWorldPoints(pathEntity)
+        length = _polylineLength(points)
+        target = distance.realValue * length if distance.realValue <= 1 else distance.realValue
+        walked = 0.0
+        for a, b in zip(points, points[1:]):
+            step = math.dist(a, b)
+            if walked + step >= target or b is points[-1]:
+                ratio = (target - walked) / step if step > 0 else 0
+                origin = _add(a, _scale(_sub(b, a), max(0.0, min(1.0, ratio))))
+                self._plane = Plane(_point(origin), _vector(_unit(_sub(b, a))))
+                break
+            walked += step
+        self._definition = ("distanceOnPath", pathEntity, distance.realValue)
+        return True
+
+    def setByPlane(self, plane: Plane) -> bool:
+        self._plane = plane.copy()
+        self._definition = ("plane", plane)
+        return True
+
+
+class ConstructionPlane(ApiObject):
+    def __init__(self, component: "Component", name: str, plane: Plane):
+        self._component = component
+        self._name = name
+        self._plane = plane
+        self.isLightBulbOn = True
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def geometry(self) -> Plane:
+        return self._plane.copy()
+
+    @property
+    def component(self) -> "Component":
+        return self._component
+
+    @property
+    def parent(self) -> "Component":
+        return self._component
+
+    @property
+    def timelineObject(self) -> "TimelineObject":
+        return self._component._design.timeline._objectOf(self)
+
+    def deleteMe(self) -> bool:
+        self._component.constructionPlanes._items.remove(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+
+class ConstructionPlanes(ReadOnlyCollection):
+    def __init__(self, component: "Component"):
+        super().__init__()
+        self._component = component
+
+    def createInput(self, occurrenceForCreation=None) -> ConstructionPlaneInput:
+        return ConstructionPlaneInput()
+
+    def add(self, input: ConstructionPlaneInput) -> ConstructionPlane:
+        if input._plane is None:
+            raise RuntimeError("3 : The construction plane input is not defined")
+        plane = ConstructionPlane(self._component, f"Plane{len(self._items) + 1}", input._plane)
+        self._items.append(plane)
+        self._component._design.timeline._append(plane)
+        return plane
+
+    def itemByName(self, name: str) -> ConstructionPlane:
+        return next((p for p in self._items if p.name == name), None)
+
+
+class ConstructionAxis(ApiObject):
+    def __init__(self, component: "Component", name: str, origin: tuple, direction: tuple):
+        self._component = component
+        self._name = name
+        self._origin = origin
+        self._direction = direction
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def geometry(self) -> InfiniteLine3D:
+        return InfiniteLine3D(_point(self._origin), _vector(self._direction))
+
+    @property
+    def component(self) -> "Component":
+        return self._component
+
+
+class ConstructionPoint(ApiObject):
+    def __init__(self, component: "Component", name: str, point: tuple):
+        self._component = component
+        self._name = name
+        self._point = point
+
+    @property
+    def geometry(self) -> Point3D:
+        return _point(self._point)
+
+
+def _planeOf(planarEntity) -> Plane:
+    if isinstance(planarEntity, ConstructionPlane):
+        return planarEntity._plane
+    if isinstance(planarEntity, BRepFace) and isinstance(planarEntity.geometry, Plane):
+        return planarEntity.geometry
+    if isinstance(planarEntity, Plane):
+        return planarEntity
+    raise RuntimeError(f"3 : {type(planarEntity).__name__} is not a planar entity")
+
+
+def _axisOf(entity) -> tuple:
+    """
+    Returns:
+        tuple: The world origin and unit direction of an axis entity.
+    """
+    if isinstance(entity, ConstructionAxis):
+        return entity._origin, _unit(entity._direction)
+    if isinstance(entity, SketchLine):
+        start, end = entity._worldPoints()
+        return start, _unit(_sub(end, start))
+    if isinstance(entity, BRepEdge):
+        return entity._points[0], _unit(_sub(entity._points[-1], entity._points[0]))
+    if isinstance(entity, BRepFace) and isinstance(entity.geometry, (Cylinder, Cone)):
+        return entity.geometry.origin.asArray(), _unit(entity.geometry.axis.asArray())
+    raise RuntimeError(f"3 : {type(entity).__name__} can't be used as an axis")
+
+
+############################################
+# Sketches
+############################################
+
+
+class SketchPoint(ApiObject):
+    def __init__(self, sketch: "Sketch", point: tuple):
+        self._sketch = sketch
+        self._point = point
+
+    @property
+    def geometry(self) -> Point3D:
+        return _point(self._point)
+
+    @property
+    def worldGeometry(self) -> Point3D:
+        return _point(self._sketch._toWorld(self._point))
+
+    def deleteMe(self) -> bool:
+        return True
+
+
+class SketchPoints(ReadOnlyCollection):
+    def __init__(self, sketch: "Sketch"):
+        super().__init__()
+        self._sketch = sketch
+
+    def add(self, point: Point3D) -> SketchPoint:
+        sketchPoint = SketchPoint(self._sketch, _xyz(point))
+        self._items.append(sketchPoint)
+        return sketchPoint
+
+
+class SketchCurve(ApiObject):
+    """
+    Base of the sketch curves, the coordinates are in sketch space
+    """
+
+    def __init__(self, sketch: "Sketch"):
+        self._sketch = sketch
+        self.isConstruction = False
+        self.isFixed = False
+        self.isReference = False
+
+    @property
+    def parentSketch(self) -> "Sketch":
+        return self._sketch
+
+    @property
+    def length(self) -> float:
+        return _polylineLength(self._samples())
+
+    def deleteMe(self) -> bool:
+        self._sketch._removeCurve(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+    def _samples(self) -> list:
+        raise NotImplementedError
+
+    def _worldPoints(self) -> list:
+        return [self._sketch._toWorld(p) for p in self._samples()]
+
+    def _endpoints(self) -> tuple:
+        """
+        Returns:
+            tuple: The start and end sketch points, None for closed curves.
+        """
+        return None
+
+
+class SketchLine(SketchCurve):
+    def __init__(self, sketch, startSketchPoint: SketchPoint, endSketchPoint: SketchPoint):
+        super().__init__(sketch)
+        self.startSketchPoint = startSketchPoint
+        self.endSketchPoint = endSketchPoint
+
+    @property
+    def geometry(self) -> Line3D:
+        return Line3D(self.startSketchPoint.geometry, self.endSketchPoint.geometry)
+
+    @property
+    def worldGeometry(self) -> Line3D:
+        return Line3D(self.startSketchPoint.worldGeometry, self.endSketchPoint.worldGeometry)
+
+    def _samples(self) -> list:
+        return [self.startSketchPoint._point, self.endSketchPoint._point]
+
+    def _worldPoints(self) -> list:
+        return [self._sketch._toWorld(p) for p in self._samples()]
+
+    def _endpoints(self) -> tuple:
+        return (self.startSketchPoint, self.endSketchPoint)
+
+
+class SketchCircle(SketchCurve):
+    def __init__(self, sketch, centerSketchPoint: SketchPoint, radius: float):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerSketchPoint
+        self.radius = radius
+
+    @property
+    def geometry(self) -> Circle3D:
+        return Circle3D(self.centerSketchPoint.geometry, Vector3D(0, 0, 1), self.radius)
+
+    @property
+    def length(self) -> float:
+        return 2 * math.pi * self.radius
+
+    @property
+    def area(self) -> float:
+        return math.pi * self.radius * self.radius
+
+    def _samples(self) -> list:
+        x, y, z = self.centerSketchPoint._point
+        return [
+            (x + self.radius * math.cos(a), y + self.radius * math.sin(a), z)
+            for a in (2 * math.pi * i / CURVE_SAMPLES for i in range(CURVE_SAMPLES))
+        ]
+
+
+class SketchArc(SketchCurve):
+    def __init__(self, sketch, centerSketchPoint: SketchPoint, radius: float, startAngle: float, sweepAngle: float, isFillet: bool = False):
+        super().__init__(sketch)
+        self.centerSketchPoint = centerSketchPoint
+        self.radius = radius
+        self._startAngle = startAngle
+        self._sweepAngle = sweepAngle
+        # the fillets are not trimming the lines in the fake, they are only rounding the corners of an existing loop
+        self._isFillet = isFillet
+        x, y, z = centerSketchPoint._point
+        end = startAngle + sweepAngle
+        self.startSketchPoint = SketchPoint(sketch, (x + radius * math.cos(startAngle), y + radius * math.sin(startAngle), z))
+        self.endSketchPoint = SketchPoint(sketch, (x + radius * math.cos(end), y + radius * math.sin(end), z))
+
+    @property
+    def geometry(self) -> Arc3D:
+        return Arc3D(self.centerSketchPoint.geometry, Vector3D(0, 0, 1), self.radius, self._startAngle, self._startAngle + self._sweepAngle)
+
+    @property
+    def length(self) -> float:
+        return abs(self._sweepAngle) * self.radius
+
+    def _samples(self) -> list:
+        x, y, z = self.centerSketchPoint._point
+        count = max(2, int(CURVE_SAMPLES * abs(self._sweepAngle) / (2 * math.pi)) + 1)
+        angles = [self._startAngle + self._sweepAngle * i / (count - 1) for i in range(count)]
+        return [(x + self.radius * math.cos(a), y + self.radius * math.sin(a), z) for a in angles]
+
+    def _endpoints(self) -> tuple:
+        return (self.startSketchPoint, self.endSketchPoint)
+
+
+class SketchFittedSpline(SketchCurve):
+    def __init__(self, sketch, points: list):
+        super().__init__(sketch)
+        self._points = points
+        self._name = None
+        self.startSketchPoint = SketchPoint(sketch, points[0])
+        self.endSketchPoint = SketchPoint(sketch, points[-1])
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def fitPoints(self) -> ObjectCollection:
+        return ObjectCollection([SketchPoint(self._sketch, p) for p in self._points])
+
+    @property
+    def geometry(self) -> NurbsCurve3D:
+        return NurbsCurve3D([_point(p) for p in self._points])
+
+    def _samples(self) -> list:
+        return list(self._points)
+
+    def _endpoints(self) -> tuple:
+        return (self.startSketchPoint, self.endSketchPoint)
+
+
+class SketchLineList(ReadOnlyCollection):
+    pass
+
+
+class SketchCurveCollection(ReadOnlyCollection):
+    def __init__(self, sketch: "Sketch"):
+        super().__init__()
+        self._sketch = sketch
+
+    def _point(self, value) -> SketchPoint:
+        return value if isinstance(value, SketchPoint) else SketchPoint(self._sketch, _xyz(value))
+
+    def _addCurve(self, curve: SketchCurve) -> SketchCurve:
+        self._items.append(curve)
+        self._sketch._curvesChanged()
+        return curve
+
+
+class SketchLines(SketchCurveCollection):
+    def addByTwoPoints(self, startPoint, endPoint) -> SketchLine:
+        return self._addCurve(SketchLine(self._sketch, self._point(startPoint), self._point(endPoint)))
+
+    def addTwoPointRectangle(self, pointOne, pointTwo) -> SketchLineList:
+        (x1, y1, z1), (x2, y2, z2) = _xyz(pointOne), _xyz(pointTwo)
+        corners = [SketchPoint(self._sketch, p) for p in ((x1, y1, z1), (x2, y1, z1), (x2, y2, z2), (x1, y2, z2))]
+        return SketchLineList([self._addCurve(SketchLine(self._sketch, corners[i], corners[(i + 1) % 4])) for i in range(4)])
+
+    def addCenterPointRectangle(self, centerPoint, cornerPoint) -> SketchLineList:
+        (cx, cy, cz), (x, y, z) = _xyz(centerPoint), _xyz(cornerPoint)
+        return self.addTwoPointRectangle(Point3D(2 * cx - x, 2 * cy - y, cz), Point3D(x, y, z))
+
+
+class SketchCircles(SketchCurveCollection):
+    def addByCenterRadius(self, centerPoint, radius: float) -> SketchCircle:
+        return self._addCurve(SketchCircle(self._sketch, self._point(centerPoint), radius))
+
+
+class SketchArcs(SketchCurveCollection):
+    def addByCenterStartSweep(self, centerPoint, startPoint, sweepAngle: float) -> SketchArc:
+        center = self._point(centerPoint)
+        cx, cy, _ = center._point
+        sx, sy, _ = _xyz(startPoint)
+        arc = SketchArc(self._sketch, center, math.hypot(sx - cx, sy - cy), math.atan2(sy - cy, sx - cx), sweepAngle)
+        if isinstance(startPoint, SketchPoint):
+            arc.startSketchPoint = startPoint
+        return self._addCurve(arc)
+
+    def addFillet(self, firstEntity, firstEntityPoint, secondEntity, secondEntityPoint, radius: float) -> SketchArc:
+        # the corner shared by the two lines
+        shared = None
+        for a in firstEntity._endpoints() or ():
+            for b in secondEntity._endpoints() or ():
+                if math.dist(a._point, b._point) < SKETCH_TOLERANCE:
+                    shared = a._point
+        if shared is None:
+            raise RuntimeError("3 : The curves to fillet are not connected")
+        center = SketchPoint(self._sketch, shared)
+        return self._addCurve(SketchArc(self._sketch, center, radius, 0.0, math.pi / 2, isFillet=True))
+
+
+class SketchFittedSplines(SketchCurveCollection):
+    def add(self, fitPoints: ObjectCollection) -> SketchFittedSpline:
+        return self._addCurve(SketchFittedSpline(self._sketch, [_xyz(p) for p in fitPoints]))
+
+
+class SketchCurves(ApiObject):
+    def __init__(self, sketch: "Sketch"):
+        self.sketchLines = SketchLines(sketch)
+        self.sketchCircles = SketchCircles(sketch)
+        self.sketchArcs = SketchArcs(sketch)
+        self.sketchFittedSplines = SketchFittedSplines(sketch)
+
+    def _all(self) -> list:
+        return [
+            c for collection in (self.sketchLines, self.sketchCircles, self.sketchArcs, self.sketchFittedSplines) for c in collection._items
+        ]
+
+    @property
+    def count(self) -> int:
+        return len(self._all())
+
+    def item(self, index: int) -> SketchCurve:
+        curves = self._all()
+        return curves[index] if 0 <= index < len(curves) else None
+
+    def __iter__(self):
+        return iter(self._all())
+
+
+class SketchTextInput(ApiObject):
+    def __init__(self, text: str, height: float):
+        self.text = text
+        self.height = height
+        self.textStyle = 0
+        self.fontName = ""
+        self.angle = 0.0
+        self._path = None
+
+    def setAsAlongPath(self, path, isAbove: bool, horizontalAlignment: int, characterSpacing: float) -> bool:
+        self._path = path
+        return True
+
+    def setAsMultiLine(self, cornerPoint, diagonalPoint, horizontalAlignment: int, verticalAlignment: int, characterSpacing: float) -> bool:
+        self._path = (cornerPoint, diagonalPoint)
+        return True
+
+
+class SketchText(ApiObject):
+    def __init__(self, sketch: "Sketch", input: SketchTextInput):
+        self._sketch = sketch
+        self.text = input.text
+        self.height = input.height
+        self.fontName = input.fontName
+        self._path = input._path
+
+    @property
+    def parentSketch(self) -> "Sketch":
+        return self._sketch
+
+    def _loops(self) -> list:
+        # the characters are approximated by a box along the path
+        if isinstance(self._path, SketchLine):
+            start, end = self._path.startSketchPoint._point, self._path.endSketchPoint._point
+        else:
+            start, end = (0.0, 0.0, 0.0), (len(self.text) * self.height * 0.6, 0.0, 0.0)
+        direction = _unit(_sub(end, start))
+        width = min(math.dist(start, end), len(self.text) * self.height * 0.6)
+        normal = (-direction[1] * self.height, direction[0] * self.height, 0.0)
+        corners = [start, _add(start, _scale(direction, width)), _add(_add(start, _scale(direction, width)), normal), _add(start, normal)]
+        return [_Loop([("line", (corners[i], corners[(i + 1) % 4])) for i in range(4)])]
+
+
+class SketchTexts(ReadOnlyCollection):
+    def __init__(self, sketch: "Sketch"):
+        super().__init__()
+        self._sketch = sketch
+
+    def createInput2(self, formattedText: str, height: float) -> SketchTextInput:
+        return SketchTextInput(formattedText, height)
+
+    def add(self, input: SketchTextInput) -> SketchText:
+        text = SketchText(self._sketch, input)
+        self._items.append(text)
+        return text
+
+
+class GeometricConstraint(ApiObject):
+    def __init__(self, kind: str, entities: tuple):
+        self.kind = kind
+        self._entities = entities
+
+    def deleteMe(self) -> bool:
+        return True
+
+
+class GeometricConstraints(ReadOnlyCollection):
+    def _add(self, kind: str, *entities) -> GeometricConstraint:
+        constraint = GeometricConstraint(kind, entities)
+        self._items.append(constraint)
+        return constraint
+
+    def addCoincident(self, point, entity) -> GeometricConstraint:
+        return self._add("coincident", point, entity)
+
+    def addHorizontal(self, line) -> GeometricConstraint:
+        return self._add("horizontal", line)
+
+    def addVertical(self, line) -> GeometricConstraint:
+        return self._add("vertical", line)
+
+    def addParallel(self, lineOne, lineTwo) -> GeometricConstraint:
+        return self._add("parallel", lineOne, lineTwo)
+
+    def addPerpendicular(self, lineOne, lineTwo) -> GeometricConstraint:
+        return self._add("perpendicular", lineOne, lineTwo)
+
+    def addConcentric(self, entityOne, entityTwo) -> GeometricConstraint:
+        return self._add("concentric", entityOne, entityTwo)
+
+
+class _Loop:
+    """
+    A closed loop of a profile, as a list of ("line" | "arc" | "circle" | "spline", sketch points) segments
+    """
+
+    def __init__(self, segments: list):
+        self.segments = segments
+        self.points = [p for _, points in segments for p in points[:-1]] if segments[0][0] != "circle" else list(segments[0][1])
+        self.isOuter = True
+
+    @property
+    def area(self) -> float:
+        # shoelace formula on the sketch x/y
+        points = self.points
+        return abs(sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(points, points[1:] + points[:1]))) / 2
+
+    @property
+    def perimeter(self) -> float:
+        return _polylineLength(self.points + self.points[:1])
+
+    @property
+    def centroid(self) -> tuple:
+        return _scale(tuple(map(sum, zip(*self.points))), 1 / len(self.points))
+
+    def contains(self, point: tuple) -> bool:
+        # ray casting on the sketch x/y
+        inside = False
+        points = self.points
+        for a, b in zip(points, points[1:] + points[:1]):
+            if (a[1] > point[1]) != (b[1] > point[1]):
+                x = a[0] + (point[1] - a[1]) * (b[0] - a[0]) / (b[1] - a[1])
+                if point[0] < x:
+                    inside = not inside
+        return inside
+
+
+def _buildLoops(curves: list) -> list:
+    """
+    Finds the closed loops formed by the sketch curves. The circles are loops by themselves, the other curves are
+    chained by their end points.
+    """
+    loops = []
+    vertices = []
+    edges = []
+
+    def vertexIndex(point: tuple) -> int:
+        for index, vertex in enumerate(vertices):
+            if math.dist(vertex, point) < SKETCH_TOLERANCE:
+                return index
+        vertices.append(point)
+        return len(vertices) - 1
+
+    for curve in curves:
+        if curve.isConstruction or getattr(curve, "_isFillet", False) or isinstance(curve, SketchFittedSpline):
+            continue
+        if isinstance(curve, SketchCircle):
+            loops.append((curve, _Loop([("circle", curve._samples())])))
+            continue
+        start, end = curve._endpoints()
+        kind = "arc" if isinstance(curve, SketchArc) else "line"
+        edges.append((curve, kind, vertexIndex(start._point), vertexIndex(end._point)))
+
+    # every vertex of a closed chain is used by exactly 2 curves
+    used = set()
+    for first in range(len(edges)):
+        if first in used:
+            continue
+        chain = [first]
+        curve, kind, start, current = edges[first]
+        segments = [(kind, curve._samples())]
+        closed = False
+        while True:
+            nextEdge = None
+            for index, (otherCurve, otherKind, a, b) in enumerate(edges):
+                if index in chain or index in used:
+                    continue
+                if a == current or b == current:
+                    nextEdge = index
+                    samples = otherCurve._samples()
+                    if b == current:
+                        samples = samples[::-1]
+                    segments.append((otherKind, samples))
+                    current = b if a == current else a
+                    break
+            if nextEdge is None:
+                break
+            chain.append(nextEdge)
+            if current == start:
+                closed = True
+                break
+        if closed or (len(chain) == 1 and start == current):
+            used.update(chain)
+            loops.append((edges[chain[0]][0], _Loop(segments)))
+    return loops
+
+
+class ProfileLoop(ApiObject):
+    def __init__(self, loop: _Loop, isOuter: bool):
+        self._loop = loop
+        self.isOuter = isOuter
+
+    @property
+    def profileCurves(self) -> ReadOnlyCollection:
+        return ReadOnlyCollection(self._loop.segments)
+
+
+class AreaProperties(ApiObject):
+    def __init__(self, area: float, perimeter: float, centroid: tuple):
+        self.area = area
+        self.perimeter = perimeter
+        self.centroid = _point(centroid)
+
+
+class Profile(ApiObject):
+    def __init__(self, sketch: "Sketch", outer: _Loop, inner: list):
+        self._sketch = sketch
+        self._outer = outer
+        self._inner = inner
+
+    @property
+    def parentSketch(self) -> "Sketch":
+        return self._sketch
+
+    @property
+    def profileLoops(self) -> ReadOnlyCollection:
+        return ReadOnlyCollection([ProfileLoop(self._outer, True)] + [ProfileLoop(loop, False) for loop in self._inner])
+
+    @property
+    def boundingBox(self) -> BoundingBox3D:
+        return BoundingBox3D.ofPoints([self._sketch._toWorld(p) for p in self._outer.points])
+
+    def areaProperties(self, accuracy: int = 0) -> AreaProperties:
+        return AreaProperties(self._area(), self._outer.perimeter, self._sketch._toWorld(self._outer.centroid))
+
+    def _area(self) -> float:
+        return max(0.0, self._outer.area - sum(loop.area for loop in self._inner))
+
+    def _loops(self) -> list:
+        return [self._outer] + self._inner
+
+
+class Profiles(ReadOnlyCollection):
+    pass
+
+
+class Sketch(ApiObject):
+    def __init__(self, component: "Component", referencePlane, plane: Plane):
+        self._component = component
+        self._referencePlane = referencePlane
+        self._plane = plane
+        self._name = f"Sketch{len(component.sketches._items) + 1}"
+        self._profiles = None
+        self._isComputeDeferred = False
+        self.isVisible = True
+        self.sketchCurves = SketchCurves(self)
+        self.sketchPoints = SketchPoints(self)
+        self.sketchTexts = SketchTexts(self)
+        self.geometricConstraints = GeometricConstraints()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def isComputeDeferred(self) -> bool:
+        return self._isComputeDeferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value: bool):
+        self._isComputeDeferred = value
+        # the deferred additions are solved together when the compute is restored
+        if not value:
+            self._profiles = None
+
+    @property
+    def referencePlane(self):
+        return self._referencePlane
+
+    @property
+    def parentComponent(self) -> "Component":
+        return self._component
+
+    @property
+    def transform(self) -> Matrix3D:
+        matrix = Matrix3D()
+        for column, vector in enumerate((self._plane.uDirection, self._plane.vDirection, self._plane.normal, self._plane.origin)):
+            for row, value in enumerate(vector.asArray()):
+                matrix.setCell(row, column, value)
+        return matrix
+
+    @property
+    def profiles(self) -> Profiles:
+        if self._profiles is None:
+            self._profiles = self._computeProfiles()
+        return Profiles(self._profiles)
+
+    @property
+    def timelineObject(self) -> "TimelineObject":
+        return self._component._design.timeline._objectOf(self)
+
+    def project(self, entity) -> ObjectCollection:
+        if isinstance(entity, SketchCurve):
+            points = [self.modelToSketchSpace(_point(p)) for p in entity._worldPoints()]
+            curve = SketchLine(self, SketchPoint(self, points[0].asArray()), SketchPoint(self, points[-1].asArray()))
+            curve.isReference = True
+            return ObjectCollection([curve])
+        return ObjectCollection([SketchPoint(self, (0.0, 0.0, 0.0))])
+
+    def modelToSketchSpace(self, modelCoordinate: Point3D) -> Point3D:
+        relative = _sub(modelCoordinate.asArray(), self._plane.origin.asArray())
+        return Point3D(
+            _dot(relative, self._plane.uDirection.asArray()),
+            _dot(relative, self._plane.vDirection.asArray()),
+            _dot(relative, self._plane.normal.asArray()),
+        )
+
+    def sketchToModelSpace(self, sketchCoordinate: Point3D) -> Point3D:
+        return _point(self._toWorld(sketchCoordinate.asArray()))
+
+    def deleteMe(self) -> bool:
+        self._component.sketches._items.remove(self)
+        self._component._design.timeline._remove(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+    def _toWorld(self, point: tuple) -> tuple:
+        plane = self._plane
+        world = plane.origin.asArray()
+        for value, direction in zip(point, (plane.uDirection, plane.vDirection, plane.normal)):
+            world = _add(world, _scale(direction.asArray(), value))
+        return world
+
+    def _curvesChanged(self):
+        if not self.isComputeDeferred:
+            self._profiles = None
+
+    def _removeCurve(self, curve: SketchCurve):
+        for collection in (self.sketchCurves.sketchLines, self.sketchCurves.sketchCircles, self.sketchCurves.sketchArcs):
+            if curve in collection._items:
+                collection._items.remove(curve)
+        self._profiles = None
+
+    def _computeProfiles(self) -> list:
+        loops = [loop for _, loop in _buildLoops(self.sketchCurves._all())]
+        profiles = []
+        for loop in loops:
+            # the loops directly inside this one are its holes, and are also profiles by themselves
+            children = [other for other in loops if other is not loop and other.area < loop.area and loop.contains(other.points[0])]
+            direct = [c for c in children if not any(c is not o and o.area > c.area and o.contains(c.points[0]) for o in children)]
+            profiles.append(Profile(self, loop, direct))
+        return profiles
+
+
+class Sketches(ReadOnlyCollection):
+    def __init__(self, component: "Component"):
+        super().__init__()
+        self._component = component
+
+    def add(self, planarEntity, occurrenceForCreation=None) -> Sketch:
+        plane = _planeOf(planarEntity)
+        sketch = Sketch(
+            self._component, planarEntity, Plane(plane.origin.copy(), plane.normal.copy(), plane.uDirection.copy(), plane.vDirection.copy())
+        )
+        self._items.append(sketch)
+        self._component._design.timeline._append(sketch)
+        return sketch
+
+    def itemByName(self, name: str) -> Sketch:
+        return next((s for s in self._items if s.name == name), None)
+
+
+class Path(ApiObject):
+    def __init__(self, curves: list):
+        self._curves = curves
+
+    @staticmethod
+    def create(curves, chainOptions=None) -> "Path":
+        return Path(list(curves) if isinstance(curves, ObjectCollection) else [curves])
+
+    @property
+    def count(self) -> int:
+        return len(self._curves)
+
+    def _worldPoints(self) -> list:
+        points = []
+        for curve in self._curves:
+            curvePoints = _curveWorldPoints(curve)
+            if points and curvePoints and math.dist(points[-1], curvePoints[-1]) < math.dist(points[-1], curvePoints[0]):
+                curvePoints = curvePoints[::-1]
+            points.extend(curvePoints)
+        return points
+
+
+def _curveWorldPoints(curve) -> list:
+    if isinstance(curve, SketchCurve):
+        return curve._worldPoints()
+    if isinstance(curve, BRepEdge):
+        return list(curve._points)
+    if isinstance(curve, Path):
+        return curve._worldPoints()
+    raise RuntimeError(f"3 : {type(curve).__name__} is not a curve")
+
+
+############################################
+# Features
+############################################
+
+
+class ModelParameter(ApiObject):
+    def __init__(self, name: str, value: float, unit: str = "cm"):
+        self._name = name
+        self._value = value
+        self.unit = unit
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        self._value = value
+
+    @property
+    def expression(self) -> str:
+        return f"{self._value:g} {self.unit}".strip()
+
+    @expression.setter
+    def expression(self, expression: str):
+        self._value = float(expression.split()[0])
+
+
+class Feature(ApiObject):
+    """
+    Base of the features. bodies are the bodies created or modified, faces the faces created by the feature.
+    """
+
+    def __init__(self, collection: "FeatureCollection", input=None):
+        self._collection = collection
+        self._component = collection._component
+        self._input = input
+        self._name = f"{collection._featureName}{len(collection._items) + 1}"
+        self._bodies = []
+        self._faces = []
+        self.isSuppressed = False
+        self.healthState = FeatureHealthStates.HealthyFeatureHealthState
+        self.errorOrWarningMessage = ""
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def parentComponent(self) -> "Component":
+        return self._component
+
+    @property
+    def bodies(self) -> BRepBodies:
+        return BRepBodies([b for b in self._bodies if b.isValid])
+
+    @property
+    def faces(self) -> BRepFaces:
+        return BRepFaces(self._faces)
+
+    @property
+    def timelineObject(self) -> "TimelineObject":
+        return self._component._design.timeline._objectOf(self)
+
+    @property
+    def operation(self) -> int:
+        return getattr(self._input, "operation", FeatureOperations.NewBodyFeatureOperation)
+
+    def deleteMe(self) -> bool:
+        self._collection._items.remove(self)
+        self._component._design.timeline._remove(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+    @fakeOnly
+    def faceList(self) -> list:
+        return list(self._faces)
+
+
+class FeatureCollection(ReadOnlyCollection):
+    """
+    Base of the feature collections (extrudeFeatures, filletFeatures, ...)
+    """
+
+    _featureName = "Feature"
+
+    def __init__(self, component: "Component"):
+        super().__init__()
+        self._component = component
+
+    def itemByName(self, name: str) -> Feature:
+        return next((f for f in self._items if f.name == name), None)
+
+    def _append(self, feature: Feature) -> Feature:
+        self._items.append(feature)
+        self._component._design.timeline._append(feature)
+        return feature
+
+
+def _profileLoops(profile) -> list:
+    """
+    Returns:
+        list: The (sketch, loop) of a profile, a text or a collection of them.
+    """
+    if isinstance(profile, ObjectCollection):
+        return [item for p in profile for item in _profileLoops(p)]
+    if isinstance(profile, Profile):
+        return [(profile._sketch, loop) for loop in profile._loops()]
+    if isinstance(profile, SketchText):
+        return [(profile._sketch, loop) for loop in profile._loops()]
+    raise RuntimeError(f"3 : {type(profile).__name__} is not a profile")
+
+
+def _profileArea(profile) -> float:
+    if isinstance(profile, ObjectCollection):
+        return sum(_profileArea(p) for p in profile)
+    if isinstance(profile, Profile):
+        return profile._area()
+    return sum(loop.area for _, loop in _profileLoops(profile))
+
+
+def _prism(loops: list, direction: tuple, area: float) -> tuple:
+    """
+    Builds the faces of the prism swept by the profile loops along the direction vector.
+
+    Args:
+        loops (list): The (sketch, loop) of the profile, the first one being the outer loop.
+        direction (tuple): The world extrusion vector.
+        area (float): The area of the profile.
+
+    Returns:
+        tuple: The start faces, the end faces and the side faces.
+    """
+    height = _norm(direction)
+    unit = _unit(direction)
+    startEdges = []
+    endEdges = []
+    sideFaces = []
+    for sketch, loop in loops:
+        vertical = {}
+        for kind, points in loop.segments:
+            world = [sketch._toWorld(p) for p in points]
+            top = [_add(p, direction) for p in world]
+            closed = kind == "circle"
+            edgeKind = "circle" if closed else ("line" if kind == "line" else "arc")
+            bottomEdge = BRepEdge(edgeKind, world, closed=closed)
+            topEdge = BRepEdge(edgeKind, top, closed=closed)
+            startEdges.append(bottomEdge)
+            endEdges.append(topEdge)
+            edges = [bottomEdge, topEdge]
+            if not closed:
+                for p in (world[0], world[-1]):
+                    key = tuple(round(v, 6) for v in p)
+                    if key not in vertical:
+                        vertical[key] = BRepEdge("line", [p, _add(p, direction)])
+                    edges.append(vertical[key])
+
+            middle = _add(world[len(world) // 2], _scale(direction, 0.5))
+            if kind == "line":
+                geometry = Plane(_point(middle), _vector(_unit(_cross(_sub(world[-1], world[0]), unit))))
+            elif kind in ("circle", "arc"):
+                center = _scale(tuple(map(sum, zip(*world))), 1 / len(world)) if closed else sketch._toWorld(_arcCenter(points))
+                geometry = Cylinder(_point(center), _vector(unit), math.dist(center, world[0]))
+            else:
+                geometry = NurbsSurface(_point(middle))
+            sideFaces.append(BRepFace(geometry, bottomEdge.length * height, middle, edges))
+
+    outerSketch, outerLoop = loops[0]
+    startPoint = _insidePoint(outerSketch, outerLoop)
+    normal = _vector(_scale(unit, -1))
+    startFace = BRepFace(Plane(_point(startPoint), normal), area, startPoint, startEdges)
+    endPoint = _add(startPoint, direction)
+    endFace = BRepFace(Plane(_point(endPoint), _vector(unit)), area, endPoint, endEdges)
+    return [startFace], [endFace], sideFaces
+
+
+def _arcCenter(points: list) -> tuple:
+    # circumcenter of the first, middle and last sampled points, in sketch space
+    (ax, ay, z), (bx, by, _), (cx, cy, _) = points[0], points[len(points) // 2], points[-1]
+    d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    if abs(d) < 1e-12:
+        return points[len(points) // 2]
+    ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay) + (cx * cx + cy * cy) * (ay - by)) / d
+    uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx) + (cx * cx + cy * cy) * (bx - ax)) / d
+    return (ux, uy, z)
+
+
+def _insidePoint(sketch: Sketch, loop: _Loop) -> tuple:
+    # a point just inside the outer boundary, it is on the face even when the profile has holes
+    boundary = loop.points[0]
+    centroid = loop.centroid
+    return sketch._toWorld(_add(boundary, _scale(_sub(centroid, boundary), 0.01)))
+
+
+def _facesBox(faces: list) -> BoundingBox3D:
+    box = None
+    for face in faces:
+        if box is None:
+            box = face.boundingBox
+        else:
+            box.combine(face.boundingBox)
+    return box
+
+
+def _boxVolume(box: BoundingBox3D) -> float:
+    return math.prod(max(0.0, b - a) for a, b in zip(box.minPoint.asArray(), box.maxPoint.asArray()))
+
+
+def _overlapRatio(tool: BoundingBox3D, body: BoundingBox3D) -> float:
+    """
+    Part of the tool bounding box inside the body bounding box, used to estimate the volume removed by a cut.
+    """
+    overlap = 1.0
+    for a0, a1, b0, b1 in zip(tool.minPoint.asArray(), tool.maxPoint.asArray(), body.minPoint.asArray(), body.maxPoint.asArray()):
+        size = a1 - a0
+        if size > 1e-9:
+            overlap *= max(0.0, min(a1, b1) - max(a0, b0)) / size
+    return overlap
+
+
+def _applyOperation(feature: Feature, operation: int, faces: list, volume: float, participants: list = None):
+    """
+    Applies the result of a feature to the bodies of its component.
+
+    Args:
+        feature (Feature): The feature, its bodies and faces are updated.
+        operation (int): The FeatureOperations value.
+        faces (list): The faces of the tool body.
+        volume (float): The volume of the tool body.
+        participants (list, optional): The bodies the operation is limited to. Defaults to the visible bodies of the component.
+    """
+    component = feature._component
+    feature._faces = list(faces)
+    toolBox = _facesBox(faces)
+    candidates = participants if participants is not None else [b for b in component._bodies if b.isVisible]
+    targets = [b for b in candidates if b._faces and toolBox is not None and toolBox.intersects(b.boundingBox)]
+
+    if operation in (FeatureOperations.NewBodyFeatureOperation, FeatureOperations.NewComponentFeatureOperation) or (
+        operation == FeatureOperations.JoinFeatureOperation and not targets
+    ):
+        body = component._newBody()
+        body._addFaces(faces)
+        body._addPiece(faces, volume)
+        feature._bodies = [body]
+    elif operation == FeatureOperations.JoinFeatureOperation:
+        # all the bodies touched by the tool become one body
+        body = targets[0]
+        body._addFaces(faces)
+        body._addPiece(faces, volume)
+        for other in targets[1:]:
+            body._join(other)
+            other._faces = []
+            component._removeBody(other)
+        feature._bodies = [body]
+    elif operation == FeatureOperations.CutFeatureOperation:
+        for body in targets:
+            body._cut(toolBox, volume)
+            body._addFaces([f for f in faces])
+        feature._bodies = targets
+    else:
+        for body in targets:
+            body._setVolume(min(body._volume, volume))
+        feature._bodies = targets
+
+
+class ExtrudeFeatureInput(ApiObject):
+    def __init__(self, profile, operation: int):
+        self.profile = profile
+        self.operation = operation
+        self.isSolid = True
+        self.participantBodies = None
+        self._distance = None
+        self._symmetric = False
+
+    def setDistanceExtent(self, isSymmetric: bool, distance: ValueInput) -> bool:
+        self._symmetric = isSymmetric
+        self._distance = distance.realValue
+        return True
+
+    def setOneSideExtent(self, extent, direction=None, taperAngle=None) -> bool:
+        if isinstance(extent, DistanceExtentDefinition):
+            self._distance = extent._distance
+        return True
+
+    def setSymmetricExtent(self, distance: ValueInput, isFullLength: bool, taperAngle=None) -> bool:
+        self._symmetric = True
+        self._distance = distance.realValue if isFullLength else 2 * distance.realValue
+        return True
+
+
+class DistanceExtentDefinition(ApiObject):
+    def __init__(self, distance: float):
+        self._distance = distance
+
+    @staticmethod
+    def create(distance: ValueInput) -> "DistanceExtentDefinition":
+        return DistanceExtentDefinition(distance.realValue)
+
+
+class ExtrudeFeature(Feature):
+    def __init__(self, collection, input):
+        super().__init__(collection, input)
+        self._startFaces = []
+        self._endFaces = []
+        self._sideFaces = []
+
+    @property
+    def startFaces(self) -> BRepFaces:
+        return BRepFaces(self._startFaces)
+
+    @property
+    def endFaces(self) -> BRepFaces:
+        return BRepFaces(self._endFaces)
+
+    @property
+    def sideFaces(self) -> BRepFaces:
+        return BRepFaces(self._sideFaces)
+
+    @property
+    def profile(self):
+        return self._input.profile
+
+    @property
+    def extentOne(self) -> DistanceExtentDefinition:
+        return DistanceExtentDefinition(self._input._distance)
+
+
+class ExtrudeFeatures(FeatureCollection):
+    _featureName = "Extrude"
+
+    def createInput(self, profile, operation: int) -> ExtrudeFeatureInput:
+        return ExtrudeFeatureInput(profile, operation)
+
+    def addSimple(self, profile, distance: ValueInput, operation: int) -> ExtrudeFeature:
+        input = ExtrudeFeatureInput(profile, operation)
+        input._distance = distance.realValue
+        return self._build(input)
+
+    def add(self, input: ExtrudeFeatureInput) -> ExtrudeFeature:
+        return self._build(input)
+
+    def _build(self, input: ExtrudeFeatureInput) -> ExtrudeFeature:
+        if input._distance is None:
+            raise RuntimeError("3 : The extent of the extrusion is not defined")
+        loops = _profileLoops(input.profile)
+        if not loops:
+            raise RuntimeError("3 : No profile to extrude")
+        sketch = loops[0][0]
+        normal = sketch._plane.normal.asArray()
+        distance = input._distance
+        area = _profileArea(input.profile)
+        if input._symmetric:
+            # the symmetric extrusions start half way below the sketch plane
+            shifted = [
+                (s, _Loop([(k, [_add(p, (0.0, 0.0, -distance / 2)) for p in pts]) for k, pts in loop.segments])) for s, loop in loops
+            ]
+            loops = shifted
+        feature = ExtrudeFeature(self, input)
+        feature._startFaces, feature._endFaces, feature._sideFaces = _prism(loops, _scale(normal, distance), area)
+        # same order as the API, the side faces first
+        faces = feature._sideFaces + feature._startFaces + feature._endFaces
+        if input.operation == FeatureOperations.CutFeatureOperation:
+            # only the walls of the cut are left on the target
+            faces = feature._sideFaces + feature._endFaces
+        _applyOperation(feature, input.operation, faces, area * abs(distance), input.participantBodies)
+        return self._append(feature)
+
+
+class SweepFeatureInput(ApiObject):
+    def __init__(self, profile, path: Path, operation: int):
+        self.profile = profile
+        self.path = path
+        self.operation = operation
+        self.orientation = 0
+        self.participantBodies = None
+
+
+class SweepFeature(Feature):
+    def __init__(self, collection, input):
+        super().__init__(collection, input)
+        self._startFaces = []
+        self._endFaces = []
+
+    @property
+    def startFaces(self) -> BRepFaces:
+        return BRepFaces(self._startFaces)
+
+    @property
+    def endFaces(self) -> BRepFaces:
+        return BRepFaces(self._endFaces)
+
+
+class SweepFeatures(FeatureCollection):
+    _featureName = "Sweep"
+
+    def createInput(self, profile, path: Path, operation: int) -> SweepFeatureInput:
+        return SweepFeatureInput(profile, path, operation)
+
+    def add(self, input: SweepFeatureInput) -> SweepFeature:
+        loops = _profileLoops(input.profile)
+        pathPoints = input.path._worldPoints()
+        if len(pathPoints) < 2:
+            raise RuntimeError("3 : The sweep path is empty")
+        pathLength = _polylineLength(pathPoints)
+        sketch, loop = loops[0]
+        radius = loop.perimeter / (2 * math.pi)
+        area = _profileArea(input.profile)
+
+        # the long edges are where the swept body meets the body it is joined to
+        start = _add(pathPoints[0], (radius, 0.0, 0.0))
+        profileStart = [sketch._toWorld(p) for p in loop.points]
+        profileEnd = [_add(p, _sub(pathPoints[-1], pathPoints[0])) for p in profileStart]
+        startEdge = BRepEdge("circle", profileStart, closed=True)
+        endEdge = BRepEdge("circle", profileEnd, closed=True)
+        longEdges = [BRepEdge("spline", [_add(p, (0.0, 0.0, offset)) for p in pathPoints]) for offset in (radius, -radius)]
+        side = BRepFace(NurbsSurface(_point(start)), loop.perimeter * pathLength, start, [startEdge, endEdge] + longEdges)
+
+        feature = SweepFeature(self, input)
+        feature._startFaces = [BRepFace(Plane(_point(profileStart[0]), Vector3D(0, 1, 0)), area, profileStart[0], [startEdge])]
+        feature._endFaces = [BRepFace(Plane(_point(profileEnd[0]), Vector3D(0, 1, 0)), area, profileEnd[0], [endEdge])]
+        _applyOperation(
+            feature, input.operation, [side] + feature._startFaces + feature._endFaces, area * pathLength, input.participantBodies
+        )
+        return self._append(feature)
+
+
+class RevolveFeatureInput(ApiObject):
+    def __init__(self, profile, axis, operation: int):
+        self.profile = profile
+        self.axis = axis
+        self.operation = operation
+        self.participantBodies = None
+        self._angle = 2 * math.pi
+
+    def setAngleExtent(self, isSymmetric: bool, angle: ValueInput) -> bool:
+        self._angle = min(abs(angle.realValue), 2 * math.pi)
+        return True
+
+    def setTorusExtent(self, isSymmetric: bool) -> bool:
+        self._angle = 2 * math.pi
+        return True
+
+
+class RevolveFeature(Feature):
+    pass
+
+
+class RevolveFeatures(FeatureCollection):
+    _featureName = "Revolve"
+
+    def createInput(self, profile, axis, operation: int) -> RevolveFeatureInput:
+        return RevolveFeatureInput(profile, axis, operation)
+
+    def add(self, input: RevolveFeatureInput) -> RevolveFeature:
+        origin, direction = _axisOf(input.axis)
+        fraction = input._angle / (2 * math.pi)
+
+        def polar(point: tuple) -> tuple:
+            relative = _sub(point, origin)
+            along = _dot(relative, direction)
+            return along, _norm(_sub(relative, _scale(direction, along)))
+
+        faces = []
+        circles = {}
+        centroidDistance = 0.0
+        for sketch, loop in _profileLoops(input.profile):
+            for kind, points in loop.segments:
+                world = [sketch._toWorld(p) for p in points]
+                (t0, r0), (t1, r1) = polar(world[0]), polar(world[-1])
+                edges = []
+                for t, r, p in ((t0, r0, world[0]), (t1, r1, world[-1])):
+                    key = (round(t, 6), round(r, 6))
+                    if r > 1e-9 and key not in circles:
+                        center = _add(origin, _scale(direction, t))
+                        circles[key] = BRepEdge("circle", _circlePoints(center, direction, r), 2 * math.pi * r * fraction)
+                    if key in circles:
+                        edges.append(circles[key])
+                length = _polylineLength(world)
+                area = math.pi * (r0 + r1) * length * fraction
+                middle = _add(origin, _scale(direction, (t0 + t1) / 2))
+                pointOnFace = _add(middle, _scale(_unit(_sub(world[0], _add(origin, _scale(direction, t0)))), (r0 + r1) / 2))
+                if abs(r0 - r1) < 1e-9:
+                    geometry = Cylinder(_point(middle), _vector(direction), r0)
+                elif abs(t0 - t1) < 1e-9:
+                    geometry = Plane(_point(middle), _vector(direction))
+                else:
+                    geometry = Cone(_point(middle), _vector(direction), (r0 + r1) / 2, math.atan2(abs(r1 - r0), abs(t1 - t0)))
+                faces.append(BRepFace(geometry, area, pointOnFace, edges))
+            centroidDistance = polar(sketch._toWorld(loop.centroid))[1]
+
+        feature = RevolveFeature(self, input)
+        # Pappus's centroid theorem
+        volume = _profileArea(input.profile) * 2 * math.pi * centroidDistance * fraction
+        _applyOperation(feature, input.operation, faces, volume, input.participantBodies)
+        return self._append(feature)
+
+
+def _circlePoints(center: tuple, normal: tuple, radius: float) -> list:
+    u = _unit(_cross(normal, (1.0, 0.0, 0.0) if abs(normal[0]) < 0.9 else (0.0, 1.0, 0.0)))
+    v = _cross(normal, u)
+    return [
+        _add(center, _add(_scale(u, radius * math.cos(a)), _scale(v, radius * math.sin(a))))
+        for a in (2 * math.pi * i / CURVE_SAMPLES for i in range(CURVE_SAMPLES))
+    ]
+
+
+class LoftSection(ApiObject):
+    def __init__(self, entity):
+        self.entity = entity
+
+
+class LoftSections(ReadOnlyCollection):
+    def add(self, entity) -> LoftSection:
+        section = LoftSection(entity)
+        self._items.append(section)
+        return section
+
+
+class LoftFeatureInput(ApiObject):
+    def __init__(self, operation: int):
+        self.operation = operation
+        self.loftSections = LoftSections()
+        self.isSolid = True
+        self.isClosed = False
+        self.participantBodies = None
+
+
+class LoftFeature(Feature):
+    pass
+
+
+class LoftFeatures(FeatureCollection):
+    _featureName = "Loft"
+
+    def createInput(self, operation: int) -> LoftFeatureInput:
+        return LoftFeatureInput(operation)
+
+    def add(self, input: LoftFeatureInput) -> LoftFeature:
+        sections = [s.entity for s in input.loftSections]
+        if len(sections) < 2:
+            raise RuntimeError("3 : A loft needs at least 2 sections")
+        first, last = _profileLoops(sections[0]), _profileLoops(sections[-1])
+        start = first[0][0]._toWorld(first[0][1].centroid)
+        end = last[0][0]._toWorld(last[0][1].centroid)
+        direction = _sub(end, start)
+        if _norm(direction) < 1e-9:
+            # sections on the same plane, the loft is flat
+            direction = _scale(first[0][0]._plane.normal.asArray(), 1e-3)
+
+        # approximated by the prism between the first and the last section
+        areas = [_profileArea(s) for s in sections]
+        area = sum(areas) / len(areas)
+        startFaces, endFaces, sideFaces = _prism(first, direction, area)
+        feature = LoftFeature(self, input)
+        _applyOperation(feature, input.operation, sideFaces + startFaces + endFaces, area * _norm(direction), input.participantBodies)
+        return self._append(feature)
+
+
+class FilletEdgeSet(ApiObject):
+    def __init__(self, edges: list, radius: float):
+        self._edges = edges
+        self.radius = radius
+
+
+class FilletEdgeSetInputs(ApiObject):
+    def __init__(self):
+        self._sets = []
+
+    @property
+    def count(self) -> int:
+        return len(self._sets)
+
+    def addConstantRadiusEdgeSet(self, edges: ObjectCollection, radius: ValueInput, isTangentChain: bool) -> FilletEdgeSet:
+        edgeSet = FilletEdgeSet(list(edges), radius.realValue)
+        self._sets.append(edgeSet)
+        return edgeSet
+
+
+class FilletFeatureInput(ApiObject):
+    def __init__(self):
+        self.edgeSetInputs = FilletEdgeSetInputs()
+        self.isRollingBallCorner = True
+        self.isG2 = False
+
+    def addConstantRadiusEdgeSet(self, edges: ObjectCollection, radius: ValueInput, isTangentChain: bool) -> bool:
+        self.edgeSetInputs.addConstantRadiusEdgeSet(edges, radius, isTangentChain)
+        return True
+
+
+def _roundEdges(feature: Feature, edgeSets: list):
+    """
+    Adds one rounded face per edge to the bodies of the edges. Fusion fails the same way on an empty edge set.
+    """
+    faces = []
+    bodies = []
+    for edges, size in edgeSets:
+        if not edges:
+            raise RuntimeError("3 : No edges to fillet or chamfer")
+        for edge in edges:
+            body = edge.body
+            if body is None or not body.isValid:
+                raise RuntimeError("3 : The edge is not part of a body")
+            middle = edge._points[len(edge._points) // 2]
+            face = BRepFace(Cylinder(_point(middle), Vector3D(0, 0, 1), size), edge.length * size * math.pi / 2, middle, [edge])
+            body._addFaces([face])
+            body._setVolume(max(0.0, body._volume - edge.length * size * size * (1 - math.pi / 4)))
+            faces.append(face)
+            if body not in bodies:
+                bodies.append(body)
+    feature._faces = faces
+    feature._bodies = bodies
+
+
+class FilletFeature(Feature):
+    pass
+
+
+class FilletFeatures(FeatureCollection):
+    _featureName = "Fillet"
+
+    def createInput(self) -> FilletFeatureInput:
+        return FilletFeatureInput()
+
+    def add(self, input: FilletFeatureInput) -> FilletFeature:
+        feature = FilletFeature(self, input)
+        _roundEdges(feature, [(s._edges, s.radius) for s in input.edgeSetInputs._sets])
+        return self._append(feature)
+
+
+class ChamferEdgeSets(ApiObject):
+    def __init__(self):
+        self._sets = []
+
+    def addEqualDistanceChamferEdgeSet(self, edges: ObjectCollection, distance: ValueInput, isTangentChain: bool) -> bool:
+        self._sets.append((list(edges), distance.realValue))
+        return True
+
+    def addDistanceAndAngleChamferEdgeSet(
+        self, edges: ObjectCollection, distance: ValueInput, angle: ValueInput, isFlipped: bool, isTangentChain: bool
+    ):
+        self._sets.append((list(edges), distance.realValue))
+        return True
+
+    def addTwoDistancesChamferEdgeSet(
+        self, edges: ObjectCollection, distanceOne: ValueInput, distanceTwo: ValueInput, isFlipped: bool, isTangentChain: bool
+    ):
+        self._sets.append((list(edges), max(distanceOne.realValue, distanceTwo.realValue)))
+        return True
+
+
+class ChamferFeatureInput(ApiObject):
+    def __init__(self):
+        self.chamferEdgeSets = ChamferEdgeSets()
+
+
+class ChamferFeature(Feature):
+    pass
+
+
+class ChamferFeatures(FeatureCollection):
+    _featureName = "Chamfer"
+
+    def createInput2(self) -> ChamferFeatureInput:
+        return ChamferFeatureInput()
+
+    def add(self, input: ChamferFeatureInput) -> ChamferFeature:
+        feature = ChamferFeature(self, input)
+        _roundEdges(feature, input.chamferEdgeSets._sets)
+        return self._append(feature)
+
+
+def _patternEntities(entities: ObjectCollection) -> tuple:
+    """
+    Splits the pattern input entities into bodies and features.
+    """
+    bodies = [e for e in entities if isinstance(e, BRepBody)]
+    features = [e for e in entities if isinstance(e, Feature)]
+    if len(bodies) + len(features) != entities.count or not entities.count:
+        raise RuntimeError("3 : Only bodies and features can be patterned")
+    return bodies, features
+
+
+def _replicate(feature: Feature, bodies: list, features: list, transforms: list):
+    """
+    Copies the bodies, or applies again the faces of the features, for every transform of a pattern.
+    """
+    created = []
+    for matrix in transforms:
+        for body in bodies:
+            created.append(body._copy(matrix))
+        for source in features:
+            edgeMap = {}
+            faces = [f._transformed(matrix, edgeMap) for f in source._faces]
+            for body in source._bodies:
+                if body.isValid:
+                    body._addFaces(faces)
+                    if body not in created:
+                        created.append(body)
+            feature._faces.extend(faces)
+    feature._bodies = created
+
+
+class RectangularPatternFeatureInput(ApiObject):
+    def __init__(self, inputEntities, directionOneEntity, quantityOne: ValueInput, distanceOne: ValueInput, patternDistanceType: int):
+        self.inputEntities = inputEntities
+        self.directionOneEntity = directionOneEntity
+        self.quantityOne = quantityOne
+        self.distanceOne = distanceOne
+        self.patternDistanceType = patternDistanceType
+        self.directionTwoEntity = None
+        self.quantityTwo = ValueInput.createByReal(1)
+        self.distanceTwo = ValueInput.createByReal(0)
+        self.isSymmetricInDirectionOne = False
+        self.isSymmetricInDirectionTwo = False
+
+    def setDirectionTwo(self, directionTwoEntity, quantityTwo: ValueInput, distanceTwo: ValueInput) -> bool:
+        self.directionTwoEntity = directionTwoEntity
+        self.quantityTwo = quantityTwo
+        self.distanceTwo = distanceTwo
+        return True
+
+
+class PatternFeature(Feature):
+    """
+    Base of the rectangular and circular patterns
+    """
+
+    def __init__(self, collection, input, transforms):
+        super().__init__(collection, input)
+        self._transforms = transforms
+
+    @property
+    def patternElements(self) -> ReadOnlyCollection:
+        return ReadOnlyCollection(list(range(len(self._transforms) + 1)))
+
+
+class RectangularPatternFeature(PatternFeature):
+    pass
+
+
+class CircularPatternFeature(PatternFeature):
+    pass
+
+
+class RectangularPatternFeatures(FeatureCollection):
+    _featureName = "RectangularPattern"
+
+    def createInput(self, inputEntities, directionOneEntity, quantityOne: ValueInput, distanceOne: ValueInput, patternDistanceType: int):
+        return RectangularPatternFeatureInput(inputEntities, directionOneEntity, quantityOne, distanceOne, patternDistanceType)
+
+    def add(self, input: RectangularPatternFeatureInput) -> RectangularPatternFeature:
+        bodies, features = _patternEntities(input.inputEntities)
+        transforms = []
+        directions = [(input.directionOneEntity, input.quantityOne, input.distanceOne)]
+        if input.directionTwoEntity is not None:
+            directions.append((input.directionTwoEntity, input.quantityTwo, input.distanceTwo))
+        steps = [[(0.0, 0.0, 0.0)]]
+        for entity, quantity, distance in directions:
+            count = int(round(quantity.realValue))
+            if count < 1:
+                raise RuntimeError("3 : The pattern quantity must be at least 1")
+            _, direction = _axisOf(entity)
+            spacing = distance.realValue
+            if input.patternDistanceType == PatternDistanceType.ExtentPatternDistanceType and count > 1:
+                spacing = distance.realValue / (count - 1)
+            steps.append([_scale(direction, spacing * i) for i in range(count)])
+        offsets = [(0.0, 0.0, 0.0)]
+        for stepList in steps[1:]:
+            offsets = [_add(o, s) for o in offsets for s in stepList]
+        for offset in offsets[1:]:
+            matrix = Matrix3D()
+            matrix.translation = _vector(offset)
+            transforms.append(matrix)
+        feature = RectangularPatternFeature(self, input, transforms)
+        _replicate(feature, bodies, features, transforms)
+        return self._append(feature)
+
+
+class CircularPatternFeatureInput(ApiObject):
+    def __init__(self, inputEntities, axis):
+        self.inputEntities = inputEntities
+        self.axis = axis
+        self.quantity = ValueInput.createByReal(3)
+        self.totalAngle = ValueInput.createByReal(2 * math.pi)
+        self.isSymmetric = False
+
+
+class CircularPatternFeatures(FeatureCollection):
+    _featureName = "CircularPattern"
+
+    def createInput(self, inputEntities, axis) -> CircularPatternFeatureInput:
+        return CircularPatternFeatureInput(inputEntities, axis)
+
+    def add(self, input: CircularPatternFeatureInput) -> CircularPatternFeature:
+        bodies, features = _patternEntities(input.inputEntities)
+        origin, direction = _axisOf(input.axis)
+        count = int(round(input.quantity.realValue))
+        if count < 1:
+            raise RuntimeError("3 : The pattern quantity must be at least 1")
+        totalAngle = input.totalAngle.realValue
+        step = totalAngle / count if math.isclose(abs(totalAngle), 2 * math.pi) else totalAngle / max(1, count - 1)
+        transforms = []
+        for i in range(1, count):
+            matrix = Matrix3D()
+            matrix.setToRotation(step * i, _vector(direction), _point(origin))
+            transforms.append(matrix)
+        feature = CircularPatternFeature(self, input, transforms)
+        _replicate(feature, bodies, features, transforms)
+        return self._append(feature)
+
+
+class MoveFeatureInput(ApiObject):
+    def __init__(self, inputEntities):
+        self.inputEntities = inputEntities
+        self.isGroup = False
+        self._transform = Matrix3D()
+
+    @property
+    def transform(self) -> Matrix3D:
+        return self._transform
+
+    @transform.setter
+    def transform(self, value: Matrix3D):
+        self._transform = value
+
+    def defineAsFreeMove(self, transform: Matrix3D) -> bool:
+        self._transform = transform
+        return True
+
+    def defineAsTranslateXYZ(
+        self, xDistance: ValueInput, yDistance: ValueInput, zDistance: ValueInput, isDirectionAlongComponent: bool
+    ) -> bool:
+        self._transform = Matrix3D()
+        self._transform.translation = Vector3D(xDistance.realValue, yDistance.realValue, zDistance.realValue)
+        return True
+
+
+class MoveFeature(Feature):
+    pass
+
+
+class MoveFeatures(FeatureCollection):
+    _featureName = "Move"
+
+    def createInput2(self, inputEntities: ObjectCollection) -> MoveFeatureInput:
+        return MoveFeatureInput(inputEntities)
+
+    def createInput(self, inputEntities: ObjectCollection, transform: Matrix3D) -> MoveFeatureInput:
+        input = MoveFeatureInput(inputEntities)
+        input.transform = transform
+        return input
+
+    def add(self, input: MoveFeatureInput) -> MoveFeature:
+        feature = MoveFeature(self, input)
+        for body in input.inputEntities:
+            body._transform(input.transform)
+            feature._bodies.append(body)
+        return self._append(feature)
+
+
+class CopyPasteBody(Feature):
+    pass
+
+
+class CopyPasteBodies(FeatureCollection):
+    _featureName = "CopyPasteBody"
+
+    def add(self, sourceBody) -> CopyPasteBody:
+        sources = list(sourceBody) if isinstance(sourceBody, ObjectCollection) else [sourceBody]
+        feature = CopyPasteBody(self, sourceBody)
+        feature._bodies = [body._copy(Matrix3D()) for body in sources]
+        return self._append(feature)
+
+
+class SplitBodyFeatureInput(ApiObject):
+    def __init__(self, splitBodies, splittingTool, isSplittingToolExtended: bool):
+        self.splitBodies = splitBodies
+        self.splittingTool = splittingTool
+        self.isSplittingToolExtended = isSplittingToolExtended
+
+
+class SplitBodyFeature(Feature):
+    pass
+
+
+class SplitBodyFeatures(FeatureCollection):
+    _featureName = "SplitBody"
+
+    def createInput(self, splitBodies, splittingTool, isSplittingToolExtended: bool) -> SplitBodyFeatureInput:
+        return SplitBodyFeatureInput(splitBodies, splittingTool, isSplittingToolExtended)
+
+    def add(self, input: SplitBodyFeatureInput) -> SplitBodyFeature:
+        if input.splittingTool is None or input.splitBodies is None:
+            raise RuntimeError("3 : The split body input is not defined")
+        plane = _planeOf(input.splittingTool)
+        origin, normal = plane.origin.asArray(), _unit(plane.normal.asArray())
+        bodies = list(input.splitBodies) if isinstance(input.splitBodies, ObjectCollection) else [input.splitBodies]
+
+        feature = SplitBodyFeature(self, input)
+        for body in bodies:
+            feature._bodies.append(body)
+            above, keep = [], []
+            for face in body._faces:
+                distances = [_dot(_sub(p, origin), normal) for e in face._edges for p in e._points] or [
+                    _dot(_sub(face._pointOnFace, origin), normal)
+                ]
+                if min(distances) > 1e-6:
+                    above.append(face)
+                elif max(distances) > 1e-6 and min(distances) < -1e-6:
+                    # crossing the splitting tool, both sides get a piece of it
+                    keep.append(face)
+                    above.append(face._transformed(Matrix3D(), {}))
+                else:
+                    keep.append(face)
+            if not above or not keep:
+                continue
+            box = body.boundingBox
+            total = _dot(_sub(box.maxPoint.asArray(), box.minPoint.asArray()), tuple(abs(n) for n in normal)) or 1.0
+            ratio = max(0.0, min(1.0, _dot(_sub(box.maxPoint.asArray(), origin), normal) / total))
+            newBody = body._component._newBody()
+            newBody._addFaces(above)
+            newBody._volume = body._volume * ratio
+            newBody._resetPieces()
+            body._faces = []
+            body._addFaces(keep)
+            body._volume -= newBody._volume
+            body._resetPieces()
+            feature._bodies.append(newBody)
+        return self._append(feature)
+
+
+class CombineFeatureInput(ApiObject):
+    def __init__(self, targetBody: BRepBody, toolBodies: ObjectCollection):
+        self.targetBody = targetBody
+        self.toolBodies = toolBodies
+        self.operation = FeatureOperations.JoinFeatureOperation
+        self.isNewComponent = False
+        self.isKeepToolBodies = False
+
+
+class CombineFeature(Feature):
+    pass
+
+
+class CombineFeatures(FeatureCollection):
+    _featureName = "Combine"
+
+    def createInput(self, targetBody: BRepBody, toolBodies: ObjectCollection) -> CombineFeatureInput:
+        return CombineFeatureInput(targetBody, toolBodies)
+
+    def add(self, input: CombineFeatureInput) -> CombineFeature:
+        if input.targetBody is None or not input.toolBodies.count:
+            raise RuntimeError("3 : The combine input is not defined")
+        feature = CombineFeature(self, input)
+        target = input.targetBody
+        for tool in input.toolBodies:
+            edgeMap = {}
+            faces = [f._transformed(Matrix3D(), edgeMap) for f in tool._faces]
+            if input.operation == FeatureOperations.JoinFeatureOperation:
+                if target._volume > 0 and not target._pieces:
+                    target._resetPieces()
+                target._pieces.extend(tool._mappedPieces(faces) if tool._pieces else [[faces, tool._volume]])
+                target._volume += tool._volume
+            elif input.operation == FeatureOperations.CutFeatureOperation:
+                target._cut(tool.boundingBox, tool._volume)
+            else:
+                target._setVolume(min(target._volume, tool._volume))
+            target._addFaces(faces)
+            if not input.isKeepToolBodies:
+                tool._component._removeBody(tool)
+        feature._bodies = [target]
+        return self._append(feature)
+
+
+class HoleFeatureInput(ApiObject):
+    def __init__(self, diameter: float):
+        self.diameter = diameter
+        self.participantBodies = None
+        self.isDefaultDirection = True
+        self._points = []
+        self._depth = None
+
+    def setPositionBySketchPoints(self, sketchPoints: ObjectCollection) -> bool:
+        self._points = [(p._sketch, p._sketch._toWorld(p._point)) for p in sketchPoints]
+        return True
+
+    def setPositionBySketchPoint(self, sketchPoint: SketchPoint) -> bool:
+        return self.setPositionBySketchPoints(ObjectCollection([sketchPoint]))
+
+    def setDistanceExtent(self, distance: ValueInput) -> bool:
+        self._depth = distance.realValue
+        return True
+
+    def setAllExtent(self, direction=None) -> bool:
+        self._depth = 1000.0
+        return True
+
+
+class HoleFeature(Feature):
+    def setToCountersink(self, countersinkDiameter: ValueInput, countersinkAngle: ValueInput) -> bool:
+        self.countersinkDiameter = countersinkDiameter.realValue
+        self.countersinkAngle = countersinkAngle.realValue
+        return True
+
+    def setToCounterbore(self, counterboreDiameter: ValueInput, counterboreDepth: ValueInput) -> bool:
+        self.counterboreDiameter = counterboreDiameter.realValue
+        self.counterboreDepth = counterboreDepth.realValue
+        return True
+
+    def setToSimple(self) -> bool:
+        return True
+
+
+class HoleFeatures(FeatureCollection):
+    _featureName = "Hole"
+
+    def createSimpleInput(self, holeDiameter: ValueInput) -> HoleFeatureInput:
+        return HoleFeatureInput(holeDiameter.realValue)
+
+    def add(self, input: HoleFeatureInput) -> HoleFeature:
+        if not input._points or input._depth is None:
+            raise RuntimeError("3 : The hole position or extent is not defined")
+        feature = HoleFeature(self, input)
+        radius = input.diameter / 2
+        faces = []
+        for sketch, center in input._points:
+            # holes go into the face the sketch is on
+            direction = _scale(sketch._plane.normal.asArray(), -input._depth)
+            top = BRepEdge("circle", _circlePoints(center, sketch._plane.normal.asArray(), radius), closed=True)
+            bottom = BRepEdge("circle", [_add(p, direction) for p in top._points], closed=True)
+            middle = _add(_add(center, _scale(direction, 0.5)), (radius, 0.0, 0.0))
+            faces.append(
+                BRepFace(Cylinder(_point(center), _vector(_unit(direction)), radius), top.length * input._depth, middle, [top, bottom])
+            )
+        _applyOperation(
+            feature,
+            FeatureOperations.CutFeatureOperation,
+            faces,
+            math.pi * radius * radius * input._depth * len(faces),
+            input.participantBodies,
+        )
+        return self._append(feature)
+
+
+class Features(ApiObject):
+    def __init__(self, component: "Component"):
+        self.extrudeFeatures = ExtrudeFeatures(component)
+        self.sweepFeatures = SweepFeatures(component)
+        self.revolveFeatures = RevolveFeatures(component)
+        self.loftFeatures = LoftFeatures(component)
+        self.filletFeatures = FilletFeatures(component)
+        self.chamferFeatures = ChamferFeatures(component)
+        self.rectangularPatternFeatures = RectangularPatternFeatures(component)
+        self.circularPatternFeatures = CircularPatternFeatures(component)
+        self.moveFeatures = MoveFeatures(component)
+        self.copyPasteBodies = CopyPasteBodies(component)
+        self.splitBodyFeatures = SplitBodyFeatures(component)
+        self.combineFeatures = CombineFeatures(component)
+        self.holeFeatures = HoleFeatures(component)
+
+    def createPath(self, curve, isChain: bool = True) -> Path:
+        return Path.create(curve)
+
+    @property
+    def count(self) -> int:
+        return sum(c.count for c in self._collections())
+
+    def _collections(self) -> list:
+        return [v for v in vars(self).values() if isinstance(v, FeatureCollection)]
+
+
+############################################
+# Components
+############################################
+
+
+class Occurrence(ApiObject):
+    def __init__(self, parent: "Component", component: "Component", transform: Matrix3D):
+        self._parent = parent
+        self._component = component
+        self._index = 1
+        self.transform = transform
+        self.isLightBulbOn = True
+        self.isGrounded = False
+
+    @property
+    def component(self) -> "Component":
+        return self._component
+
+    @property
+    def name(self) -> str:
+        return f"{self._component.name}:{self._index}"
+
+    @property
+    def bRepBodies(self) -> BRepBodies:
+        return self._component.bRepBodies
+
+    @property
+    def sourceComponent(self) -> "Component":
+        return self._parent
+
+    @property
+    def transform2(self) -> Matrix3D:
+        return self.transform.copy()
+
+    @transform2.setter
+    def transform2(self, value: Matrix3D):
+        self.transform = value.copy()
+
+    @property
+    def isVisible(self) -> bool:
+        return self.isLightBulbOn
+
+    def activate(self) -> bool:
+        self._component._design.activeComponent = self._component
+        return True
+
+    def deleteMe(self) -> bool:
+        self._parent.occurrences._items.remove(self)
+        # the component is deleted with its last occurrence
+        self._component._occurrenceCount -= 1
+        if self._component._occurrenceCount == 0:
+            for child in list(self._component.occurrences):
+                child.deleteMe()
+            self._component._design._removeComponent(self._component)
+        self.__dict__["_deleted"] = True
+        return True
+
+
+class Occurrences(ReadOnlyCollection):
+    def __init__(self, component: "Component"):
+        super().__init__()
+        self._component = component
+
+    def addNewComponent(self, transform: Matrix3D) -> Occurrence:
+        design = self._component._design
+        component = Component(design, f"Component{len(design._components)}")
+        design._components.append(component)
+        occurrence = Occurrence(self._component, component, transform)
+        component._occurrenceCount += 1
+        self._items.append(occurrence)
+        design.timeline._append(occurrence)
+        return occurrence
+
+    def addExistingComponent(self, component: "Component", transform: Matrix3D) -> Occurrence:
+        occurrence = Occurrence(self._component, component, transform)
+        component._occurrenceCount += 1
+        occurrence._index = component._occurrenceCount
+        self._items.append(occurrence)
+        self._component._design.timeline._append(occurrence)
+        return occurrence
+
+    def itemByName(self, name: str) -> Occurrence:
+        return next((o for o in self._items if o.name == name), None)
+
+
+class Component(ApiObject):
+    def __init__(self, design: "Design", name: str):
+        self._design = design
+        self._name = name
+        self._bodies = []
+        self._bodyCounter = 0
+        self._occurrenceCount = 0
+        self.occurrences = Occurrences(self)
+        self.sketches = Sketches(self)
+        self.features = Features(self)
+        self.constructionPlanes = ConstructionPlanes(self)
+        self.customGraphicsGroups = CustomGraphicsGroups([])
+        self.xYConstructionPlane = ConstructionPlane(self, "XY", Plane(Point3D(), Vector3D(0, 0, 1), Vector3D(1, 0, 0), Vector3D(0, 1, 0)))
+        # the sketch Y axis of the XZ plane is the world -Z
+        self.xZConstructionPlane = ConstructionPlane(self, "XZ", Plane(Point3D(), Vector3D(0, 1, 0), Vector3D(1, 0, 0), Vector3D(0, 0, -1)))
+        self.yZConstructionPlane = ConstructionPlane(self, "YZ", Plane(Point3D(), Vector3D(1, 0, 0), Vector3D(0, 0, -1), Vector3D(0, 1, 0)))
+        self.xConstructionAxis = ConstructionAxis(self, "X", (0.0, 0.0, 0.0), (1.0, 0.0, 0.0))
+        self.yConstructionAxis = ConstructionAxis(self, "Y", (0.0, 0.0, 0.0), (0.0, 1.0, 0.0))
+        self.zConstructionAxis = ConstructionAxis(self, "Z", (0.0, 0.0, 0.0), (0.0, 0.0, 1.0))
+        self.originConstructionPoint = ConstructionPoint(self, "Origin", (0.0, 0.0, 0.0))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def parentDesign(self) -> "Design":
+        return self._design
+
+    @property
+    def bRepBodies(self) -> BRepBodies:
+        return BRepBodies(self._bodies)
+
+    @property
+    def allOccurrences(self) -> ReadOnlyCollection:
+        occurrences = []
+        for occurrence in self.occurrences:
+            occurrences.append(occurrence)
+            occurrences.extend(occurrence.component.allOccurrences)
+        return ReadOnlyCollection(occurrences)
+
+    @property
+    def isBodiesFolderLightBulbOn(self) -> bool:
+        return True
+
+    def _newBody(self) -> BRepBody:
+        self._bodyCounter += 1
+        body = BRepBody(self, f"Body{self._bodyCounter}")
+        self._bodies.append(body)
+        return body
+
+    def _removeBody(self, body: BRepBody):
+        if body in self._bodies:
+            self._bodies.remove(body)
+        body.__dict__["_deleted"] = True
+
+
+############################################
+# Design
+############################################
+
+
+class TimelineObject(ApiObject):
+    def __init__(self, timeline: "Timeline", entity):
+        self._timeline = timeline
+        self.entity = entity
+        self.isSuppressed = False
+
+    @property
+    def index(self) -> int:
+        return self._timeline._items.index(self)
+
+    @property
+    def name(self) -> str:
+        return getattr(self.entity, "name", "")
+
+    @property
+    def isRolledBack(self) -> bool:
+        return self.index >= self._timeline.markerPosition
+
+    @property
+    def healthState(self) -> int:
+        return getattr(self.entity, "healthState", FeatureHealthStates.HealthyFeatureHealthState)
+
+    def rollTo(self, rollBefore: bool) -> bool:
+        self._timeline.markerPosition = self.index if rollBefore else self.index + 1
+        return True
+
+
+class Timeline(ReadOnlyCollection):
+    def __init__(self):
+        super().__init__()
+        self.markerPosition = 0
+        # a direct design doesn't capture history
+        self._isCapturing = True
+
+    def moveToEnd(self) -> bool:
+        self.markerPosition = len(self._items)
+        return True
+
+    def deleteAllAfterMarker(self) -> bool:
+        for timelineObject in self._items[self.markerPosition :]:
+            timelineObject.entity.__dict__["_deleted"] = True
+        del self._items[self.markerPosition :]
+        return True
+
+    def _append(self, entity):
+        if not self._isCapturing:
+            return
+        atEnd = self.markerPosition == len(self._items)
+        self._items.insert(self.markerPosition, TimelineObject(self, entity))
+        if atEnd or self.markerPosition < len(self._items):
+            self.markerPosition += 1
+
+    def _objectOf(self, entity) -> TimelineObject:
+        return next((t for t in self._items if t.entity is entity), None)
+
+    def _remove(self, entity):
+        timelineObject = self._objectOf(entity)
+        if timelineObject is not None:
+            index = timelineObject.index
+            self._items.remove(timelineObject)
+            if index < self.markerPosition:
+                self.markerPosition -= 1
+
+
+class UserParameter(ApiObject):
+    def __init__(self, parameters: "UserParameters", name: str, expression: str, value: float, unit: str, comment: str):
+        self._parameters = parameters
+        self._name = name
+        self._expression = expression
+        self._value = value
+        self.unit = unit
+        self.comment = comment
+        self.isFavorite = False
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        self._value = value
+        self._expression = f"{value:g} {self.unit}".strip()
+
+    @property
+    def expression(self) -> str:
+        return self._expression
+
+    @expression.setter
+    def expression(self, expression: str):
+        self._expression = expression
+        self._value = self._parameters._evaluate(expression)
+
+    def deleteMe(self) -> bool:
+        self._parameters._items.remove(self)
+        self.__dict__["_deleted"] = True
+        return True
+
+
+class UserParameters(ReadOnlyCollection):
+    def add(self, name: str, value: ValueInput, units: str, comment: str) -> UserParameter:
+        if self.itemByName(name) is not None:
+            raise RuntimeError(f"3 : A parameter with the name '{name}' already exists")
+        if value.valueType == 1:
+            expression = value.stringValue
+            parsed = self._evaluate(expression)
+        else:
+            parsed = value.realValue
+            expression = f"{parsed:g} {units}".strip()
+        parameter = UserParameter(self, name, expression, parsed, units, comment)
+        self._items.append(parameter)
+        return parameter
+
+    def itemByName(self, name: str) -> UserParameter:
+        return next((p for p in self._items if p.name == name), None)
+
+    def _evaluate(self, expression: str) -> float:
+        """
+        Evaluates simple expressions: numbers, units and references to the other parameters.
+        """
+        names = {p.name: p.value for p in self._items}
+        cleaned = expression
+        for unit in ("mm", "cm", "deg", "in"):
+            cleaned = cleaned.replace(f" {unit}", "")
+        try:
+            return float(eval(cleaned, {"__builtins__": {}, "math": math}, names))
+        except Exception:
+            return 0.0
+
+
+class ExportOptions(ApiObject):
+    def __init__(self, kind: str, filename: str, geometry):
+        self.kind = kind
+        self.filename = filename
+        self.geometry = geometry
+        self.meshRefinement = MeshRefinementSettings.MeshRefinementMedium
+        self.isBinaryFormat = True
+        self.isOneFilePerBody = False
+        self.sendToPrintUtility = False
+
+
+class ExportManager(ApiObject):
+    """
+    The exports write a small text file describing what would have been exported, so the pipelines can be run headless.
+    """
+
+    def __init__(self, design: "Design"):
+        self._design = design
+        self.exported = []
+
+    def createSTEPExportOptions(self, filename: str, geometry=None) -> ExportOptions:
+        return ExportOptions("STEP", filename, geometry or self._design.rootComponent)
+
+    def createSTLExportOptions(self, geometry, filename: str = "") -> ExportOptions:
+        return ExportOptions("STL", filename, geometry)
+
+    def createIGESExportOptions(self, filename: str, geometry=None) -> ExportOptions:
+        return ExportOptions("IGES", filename, geometry or self._design.rootComponent)
+
+    def createF3DExportOptions(self, filename: str, geometry=None) -> ExportOptions:
+        return ExportOptions("F3D", filename, geometry or self._design.rootComponent)
+
+    def createC3MFExportOptions(self, geometry, filename: str = "") -> ExportOptions:
+        return ExportOptions("3MF", filename, geometry)
+
+    def execute(self, exportOptions: ExportOptions) -> bool:
+        geometry = exportOptions.geometry
+        if isinstance(geometry, BRepBody):
+            components = []
+            occurrences = []
+            bodies = [geometry]
+        else:
+            # an occurrence or a component is exported with its sub-components
+            component = geometry.component if isinstance(geometry, Occurrence) else geometry
+            # the instances of an assembly reference their component, its bodies are written once
+            occurrences = list(component.allOccurrences)
+            if component is self._design.rootComponent:
+                components = list(self._design._components)
+            else:
+                components = [component] + list({id(o.component): o.component for o in occurrences}.values())
+            bodies = [b for c in components for b in c._bodies]
+        self.exported.append((exportOptions.kind, exportOptions.filename, len(bodies)))
+        if exportOptions.filename:
+            folder = os.path.dirname(exportOptions.filename)
+            if folder and not os.path.isdir(folder):
+                raise RuntimeError(f"2 : The folder '{folder}' doesn't exist")
+            with open(exportOptions.filename, "w") as file:
+                file.write(f"fake {exportOptions.kind} export\n")
+                for body in bodies:
+                    file.write(f"{body.parentComponent.name}/{body.name} faces={len(body._faces)} volume={body.volume:.6f}\n")
+                for occurrence in occurrences:
+                    file.write(f"{occurrence.name} -> {occurrence.component.name} {occurrence.transform.translation.asArray()}\n")
+        return True
+
+
+class Design(ApiObject):
+    def __init__(self):
+        self._components = []
+        self.timeline = Timeline()
+        self.userParameters = UserParameters()
+        self.exportManager = ExportManager(self)
+        self.appearances = Appearances()
+        self._designType = DesignTypes.ParametricDesignType
+        self.rootComponent = Component(self, "root")
+        self._components.append(self.rootComponent)
+        self.activeComponent = self.rootComponent
+
+    @property
+    def allComponents(self) -> ReadOnlyCollection:
+        return ReadOnlyCollection(self._components)
+
+    @property
+    def designType(self) -> int:
+        return self._designType
+
+    @designType.setter
+    def designType(self, value: int):
+        # switching to direct modeling drops the history, the features already built stay as base features
+        if value == DesignTypes.DirectDesignType:
+            self.timeline._items.clear()
+            self.timeline.markerPosition = 0
+        self.timeline._isCapturing = value == DesignTypes.ParametricDesignType
+        self._designType = value
+
+    def _removeComponent(self, component: Component):
+        if component in self._components:
+            self._components.remove(component)
+        for body in list(component._bodies):
+            component._removeBody(body)
+        # the features of the deleted component disappear from the timeline
+        for timelineObject in list(self.timeline._items):
+            entity = timelineObject.entity
+            owner = getattr(entity, "_component", None)
+            bodies = getattr(entity, "_bodies", None)
+            if owner is component or (bodies and all(b._component is component for b in bodies)):
+                self.timeline._remove(entity)
+
+    @fakeOnly
+    def bodyList(self) -> list:
+        """
+        Returns:
+            list: All the bodies of the design.
+        """
+        return [b for c in self._components for b in c._bodies]
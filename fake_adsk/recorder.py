@@ -0,0 +1,216 @@
+import functools
+import itertools
+import json
+from collections import Counter
+from typing import Callable
+
+# Every public call made on a fake API object is logged here with its arguments, so the headless runs can be
+# asserted (feature counts, names, values) and their pure Python overhead measured.
+
+
+class Operation:
+    """
+    A call made on a fake API object
+    index: The position of the call in the log
+    target: The name of the class of the called object
+    name: The name of the method, or "<property>=" for a property assignment
+    args: The positional arguments
+    kwargs: The keyword arguments
+    """
+
+    __slots__ = ("index", "target", "name", "args", "kwargs")
+
+    def __init__(self, index: int, target: str, name: str, args: tuple, kwargs: dict):
+        self.index = index
+        self.target = target
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def qualifiedName(self) -> str:
+        return f"{self.target}.{self.name}"
+
+    def __str__(self) -> str:
+        arguments = [describe(a) for a in self.args] + [f"{k}={describe(v)}" for k, v in self.kwargs.items()]
+        return f"{self.qualifiedName}({', '.join(arguments)})"
+
+    def __repr__(self) -> str:
+        return f"<Operation {self.index} {self}>"
+
+
+_uids = itertools.count(1)
+
+
+def uid(obj) -> int:
+    """
+    Returns:
+        int: A short identifier of a fake object, stable for the life of the object.
+    """
+    try:
+        return obj.__dict__["_uid"]
+    except KeyError:
+        obj.__dict__["_uid"] = next(_uids)
+        return obj.__dict__["_uid"]
+
+
+def describe(value) -> str:
+    """
+    Formats an argument for the log, fake objects are shown with their class and identifier.
+    """
+    if isinstance(value, ApiObject):
+        name = value.__dict__.get("_name")
+        return f"<{type(value).__name__}#{uid(value)}{' ' + repr(name) if name else ''}>"
+    if isinstance(value, float):
+        return f"{value:g}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(describe(v) for v in value) + "]"
+    return repr(value)
+
+
+class Recorder:
+    """
+    The log of the calls made on the fake API
+    operations: The recorded operations, in call order
+    enabled: When False, nothing is recorded
+    """
+
+    def __init__(self):
+        self.operations = []
+        self.enabled = True
+        self.depth = 0
+
+    def record(self, target: str, name: str, args: tuple, kwargs: dict):
+        self.operations.append(Operation(len(self.operations), target, name, args, kwargs))
+
+    def clear(self):
+        self.operations = []
+
+    def count(self, name: str = None) -> int:
+        """
+        Counts the recorded operations.
+
+        Args:
+            name (str, optional): A method name ("add") or a qualified name ("ExtrudeFeatures.add"). Defaults to all.
+
+        Returns:
+            int: The number of matching operations.
+        """
+        if name is None:
+            return len(self.operations)
+        if "." in name:
+            return sum(1 for o in self.operations if o.qualifiedName == name)
+        return sum(1 for o in self.operations if o.name == name)
+
+    def counts(self) -> Counter:
+        """
+        Returns:
+            Counter: The number of operations per qualified name.
+        """
+        return Counter(o.qualifiedName for o in self.operations)
+
+    def find(self, name: str) -> list:
+        """
+        Returns:
+            list: The operations matching a method name or a qualified name.
+        """
+        if "." in name:
+            return [o for o in self.operations if o.qualifiedName == name]
+        return [o for o in self.operations if o.name == name]
+
+    def dump(self, path: str):
+        """
+        Writes the log as JSON lines, one operation per line.
+        """
+        with open(path, "w") as file:
+            for o in self.operations:
+                file.write(json.dumps({"index": o.index, "call": o.qualifiedName, "args": [describe(a) for a in o.args]}) + "\n")
+
+
+RECORDER = Recorder()
+
+
+def fakeOnly(function: Callable) -> Callable:
+    """
+    Marks a method that doesn't exist in the real API (test helpers), it is not recorded.
+    """
+    function._fakeOnly = True
+    return function
+
+
+def _recordedCall(target: str, name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        recorder = RECORDER
+        # only the calls made by the add-in are logged, not the calls made by the fake itself
+        if recorder.depth or not recorder.enabled:
+            return function(*args, **kwargs)
+        if args and isinstance(args[0], ApiObject):
+            # logged under the class of the object, not the base class defining the method
+            recorder.record(type(args[0]).__name__, name, args[1:], kwargs)
+        else:
+            recorder.record(target, name, args, kwargs)
+        recorder.depth += 1
+        try:
+            return function(*args, **kwargs)
+        finally:
+            recorder.depth -= 1
+
+    return wrapper
+
+
+def _recordedSetter(name: str, setter: Callable) -> Callable:
+    @functools.wraps(setter)
+    def wrapper(self, value):
+        recorder = RECORDER
+        if not recorder.depth and recorder.enabled:
+            recorder.record(type(self).__name__, f"{name}=", (value,), {})
+        setter(self, value)
+
+    return wrapper
+
+
+_PACKAGE = __name__.rsplit(".", 1)[0]
+
+
+class ApiObject:
+    """
+    Base of the fake API classes. The public methods and property setters of the subclasses are recorded.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the add-in subclasses (event handlers) are not part of the API
+        if not cls.__module__.startswith(_PACKAGE):
+            return
+        target = cls.__name__
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith("_") or getattr(attribute, "_fakeOnly", False):
+                continue
+            if isinstance(attribute, property):
+                if attribute.fset is not None:
+                    setter = _recordedSetter(name, attribute.fset)
+                    setattr(cls, name, property(attribute.fget, setter, attribute.fdel, attribute.__doc__))
+            elif isinstance(attribute, staticmethod):
+                if not getattr(attribute.__func__, "_fakeOnly", False):
+                    setattr(cls, name, staticmethod(_recordedCall(target, name, attribute.__func__)))
+            elif isinstance(attribute, classmethod):
+                if not getattr(attribute.__func__, "_fakeOnly", False):
+                    setattr(cls, name, classmethod(_recordedCall(target, name, attribute.__func__)))
+            elif callable(attribute) and not isinstance(attribute, type):
+                setattr(cls, name, _recordedCall(target, name, attribute))
+
+    @classmethod
+    def cast(cls, obj):
+        return obj if isinstance(obj, cls) else None
+
+    @property
+    def objectType(self) -> str:
+        return f"adsk::{type(self).__module__.rsplit('.', 1)[-1]}::{type(self).__name__}"
+
+    @property
+    def isValid(self) -> bool:
+        return not self.__dict__.get("_deleted", False)
+
+    def __repr__(self) -> str:
+        return describe(self)
@@ -43,7 +43,11 @@ def stl_wall_generation():
         app.log("calling addin...", adsk.core.LogLevels.InfoLogLevel, adsk.core.LogTypes.ConsoleLogType)
 
         design = app.activeProduct
-        design.userParameters.itemByName("script_exportPath").comment = base_path
+        # the add-in reads the export folder from this user parameter
+        exportPath = design.userParameters.itemByName("script_exportPath")
+        if not exportPath:
+            exportPath = design.userParameters.add("script_exportPath", adsk.core.ValueInput.createByString("path"), "", "")
+        exportPath.comment = base_path
         cmdDef.execute()
 
 
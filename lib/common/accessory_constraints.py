@@ -0,0 +1,261 @@
+import math
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Iterable
+
+from ...lib.common.accessory_parameters import (
+    AnchorParameters,
+    HookParameters,
+    InsertParameters,
+    MainScrewParameters,
+    ShelfInsertParameters,
+    ShelfParameters,
+)
+from ...lib.common.shelf_sizing import shelfFit
+
+# NNWS constants
+from ...lib.common.nnws_constants import (
+    ACC_ANCHOR_TOP_OFFSET_CM,
+    MIN_SHELF_SIZE_CM,
+    MIN_SHELF_THICKNESS_CM,
+    WALL_INNER_SECTION_OFFSET_CM,
+    WALL_THICKNESS_CM,
+)
+
+# Maximum clearance allowed for the accessories
+MAX_CLEARANCE_CM = 0.025
+
+# Minimum size of the hook and the main screw height
+MIN_HOOK_SIZE_CM = 0.75
+MIN_MAIN_SCREW_HEIGHT_CM = 0.75
+
+
+class Severity(Enum):
+    """
+    ERROR: The part can't be generated with these parameters
+    WARNING: The part can be generated, but some features are skipped
+    """
+
+    ERROR = "error"
+    WARNING = "warning"
+
+
+@dataclass(frozen=True, slots=True)
+class Constraint:
+    """
+    A validity rule on a parameter snapshot
+    name: The unique name of the rule
+    message: The message shown to the user when the rule is violated
+    isValid: The predicate taking the parameter snapshot, True when the rule is respected
+    severity: The severity of a violation
+    """
+
+    name: str
+    message: str
+    isValid: Callable
+    severity: Severity = Severity.ERROR
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """
+    A violated constraint
+    name: The name of the violated rule
+    message: The message of the violated rule
+    severity: The severity of the violation
+    """
+
+    name: str
+    message: str
+    severity: Severity
+
+
+class InfeasibleParametersError(ValueError):
+    """
+    Raised when a generation is requested for parameters that violate at least one error constraint
+    """
+
+    def __init__(self, params, violations: list):
+        self.params = params
+        self.violations = violations
+        super().__init__(f"{type(params).__name__}: " + " ".join(v.message for v in violations))
+
+
+def _clearanceConstraint(screw) -> Constraint:
+    return Constraint(
+        "clearance",
+        f"The clearance must be between 0 and {MAX_CLEARANCE_CM * 10:g} mm.",
+        lambda p: 0 <= screw(p).clearance <= MAX_CLEARANCE_CM,
+    )
+
+
+def _insertConstraints(insert) -> tuple:
+    return (
+        _clearanceConstraint(lambda p: insert(p).screw),
+        Constraint("trimTop", "The Top/Right width must be greater than 0.", lambda p: insert(p).trimTop > 0),
+        Constraint("trimBottom", "The Bottom/Left width must be greater than 0.", lambda p: insert(p).trimBottom > 0),
+        Constraint("extraSpacing", "The extra spacing can't be negative.", lambda p: insert(p).extraSpacing >= 0),
+    )
+
+
+CONSTRAINTS = {
+    MainScrewParameters: (
+        _clearanceConstraint(lambda p: p.screw),
+        Constraint(
+            "mainScrewHeight",
+            f"The main screw height must be at least {MIN_MAIN_SCREW_HEIGHT_CM * 10:g} mm.",
+            lambda p: p.height >= MIN_MAIN_SCREW_HEIGHT_CM,
+        ),
+    ),
+    InsertParameters: _insertConstraints(lambda p: p)
+    + (Constraint("insertCount", "The insert counts must be at least 1.", lambda p: p.xCount >= 1 and p.yCount >= 1),),
+    ShelfParameters: _insertConstraints(lambda p: p.insert)
+    + (
+        Constraint(
+            "shelfDepth", f"The shelf depth must be at least {MIN_SHELF_SIZE_CM * 10:g} mm.", lambda p: p.depth >= MIN_SHELF_SIZE_CM
+        ),
+        Constraint(
+            "shelfLength", f"The shelf length must be at least {MIN_SHELF_SIZE_CM * 10:g} mm.", lambda p: p.length >= MIN_SHELF_SIZE_CM
+        ),
+        Constraint(
+            "shelfAttachment",
+            "The shelf is too short for the number of inserts, the outer inserts would not be attached.",
+            lambda p: shelfFit(p.insert.xCount, p.length).isAttached,
+        ),
+        Constraint(
+            "shelfFrame",
+            "The shelf is too small for the rounded corners of its frame.",
+            lambda p: shelfFit(p.insert.xCount, p.length).sketchFits(p.depth),
+        ),
+        Constraint(
+            "shelfFillet",
+            "The shelf is too small for the number of inserts, could not calculate fillet.",
+            lambda p: shelfFit(p.insert.xCount, p.length).edgeFillet,
+            Severity.WARNING,
+        ),
+    ),
+    ShelfInsertParameters: (
+        _clearanceConstraint(lambda p: p.screw),
+        Constraint(
+            "shelfInsertThickness",
+            f"The shelf thickness must be at least {MIN_SHELF_THICKNESS_CM * 10:g} mm.",
+            lambda p: p.thickness >= MIN_SHELF_THICKNESS_CM,
+        ),
+        Constraint(
+            "shelfInsertDepth", f"The shelf depth must be at least {MIN_SHELF_SIZE_CM * 10:g} mm.", lambda p: p.depth >= MIN_SHELF_SIZE_CM
+        ),
+        Constraint(
+            "shelfInsertLength",
+            f"The shelf length must be at least {MIN_SHELF_SIZE_CM * 10:g} mm.",
+            lambda p: p.length >= MIN_SHELF_SIZE_CM,
+        ),
+    ),
+    HookParameters: _insertConstraints(lambda p: p.insert)
+    + (
+        Constraint("hookLength", "The hook length can't be negative.", lambda p: p.length >= 0),
+        Constraint("hookMinSize", f"The hook size must be at least {MIN_HOOK_SIZE_CM * 10:g} mm.", lambda p: p.size >= MIN_HOOK_SIZE_CM),
+        Constraint(
+            "hookMaxSize",
+            "The hook size can't be bigger than the sum of the trims.",
+            lambda p: p.size <= p.insert.trimTop + p.insert.trimBottom,
+        ),
+    ),
+    AnchorParameters: (
+        _clearanceConstraint(lambda p: p.screw),
+        Constraint("headDiameter", "The head diameter must be greater than 0.", lambda p: p.headDiameter > 0),
+        Constraint(
+            "countersinkAngle", "The countersink angle must be between 0 and 180 degrees.", lambda p: 0 < p.countersinkAngle < math.pi
+        ),
+        Constraint("holeDiameter", "The hole diameter must be greater than 0.", lambda p: p.holeDiameter > 0),
+        Constraint("countersink", "The hole diameter must be smaller than the head diameter.", lambda p: p.holeDiameter < p.headDiameter),
+        Constraint(
+            "anchorTopOffset",
+            "The clearance from the top of the anchor is too big.",
+            lambda p: p.topOffset < WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - ACC_ANCHOR_TOP_OFFSET_CM,
+        ),
+    ),
+}
+
+
+def validate(params) -> list:
+    """
+    Checks every constraint of the parameter snapshot, without stopping at the first violation.
+
+    Args:
+        params: The parameter snapshot of an accessory.
+
+    Returns:
+        list: The Violation list, empty when all the constraints are respected.
+    """
+    return validateMany([params])[0]
+
+
+def validateMany(paramsList: Iterable) -> list:
+    """
+    Checks every constraint on a whole batch of parameter snapshots, like all the combinations of a catalog.
+    The rules are evaluated one at a time over all the snapshots of the same type, and identical snapshots are only
+    evaluated once.
+
+    Args:
+        paramsList (Iterable): The parameter snapshots, of any accessory type.
+
+    Returns:
+        list: One Violation list per snapshot, in the same order.
+    """
+    paramsList = list(paramsList)
+
+    # group the unique snapshots by type
+    uniqueByType = {}
+    for params in paramsList:
+        uniqueByType.setdefault(type(params), {}).setdefault(params, [])
+
+    for paramsType, violationsByParams in uniqueByType.items():
+        uniqueParams = list(violationsByParams)
+        for constraint in CONSTRAINTS[paramsType]:
+            results = [constraint.isValid(p) for p in uniqueParams]
+            for params, isValid in zip(uniqueParams, results):
+                if not isValid:
+                    violationsByParams[params].append(Violation(constraint.name, constraint.message, constraint.severity))
+
+    return [list(uniqueByType[type(params)][params]) for params in paramsList]
+
+
+def errors(violations: list) -> list:
+    """
+    Filters the violations that prevent the generation.
+
+    Args:
+        violations (list): The violations of a snapshot.
+
+    Returns:
+        list: The violations with the ERROR severity.
+    """
+    return [v for v in violations if v.severity == Severity.ERROR]
+
+
+def isFeasible(params) -> bool:
+    """
+    Checks if the accessory can be generated with these parameters.
+
+    Args:
+        params: The parameter snapshot of an accessory.
+
+    Returns:
+        bool: True if no error constraint is violated.
+    """
+    return not errors(validate(params))
+
+
+def requireFeasible(params):
+    """
+    Raises before any geometry is built when the accessory can't be generated with these parameters.
+
+    Args:
+        params: The parameter snapshot of an accessory.
+
+    Raises:
+        InfeasibleParametersError: If at least one error constraint is violated.
+    """
+    violations = errors(validate(params))
+    if violations:
+        raise InfeasibleParametersError(params, violations)
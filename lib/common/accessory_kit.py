@@ -0,0 +1,120 @@
+import json
+from dataclasses import dataclass, fields, is_dataclass, replace
+from typing import Callable
+
+from ...lib.common.accessory_parameters import ScrewDimensions, defaultParameters
+
+# NNWS constants
+from ...lib.common.nnws_constants import MAIN_SCREW_BODY_CLEARANCE_CM
+
+# Kits of accessories generated in one command. A kit is a bill of materials, a line per accessory with its parameters
+# and its number of copies, read from the kit table of the accessory dialog or from a JSON file like
+#   {"clearance": 0.03, "items": [{"accessory": "Hook", "count": 4, "parameters": {"length": 5, "insert": {"notch": false}}}]}
+# where the parameters override the defaults of the accessory, named and in the units of the parameter snapshots (cm,
+# radians). All the lines share the screw dimensions of the kit clearance. Plain Python, no adsk import.
+
+
+@dataclass(frozen=True, slots=True)
+class KitItem:
+    """
+    A line of a kit
+    accessory: The accessory type, as in the accessory dropdown
+    count: The number of copies
+    params: The parameter snapshot of the accessory
+    """
+
+    accessory: str
+    count: int
+    params: object
+
+
+@dataclass(frozen=True, slots=True)
+class KitItemReport:
+    """
+    The generation of a line of a kit
+    accessory: The accessory type
+    count: The number of copies
+    seconds: The time of the line, the build of the accessory and the placement of its copies
+    shared: Whether the accessory was already built by a previous line with the same parameters
+    """
+
+    accessory: str
+    count: int
+    seconds: float
+    shared: bool
+
+
+def withOverrides(params, overrides: dict):
+    """
+    Args:
+        params: A parameter snapshot.
+        overrides (dict): field -> value, a dict for the fields holding a snapshot, like the insert of a hook.
+
+    Raises:
+        ValueError: When a field doesn't exist or can't be set.
+
+    Returns:
+        The snapshot with the overridden fields.
+    """
+    names = {f.name for f in fields(params) if f.init}
+    changes = {}
+    for name, value in overrides.items():
+        if name not in names:
+            raise ValueError(f"Unknown parameter '{name}' for {type(params).__name__}, expected one of {', '.join(sorted(names))}")
+        current = getattr(params, name)
+        if is_dataclass(current):
+            if not isinstance(value, dict):
+                raise ValueError(f"The parameter '{name}' of {type(params).__name__} expects its own parameters")
+            value = withOverrides(current, value)
+        changes[name] = value
+    return replace(params, **changes)
+
+
+def parseKit(data: dict, defaults: Callable[[str, ScrewDimensions], object] = defaultParameters) -> list:
+    """
+    Args:
+        data (dict): The kit, as described at the top of the module.
+        defaults (Callable, optional): (accessory, screw) -> the default parameter snapshot, None when the accessory is
+            unknown. Defaults to the defaults of the dialog.
+
+    Raises:
+        ValueError: When the kit is not valid.
+
+    Returns:
+        list: The KitItem of the lines with copies, in the order of the kit.
+    """
+    screw = ScrewDimensions(data.get("clearance", MAIN_SCREW_BODY_CLEARANCE_CM))
+    items = []
+    for index, line in enumerate(data.get("items", [])):
+        accessory = line.get("accessory")
+        params = defaults(accessory, screw)
+        if params is None:
+            raise ValueError(f"Kit line {index + 1}: unknown accessory '{accessory}'")
+        count = line.get("count", 1)
+        if not isinstance(count, int) or count < 0:
+            raise ValueError(f"Kit line {index + 1}: the count of {accessory} must be a positive integer, got {count!r}")
+        if count:
+            items.append(KitItem(accessory, count, withOverrides(params, line.get("parameters", {}))))
+    return items
+
+
+def loadKit(path: str, defaults: Callable[[str, ScrewDimensions], object] = defaultParameters) -> list:
+    """
+    Returns:
+        list: The KitItem of a JSON kit file, see parseKit.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        return parseKit(json.load(file), defaults)
+
+
+def kitReport(reports: list) -> str:
+    """
+    Returns:
+        str: The time of every line of a kit and the total.
+    """
+    lines = [
+        f"{report.accessory} x{report.count}: {report.seconds * 1000:.0f} ms{' (shared build)' if report.shared else ''}"
+        for report in reports
+    ]
+    lines.append(f"Kit of {sum(report.count for report in reports)} parts: {sum(report.seconds for report in reports) * 1000:.0f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,224 @@
+import math
+from dataclasses import dataclass, field
+
+# NNWS constants
+from ...lib.common.nnws_constants import (
+    ACC_ANCHOR_TOP_OFFSET_CM,
+    ACC_EXTENSION_HEIGTH_CM,
+    ACC_EXTRA_SPACING_DEFAULT_CM,
+    ACC_LEDGER_WIDTH_CM,
+    GRIDFINITY_BASE_HEIGHT_CM,
+    GRIDFINITY_SIZE_CM,
+    H_NEW_CM,
+    MAIN_SCREW_BODY_CLEARANCE_CM,
+    MAIN_SCREW_BODY_END_CLEARANCE_CM,
+    MAIN_SCREW_HEAD_THICKNESS_CM,
+    MAIN_SCREW_HEIGHT_CM,
+    MIN_SHELF_THICKNESS_CM,
+    THREAD_SIZE_D_MAJOR_CM,
+)
+from ...lib.common.screw_definitions import ScrewDefinitionsEnum
+
+# Parameter snapshots for the accessories. They are filled in one pass from the command inputs (or built directly by
+# batch code) and are the only thing the generators read, so a generation never has to go back to the dialog.
+
+# Accessory types, the names of the accessory dropdown
+ACCESSORY_MAIN_SCREW = "Main Screw"
+ACCESSORY_INSERT = "Base Insert"
+ACCESSORY_SHELF = "Shelf Support"
+ACCESSORY_SHELF_INSERT = "Shelf Insert"
+ACCESSORY_HOOK = "Hook"
+ACCESSORY_ANCHOR = "Fastening Anchor"
+ACCESSORY_OFFSET_ANCHOR = "Offset Fastening Anchor Set"
+
+# Default and maximum insert X count of the shelf, the shelf insert length follows it
+SHELF_DEFAULT_X_COUNT = 2
+SHELF_MAX_X_COUNT = 5
+
+
+@dataclass(frozen=True, slots=True)
+class ScrewDimensions:
+    """
+    Main screw dimensions, derived once from the clearance
+    clearance: The clearance applied to all the accessories
+    outerRadius: The outer radius of the main screw body
+    innerRadius: The inner radius of the main screw body
+    """
+
+    clearance: float = MAIN_SCREW_BODY_CLEARANCE_CM
+    outerRadius: float = field(init=False)
+    innerRadius: float = field(init=False)
+
+    def __post_init__(self):
+        outerRadius = (THREAD_SIZE_D_MAJOR_CM - H_NEW_CM - self.clearance) / 2
+        object.__setattr__(self, "outerRadius", outerRadius)
+        object.__setattr__(self, "innerRadius", outerRadius - MAIN_SCREW_HEAD_THICKNESS_CM / 2)
+
+
+@dataclass(frozen=True, slots=True)
+class MainScrewParameters:
+    """
+    Main screw settings
+    screw: The main screw dimensions
+    height: The effective height of the screw from the bottom of the head
+    """
+
+    screw: ScrewDimensions
+    height: float
+
+
+@dataclass(frozen=True, slots=True)
+class InsertParameters:
+    """
+    Base insert settings, also used as the base of the shelf and the hook
+    screw: The main screw dimensions
+    trimTop: The top/right width of the insert
+    trimBottom: The bottom/left width of the insert
+    extraSpacing: The extra spacing between the insert and the wall
+    notch: Whether to generate the notches
+    invertAxis: Whether to invert the trim direction
+    xCount: The number of inserts in the X direction
+    yCount: The number of inserts in the Y direction
+    outerRadius: The outer radius of the insert, the trims are limited to it
+    """
+
+    screw: ScrewDimensions
+    trimTop: float
+    trimBottom: float
+    extraSpacing: float
+    notch: bool
+    invertAxis: bool = False
+    xCount: int = 1
+    yCount: int = 1
+    outerRadius: float = field(init=False)
+
+    def __post_init__(self):
+        # 0.05 to give some space
+        object.__setattr__(self, "outerRadius", self.screw.innerRadius - self.screw.clearance - 0.05)
+
+
+@dataclass(frozen=True, slots=True)
+class ShelfParameters:
+    """
+    Shelf support settings
+    insert: The base insert of the shelf, its xCount is the number of inserts
+    depth: The depth of the shelf
+    length: The length of the shelf
+    numFits: The number of grid units fitting in the shelf length
+    sideWidth: The width of the shelf on each side of the outer inserts
+    """
+
+    insert: InsertParameters
+    depth: float
+    length: float
+    numFits: int = field(init=False)
+    sideWidth: float = field(init=False)
+
+    def __post_init__(self):
+        numFits = int(self.length // GRIDFINITY_SIZE_CM)
+        object.__setattr__(self, "numFits", numFits)
+        object.__setattr__(self, "sideWidth", (self.length - max(self.insert.xCount - 1, numFits - 1) * GRIDFINITY_SIZE_CM) / 2)
+
+
+@dataclass(frozen=True, slots=True)
+class ShelfInsertParameters:
+    """
+    Shelf insert settings
+    screw: The main screw dimensions, only the clearance is used
+    notch: Whether to generate the notches
+    thickness: The thickness of the shelf insert
+    depth: The depth of the shelf insert
+    length: The length of the shelf insert
+    """
+
+    screw: ScrewDimensions
+    notch: bool
+    thickness: float
+    depth: float
+    length: float
+
+
+@dataclass(frozen=True, slots=True)
+class HookParameters:
+    """
+    Hook settings
+    insert: The base insert of the hook
+    size: The size of the hook, always starting from the bottom
+    length: The length of the hook from the base of the insert
+    stopper: Whether to add a stopper at the end of the hook
+    stopperHeight: The height of the stopper
+    """
+
+    insert: InsertParameters
+    size: float
+    length: float
+    stopper: bool
+    stopperHeight: float
+
+
+@dataclass(frozen=True, slots=True)
+class AnchorParameters:
+    """
+    Fastening anchor settings
+    screw: The main screw dimensions, only the clearance is used
+    topOffset: The clearance from the top of the anchor to the screw head
+    headDiameter: The diameter of the screw head
+    countersinkAngle: The countersink angle, in radians
+    holeDiameter: The diameter of the screw hole
+    offset: Whether to generate the offset anchor set
+    """
+
+    screw: ScrewDimensions
+    topOffset: float
+    headDiameter: float
+    countersinkAngle: float
+    holeDiameter: float
+    offset: bool = False
+
+
+def defaultParameters(accessory: str, screw: ScrewDimensions = None):
+    """
+    The parameters of an accessory with the defaults of the dialog, for the kits and the planning outside of Fusion.
+
+    Args:
+        accessory (str): The accessory type.
+        screw (ScrewDimensions, optional): The main screw dimensions. Defaults to the default clearance.
+
+    Returns:
+        The parameter snapshot of the accessory, None if the type is unknown.
+    """
+    screw = screw or ScrewDimensions()
+    # the default trims follow the default screw, whatever the clearance
+    defaultScrew = ScrewDimensions()
+    if ACCESSORY_MAIN_SCREW == accessory:
+        return MainScrewParameters(screw, MAIN_SCREW_HEIGHT_CM - MAIN_SCREW_BODY_END_CLEARANCE_CM)
+    elif ACCESSORY_INSERT == accessory:
+        return InsertParameters(screw, defaultScrew.innerRadius, GRIDFINITY_BASE_HEIGHT_CM / 2, ACC_EXTRA_SPACING_DEFAULT_CM, True, True)
+    elif ACCESSORY_SHELF == accessory:
+        insert = InsertParameters(
+            screw, defaultScrew.innerRadius, ACC_EXTENSION_HEIGTH_CM / 2, ACC_EXTRA_SPACING_DEFAULT_CM, True, True, SHELF_DEFAULT_X_COUNT
+        )
+        return ShelfParameters(insert, 2 * GRIDFINITY_SIZE_CM, SHELF_DEFAULT_X_COUNT * GRIDFINITY_SIZE_CM)
+    elif ACCESSORY_SHELF_INSERT == accessory:
+        return ShelfInsertParameters(
+            screw,
+            True,
+            MIN_SHELF_THICKNESS_CM,
+            2 * (GRIDFINITY_SIZE_CM - ACC_LEDGER_WIDTH_CM),
+            SHELF_DEFAULT_X_COUNT * (GRIDFINITY_SIZE_CM - ACC_LEDGER_WIDTH_CM),
+        )
+    elif ACCESSORY_HOOK == accessory:
+        # the hook is always using an inverted insert without extra spacing
+        insert = InsertParameters(screw, defaultScrew.innerRadius, ACC_EXTENSION_HEIGTH_CM / 2, 0, True, True)
+        return HookParameters(insert, ACC_EXTENSION_HEIGTH_CM, 7.5, True, 0.5)
+    elif ACCESSORY_ANCHOR == accessory or ACCESSORY_OFFSET_ANCHOR == accessory:
+        screwDefinition = ScrewDefinitionsEnum.M5.value
+        return AnchorParameters(
+            screw,
+            ACC_ANCHOR_TOP_OFFSET_CM,
+            screwDefinition.headDiameter,
+            math.radians(screwDefinition.countersinkAngle),
+            screwDefinition.holeDiameter,
+            ACCESSORY_OFFSET_ANCHOR == accessory,
+        )
+    return None
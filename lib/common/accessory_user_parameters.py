@@ -0,0 +1,195 @@
+import re
+from dataclasses import dataclass, replace
+
+from ...lib.common.accessory_kit import withOverrides
+from ...lib.common.accessory_parameters import (
+    ACCESSORY_ANCHOR,
+    ACCESSORY_HOOK,
+    ACCESSORY_INSERT,
+    ACCESSORY_MAIN_SCREW,
+    ACCESSORY_OFFSET_ANCHOR,
+    ACCESSORY_SHELF,
+    ACCESSORY_SHELF_INSERT,
+)
+
+# NNWS constants
+from ...lib.common.nnws_constants import H_NEW_CM, MAIN_SCREW_HEAD_THICKNESS_CM, THREAD_SIZE_D_MAJOR_CM
+
+# User parameters of the generated accessories. Every accessory writes the values it is built with to the design, named
+# after a prefix unique in the design ("ShelfSupport_length", "ShelfSupport2_length"), so they show in Change Parameters
+# and can be re-used by other features. The driving parameters are referenced by the features through expressions,
+# changing one is an incremental recompute of the timeline instead of a regeneration. The other values place sketch
+# geometry computed from points, a change of one of them still needs a regeneration. parameterEdit tells the two
+# apart. Plain Python, no adsk import.
+
+# The screw dimensions follow the clearance, like ScrewDimensions
+SCREW_OUTER_RADIUS_EXPRESSION = f"({THREAD_SIZE_D_MAJOR_CM - H_NEW_CM:.6g} cm - {{prefix}}_clearance) / 2"
+SCREW_INNER_RADIUS_EXPRESSION = f"{{prefix}}_screwOuterRadius - {MAIN_SCREW_HEAD_THICKNESS_CM / 2:.6g} cm"
+
+
+@dataclass(frozen=True, slots=True)
+class UserParameterSpec:
+    """
+    A value of an accessory written to the design as a user parameter
+    field: The field of the parameter snapshot, dotted for a field of a nested snapshot ("insert.trimTop")
+    suffix: The name of the parameter after the prefix of the accessory
+    unit: The unit shown in Change Parameters
+    comment: The description shown in Change Parameters
+    driving: Whether features reference the parameter, a change is then recomputed instead of regenerated
+    expressionTemplate: The expression of a derived value, {prefix} is the prefix of the accessory, empty for a value
+    """
+
+    field: str
+    suffix: str
+    unit: str
+    comment: str
+    driving: bool = False
+    expressionTemplate: str = ""
+
+    def name(self, prefix: str) -> str:
+        return parameterName(prefix, self.suffix)
+
+    def value(self, params):
+        """
+        Returns:
+            The value of the field in a parameter snapshot, in the internal units (cm, radians).
+        """
+        for name in self.field.split("."):
+            params = getattr(params, name)
+        return params
+
+    def expression(self, prefix: str) -> str:
+        return self.expressionTemplate.format(prefix=prefix)
+
+
+def _nested(field: str, specs: tuple) -> tuple:
+    # the parameters of a nested snapshot, like the insert of a shelf
+    return tuple(replace(spec, field=f"{field}.{spec.field}") for spec in specs)
+
+
+CLEARANCE_PARAMETER = UserParameterSpec("screw.clearance", "clearance", "mm", "Clearance applied to the accessory")
+SCREW_PARAMETERS = (
+    CLEARANCE_PARAMETER,
+    UserParameterSpec(
+        "screw.outerRadius",
+        "screwOuterRadius",
+        "mm",
+        "Outer radius of the main screw body",
+        expressionTemplate=SCREW_OUTER_RADIUS_EXPRESSION,
+    ),
+    UserParameterSpec(
+        "screw.innerRadius",
+        "screwInnerRadius",
+        "mm",
+        "Inner radius of the main screw body",
+        expressionTemplate=SCREW_INNER_RADIUS_EXPRESSION,
+    ),
+)
+TRIM_PARAMETERS = (
+    UserParameterSpec("trimTop", "trimTop", "mm", "Top/right width of the insert"),
+    UserParameterSpec("trimBottom", "trimBottom", "mm", "Bottom/left width of the insert"),
+)
+INSERT_PARAMETERS = (
+    SCREW_PARAMETERS
+    + TRIM_PARAMETERS
+    + (UserParameterSpec("extraSpacing", "extraSpacing", "mm", "Extra spacing between the insert and the wall"),)
+)
+ANCHOR_PARAMETERS = (
+    CLEARANCE_PARAMETER,
+    UserParameterSpec("topOffset", "topOffset", "mm", "Clearance from the top of the anchor to the screw head"),
+    UserParameterSpec("headDiameter", "headDiameter", "mm", "Diameter of the screw head"),
+    UserParameterSpec("countersinkAngle", "countersinkAngle", "deg", "Countersink angle of the screw hole", True),
+    UserParameterSpec("holeDiameter", "holeDiameter", "mm", "Diameter of the screw hole", True),
+)
+
+# accessory type -> the user parameters of the accessory, in creation order, the derived ones after their sources
+ACCESSORY_USER_PARAMETERS = {
+    ACCESSORY_MAIN_SCREW: SCREW_PARAMETERS
+    + (UserParameterSpec("height", "height", "mm", "Effective height of the screw from the bottom of the head"),),
+    ACCESSORY_INSERT: INSERT_PARAMETERS,
+    ACCESSORY_SHELF: _nested("insert", INSERT_PARAMETERS)
+    + (
+        UserParameterSpec("depth", "depth", "mm", "Depth of the shelf"),
+        UserParameterSpec("length", "length", "mm", "Length of the shelf"),
+    ),
+    ACCESSORY_SHELF_INSERT: (
+        CLEARANCE_PARAMETER,
+        UserParameterSpec("thickness", "thickness", "mm", "Thickness of the shelf insert", True),
+        UserParameterSpec("depth", "depth", "mm", "Depth of the shelf insert"),
+        UserParameterSpec("length", "length", "mm", "Length of the shelf insert"),
+    ),
+    # the hook insert has no extra spacing
+    ACCESSORY_HOOK: _nested("insert", SCREW_PARAMETERS + TRIM_PARAMETERS)
+    + (
+        UserParameterSpec("size", "size", "mm", "Size of the hook"),
+        UserParameterSpec("length", "length", "mm", "Length of the hook from the base of the insert"),
+        UserParameterSpec("stopperHeight", "stopperHeight", "mm", "Height of the stopper", True),
+    ),
+    ACCESSORY_ANCHOR: ANCHOR_PARAMETERS,
+    ACCESSORY_OFFSET_ANCHOR: ANCHOR_PARAMETERS,
+}
+
+
+def parameterName(prefix: str, suffix: str) -> str:
+    return f"{prefix}_{suffix}"
+
+
+def parameterPrefix(accessory: str, names: list) -> str:
+    """
+    Args:
+        accessory (str): The accessory type.
+        names (list): The names of the user parameters of the design.
+
+    Returns:
+        str: The accessory type without its spaces, numbered from 2 when an accessory of the design already uses it.
+    """
+    base = re.sub(r"[^A-Za-z0-9]", "", accessory)
+    taken = {name.split("_", 1)[0] for name in names}
+    prefix = base
+    index = 1
+    while prefix in taken:
+        index += 1
+        prefix = f"{base}{index}"
+    return prefix
+
+
+def drivingParameters(accessory: str, prefix: str) -> dict:
+    """
+    Returns:
+        dict: field -> the name of the user parameter driving it, for the fields the features reference.
+    """
+    return {spec.field: spec.name(prefix) for spec in ACCESSORY_USER_PARAMETERS.get(accessory, ()) if spec.driving}
+
+
+def _overrides(field: str, value) -> dict:
+    # "insert.trimTop" -> {"insert": {"trimTop": value}}, for withOverrides
+    *parents, name = field.split(".")
+    overrides = {name: value}
+    for parent in reversed(parents):
+        overrides = {parent: overrides}
+    return overrides
+
+
+def parameterEdit(accessory: str, previous, params) -> dict:
+    """
+    Tells whether an accessory built with a parameter snapshot can be changed to another one by editing its user
+    parameters, Fusion then recomputes the features referencing them instead of the whole accessory being regenerated.
+
+    Args:
+        accessory (str): The accessory type.
+        previous: The parameter snapshot the accessory was built with.
+        params: The new parameter snapshot.
+
+    Returns:
+        dict: suffix -> the new value of every driving parameter that changed, empty when nothing changed, None when
+        a value that isn't driven by a parameter changed and the accessory has to be regenerated.
+    """
+    if type(previous) is not type(params):
+        return None
+    driving = [spec for spec in ACCESSORY_USER_PARAMETERS.get(accessory, ()) if spec.driving]
+    edited = previous
+    for spec in driving:
+        edited = withOverrides(edited, _overrides(spec.field, spec.value(params)))
+    if edited != params:
+        return None
+    return {spec.suffix: spec.value(params) for spec in driving if spec.value(params) != spec.value(previous)}
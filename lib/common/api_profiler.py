@@ -0,0 +1,328 @@
+import functools
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Opt-in profiler of the Fusion API calls made by the generators. Nothing is patched until enable() is called, so the
+# only cost left when disabled is a global check in the phase context managers and the profiled decorator.
+# The adsk modules are only imported by enable(), any stand-in module with the same class layout can be profiled.
+
+# Methods whose name starts with one of these are timed: feature adds, sketch creation, collection access and exports
+PROFILED_METHOD_PREFIXES = (
+    "add",
+    "create",
+    "execute",
+    "export",
+    "item",
+    "deleteMe",
+    "intersectWith",
+    "setDistanceExtent",
+    "setOneSideExtent",
+)
+
+# Properties that are traversing or computing B-rep data
+PROFILED_PROPERTIES = (
+    "bRepBodies",
+    "bodies",
+    "faces",
+    "edges",
+    "vertices",
+    "profiles",
+    "startFaces",
+    "endFaces",
+    "sideFaces",
+    "boundingBox",
+    "area",
+    "volume",
+    "length",
+    "pointOnFace",
+    "geometry",
+)
+
+# Upper limit of API calls kept for the trace file, the counters are always complete
+MAX_TRACE_EVENTS = 200000
+
+# Separator of the nested phase names in the report
+PHASE_SEPARATOR = " > "
+
+_profiler = None
+_patches = []
+
+
+class ApiProfiler:
+    """
+    Collects the API call counters and the trace events of a run
+    calls: (phase, api name) -> [count, total seconds]
+    phases: phase -> [count, total seconds]
+    events: The Chrome trace events, in microseconds from the start of the run
+    running: True during a profiled run, kept by reset
+    """
+
+    def __init__(self):
+        self.running = False
+        self.reset()
+
+    def reset(self):
+        self.calls = {}
+        self.phases = {}
+        self.events = []
+        self.phaseStack = []
+        self.depth = 0
+        self.origin = time.perf_counter()
+
+    @property
+    def currentPhase(self) -> str:
+        return PHASE_SEPARATOR.join(self.phaseStack) if self.phaseStack else "(no phase)"
+
+    def recordCall(self, apiName: str, start: float, end: float):
+        stats = self.calls.setdefault((self.currentPhase, apiName), [0, 0.0])
+        stats[0] += 1
+        stats[1] += end - start
+        self._addEvent(apiName, "api", start, end)
+
+    def recordPhase(self, phase: str, start: float, end: float):
+        stats = self.phases.setdefault(phase, [0, 0.0])
+        stats[0] += 1
+        stats[1] += end - start
+        self._addEvent(phase.split(PHASE_SEPARATOR)[-1], "phase", start, end)
+
+    def _addEvent(self, name: str, category: str, start: float, end: float):
+        if len(self.events) < MAX_TRACE_EVENTS:
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self.origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": 1,
+                    "tid": 1,
+                }
+            )
+
+    def report(self, title: str) -> str:
+        """
+        Formats the counters as a text table, the most expensive phases and calls first.
+
+        Args:
+            title (str): The title of the report.
+
+        Returns:
+            str: The report.
+        """
+        apiCalls = sum(c for c, _ in self.calls.values())
+        apiSeconds = sum(t for _, t in self.calls.values())
+        wallSeconds = time.perf_counter() - self.origin
+        lines = [
+            f"API profile: {title} ({apiCalls} calls, {apiSeconds * 1000:.1f} ms in API, {wallSeconds * 1000:.1f} ms total)",
+            f"{'phase / call':<70}{'calls':>8}{'total ms':>12}{'mean ms':>10}",
+        ]
+
+        callsByPhase = {}
+        for (phase, apiName), stats in self.calls.items():
+            callsByPhase.setdefault(phase, []).append((apiName, stats))
+
+        def phaseSeconds(phase):
+            return self.phases.get(phase, [0, sum(t for _, (_, t) in callsByPhase[phase])])[1]
+
+        for phase in sorted(callsByPhase, key=phaseSeconds, reverse=True):
+            count = self.phases.get(phase, [1])[0]
+            lines.append(f"{phase:<70}{count:>8}{phaseSeconds(phase) * 1000:>12.1f}")
+            for apiName, (count, seconds) in sorted(callsByPhase[phase], key=lambda c: c[1][1], reverse=True):
+                lines.append(f"    {apiName:<66}{count:>8}{seconds * 1000:>12.1f}{seconds * 1000 / count:>10.2f}")
+        return "\n".join(lines)
+
+    def trace(self) -> dict:
+        """
+        Returns:
+            dict: The run as a Chrome trace-event document, to open in chrome://tracing or Perfetto.
+        """
+        return {"traceEvents": sorted(self.events, key=lambda e: e["ts"]), "displayTimeUnit": "ms"}
+
+
+def _timedCall(apiName: str, original: Callable) -> Callable:
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        profiler = _profiler
+        # nested calls are part of the outer call
+        if profiler is None or profiler.depth:
+            return original(*args, **kwargs)
+        profiler.depth += 1
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            profiler.depth -= 1
+            profiler.recordCall(apiName, start, time.perf_counter())
+
+    return wrapper
+
+
+def _wrapAttribute(cls: type, name: str, attribute):
+    apiName = f"{cls.__name__}.{name}"
+    if isinstance(attribute, property):
+        if name not in PROFILED_PROPERTIES or attribute.fget is None:
+            return None
+        return property(_timedCall(apiName, attribute.fget), attribute.fset, attribute.fdel, attribute.__doc__)
+
+    if not name.startswith(PROFILED_METHOD_PREFIXES):
+        return None
+    if isinstance(attribute, staticmethod):
+        return staticmethod(_timedCall(apiName, attribute.__func__))
+    if isinstance(attribute, classmethod):
+        return classmethod(_timedCall(apiName, attribute.__func__))
+    if callable(attribute):
+        return _timedCall(apiName, attribute)
+    return None
+
+
+def _install(modules: list):
+    for module in modules:
+        for cls in vars(module).values():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            for name, attribute in list(vars(cls).items()):
+                wrapped = _wrapAttribute(cls, name, attribute)
+                if wrapped is not None:
+                    _patches.append((cls, name, attribute))
+                    setattr(cls, name, wrapped)
+
+
+def enable(modules: list = None):
+    """
+    Starts profiling the API calls. Safe to call more than once.
+
+    Args:
+        modules (list, optional): The modules whose classes are patched. Defaults to adsk.core and adsk.fusion.
+    """
+    global _profiler
+    if _profiler is not None:
+        return
+
+    if modules is None:
+        import adsk.core
+        import adsk.fusion
+
+        modules = [adsk.core, adsk.fusion]
+
+    _install(modules)
+    _profiler = ApiProfiler()
+
+
+def disable():
+    """
+    Stops profiling and restores the original API classes.
+    """
+    global _profiler
+    _profiler = None
+    while _patches:
+        cls, name, attribute = _patches.pop()
+        setattr(cls, name, attribute)
+
+
+def isEnabled() -> bool:
+    return _profiler is not None
+
+
+def profiler() -> ApiProfiler:
+    """
+    Returns:
+        ApiProfiler: The active profiler, None when disabled.
+    """
+    return _profiler
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Attributes the API calls made in the block to a generator phase. Phases can be nested.
+
+    Args:
+        name (str): The name of the phase.
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+
+    profiler.phaseStack.append(name)
+    phasePath = profiler.currentPhase
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.recordPhase(phasePath, start, time.perf_counter())
+        profiler.phaseStack.pop()
+
+
+def profiled(name: str = None) -> Callable:
+    """
+    Decorator running the function in its own phase, named after the function by default.
+
+    Args:
+        name (str, optional): The name of the phase.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        phaseName = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _profiler is None:
+                return function(*args, **kwargs)
+            with phase(phaseName):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def profiledRun(name: str, outputDir: str = None, log: Callable = None):
+    """
+    Profiles a whole generation. At the end, the text report and the Chrome trace file are written to the output folder.
+    A run started during another one, like the accessories of a kit, is only a phase of the outer run.
+
+    Args:
+        name (str): The name of the run, used as the top phase and in the file names.
+        outputDir (str, optional): The folder of the report files. Defaults to NNWS_profiles in the temp folder.
+        log (Callable, optional): Called with the text report and the file paths.
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    if profiler.running:
+        with phase(name):
+            yield
+        return
+
+    # the phases open around the run are closed after it, they are kept over the reset
+    openPhases = profiler.phaseStack
+    profiler.reset()
+    profiler.phaseStack = openPhases
+    profiler.running = True
+    try:
+        with phase(name):
+            yield
+    finally:
+        profiler.running = False
+        report = profiler.report(name)
+        outputDir = outputDir or os.path.join(tempfile.gettempdir(), "NNWS_profiles")
+        baseName = f"{time.strftime('%Y%m%d_%H%M%S')}_{re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')}"
+        try:
+            os.makedirs(outputDir, exist_ok=True)
+            with open(os.path.join(outputDir, f"{baseName}.txt"), "w") as file:
+                file.write(report)
+            with open(os.path.join(outputDir, f"{baseName}.trace.json"), "w") as file:
+                json.dump(profiler.trace(), file)
+            report += f"\nProfile written to {os.path.join(outputDir, baseName)}.txt/.trace.json"
+        except OSError as e:
+            report += f"\nCould not write the profile to {outputDir}: {e}"
+        if log:
+            log(report)
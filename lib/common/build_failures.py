@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+
+class KnownBuildFailure(RuntimeError):
+    """
+    Raised in preview when a step without fallback is known to fail for the parameters
+    """
+
+
+@dataclass(slots=True)
+class BuildFailure:
+    """
+    A geometry step that failed for a parameter key
+    key: The parameter key, the repr of the parameter snapshot
+    step: The name of the failing step
+    error: The last error message
+    count: The number of failures recorded
+    lastFailure: The time of the last failure, in seconds since the epoch
+    """
+
+    key: str
+    step: str
+    error: str
+    count: int
+    lastFailure: float
+
+
+def buildKey(params) -> str:
+    """
+    Creates the cache key of a parameter snapshot. The snapshots are frozen dataclasses, so their repr is stable.
+
+    Args:
+        params: The parameter snapshot.
+
+    Returns:
+        str: The key of the parameters.
+    """
+    return repr(params)
+
+
+def sourceFingerprint(paths: list) -> str:
+    """
+    Hashes the content of source files, so cached results expire when the code or the constants change.
+
+    Args:
+        paths (list): The paths of the files to hash.
+
+    Returns:
+        str: The hexadecimal digest of the files.
+    """
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+class BuildFailureCache:
+    """
+    Negative cache of the geometry steps that raised for a set of parameters.
+    In preview, known failures go straight to the fallback of the step (or raise KnownBuildFailure when there is none)
+    instead of paying for the build again. Outside of preview the steps are always retried and a success clears the entry.
+    """
+
+    def __init__(self, path: str, sourceFiles: list):
+        """
+        Args:
+            path (str): The JSON file where the failures are persisted.
+            sourceFiles (list): The source files of the generation code, the cache expires when one of them changes.
+        """
+        self.path = path
+        self.sourceFiles = sourceFiles
+        self.isPreview = False
+        self._fingerprint = None
+        self._failures = None
+
+    @property
+    def fingerprint(self) -> str:
+        if self._fingerprint is None:
+            self._fingerprint = sourceFingerprint(self.sourceFiles)
+        return self._fingerprint
+
+    @property
+    def failures(self) -> dict:
+        if self._failures is None:
+            self._failures = self._load()
+        return self._failures
+
+    @contextmanager
+    def previewing(self):
+        """
+        Marks the steps attempted in the block as preview steps.
+        """
+        self.isPreview = True
+        try:
+            yield self
+        finally:
+            self.isPreview = False
+
+    def lookup(self, params, step: str) -> BuildFailure:
+        """
+        Returns the recorded failure of the step for the parameters, None if there is none.
+        """
+        return self.failures.get((buildKey(params), step))
+
+    def record(self, params, step: str, error: Exception) -> BuildFailure:
+        """
+        Records a failure of the step for the parameters.
+        """
+        key = buildKey(params)
+        failure = self.failures.get((key, step))
+        if failure is None:
+            failure = BuildFailure(key, step, str(error), 0, 0)
+            self.failures[(key, step)] = failure
+        failure.error = str(error)
+        failure.count += 1
+        failure.lastFailure = time.time()
+        self._save()
+        return failure
+
+    def forget(self, params, step: str):
+        """
+        Removes the failure of the step for the parameters, if any.
+        """
+        if self.failures.pop((buildKey(params), step), None) is not None:
+            self._save()
+
+    def clear(self):
+        self._failures = {}
+        self._save()
+
+    def attempt(self, params, step: str, build: Callable, fallback: Callable = None):
+        """
+        Runs a geometry step, recording it when it raises.
+
+        Args:
+            params: The parameter snapshot of the generation.
+            step (str): The name of the step.
+            build (Callable): The step to run.
+            fallback (Callable, optional): The cheaper alternative used when the step fails. Without it, the error is raised.
+
+        Returns:
+            The result of the step or of the fallback.
+
+        Raises:
+            KnownBuildFailure: In preview, when the step is known to fail and has no fallback.
+        """
+        known = self.lookup(params, step) if self.isPreview else None
+        if known is not None:
+            if fallback is None:
+                raise KnownBuildFailure(
+                    f"'{step}' failed {known.count} time(s) with these settings: {known.error}\nClick OK to try the generation again."
+                )
+            return fallback()
+
+        try:
+            result = build()
+        except RuntimeError as error:
+            self.record(params, step, error)
+            if fallback is None:
+                raise
+            return fallback()
+
+        self.forget(params, step)
+        return result
+
+    def dump(self, path: str = None) -> list:
+        """
+        Lists the recorded failures, the most frequent first, to find where the geometry is fragile.
+
+        Args:
+            path (str, optional): When set, the list is also written to this JSON file.
+
+        Returns:
+            list: The failures as dictionaries.
+        """
+        report = [asdict(f) for f in sorted(self.failures.values(), key=lambda f: (-f.count, f.step, f.key))]
+        if path:
+            with open(path, "w") as file:
+                json.dump({"fingerprint": self.fingerprint, "failures": report}, file, indent=2)
+        return report
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        # the code or the constants changed, the recorded failures may not be true anymore
+        if content.get("fingerprint") != self.fingerprint:
+            return {}
+
+        failures = {}
+        for f in content.get("failures", []):
+            failure = BuildFailure(**f)
+            failures[(failure.key, failure.step)] = failure
+        return failures
+
+    def _save(self):
+        try:
+            self.dump(self.path)
+        except OSError:
+            # the cache is only an optimization, never fail a generation because it can't be written
+            pass
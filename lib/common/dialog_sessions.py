@@ -0,0 +1,282 @@
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+# Recording and replay of the dialog sessions: the sequence of input changes and previews made by a user in a command
+# dialog, with the input values. The inputs are read through their objectType, so this module works the same with the
+# Fusion API and with a stand-in of it.
+
+# Command input types whose value is recorded, by the suffix of their objectType
+VALUE_INPUT_TYPES = (
+    "BoolValueCommandInput",
+    "IntegerSpinnerCommandInput",
+    "FloatSpinnerCommandInput",
+    "ValueCommandInput",
+    "StringValueCommandInput",
+)
+DROPDOWN_INPUT_TYPE = "DropDownCommandInput"
+GROUP_INPUT_TYPE = "GroupCommandInput"
+
+# Percentiles of the latency report
+REPORT_PERCENTILES = (50, 95)
+
+
+def _inputType(input) -> str:
+    return input.objectType.rsplit(":", 1)[-1]
+
+
+def readInputValue(input):
+    """
+    Returns:
+        The value of a command input, the selected item name for the dropdowns, None for the inputs without value.
+    """
+    inputType = _inputType(input)
+    if inputType == DROPDOWN_INPUT_TYPE:
+        return input.selectedItem.name if input.selectedItem else None
+    if inputType in VALUE_INPUT_TYPES:
+        return input.value
+    return None
+
+
+def writeInputValue(input, value) -> bool:
+    """
+    Sets the value of a command input, selecting the item by name for the dropdowns.
+
+    Returns:
+        bool: False when the value can't be set on this input.
+    """
+    inputType = _inputType(input)
+    if inputType == DROPDOWN_INPUT_TYPE:
+        for item in input.listItems:
+            if item.name == value:
+                item.isSelected = True
+                return True
+        return False
+    if inputType in VALUE_INPUT_TYPES:
+        input.value = value
+        return True
+    return False
+
+
+def snapshotInputs(inputs) -> dict:
+    """
+    Returns:
+        dict: id -> value of all the valued inputs, the groups are walked recursively.
+    """
+    values = {}
+    for input in inputs:
+        if _inputType(input) == GROUP_INPUT_TYPE:
+            values.update(snapshotInputs(input.children))
+            continue
+        value = readInputValue(input)
+        if value is not None:
+            values[input.id] = value
+    return values
+
+
+class SessionRecorder:
+    """
+    Writes the dialog events of a command as JSON lines, one file per dialog session. Does nothing when disabled.
+    """
+
+    def __init__(self, commandName: str, enabled: bool, outputDir: str = None):
+        """
+        Args:
+            commandName (str): The name of the command module, e.g. "commandWall", stored in the session header.
+            enabled (bool): Whether the sessions are recorded.
+            outputDir (str, optional): The folder of the session files. Defaults to NNWS_sessions in the temp folder.
+        """
+        self.commandName = commandName
+        self.enabled = enabled
+        self.outputDir = outputDir or os.path.join(tempfile.gettempdir(), "NNWS_sessions")
+        self.path = None
+        self._file = None
+        self._start = 0.0
+
+    def _write(self, event: dict):
+        event["t"] = round(time.perf_counter() - self._start, 6)
+        self._file.write(json.dumps(event) + "\n")
+
+    def start(self, inputs):
+        """
+        Starts a session, the initial values of the inputs are written in the header.
+        """
+        if not self.enabled:
+            return
+        self.stop()
+        os.makedirs(self.outputDir, exist_ok=True)
+        name = re.sub(r"[^A-Za-z0-9]+", "_", self.commandName)
+        self.path = os.path.join(self.outputDir, f"{time.strftime('%Y%m%d_%H%M%S')}_{name}.jsonl")
+        self._file = open(self.path, "w")
+        self._start = time.perf_counter()
+        self._write({"event": "start", "command": self.commandName, "inputs": snapshotInputs(inputs)})
+
+    def inputChanged(self, input):
+        if self._file is None:
+            return
+        self._write({"event": "inputChanged", "input": input.id, "value": readInputValue(input)})
+
+    @contextmanager
+    def timed(self, event: str):
+        """
+        Records an event handled in the block ("preview", "execute"), with its duration.
+        """
+        if self._file is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._write({"event": event, "ms": round((time.perf_counter() - start) * 1000, 3)})
+
+    def stop(self):
+        if self._file is None:
+            return
+        self._write({"event": "end"})
+        self._file.close()
+        self._file = None
+
+
+def loadSession(path: str) -> list:
+    """
+    Returns:
+        list: The events of a recorded session, the first one is the "start" header.
+    """
+    with open(path) as file:
+        events = [json.loads(line) for line in file if line.strip()]
+    if not events or events[0].get("event") != "start":
+        raise ValueError(f"{path} is not a dialog session")
+    return events
+
+
+class ReplayArgs:
+    """
+    Stands for the event arguments given to the handlers, they only read these attributes
+    command: The command of the dialog
+    input: The changed input, for the inputChanged events
+    inputs: The command inputs
+    areInputsValid: Set by the validateInputs handlers
+    """
+
+    def __init__(self, command, input=None):
+        self.command = command
+        self.input = input
+        self.inputs = command.commandInputs
+        self.areInputsValid = True
+
+
+class ReplayLatency:
+    """
+    The latency of a replayed event
+    event: The event name, "inputChanged", "preview" or "execute"
+    trigger: The id of the last changed input, the previews are attributed to it
+    seconds: The replay duration
+    recordedMs: The duration recorded in the live session, None when unknown
+    apiCalls: The number of API calls made by the handler, None when they are not counted
+    """
+
+    __slots__ = ("event", "trigger", "seconds", "recordedMs", "apiCalls")
+
+    def __init__(self, event: str, trigger: str, seconds: float, recordedMs: float = None, apiCalls: int = None):
+        self.event = event
+        self.trigger = trigger
+        self.seconds = seconds
+        self.recordedMs = recordedMs
+        self.apiCalls = apiCalls
+
+
+def replaySession(events: list, command, handlers: dict, beforePreview: Callable = None, callCounter: Callable = None) -> list:
+    """
+    Feeds a recorded session back through the dialog handlers of a command. Works on a live Fusion command as well as on
+    a stand-in one, the handlers are called directly with ReplayArgs.
+
+    Args:
+        events (list): The session, as returned by loadSession.
+        command: The command whose inputs were created by the command_created handler.
+        handlers (dict): The handlers by event name: "inputChanged", "preview" and optionally "execute".
+        beforePreview (Callable, optional): Called before every preview, e.g. to discard the previous preview geometry.
+        callCounter (Callable, optional): Returns the number of API calls made so far, to count the calls of each handler.
+
+    Returns:
+        list: The ReplayLatency of every replayed event.
+    """
+    inputs = command.commandInputs
+    for inputId, value in events[0]["inputs"].items():
+        input = inputs.itemById(inputId)
+        if input is not None:
+            writeInputValue(input, value)
+
+    latencies = []
+    trigger = None
+    for event in events[1:]:
+        name = event["event"]
+        handler = handlers.get(name)
+        if handler is None:
+            continue
+
+        if name == "inputChanged":
+            input = inputs.itemById(event["input"])
+            if input is None or not writeInputValue(input, event["value"]):
+                continue
+            trigger = event["input"]
+            args = ReplayArgs(command, input)
+        else:
+            if beforePreview:
+                beforePreview()
+            args = ReplayArgs(command)
+
+        calls = callCounter() if callCounter else 0
+        start = time.perf_counter()
+        handler(args)
+        seconds = time.perf_counter() - start
+        apiCalls = callCounter() - calls if callCounter else None
+        latencies.append(ReplayLatency(name, trigger, seconds, event.get("ms"), apiCalls))
+    return latencies
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Returns:
+        float: The nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def latencyReport(latencies: list, title: str) -> str:
+    """
+    Formats the percentiles of the replayed events, per event and per triggering input.
+
+    Args:
+        latencies (list): The ReplayLatency of the replay.
+        title (str): The title of the report.
+
+    Returns:
+        str: The report.
+    """
+    groups = {}
+    for latency in latencies:
+        groups.setdefault(latency.event, []).append(latency)
+        if latency.event == "preview":
+            groups.setdefault(f"preview after {latency.trigger}", []).append(latency)
+
+    header = "".join(f"{f'p{p} ms':>10}" for p in REPORT_PERCENTILES)
+    lines = [
+        f"Dialog replay: {title} ({len(latencies)} events)",
+        f"{'event':<50}{'count':>8}{header}{'max ms':>10}{'live p50':>10}{'calls p50':>11}",
+    ]
+    for name, group in groups.items():
+        values = [latency.seconds * 1000 for latency in group]
+        recorded = [latency.recordedMs for latency in group if latency.recordedMs is not None]
+        counted = [latency.apiCalls for latency in group if latency.apiCalls is not None]
+        columns = "".join(f"{percentile(values, p):>10.1f}" for p in REPORT_PERCENTILES)
+        live = f"{percentile(recorded, 50):>10.1f}" if recorded else f"{'-':>10}"
+        calls = f"{percentile(counted, 50):>11}" if counted else f"{'-':>11}"
+        lines.append(f"{name:<50}{len(group):>8}{columns}{max(values):>10.1f}{live}{calls}")
+    return "\n".join(lines)
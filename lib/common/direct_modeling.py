@@ -0,0 +1,199 @@
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+from adsk.core import Application, DocumentTypes
+from adsk.fusion import Design, DesignTypes
+
+from ...lib.common import nnws_log
+
+# Direct modeling fast path of the batch generations. The exported parts are never edited, so their history is not
+# needed: in a direct design the features are built as base features, nothing is added to the timeline and the
+# previous features are not recomputed when the next one is added. Switching a design to direct modeling drops its
+# history, so it is only done on a design without history.
+
+# Relative tolerance of the volumes and absolute tolerance of the bounding boxes, in cm, of the equivalence check
+VOLUME_TOLERANCE = 1e-6
+BOUNDING_BOX_TOLERANCE_CM = 1e-4
+
+log = nnws_log.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class BodySignature:
+    """
+    The measures compared between the parametric and the direct build of a body
+    name: The name of the body, with the name of its component
+    volume: The volume of the body, in cm3
+    minPoint: The minimum point of the bounding box, (x, y, z)
+    maxPoint: The maximum point of the bounding box, (x, y, z)
+    isVisible: Whether the body is visible, the hidden bodies are not exported
+    """
+
+    name: str
+    volume: float
+    minPoint: tuple
+    maxPoint: tuple
+    isVisible: bool
+
+    @property
+    def sortKey(self) -> tuple:
+        # rounded so the same body built both ways sorts at the same place
+        return tuple(round(value, 3) for value in self.minPoint + self.maxPoint) + (round(self.volume, 3),)
+
+
+@dataclass(slots=True)
+class DirectCheck:
+    """
+    The comparison of a parametric and a direct build of the same part
+    parametricSeconds: The time of the parametric build
+    directSeconds: The time of the direct build
+    differences: A message per body that isn't equivalent, empty when the builds are equivalent
+    """
+
+    parametricSeconds: float
+    directSeconds: float
+    differences: list
+
+    @property
+    def isEquivalent(self) -> bool:
+        return not self.differences
+
+    @property
+    def speedup(self) -> float:
+        return self.parametricSeconds / self.directSeconds if self.directSeconds > 0 else math.inf
+
+
+def isDirect(design: Design) -> bool:
+    return design.designType == DesignTypes.DirectDesignType
+
+
+def canSwitch(design: Design) -> bool:
+    """
+    Returns:
+        bool: Whether the design can be switched to direct modeling without losing history.
+    """
+    return isDirect(design) or design.timeline.count == 0
+
+
+@contextmanager
+def directModeling(design: Design, enabled: bool = True):
+    """
+    Builds the features of the block without history when enabled, the design type is restored afterward. The bodies
+    built in the block are kept as base features when the design goes back to parametric.
+
+    Args:
+        design (Design): The design to build in.
+        enabled (bool, optional): Whether to switch to direct modeling, the block runs unchanged otherwise. Defaults to True.
+
+    Yields:
+        bool: Whether the block runs in direct modeling.
+    """
+    previous = design.designType
+    if enabled and not isDirect(design):
+        if not canSwitch(design):
+            log.warning("The design has a history, generating with the parametric timeline")
+            enabled = False
+        else:
+            design.designType = DesignTypes.DirectDesignType
+    try:
+        yield enabled or isDirect(design)
+    finally:
+        if design.designType != previous:
+            design.designType = previous
+
+
+def bodySignatures(design: Design) -> list:
+    """
+    Returns:
+        list: The BodySignature of every body of the design, sorted by position.
+    """
+    signatures = []
+    for component in design.allComponents:
+        for body in component.bRepBodies:
+            box = body.boundingBox
+            signatures.append(
+                BodySignature(
+                    f"{component.name}/{body.name}",
+                    body.volume,
+                    tuple(box.minPoint.asArray()),
+                    tuple(box.maxPoint.asArray()),
+                    body.isVisible,
+                )
+            )
+    return sorted(signatures, key=lambda s: s.sortKey)
+
+
+def compareSignatures(reference: list, candidate: list) -> list:
+    """
+    Compares the bodies of two builds, matched by position.
+
+    Args:
+        reference (list): The BodySignature of the parametric build.
+        candidate (list): The BodySignature of the direct build.
+
+    Returns:
+        list: A message per body whose volume, bounding box or visibility differ, empty when the builds are equivalent.
+    """
+    if len(reference) != len(candidate):
+        return [f"{len(reference)} bodies -> {len(candidate)} bodies"]
+
+    differences = []
+    for expected, actual in zip(reference, candidate):
+        if not math.isclose(expected.volume, actual.volume, rel_tol=VOLUME_TOLERANCE, abs_tol=VOLUME_TOLERANCE):
+            differences.append(f"{expected.name}: volume {expected.volume:.6f} -> {actual.volume:.6f} cm3")
+        corners = zip(expected.minPoint + expected.maxPoint, actual.minPoint + actual.maxPoint)
+        if any(abs(a - b) > BOUNDING_BOX_TOLERANCE_CM for a, b in corners):
+            differences.append(
+                f"{expected.name}: bounding box {expected.minPoint} {expected.maxPoint} -> {actual.minPoint} {actual.maxPoint}"
+            )
+        if expected.isVisible != actual.isVisible:
+            differences.append(f"{expected.name}: visible {expected.isVisible} -> {actual.isVisible}")
+    return differences
+
+
+def measuredBuild(design: Design, build: Callable, direct: bool) -> tuple:
+    """
+    Builds a part in an empty design and measures it.
+
+    Args:
+        design (Design): The empty design the part is built in.
+        build (Callable): Generates the part in the active design.
+        direct (bool): Whether to build it without history.
+
+    Returns:
+        tuple: The seconds of the build and the BodySignature of its bodies.
+    """
+    with directModeling(design, direct):
+        start = time.perf_counter()
+        build()
+        seconds = time.perf_counter() - start
+        return seconds, bodySignatures(design)
+
+
+def _buildInNewDocument(build: Callable, direct: bool) -> tuple:
+    app = Application.get()
+    active = app.activeDocument
+    document = app.documents.add(DocumentTypes.FusionDesignDocumentType)
+    try:
+        return measuredBuild(Design.cast(app.activeProduct), build, direct)
+    finally:
+        document.close(False)
+        active.activate()
+
+
+def verifyDirectBuild(build: Callable) -> DirectCheck:
+    """
+    Builds a part with and without history, each in a new document closed afterward, and compares the bodies.
+
+    Args:
+        build (Callable): Generates the part in the active design.
+
+    Returns:
+        DirectCheck: The times of the builds and the differences of their bodies.
+    """
+    parametricSeconds, reference = _buildInNewDocument(build, False)
+    directSeconds, candidate = _buildInNewDocument(build, True)
+    return DirectCheck(parametricSeconds, directSeconds, compareSignatures(reference, candidate))
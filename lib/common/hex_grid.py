@@ -0,0 +1,92 @@
+import math
+from enum import Enum
+
+from ...lib.common import nnws_log
+
+# NNWS constants
+from ...lib.common.nnws_constants import GRIDFINITY_SIZE_CM
+
+# Geometry of the hex grid of the walls, on plain (x, y) tuples in cm, so the layouts can be planned outside of Fusion.
+# The cells are pointy top hexagons, GRIDFINITY_SIZE_CM across the flats, every row starts half a cell to the left or
+# to the right of the previous one.
+
+# Hex pattern, haven't tested anything else
+WALL_NB_SIDES = 6
+
+log = nnws_log.getLogger(__name__)
+
+
+# This is based on the assumption that the hexagon is created in a counter clockwise direction with createExteriorContainer
+class HexPointIndex(Enum):
+    TOP = 0
+    TOP_LEFT = 1
+    BOTTOM_LEFT = 2
+    BOTTOM = 3
+    BOTTOM_RIGHT = 4
+    TOP_RIGHT = 5
+
+
+def calculateOffsetAngle(nbSides: int):
+    return math.pi / 2 if nbSides % 2 == 0 else math.pi / nbSides + math.pi / 2
+
+
+def cellRadius() -> float:
+    """
+    Returns:
+        float: The radius of the circle through the corners of a cell, in cm.
+    """
+    return GRIDFINITY_SIZE_CM / 2 / math.cos(math.pi / WALL_NB_SIDES)
+
+
+def hexPointXY(radius: float, index: int, offset: int, offset_angle: float) -> tuple:
+    """
+    Returns:
+        tuple: The (x, y) corner of a hexagon, moved by offset cells along X keeping it on the circle of the corners.
+    """
+    angle = 2 * math.pi * index / WALL_NB_SIDES + offset_angle
+    x = math.cos(angle) * radius
+    y = math.sin(angle) * radius
+    if offset != 0:
+        positiveOffset: bool = offset >= 0
+        offsetValue = offset * GRIDFINITY_SIZE_CM
+        new_x = x + offsetValue
+        hyp = math.hypot(y, new_x)
+        angle = math.asin(y / hyp)
+        if not positiveOffset:
+            angle = -angle
+
+        x = math.cos(angle) * radius + offsetValue
+        if log.isDebug:
+            log.debug("new_x: %s, hyp: %s, new angle: %s, final x: %s", new_x, hyp, angle, x)
+
+    return x, y
+
+
+def rowDeltaXY(rowIndex: int, offset: int) -> tuple:
+    """
+    Returns:
+        tuple: The (x, y) move from the previous row to the row, the rows alternate to the bottom left and bottom right.
+    """
+    offset_angle = calculateOffsetAngle(WALL_NB_SIDES)
+    r = cellRadius()
+    startX, startY = hexPointXY(r, HexPointIndex.TOP.value, 0, offset_angle)
+    toIndex = HexPointIndex.BOTTOM_LEFT.value if rowIndex % 2 == 0 else HexPointIndex.BOTTOM_RIGHT.value
+    toX, toY = hexPointXY(r, toIndex, offset, offset_angle)
+    return toX - startX, toY - startY
+
+
+def rowOriginsXY(rows: list) -> list:
+    """
+    Args:
+        rows (list): The (width, offset) of every row, the offset of the first row isn't used.
+
+    Returns:
+        list: The (x, y) center of the first cell of every row, the first row at the origin.
+    """
+    x, y = 0.0, 0.0
+    origins = [(x, y)]
+    for rowIndex in range(1, len(rows)):
+        dx, dy = rowDeltaXY(rowIndex, rows[rowIndex][1])
+        x, y = x + dx, y + dy
+        origins.append((x, y))
+    return origins
@@ -0,0 +1,86 @@
+import json
+
+# Job queues, the batches planned outside of Fusion (python -m nnws --queue) and run by the wall automation command.
+# A queue is a JSON file, {"version": 1, "jobs": [...]}, named QUEUE_FILE_NAME in the folder given to the automation
+# command; the export paths of the jobs are relative to that folder. Plain Python, no adsk import.
+
+QUEUE_VERSION = 1
+QUEUE_FILE_NAME = "nnws_jobs.json"
+
+# A wall exported to a STEP file
+JOB_WALL = "wall"
+# A wall exported as print bed tiles, a STEP file per tile in a folder
+JOB_WALL_TILES = "wallTiles"
+# A kit of accessories exported to a STEP file, see lib/common/accessory_kit.py
+JOB_KIT = "kit"
+# A kit of accessories packed on print plates, a STEP file per plate in a folder
+JOB_ACCESSORY_PLATES = "accessoryPlates"
+# The parts of a reference set measured, their volumes written to a JSON file, see lib/common/material_estimate.py
+JOB_VOLUMES = "volumes"
+
+# job type -> required fields
+JOB_FIELDS = {
+    JOB_WALL: ("width", "height", "notch", "path"),
+    JOB_WALL_TILES: ("width", "height", "notch", "path", "bedSizeMm"),
+    JOB_KIT: ("kit", "path"),
+    JOB_ACCESSORY_PLATES: ("kit", "path", "bedSizeMm"),
+    JOB_VOLUMES: ("parts", "path"),
+}
+
+
+def wallJob(width: int, height: int, notch: bool, path: str) -> dict:
+    return {"type": JOB_WALL, "width": width, "height": height, "notch": notch, "path": path}
+
+
+def wallTilesJob(width: int, height: int, notch: bool, path: str, bedSizeMm: tuple) -> dict:
+    return {"type": JOB_WALL_TILES, "width": width, "height": height, "notch": notch, "path": path, "bedSizeMm": list(bedSizeMm)}
+
+
+def kitJob(kit: dict, path: str) -> dict:
+    return {"type": JOB_KIT, "kit": kit, "path": path}
+
+
+def accessoryPlatesJob(kit: dict, path: str, bedSizeMm: tuple) -> dict:
+    return {"type": JOB_ACCESSORY_PLATES, "kit": kit, "path": path, "bedSizeMm": list(bedSizeMm)}
+
+
+def volumesJob(parts: list, path: str) -> dict:
+    return {"type": JOB_VOLUMES, "parts": parts, "path": path}
+
+
+def validateJobs(jobs: list) -> list:
+    """
+    Raises:
+        ValueError: When a job has an unknown type or misses a field.
+
+    Returns:
+        list: The jobs.
+    """
+    for index, job in enumerate(jobs):
+        required = JOB_FIELDS.get(job.get("type"))
+        if required is None:
+            raise ValueError(f"Job {index + 1}: unknown type '{job.get('type')}', expected one of {', '.join(JOB_FIELDS)}")
+        missing = [name for name in required if name not in job]
+        if missing:
+            raise ValueError(f"Job {index + 1} ({job['type']}): missing {', '.join(missing)}")
+    return jobs
+
+
+def writeQueue(path: str, jobs: list):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"version": QUEUE_VERSION, "jobs": validateJobs(jobs)}, file, indent=2)
+
+
+def readQueue(path: str) -> list:
+    """
+    Raises:
+        ValueError: When the queue is not valid or was written by another version.
+
+    Returns:
+        list: The jobs of a queue file, in order.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        queue = json.load(file)
+    if queue.get("version") != QUEUE_VERSION:
+        raise ValueError(f"{path}: job queue version {queue.get('version')}, expected {QUEUE_VERSION}")
+    return validateJobs(queue.get("jobs", []))
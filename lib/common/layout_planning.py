@@ -0,0 +1,170 @@
+from ...lib.common import accessory_kit, job_queue, material_estimate, wall_tiling
+from ...lib.common.hex_grid import rowOriginsXY
+
+# NNWS constants
+from ...lib.common.nnws_constants import GRIDFINITY_SIZE_CM, mmToCm
+
+# Planning of walls and accessory kits without Fusion, for the command line (python -m nnws): the cells of the walls,
+# their print bed tiles, the bill of materials, the files the batches write and the material, and the job queue the
+# wall automation command runs. The results are plain dicts, in mm, ready for JSON.
+
+
+def _mm(value: float) -> float:
+    # a micron is below the printers resolution
+    return round(value * 10, 3)
+
+
+def wallName(width: int, height: int, notch: bool) -> str:
+    return f"wall_{width}x{height}{'_notched' if notch else ''}"
+
+
+def wallFileName(width: int, height: int, notch: bool) -> str:
+    """
+    Returns:
+        str: The STEP file of a wall in the export folder of the automation command, the notched walls in a sub folder.
+    """
+    return f"{'notched/' if notch else ''}{wallName(width, height, notch)}.step"
+
+
+def cellPositions(rows: list) -> list:
+    """
+    Args:
+        rows (list): The (width, offset) of every row of the wall, from the top, as in the wall pattern table.
+
+    Returns:
+        list: The (row, column, x, y) of every cell, its center in cm, the first cell at the origin.
+    """
+    cells = []
+    for rowIndex, (x, y) in enumerate(rowOriginsXY(rows)):
+        cells.extend((rowIndex, column, x + column * GRIDFINITY_SIZE_CM, y) for column in range(rows[rowIndex][0]))
+    return cells
+
+
+def planWall(width: int, height: int, notch: bool, bedSizeMm: tuple, density: float = material_estimate.PLA_DENSITY_G_CM3) -> dict:
+    """
+    Plans a wall, tiled when it doesn't fit on the print bed.
+
+    Args:
+        width (int): The number of cells of every row.
+        height (int): The number of rows.
+        notch (bool): Whether the cells have notches.
+        bedSizeMm (tuple): The (width, depth) of the print bed in mm.
+        density (float, optional): The density of the filament, in g/cm3. Defaults to PLA.
+
+    Raises:
+        ValueError: When a single cell doesn't fit on the bed.
+
+    Returns:
+        dict: The cells, the tiles (empty when the wall fits on the bed), the files, the volume and the weight.
+    """
+    rows = [(width, 0)] * height
+    plan = wall_tiling.planTiles(rows, *(mmToCm(size) for size in bedSizeMm))
+    name = wallName(width, height, notch)
+    tiled = len(plan.tiles) > 1
+    volume = material_estimate.wallVolume(width, height, notch)
+    return {
+        "name": name,
+        "width": width,
+        "height": height,
+        "notch": notch,
+        "cells": [{"row": row, "column": column, "x": _mm(x), "y": _mm(y)} for row, column, x, y in cellPositions(rows)],
+        "tiles": [
+            {
+                "index": tile.index + 1,
+                "cells": len(tile.cells),
+                "origin": [_mm(c) for c in tile.origin],
+                "width": _mm(tile.width),
+                "depth": _mm(tile.depth),
+            }
+            for tile in plan.tiles
+        ]
+        if tiled
+        else [],
+        "files": [f"{name}/{name}_tile_{tile.index + 1}.step" for tile in plan.tiles] if tiled else [wallFileName(width, height, notch)],
+        "volumeCm3": round(volume, 3),
+        "grams": round(material_estimate.grams(volume, density), 1),
+    }
+
+
+def planKit(kit: dict, name: str = "kit", plates: bool = False, density: float = material_estimate.PLA_DENSITY_G_CM3) -> dict:
+    """
+    Plans a kit of accessories.
+
+    Args:
+        kit (dict): The kit, see lib/common/accessory_kit.py.
+        name (str, optional): The name of the files. Defaults to "kit".
+        plates (bool, optional): Whether the kit is packed on print plates instead of a single file. Defaults to False.
+        density (float, optional): The density of the filament, in g/cm3. Defaults to PLA.
+
+    Raises:
+        ValueError: When the kit is not valid.
+
+    Returns:
+        dict: The bill of materials with the volume and the weight of every line, and the files, the plates are only
+        known once the parts are built.
+    """
+    lines = []
+    for item in accessory_kit.parseKit(kit):
+        volume = material_estimate.accessoryVolume(item.accessory, item.params) * item.count
+        lines.append(
+            {
+                "accessory": item.accessory,
+                "count": item.count,
+                "volumeCm3": round(volume, 3),
+                "grams": round(material_estimate.grams(volume, density), 1),
+            }
+        )
+    return {
+        "name": name,
+        "items": lines,
+        "parts": sum(line["count"] for line in lines),
+        "grams": round(sum(line["grams"] for line in lines), 1),
+        "files": [f"{name}_plates/accessory_plate_<n>.step"] if plates else [f"{name}.step"],
+    }
+
+
+def planSpec(spec: dict, bedSizeMm: tuple, density: float = material_estimate.PLA_DENSITY_G_CM3) -> dict:
+    """
+    Plans the walls and the kit of a spec, {"walls": [{"width": 8, "height": 4, "notch": true}], "kit": {...},
+    "plates": false}, and the job queue running it.
+
+    Args:
+        spec (dict): The walls and the accessory kit, both optional.
+        bedSizeMm (tuple): The (width, depth) of the print bed in mm.
+        density (float, optional): The density of the filament, in g/cm3. Defaults to PLA.
+
+    Raises:
+        ValueError: When a wall or the kit is not valid.
+
+    Returns:
+        dict: The plans of the walls and of the kit, the jobs and the totals.
+    """
+    walls = [planWall(wall["width"], wall["height"], wall.get("notch", True), bedSizeMm, density) for wall in spec.get("walls", [])]
+    plates = spec.get("plates", False)
+    kit = planKit(spec["kit"], plates=plates, density=density) if spec.get("kit") else None
+
+    jobs = []
+    for wall in walls:
+        if wall["tiles"]:
+            jobs.append(job_queue.wallTilesJob(wall["width"], wall["height"], wall["notch"], wall["name"], bedSizeMm))
+        else:
+            jobs.append(job_queue.wallJob(wall["width"], wall["height"], wall["notch"], wall["files"][0]))
+    if kit:
+        if plates:
+            jobs.append(job_queue.accessoryPlatesJob(spec["kit"], f"{kit['name']}_plates", bedSizeMm))
+        else:
+            jobs.append(job_queue.kitJob(spec["kit"], kit["files"][0]))
+
+    return {
+        "bedSizeMm": list(bedSizeMm),
+        "walls": walls,
+        "kit": kit,
+        "jobs": jobs,
+        "totals": {
+            "cells": sum(len(wall["cells"]) for wall in walls),
+            "files": sum(len(wall["files"]) for wall in walls) + (len(kit["files"]) if kit else 0),
+            "accessories": kit["parts"] if kit else 0,
+            "wallGrams": round(sum(wall["grams"] for wall in walls), 1),
+            "kitGrams": kit["grams"] if kit else 0,
+        },
+    }
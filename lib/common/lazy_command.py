@@ -0,0 +1,104 @@
+import importlib
+import time
+
+import adsk.core
+
+from ...lib import fusion360utils as futil
+from ...lib.common import nnws_log
+
+# Registration of the command buttons, split from their implementation. Only the button definitions are created when
+# the add-in starts, the implementation module (the dialog and the generators) is imported on the first commandCreated.
+
+log = nnws_log.getLogger(__name__)
+
+
+class LazyCommand:
+    """
+    A command button whose implementation module is imported when the command is first created
+    package: The package of the command, e.g. "...commands.commandWall"
+    moduleName: The implementation module in the package, e.g. "entry"
+    createdHandler: The name of the commandCreated handler of the implementation module
+    cmdId: The id of the command definition
+    name: The name of the button
+    description: The tooltip of the button
+    iconFolder: The folder of the button icons
+    workspaceId: The workspace of the button, None for a command without button (run by a script)
+    panelId: The panel of the button in the workspace
+    besideId: The id of the control the button is placed after
+    isPromoted: Whether the button is promoted to the main toolbar
+    """
+
+    def __init__(
+        self,
+        package: str,
+        moduleName: str,
+        createdHandler: str,
+        cmdId: str,
+        name: str,
+        description: str,
+        iconFolder: str = "",
+        workspaceId: str = None,
+        panelId: str = None,
+        besideId: str = "",
+        isPromoted: bool = False,
+    ):
+        self.package = package
+        self.moduleName = moduleName
+        self.createdHandler = createdHandler
+        self.cmdId = cmdId
+        self.name = name
+        self.description = description
+        self.iconFolder = iconFolder
+        self.workspaceId = workspaceId
+        self.panelId = panelId
+        self.besideId = besideId
+        self.isPromoted = isPromoted
+        self._module = None
+
+    @property
+    def isLoaded(self) -> bool:
+        return self._module is not None
+
+    def module(self):
+        """
+        Returns:
+            The implementation module, imported on the first call.
+        """
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(f"{self.package}.{self.moduleName}")
+            log.info("%s loaded in %.0f ms", self.name, (time.perf_counter() - start) * 1000)
+        return self._module
+
+    def _commandCreated(self, args: adsk.core.CommandCreatedEventArgs):
+        getattr(self.module(), self.createdHandler)(args)
+
+    def start(self):
+        """
+        Creates the command definition and its button, without importing the implementation.
+        """
+        ui = adsk.core.Application.get().userInterface
+        cmdDef = ui.commandDefinitions.itemById(self.cmdId)
+        if not cmdDef:
+            cmdDef = ui.commandDefinitions.addButtonDefinition(self.cmdId, self.name, self.description, self.iconFolder)
+        futil.add_handler(cmdDef.commandCreated, self._commandCreated, name=self.name)
+
+        if self.workspaceId:
+            panel = ui.workspaces.itemById(self.workspaceId).toolbarPanels.itemById(self.panelId)
+            control = panel.controls.addCommand(cmdDef, self.besideId, False)
+            control.isPromoted = self.isPromoted
+
+    def stop(self):
+        """
+        Deletes the button and the command definition.
+        """
+        ui = adsk.core.Application.get().userInterface
+        if self.workspaceId:
+            panel = ui.workspaces.itemById(self.workspaceId).toolbarPanels.itemById(self.panelId)
+            control = panel.controls.itemById(self.cmdId)
+            if control:
+                control.deleteMe()
+
+        cmdDef = ui.commandDefinitions.itemById(self.cmdId)
+        if cmdDef:
+            cmdDef.deleteMe()
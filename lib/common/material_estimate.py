@@ -0,0 +1,580 @@
+import math
+from dataclasses import dataclass
+
+from ...lib.common.accessory_kit import withOverrides
+from ...lib.common.accessory_parameters import (
+    ACCESSORY_ANCHOR,
+    ACCESSORY_HOOK,
+    ACCESSORY_INSERT,
+    ACCESSORY_MAIN_SCREW,
+    ACCESSORY_OFFSET_ANCHOR,
+    ACCESSORY_SHELF,
+    ACCESSORY_SHELF_INSERT,
+    AnchorParameters,
+    HookParameters,
+    InsertParameters,
+    MainScrewParameters,
+    ShelfInsertParameters,
+    ShelfParameters,
+    defaultParameters,
+)
+from ...lib.common.hex_grid import cellRadius
+from ...lib.common.shelf_sizing import (
+    SHELF_EDGE_FILLET_RADIUS_CM,
+    SHELF_HOLE_FILLET_RADIUS_CM,
+    SHELF_HOLE_OFFSET_CM,
+    SHELF_LEDGE_FILLET_RADIUS_CM,
+    SHELF_LEDGE_OFFSET_CM,
+    shelfFit,
+)
+
+# NNWS constants
+from ...lib.common.nnws_constants import (
+    ACC_EXTENSION_HEIGTH_CM,
+    ACC_EXTENSION_WIDTH_CM,
+    ACC_INTERNAL_SKETCH_RADIUS_CM,
+    ACC_LEDGER_WIDTH_CM,
+    ACC_SHELF_WIDTH_CM,
+    EXTERNAL_TOLERANCE_CM,
+    GRIDFINITY_BASE_HEIGHT_CM,
+    GRIDFINITY_SIZE_CM,
+    HEAD_OFFSET_CM,
+    INTERNAL_WALL_CHAMFER_ANGLE,
+    MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM,
+    MAIN_SCREW_HEAD_THICKNESS_CM,
+    MAIN_SCREW_THREAD_BODY_THICKNESS_CM,
+    NOTCH_SIZE_RADIUS_CM,
+    THREAD_PITCH_CM,
+    THREAD_RADIUS_CM,
+    THREAD_SIZE_D_MAJOR_CM,
+    WALL_BOTTOM_THICKNESS_CM,
+    WALL_INNER_SECTION_OFFSET_CM,
+    WALL_INNER_WALL_OFFSET_CM,
+    WALL_OUTER_WALL_THICKNESS_CM,
+    WALL_THICKNESS_CM,
+)
+
+# Material estimate of the walls and the accessories without Fusion, in closed form from the constants and the parameter
+# snapshots the generators read: the extrusions are areas times heights, the bores and the trims are circles and
+# circular segments, the chamfers are revolved triangles (Pappus), the threads are their profile times the length of
+# their helix, and the fillets are the area they add or remove along their edges. The small features are left out: the
+# fillets under 0.5 mm, the ends of the threads, the embossed text of the shelf and the head fillets of the main screw.
+# The estimates are checked against the volumes Fusion reports for the parts of referenceSet(), see the volumes job of
+# lib/common/job_queue.py and "python -m nnws --check-volumes". Plain Python, no adsk import.
+
+# Density of PLA, in g/cm3
+PLA_DENSITY_G_CM3 = 1.24
+
+# Relative error of the estimates accepted against the volumes measured in Fusion
+VOLUME_TOLERANCE = 0.05
+
+# Volumes measured by the volumes job, in the folder of the job queue
+MEASURED_VOLUMES_FILE_NAME = "nnws_volumes.json"
+
+# Fillet of the thread to the wall or to the screw body, see createInternalThread and createExternalThread
+THREAD_FILLET_RADIUS_CM = 0.075
+
+# Convex fillet of the hook and the shelf insert edges
+EDGE_FILLET_RADIUS_CM = 0.1
+
+
+def hexagonArea() -> float:
+    """
+    Returns:
+        float: The area of a wall cell seen from the top, in cm2.
+    """
+    return 3 * math.sqrt(3) / 2 * cellRadius() ** 2
+
+
+def ringArea(outerRadius: float, innerRadius: float) -> float:
+    return math.pi * (outerRadius**2 - innerRadius**2)
+
+
+def circleSegmentArea(radius: float, distance: float) -> float:
+    """
+    Returns:
+        float: The area of the part of a circle beyond a chord at a distance from its center.
+    """
+    if distance >= radius:
+        return 0.0
+    if distance <= -radius:
+        return math.pi * radius**2
+    return radius**2 * math.acos(distance / radius) - distance * math.sqrt(radius**2 - distance**2)
+
+
+def polygonArea(nbSides: int, apothem: float) -> float:
+    return nbSides * apothem**2 * math.tan(math.pi / nbSides)
+
+
+def roundedRectangleArea(width: float, depth: float, radii: tuple) -> float:
+    """
+    Returns:
+        float: The area of a rectangle with a fillet of each radius at its corners.
+    """
+    return width * depth - sum((1 - math.pi / 4) * radius**2 for radius in radii)
+
+
+def roundedRectanglePerimeter(width: float, depth: float, radius: float) -> float:
+    return 2 * (width + depth) - (8 - 2 * math.pi) * radius
+
+
+def slotArea(innerRadius: float, sweep: float, width: float) -> float:
+    """
+    Returns:
+        float: The area of a slot along an arc, from its inner radius and its sweep in radians, with round ends.
+    """
+    return sweep * ((innerRadius + width) ** 2 - innerRadius**2) / 2 + math.pi * (width / 2) ** 2
+
+
+def frustumVolume(height: float, bottomRadius: float, topRadius: float) -> float:
+    return math.pi * height / 3 * (bottomRadius**2 + bottomRadius * topRadius + topRadius**2)
+
+
+def loftVolume(height: float, bottomArea: float, topArea: float) -> float:
+    """
+    Returns:
+        float: The volume of a loft between two similar sections, a frustum of their areas.
+    """
+    return height / 3 * (bottomArea + topArea + math.sqrt(bottomArea * topArea))
+
+
+def revolvedVolume(points: list) -> float:
+    """
+    Args:
+        points (list): The (radius, z) points of a closed profile, in order.
+
+    Returns:
+        float: The volume of the profile revolved around the z axis, its area times the path of its centroid.
+    """
+    moment = 0.0
+    for (r1, z1), (r2, z2) in zip(points, points[1:] + points[:1]):
+        moment += (r1 + r2) * (r1 * z2 - r2 * z1)
+    return abs(2 * math.pi * moment / 6)
+
+
+def chamferRingVolume(radius: float, width: float, height: float, inward: bool) -> float:
+    """
+    Args:
+        radius (float): The radius of the chamfered circular edge.
+        width (float): The radial side of the chamfer.
+        height (float): The axial side of the chamfer.
+        inward (bool): Whether the chamfer removes the material inside the edge, the edge of a shaft, or outside of it,
+            the edge of a bore.
+
+    Returns:
+        float: The volume removed by the chamfer of a circular edge.
+    """
+    return 2 * math.pi * (radius - width / 3 if inward else radius + width / 3) * width * height / 2
+
+
+def edgeFilletArea(radius: float, angle: float = math.pi / 2) -> float:
+    """
+    Returns:
+        float: The section removed by the fillet of a convex edge, for the angle between its faces in radians.
+    """
+    return radius**2 * (1 / math.tan(angle / 2) - (math.pi - angle) / 2)
+
+
+def threadFilletArea(threadRadius: float, filletRadius: float) -> float:
+    """
+    Returns:
+        float: The section added by the fillet between a thread profile centered on a surface and the surface.
+    """
+    x = math.sqrt((threadRadius + filletRadius) ** 2 - filletRadius**2)
+    threadAngle = math.atan2(filletRadius, x)
+    filletAngle = math.acos(filletRadius / (threadRadius + filletRadius))
+    return (x * filletRadius - threadRadius**2 * threadAngle - filletRadius**2 * filletAngle) / 2
+
+
+def helixLength(radius: float, height: float, pitch: float = THREAD_PITCH_CM) -> float:
+    return max(0.0, height) / pitch * math.hypot(2 * math.pi * radius, pitch)
+
+
+def threadVolume(radius: float, height: float) -> float:
+    """
+    Args:
+        radius (float): The radius of the thread helix, on the surface it is joined to.
+        height (float): The height of the thread out of the other features.
+
+    Returns:
+        float: The volume added by a thread built by commonCreateThread, the half of its profile out of the surface and
+        the fillets on both sides.
+    """
+    section = math.pi * THREAD_RADIUS_CM**2 / 2 + 2 * threadFilletArea(THREAD_RADIUS_CM, THREAD_FILLET_RADIUS_CM)
+    return section * helixLength(radius, height)
+
+
+def wallCellVolume(notch: bool = True) -> float:
+    """
+    Args:
+        notch (bool, optional): Whether the cell has notches. Defaults to True.
+
+    Returns:
+        float: The volume of a wall cell, in cm3, see createWallSection.
+    """
+    outerRadius = GRIDFINITY_SIZE_CM / 2 - WALL_OUTER_WALL_THICKNESS_CM
+    middleRadius = outerRadius - WALL_INNER_WALL_OFFSET_CM
+    innerRadius = middleRadius - WALL_INNER_WALL_OFFSET_CM
+    internalSectionHeight = WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM
+
+    hexagon = (hexagonArea() - math.pi * outerRadius**2) * WALL_THICKNESS_CM
+    bottom = ringArea(outerRadius, middleRadius) * WALL_BOTTOM_THICKNESS_CM
+    innerSection = ringArea(middleRadius, innerRadius) * internalSectionHeight
+
+    # the chamfer of the inner section starts 1 mm from the bottom
+    chamferHeight = internalSectionHeight - 0.1
+    chamferWidth = chamferHeight / math.tan(math.radians(INTERNAL_WALL_CHAMFER_ANGLE))
+    chamfer = chamferRingVolume(innerRadius, chamferWidth, chamferHeight, False)
+
+    notches = 0.0
+    if notch:
+        # 8 cylinders across the top of the inner section, their center half a notch radius over it
+        notchRadius = NOTCH_SIZE_RADIUS_CM * 1.25
+        section = circleSegmentArea(notchRadius, NOTCH_SIZE_RADIUS_CM / 2)
+        notches = 8 * section * (middleRadius - innerRadius - chamferWidth)
+
+    threadStartOffset = WALL_BOTTOM_THICKNESS_CM + THREAD_PITCH_CM
+    thread = threadVolume(THREAD_SIZE_D_MAJOR_CM / 2, WALL_THICKNESS_CM - threadStartOffset)
+    return hexagon + bottom + innerSection - chamfer - notches + thread
+
+
+def wallVolume(width: int, height: int, notch: bool = True) -> float:
+    """
+    Returns:
+        float: The volume of a wall of width cells by height rows, in cm3.
+    """
+    return wallCellVolume(notch) * width * height
+
+
+def mainScrewVolume(params: MainScrewParameters) -> float:
+    """
+    Returns:
+        float: The volume of the main screw, in cm3, see generateMainScrew.
+    """
+    outerRadius = params.screw.outerRadius
+    innerRadius = params.screw.innerRadius
+    body = ringArea(outerRadius, innerRadius) * params.height
+
+    # the head profile revolved, joined to the bottom of the body
+    headInnerRadius = MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2
+    headOuterRadius = (GRIDFINITY_SIZE_CM - HEAD_OFFSET_CM) / 2
+    headHeight = MAIN_SCREW_HEAD_THICKNESS_CM
+    thickness = MAIN_SCREW_THREAD_BODY_THICKNESS_CM
+    head = revolvedVolume(
+        [
+            (headInnerRadius, thickness),
+            (headInnerRadius, 0),
+            (headOuterRadius, 0),
+            (headOuterRadius, headHeight),
+            (headInnerRadius + thickness, headHeight),
+        ]
+    )
+    overlap = ringArea(min(outerRadius, headOuterRadius), max(innerRadius, headInnerRadius + thickness)) * min(params.height, headHeight)
+
+    # 8 slots lofted in the bottom of the head
+    sweep = math.radians(360 / 16) - 0.275 / headOuterRadius
+    topSlot = slotArea(0.015 + headOuterRadius - 0.275, sweep, 0.275)
+    bottomSlot = slotArea(0.015 + headOuterRadius - 0.15 + 0.01, sweep * 3 / 4, 0.15)
+    slots = 8 * loftVolume(headHeight / 2, topSlot, bottomSlot)
+
+    # the thread in the head adds nothing
+    thread = threadVolume(outerRadius, params.height - headHeight)
+    return body + head - overlap - slots + thread
+
+
+def insertCellVolume(params: InsertParameters) -> float:
+    """
+    Returns:
+        float: The volume of one insert of a plate, in cm3, see generateInsertBase.
+    """
+    outerRadius = params.outerRadius
+    thickness = MAIN_SCREW_THREAD_BODY_THICKNESS_CM
+    baseHeight = WALL_INNER_SECTION_OFFSET_CM
+    base = math.pi * outerRadius**2 * baseHeight
+
+    chamferedRadius = outerRadius - thickness / 2
+    chamfered = math.pi * chamferedRadius**2 * thickness - chamferRingVolume(chamferedRadius, thickness, thickness, True)
+
+    topRadius = MAIN_SCREW_HEAD_INTERNAL_DIAMETER_CM / 2 - EXTERNAL_TOLERANCE_CM
+    topHeight = thickness + EXTERNAL_TOLERANCE_CM
+    top = math.pi * topRadius**2 * topHeight
+
+    extension = ACC_EXTENSION_WIDTH_CM * ACC_EXTENSION_HEIGTH_CM * params.extraSpacing
+
+    notches = 0.0
+    if params.notch:
+        notches = 2 * math.pi * (NOTCH_SIZE_RADIUS_CM - params.screw.clearance) ** 2 * NOTCH_SIZE_RADIUS_CM * 2
+
+    trims = 0.0
+    for trim in (min(params.trimTop, outerRadius), min(params.trimBottom, outerRadius)):
+        if trim < outerRadius:
+            # the chamfered cylinder is cut as a cylinder of its mean radius
+            trims += circleSegmentArea(outerRadius, trim) * baseHeight
+            trims += circleSegmentArea(chamferedRadius - thickness / 2, trim) * thickness
+            trims += circleSegmentArea(topRadius, trim) * topHeight
+            trims += max(0.0, ACC_EXTENSION_WIDTH_CM / 2 - trim) * ACC_EXTENSION_HEIGTH_CM * params.extraSpacing
+    return base + chamfered + top + extension + notches - trims
+
+
+def insertVolume(params: InsertParameters) -> float:
+    """
+    Returns:
+        float: The volume of an insert plate, in cm3.
+    """
+    return insertCellVolume(params) * params.xCount * params.yCount
+
+
+def hookVolume(params: HookParameters) -> float:
+    """
+    Returns:
+        float: The volume of a hook and its insert, in cm3, see generateHook.
+    """
+    apothem = params.size / 2
+    side = 2 * apothem * math.tan(math.pi / 8)
+    # the 8 side edges and the edges of the end face are filleted
+    hook = polygonArea(8, apothem) * params.length
+    hook -= 8 * edgeFilletArea(EDGE_FILLET_RADIUS_CM, math.radians(135)) * params.length
+    hook -= 8 * side * edgeFilletArea(EDGE_FILLET_RADIUS_CM)
+
+    stopper = 0.0
+    if params.stopper:
+        stopperRadius = (params.size / 2 - 0.15) / 2
+        filletRadius = 0.2 if params.size > 8 else 0.1
+        stopper = math.pi * stopperRadius**2 * params.stopperHeight
+        stopper -= 2 * 2 * math.pi * stopperRadius * edgeFilletArea(filletRadius)
+    return insertVolume(params.insert) + hook + max(0.0, stopper)
+
+
+def anchorVolume(params: AnchorParameters) -> float:
+    """
+    Returns:
+        float: The volume of an anchor, in cm3, see generateAnchor. The offset anchor set splits the same volume in
+        its two bodies.
+    """
+    clearance = params.screw.clearance
+    height = WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - clearance
+    internalRadius = GRIDFINITY_SIZE_CM / 2 - WALL_OUTER_WALL_THICKNESS_CM - 2 * WALL_INNER_WALL_OFFSET_CM
+    chamferTan = math.tan(math.radians(INTERNAL_WALL_CHAMFER_ANGLE))
+    radius = internalRadius + (WALL_THICKNESS_CM - WALL_INNER_SECTION_OFFSET_CM - 0.1) / chamferTan - clearance / 2
+    base = math.pi * radius**2 * height - chamferRingVolume(radius, height / chamferTan, height, True)
+
+    # counterbore from the top, countersink and hole through the rest
+    headRadius = params.headDiameter / 2
+    holeRadius = params.holeDiameter / 2
+    counterbore = min(params.topOffset, height)
+    countersink = min((headRadius - holeRadius) / math.tan(params.countersinkAngle / 2), height - counterbore)
+    bottomRadius = headRadius - countersink * math.tan(params.countersinkAngle / 2)
+    hole = math.pi * headRadius**2 * counterbore
+    hole += frustumVolume(countersink, headRadius, bottomRadius)
+    hole += math.pi * holeRadius**2 * (height - counterbore - countersink)
+    return base - hole
+
+
+def shelfVolume(params: ShelfParameters) -> float:
+    """
+    Returns:
+        float: The volume of a shelf support and its inserts, in cm3, see generateShelf.
+    """
+    length = params.length
+    depth = params.depth
+    thickness = GRIDFINITY_BASE_HEIGHT_CM
+    fit = shelfFit(params.insert.xCount, length)
+    outerRadius = fit.outerFilletRadius
+    outer = roundedRectangleArea(length, depth, (outerRadius, outerRadius, fit.sideFilletRadius, fit.sideFilletRadius))
+    holeOffset = SHELF_HOLE_OFFSET_CM
+    hole = roundedRectangleArea(length - 2 * holeOffset, depth - 2 * holeOffset, (SHELF_HOLE_FILLET_RADIUS_CM,) * 4)
+
+    # the ledge is cut half way through the frame, the notch is swept along it
+    ledgeRadius = SHELF_LEDGE_FILLET_RADIUS_CM
+    ledgeLength = length - 2 * SHELF_LEDGE_OFFSET_CM
+    ledgeDepth = depth - 2 * SHELF_LEDGE_OFFSET_CM
+    ledge = (roundedRectangleArea(ledgeLength, ledgeDepth, (ledgeRadius,) * 4) - hole) * thickness / 2
+    notch = math.pi * NOTCH_SIZE_RADIUS_CM**2 / 2 * roundedRectanglePerimeter(ledgeLength, ledgeDepth, ledgeRadius)
+
+    fillets = 0.0
+    if fit.edgeFillet:
+        fillets = 2 * roundedRectanglePerimeter(length, depth, outerRadius) * edgeFilletArea(SHELF_EDGE_FILLET_RADIUS_CM)
+    return insertVolume(params.insert) + (outer - hole) * thickness - ledge - notch - fillets
+
+
+def shelfInsertVolume(params: ShelfInsertParameters) -> float:
+    """
+    Returns:
+        float: The volume of a shelf insert, in cm3, see generateShelfInsert.
+    """
+    clearance = params.screw.clearance
+    length = params.length - EXTERNAL_TOLERANCE_CM - clearance
+    depth = params.depth - EXTERNAL_TOLERANCE_CM - clearance
+    radius = ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM + ACC_INTERNAL_SKETCH_RADIUS_CM
+    plate = roundedRectangleArea(length, depth, (radius,) * 4) * params.thickness
+    plate -= roundedRectanglePerimeter(length, depth, radius) * edgeFilletArea(EDGE_FILLET_RADIUS_CM)
+
+    notches = 0.0
+    if params.notch:
+        # 8 cylinders centered on the sides
+        notches = 8 * math.pi * (NOTCH_SIZE_RADIUS_CM - clearance) ** 2 / 2 * NOTCH_SIZE_RADIUS_CM * 2
+    return plate + notches
+
+
+# accessory type -> volume of its parameter snapshot
+ACCESSORY_VOLUMES = {
+    ACCESSORY_MAIN_SCREW: mainScrewVolume,
+    ACCESSORY_INSERT: insertVolume,
+    ACCESSORY_SHELF: shelfVolume,
+    ACCESSORY_SHELF_INSERT: shelfInsertVolume,
+    ACCESSORY_HOOK: hookVolume,
+    ACCESSORY_ANCHOR: anchorVolume,
+    ACCESSORY_OFFSET_ANCHOR: anchorVolume,
+}
+
+
+def accessoryVolume(accessory: str, params) -> float:
+    """
+    Raises:
+        ValueError: When the accessory type is unknown.
+
+    Returns:
+        float: The volume of an accessory, in cm3.
+    """
+    if accessory not in ACCESSORY_VOLUMES:
+        raise ValueError(f"No volume estimate for the accessory '{accessory}'")
+    return ACCESSORY_VOLUMES[accessory](params)
+
+
+def grams(volume: float, density: float = PLA_DENSITY_G_CM3) -> float:
+    """
+    Returns:
+        float: The weight of a volume in cm3, for a density in g/cm3.
+    """
+    return volume * density
+
+
+def wallVolumeGrid(widths: list, heights: list, notch: bool = True) -> list:
+    """
+    Returns:
+        list: The volume of the walls, a row per height and a column per width, the cell is estimated once.
+    """
+    cell = wallCellVolume(notch)
+    return [[cell * width * height for width in widths] for height in heights]
+
+
+def _override(path: str, value) -> dict:
+    # "insert.xCount", 3 -> {"insert": {"xCount": 3}}
+    for name in reversed(path.split(".")):
+        value = {name: value}
+    return value
+
+
+def accessoryVolumeGrid(accessory: str, rowField: str, rowValues: list, columnField: str, columnValues: list, params=None) -> list:
+    """
+    Args:
+        accessory (str): The accessory type.
+        rowField (str): The parameter of the rows, a dotted path for the nested snapshots, like "insert.xCount".
+        rowValues (list): The values of the rows.
+        columnField (str): The parameter of the columns.
+        columnValues (list): The values of the columns.
+        params (optional): The parameter snapshot of the other parameters. Defaults to the defaults of the dialog.
+
+    Raises:
+        ValueError: When a parameter doesn't exist or the accessory type is unknown.
+
+    Returns:
+        list: The volume of the accessory for every combination, a row per row value and a column per column value.
+    """
+    params = params or defaultParameters(accessory)
+    if params is None:
+        raise ValueError(f"Unknown accessory '{accessory}'")
+    grid = []
+    for rowValue in rowValues:
+        rowParams = withOverrides(params, _override(rowField, rowValue))
+        grid.append(
+            [accessoryVolume(accessory, withOverrides(rowParams, _override(columnField, columnValue))) for columnValue in columnValues]
+        )
+    return grid
+
+
+def referenceSet() -> list:
+    """
+    Returns:
+        list: The parts measured in Fusion to check the estimates, {"name", "wall": {"width", "height", "notch"}} or
+        {"name", "accessory", "parameters"} with the parameters overriding the defaults, as in the kits.
+    """
+    parts = [
+        {"name": "wall_cell", "wall": {"width": 1, "height": 1, "notch": False}},
+        {"name": "wall_cell_notched", "wall": {"width": 1, "height": 1, "notch": True}},
+    ]
+    parts.extend({"name": accessory, "accessory": accessory, "parameters": {}} for accessory in ACCESSORY_VOLUMES)
+    parts.append({"name": "Base Insert 3x1 without notch", "accessory": ACCESSORY_INSERT, "parameters": {"xCount": 3, "notch": False}})
+    parts.append({"name": "Hook 10 cm", "accessory": ACCESSORY_HOOK, "parameters": {"length": 10}})
+    parts.append({"name": "Shelf Insert 5 mm", "accessory": ACCESSORY_SHELF_INSERT, "parameters": {"thickness": 0.5}})
+    return parts
+
+
+def referenceParameters(part: dict):
+    """
+    Returns:
+        The parameter snapshot of an accessory of the reference set.
+    """
+    return withOverrides(defaultParameters(part["accessory"]), part.get("parameters", {}))
+
+
+def estimateVolume(part: dict) -> float:
+    """
+    Returns:
+        float: The estimated volume of a part of the reference set, in cm3.
+    """
+    if "wall" in part:
+        wall = part["wall"]
+        return wallVolume(wall["width"], wall["height"], wall.get("notch", True))
+    return accessoryVolume(part["accessory"], referenceParameters(part))
+
+
+@dataclass(frozen=True, slots=True)
+class VolumeCheck:
+    """
+    The estimate of a part against its volume measured in Fusion
+    name: The name of the part in the reference set
+    estimated: The estimated volume, in cm3
+    measured: The volume reported by Fusion, in cm3
+    """
+
+    name: str
+    estimated: float
+    measured: float
+
+    @property
+    def relativeError(self) -> float:
+        return (self.estimated - self.measured) / self.measured if self.measured else math.inf
+
+
+def compareVolumes(parts: list, measured: dict) -> list:
+    """
+    Args:
+        parts (list): The parts of the reference set.
+        measured (dict): name -> the volume measured in Fusion, in cm3.
+
+    Raises:
+        ValueError: When a part wasn't measured.
+
+    Returns:
+        list: The VolumeCheck of every part.
+    """
+    missing = [part["name"] for part in parts if part["name"] not in measured]
+    if missing:
+        raise ValueError(f"No measured volume for {', '.join(missing)}")
+    return [VolumeCheck(part["name"], estimateVolume(part), measured[part["name"]]) for part in parts]
+
+
+def volumeReport(checks: list, tolerance: float = VOLUME_TOLERANCE) -> str:
+    """
+    Returns:
+        str: The estimated and measured volume of every part, the parts out of the tolerance flagged.
+    """
+    lines = [
+        f"{check.name}: {check.estimated:.3f} cm3 estimated, {check.measured:.3f} cm3 measured, {check.relativeError * 100:+.1f}%"
+        + ("" if abs(check.relativeError) <= tolerance else " OUT OF TOLERANCE")
+        for check in checks
+    ]
+    failures = sum(1 for check in checks if abs(check.relativeError) > tolerance)
+    lines.append(f"{len(checks) - failures}/{len(checks)} parts within {tolerance * 100:.0f}%")
+    return "\n".join(lines)
@@ -1,4 +1,4 @@
-from adsk.core import *
+# Plain values only, no adsk import here so the constants can be used outside of Fusion (constraints, planning, ...)
 
 
 # Fusion works with cm, but I like define in mm, this is to convert the constants
@@ -6,11 +6,6 @@ def mmToCm(value):
     return value / 10
 
 
-# Defaut axis for comparison
-X_AXIS = Vector3D.create(1, 0, 0)
-Y_AXIS = Vector3D.create(0, 1, 0)
-Z_AXIS = Vector3D.create(0, 0, 1)
-
 UNIT_MM = "mm"
 UNIT_DEG = "°"
 
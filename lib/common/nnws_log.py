@@ -0,0 +1,161 @@
+import time
+from collections import deque
+from typing import Callable
+
+# Leveled logging of the add-in. The messages are %-style formatted only when they are written, a disabled level costs
+# one integer comparison, and the hot loops can skip even the call with "if log.isDebug:".
+# The debug records passing the level are kept in a ring buffer, without any Fusion API call, and only written when
+# flush() is called or when an error is logged, to give the context of the error. The other records are written right away.
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+# Number of records kept in the ring buffer
+BUFFER_SIZE = 1000
+
+# Records at or above this level are written right away
+IMMEDIATE_LEVEL = INFO
+
+_defaultLevel = INFO
+_moduleLevels = {}
+_sink = print
+_buffer = deque(maxlen=BUFFER_SIZE)
+_loggers = {}
+
+
+def levelValue(level) -> int:
+    """
+    Returns:
+        int: The value of a level given by name ("DEBUG") or by value.
+    """
+    if isinstance(level, str):
+        return {name: value for value, name in LEVEL_NAMES.items()}[level.upper()]
+    return level
+
+
+class Logger:
+    """
+    The logger of a module
+    name: The module name
+    level: The minimum level of the records kept
+    isDebug: Whether the debug records are kept, to guard the code computing debug only values
+    """
+
+    __slots__ = ("name", "level", "isDebug")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.setLevel(_levelOf(name))
+
+    def setLevel(self, level):
+        self.level = levelValue(level)
+        self.isDebug = self.level <= DEBUG
+
+    def isEnabledFor(self, level: int) -> bool:
+        return level >= self.level
+
+    def log(self, level: int, message: str, *args):
+        if level < self.level:
+            return
+        record = (time.time(), self.name, level, message, args)
+        if level >= ERROR:
+            # the buffered records are the context of the error
+            _buffer.append(record)
+            flush()
+        elif level >= IMMEDIATE_LEVEL:
+            _write(record)
+        else:
+            _buffer.append(record)
+
+    def debug(self, message: str, *args):
+        if self.isDebug:
+            self.log(DEBUG, message, *args)
+
+    def info(self, message: str, *args):
+        self.log(INFO, message, *args)
+
+    def warning(self, message: str, *args):
+        self.log(WARNING, message, *args)
+
+    def error(self, message: str, *args):
+        self.log(ERROR, message, *args)
+
+
+def _levelOf(name: str) -> int:
+    """
+    Returns:
+        int: The configured level of a module, the keys match the end of the module name ("wall_pattern", "commandWall.entry").
+    """
+    for key, level in _moduleLevels.items():
+        if name == key or name.endswith("." + key):
+            return level
+    return _defaultLevel
+
+
+def _format(record: tuple) -> str:
+    created, name, level, message, args = record
+    if args:
+        try:
+            message = message % args
+        except (TypeError, ValueError):
+            message = f"{message} {args}"
+    return f"{time.strftime('%H:%M:%S', time.localtime(created))} {LEVEL_NAMES.get(level, level)} {name.rsplit('.', 1)[-1]}: {message}"
+
+
+def _write(record: tuple):
+    _sink(_format(record))
+
+
+def getLogger(name: str) -> Logger:
+    """
+    Returns:
+        Logger: The logger of a module, usually getLogger(__name__).
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+    return logger
+
+
+def configure(level=INFO, moduleLevels: dict = None, sink: Callable = None):
+    """
+    Sets the levels of all the loggers, including the ones already created, and where the messages are written.
+
+    Args:
+        level (optional): The default level, by name or value. Defaults to INFO.
+        moduleLevels (dict, optional): The level per module, e.g. {"wall_pattern": "DEBUG"}.
+        sink (Callable, optional): Called with every formatted message. Defaults to print.
+    """
+    global _defaultLevel, _moduleLevels, _sink
+    _defaultLevel = levelValue(level)
+    _moduleLevels = {key: levelValue(value) for key, value in (moduleLevels or {}).items()}
+    _sink = sink or print
+    for logger in _loggers.values():
+        logger.setLevel(_levelOf(logger.name))
+
+
+def flush():
+    """
+    Writes and clears the buffered records.
+    """
+    while _buffer:
+        _write(_buffer.popleft())
+
+
+def buffered() -> list:
+    """
+    Returns:
+        list: The buffered messages, formatted, without clearing them.
+    """
+    return [_format(record) for record in _buffer]
+
+
+def clear():
+    """
+    Drops the buffered records without writing them.
+    """
+    _buffer.clear()
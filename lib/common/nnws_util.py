@@ -1,4 +1,7 @@
 import math
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
 
 from adsk.core import (
     Appearance,
@@ -31,16 +34,72 @@ from adsk.fusion import (
     FilletFeatures,
     Occurrence,
     Occurrences,
+    Profile,
     Sketch,
     SweepFeature,
 )
 
-from ...lib import fusion360utils as futil
+from ...lib.common import api_profiler as prof
+from ...lib.common import nnws_log
 
 # NNWS constants
-from ...lib.common.nnws_constants import INTERNAL_WALL_CHAMFER_ANGLE, THREAD_PITCH_CM, THREAD_RADIUS_CM, UNIT_DEG, X_AXIS, Y_AXIS, Z_AXIS
+from ...lib.common.nnws_constants import INTERNAL_WALL_CHAMFER_ANGLE, THREAD_PITCH_CM, THREAD_RADIUS_CM, UNIT_DEG
 
-# NNWS constants
+log = nnws_log.getLogger(__name__)
+
+# Defaut axis for comparison
+X_AXIS = Vector3D.create(1, 0, 0)
+Y_AXIS = Vector3D.create(0, 1, 0)
+Z_AXIS = Vector3D.create(0, 0, 1)
+
+
+class SketchComputeStats:
+    """
+    Counts the curves added to sketches while their compute was deferred
+    batches: The number of deferred batches, each one is solved once when its compute is restored
+    curves: The number of curves added in the batches, each one would have been solved on its own
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.batches = 0
+        self.curves = 0
+
+    @property
+    def savedRecomputes(self) -> int:
+        return self.curves - self.batches
+
+
+sketchComputeStats = SketchComputeStats()
+
+
+@contextmanager
+def deferredCompute(sketch: Sketch):
+    """
+    Defers the compute of a sketch while a batch of curves is added to it, the constraints and the profiles are solved
+    once when the block exits. The profiles of the sketch must not be read inside the block.
+
+    Args:
+        sketch (Sketch): The sketch the curves are added to.
+
+    Yields:
+        Sketch: The sketch.
+    """
+    wasDeferred = sketch.isComputeDeferred
+    curvesBefore = sketch.sketchCurves.count
+    sketch.isComputeDeferred = True
+    try:
+        yield sketch
+    finally:
+        sketch.isComputeDeferred = wasDeferred
+        # a nested block is part of the batch of the outer one
+        if not wasDeferred:
+            added = sketch.sketchCurves.count - curvesBefore
+            if added > 0:
+                sketchComputeStats.batches += 1
+                sketchComputeStats.curves += added
 
 
 def valueInputMinMax(
@@ -69,6 +128,17 @@ def valueInputMinMax(
     return input
 
 
+def valueOrExpression(value) -> ValueInput:
+    """
+    Args:
+        value: A value in the internal units (cm, radians), or the expression of the user parameter driving it.
+
+    Returns:
+        ValueInput: The input of a feature, recomputed with the user parameter when it is an expression.
+    """
+    return ValueInput.createByString(value) if isinstance(value, str) else ValueInput.createByReal(value)
+
+
 def createNamedComponent(root: Component, name: str) -> Occurrence:
     """
     Creates a named component within the root component.
@@ -86,6 +156,7 @@ def createNamedComponent(root: Component, name: str) -> Occurrence:
     return newComponent
 
 
+@prof.profiled()
 def commonCreateThread(targetOccurence: Occurrence, threadStartOffset: float, radius: float, height: float) -> SweepFeature:
     """
     Creates a thread feature on a given target occurrence.
@@ -120,8 +191,9 @@ def commonCreateThread(targetOccurence: Occurrence, threadStartOffset: float, ra
     for pointIndex in range(1, iteration):
         points.add(helix_point(threadStartOffset, radius, THREAD_PITCH_CM, resolution, pointIndex))
 
-    spline = sketch.sketchCurves.sketchFittedSplines.add(points)
-    spline.name = "ThreadSpline"
+    with deferredCompute(sketch):
+        spline = sketch.sketchCurves.sketchFittedSplines.add(points)
+        spline.name = "ThreadSpline"
 
     # Create the sketch for the thread profile for the sweep, creating in the xz plane so the sweep is following the helix
     xz_plane = targetOccurence.xZConstructionPlane
@@ -189,28 +261,60 @@ def createInternalThread(targetOccurence: Occurrence, threadStartOffset: float,
     sweepFeature = commonCreateThread(targetOccurence, threadStartOffset, radius, height)
 
     # TODO need better selection that that! At least area and edge selcetion should be based on contants calculation of expected values
-    # Filet the thread end
+    # Filet the thread end and the edges connecting the thread to the wall, both selected on the thread before filleting
     endEdgeCollection = ObjectCollection.create()
+    edgeCollection = ObjectCollection.create()
     for f in sweepFeature.faces:
         if f.area > 10:
             for edge in f.edges:
                 if edge.length < 5:
                     endEdgeCollection.add(edge)
-
-    filletEdges(targetOccurence, endEdgeCollection, 0.05)
-
-    edgeCollection = ObjectCollection.create()
-    for f in sweepFeature.faces:
-        if f.area > 10:
-            for edge in f.edges:
-                if edge.length > 15:
+                elif edge.length > 15:
                     edgeCollection.add(edge)
 
-    filletEdges(targetOccurence, edgeCollection, 0.075)
+    with FilletAccumulator(targetOccurence) as fillets:
+        fillets.add(endEdgeCollection, 0.05)
+        fillets.add(edgeCollection, 0.075)
 
     return sweepFeature
 
 
+def threadOvershoot(threadStartOffset: float) -> float:
+    """
+    Returns:
+        float: How far a thread built by commonCreateThread goes over the top of its part, the helix ends one start
+        offset over the top and the profile adds its radius.
+    """
+    return threadStartOffset + THREAD_RADIUS_CM
+
+
+@prof.profiled()
+def cutThreadOvershoot(targetOccurence: Occurrence, radius: float, top: float, threadStartOffset: float) -> ExtrudeFeature:
+    """
+    Cuts the part of a thread going over the top of its part, the part stays a single body.
+
+    Args:
+        targetOccurence (Occurrence): The target occurrence of the thread.
+        radius (float): The radius of the thread.
+        top (float): The height of the top of the part.
+        threadStartOffset (float): The offset of the thread start.
+
+    Returns:
+        ExtrudeFeature: The cut feature.
+    """
+    # the cutter covers the whole thread profile, there is nothing else over the top of the part
+    cutterRadius = radius + 2 * THREAD_RADIUS_CM
+    margin = THREAD_RADIUS_CM
+    return createCylinderFromPointXYPlane(
+        targetOccurence,
+        cutterRadius,
+        threadOvershoot(threadStartOffset) + margin,
+        Point3D.create(0, 0, top),
+        FeatureOperations.CutFeatureOperation,
+    )
+
+
+@prof.profiled()
 def filletEdges(targetOccurence: Occurrence, edgeCollection: ObjectCollection, radius: float) -> FilletFeature:
     """
     Fillets the edges in the given edge collection with the specified radius.
@@ -220,15 +324,139 @@ def filletEdges(targetOccurence: Occurrence, edgeCollection: ObjectCollection, r
         edgeCollection (ObjectCollection): The collection of edges to be filleted.
         radius (float): The radius of the fillet.
 
+    Returns:
+        FilletFeature: The fillet feature created.
+    """
+    return filletEdgeSets(targetOccurence, [(edgeCollection, radius)])
+
+
+def filletEdgeSets(targetOccurence: Occurrence, edgeSets: list) -> FilletFeature:
+    """
+    Fillets several edge sets, each with its own radius, in a single fillet feature.
+
+    Args:
+        targetOccurence (Occurrence): The occurrence containing the edges to be filleted.
+        edgeSets (list): The (edge collection, radius) of every edge set.
+
     Returns:
         FilletFeature: The fillet feature created.
     """
     fillet: FilletFeatures = targetOccurence.features.filletFeatures
     filletInput: FilletFeatureInput = fillet.createInput()
-    filletInput.edgeSetInputs.addConstantRadiusEdgeSet(edgeCollection, ValueInput.createByReal(radius), True)
+    for edgeCollection, radius in edgeSets:
+        filletInput.edgeSetInputs.addConstantRadiusEdgeSet(edgeCollection, ValueInput.createByReal(radius), True)
     return fillet.add(filletInput)
 
 
+@dataclass
+class FilletSet:
+    """
+    An edge set waiting in a FilletAccumulator
+    edges: The edges to fillet
+    radius: The radius of the fillet
+    step: The build failure step of the set, None when its failures are not recorded
+    fallback: Called when the set fails on its own, the error is raised when None
+    """
+
+    edges: ObjectCollection
+    radius: float
+    step: str = None
+    fallback: Callable = None
+
+
+class FilletAccumulator:
+    """
+    Collects the fillets of a component during a generation and applies them at the end as a single fillet feature,
+    one edge set per fillet, instead of a feature per fillet. When the combined feature fails, the sets are filleted
+    one by one so only the failing ones fall back.
+    The edges must still exist when the fillets are applied: a set is added after the last feature splitting its body.
+    Used as a context manager, the fillets are applied when the block exits without error.
+    """
+
+    def __init__(self, targetOccurence: Occurrence, failures=None, params=None):
+        """
+        Args:
+            targetOccurence (Occurrence): The occurrence containing the edges, the fillet feature is created in it.
+            failures (BuildFailureCache, optional): Records the failing sets that have a step. Defaults to None.
+            params (optional): The parameter snapshot of the generation, the key of the recorded failures.
+        """
+        self.targetOccurence = targetOccurence
+        self.failures = failures
+        self.params = params
+        self.sets = []
+
+    def __enter__(self) -> "FilletAccumulator":
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if excType is None:
+            self.apply()
+
+    def add(self, edges: ObjectCollection, radius: float, step: str = None, fallback: Callable = None):
+        """
+        Adds an edge set. An edge already in a set keeps the radius of that set, it can only be filleted once: it is
+        removed from the collection, and a set whose edges are all in other sets is dropped.
+
+        Args:
+            edges (ObjectCollection): The edges to fillet.
+            radius (float): The radius of the fillet.
+            step (str, optional): The build failure step of the set. Defaults to None.
+            fallback (Callable, optional): Called when the set fails on its own. Defaults to None, the error is raised.
+        """
+        # only the edges of the sets already added are looked up, so the small sets go first
+        for filletSet in self.sets:
+            for edge in filletSet.edges:
+                edges.removeByItem(edge)
+        if edges.count > 0:
+            self.sets.append(FilletSet(edges, radius, step, fallback))
+
+    @prof.profiled()
+    def apply(self) -> list:
+        """
+        Applies the collected sets, combined in one feature when possible.
+
+        Returns:
+            list: The fillet features created.
+        """
+        sets, self.sets = self.sets, []
+        # in preview, the sets known to fail go straight to their fallback instead of failing the combined feature
+        known = [s for s in sets if self._isKnownFailure(s)]
+        combined = [s for s in sets if s not in known]
+
+        features = []
+        if len(combined) > 1:
+            try:
+                features.append(filletEdgeSets(self.targetOccurence, [(s.edges, s.radius) for s in combined]))
+            except RuntimeError as error:
+                log.debug("The fillet of %d edge sets failed (%s), filleting them one by one", len(combined), error)
+            else:
+                for filletSet in combined:
+                    if filletSet.step and self.failures:
+                        self.failures.forget(self.params, filletSet.step)
+                combined = []
+        for filletSet in combined + known:
+            feature = self._applyAlone(filletSet)
+            if isinstance(feature, FilletFeature):
+                features.append(feature)
+        return features
+
+    def _isKnownFailure(self, filletSet: FilletSet) -> bool:
+        return bool(filletSet.step and self.failures and self.failures.isPreview and self.failures.lookup(self.params, filletSet.step))
+
+    def _applyAlone(self, filletSet: FilletSet):
+        def build():
+            return filletEdgeSets(self.targetOccurence, [(filletSet.edges, filletSet.radius)])
+
+        if filletSet.step and self.failures:
+            return self.failures.attempt(self.params, filletSet.step, build, filletSet.fallback)
+        try:
+            return build()
+        except RuntimeError:
+            if filletSet.fallback is None:
+                raise
+            return filletSet.fallback()
+
+
 def wrapInCollection(object: any) -> ObjectCollection:
     """
     Wraps a single object in a collection.
@@ -385,7 +613,7 @@ def createPolygon(sketch: Sketch, radius: float, nbSides: int, xOffset: float =
         None
     """
     if nbSides < 4:
-        futil.log("The minimum number of side is 5 for polygon creaion")
+        log.warning("The minimum number of side is 5 for polygon creaion")
         return
 
     edges = ObjectCollection.create()
@@ -400,10 +628,11 @@ def createPolygon(sketch: Sketch, radius: float, nbSides: int, xOffset: float =
         points.add(createPolygonHexPoint(r, nbSides, p, offset_angle, xOffset, yOffset))
 
     # Connect the points with lines to form the polygon
-    for point in range(nbSides):
-        start_point = points.item(point)
-        end_point = points.item((point + 1) % nbSides)
-        edges.add(sketch.sketchCurves.sketchLines.addByTwoPoints(start_point, end_point))
+    with deferredCompute(sketch):
+        for point in range(nbSides):
+            start_point = points.item(point)
+            end_point = points.item((point + 1) % nbSides)
+            edges.add(sketch.sketchCurves.sketchLines.addByTwoPoints(start_point, end_point))
 
     return edges
 
@@ -492,7 +721,7 @@ def createCylinderFromPoint(
     Args:
         targetOccurence (Occurrence): The target occurrence where the cylinder will be created.
         outerRadius (float): The outer radius of the cylinder.
-        height (float): The height of the cylinder.
+        height (float): The height of the cylinder, or the expression of the user parameter driving it.
         point3d (Point3D): The center point of the circle sketch.
         plane: The plane on which the circle sketch will be created.
         operationType (FeatureOperations, optional): The type of operation to perform. Defaults to FeatureOperations.JoinFeatureOperation.
@@ -504,12 +733,30 @@ def createCylinderFromPoint(
     sketches = targetOccurence.sketches
     outer_sketch = sketches.add(plane)
     outer_sketch.sketchCurves.sketchCircles.addByCenterRadius(point3d, outerRadius)
-    profile = outer_sketch.profiles.item(0)
+    return extrudeProfile(targetOccurence, outer_sketch.profiles.item(0), height, operationType)
+
 
+def extrudeProfile(
+    targetOccurence: Occurrence,
+    profile,
+    height: float,
+    operationType: FeatureOperations = FeatureOperations.JoinFeatureOperation,
+) -> ExtrudeFeature:
+    """
+    Extrudes a profile, or a collection of profiles in a single feature, to the given height.
+
+    Args:
+        targetOccurence (Occurrence): The target occurrence where the extrude feature will be created.
+        profile: The profile, or an ObjectCollection of profiles, to extrude.
+        height (float): The height of the extrusion, or the expression of the user parameter driving it.
+        operationType (FeatureOperations, optional): The type of operation to perform. Defaults to FeatureOperations.JoinFeatureOperation.
+
+    Returns:
+        ExtrudeFeature: The created extrude feature.
+    """
     extrudes = targetOccurence.features.extrudeFeatures
     extrude_input = extrudes.createInput(profile, operationType)
-    extrude_distance = ValueInput.createByReal(height)
-    extrude_input.setDistanceExtent(False, extrude_distance)
+    extrude_input.setDistanceExtent(False, valueOrExpression(height))
     return extrudes.add(extrude_input)
 
 
@@ -546,9 +793,9 @@ def create2PointRectFromPoints(
     return extrudes.add(extrude_input)
 
 
-def createHollowCylinder(targetOccurence: Occurrence, outerRadius: float, offset: float, height: float) -> ExtrudeFeatures:
+def createHollowCylinder(targetOccurence: Occurrence, outerRadius: float, offset: float, height: float) -> ExtrudeFeature:
     """
-    Creates a hollow cylinder by extruding two concentric circles.
+    Creates a hollow cylinder by extruding the ring between two concentric circles.
 
     Args:
         targetOccurence (Occurrence): The target occurrence to create the cylinder in.
@@ -557,31 +804,64 @@ def createHollowCylinder(targetOccurence: Occurrence, outerRadius: float, offset
         height (float): The height of the cylinder.
 
     Returns:
-        ExtrudeFeatures: The extrude feature representing the hollow cylinder.
+        ExtrudeFeature: The extrude feature representing the hollow cylinder.
     """
+    return createAnnulus(
+        targetOccurence, targetOccurence.xYConstructionPlane, Point3D.create(0, 0, 0), outerRadius, outerRadius - offset, height
+    )
 
-    sketches = targetOccurence.sketches
-    xy_plane = targetOccurence.xYConstructionPlane
 
-    # Create a sketch for the outer circle
-    outer_sketch = sketches.add(xy_plane)
-    outer_sketch.sketchCurves.sketchCircles.addByCenterRadius(Point3D.create(0, 0, 0), outerRadius)
+def createAnnulus(
+    targetOccurence: Occurrence,
+    plane,
+    center: Point3D,
+    outerRadius: float,
+    innerRadius: float,
+    height: float,
+    operationType: FeatureOperations = FeatureOperations.NewBodyFeatureOperation,
+) -> ExtrudeFeature:
+    """
+    Creates a ring from a single sketch and a single extrude, instead of extruding the outer circle and cutting the
+    inner one.
 
-    # Create a second sketch for the inner circle
-    inner_sketch = sketches.add(xy_plane)
-    inner_sketch.sketchCurves.sketchCircles.addByCenterRadius(Point3D.create(0, 0, 0), outerRadius - offset)
+    Args:
+        targetOccurence (Occurrence): The target occurrence to create the ring in.
+        plane: The plane of the sketch.
+        center (Point3D): The center of the circles.
+        outerRadius (float): The radius of the outer circle.
+        innerRadius (float): The radius of the inner circle.
+        height (float): The height of the ring.
+        operationType (FeatureOperations, optional): The type of operation to perform.
+            Defaults to FeatureOperations.NewBodyFeatureOperation.
+
+    Returns:
+        ExtrudeFeature: The extrude feature of the ring, the hole is its side face with the smallest radius.
+    """
+    sketch = targetOccurence.sketches.add(plane)
+    circles = sketch.sketchCurves.sketchCircles
+    with deferredCompute(sketch):
+        circles.addByCenterRadius(center, outerRadius)
+        circles.addByCenterRadius(center, innerRadius)
+    return extrudeProfile(targetOccurence, annulusProfile(sketch), height, operationType)
+
+
+def annulusProfile(sketch: Sketch) -> Profile:
+    """
+    Returns:
+        Profile: The profile of the sketch with a hole, the ring between two concentric circles. None if there is none.
+    """
+    for profile in sketch.profiles:
+        if profile.profileLoops.count == 2:
+            return profile
+    return None
 
-    # Create an extrusion for the cylinder
-    extrudes = targetOccurence.features.extrudeFeatures
-    extrude_input = extrudes.createInput(outer_sketch.profiles.item(0), FeatureOperations.NewBodyFeatureOperation)
-    extrude_distance = ValueInput.createByReal(height)
-    extrude_input.setDistanceExtent(False, extrude_distance)
-    extrudes.add(extrude_input)
 
-    # Create a second extrusion to remove material and create the hole
-    hole_extrude_input = extrudes.createInput(inner_sketch.profiles.item(0), FeatureOperations.CutFeatureOperation)
-    hole_extrude_input.setDistanceExtent(False, extrude_distance)
-    return extrudes.add(hole_extrude_input)
+def innerSideFace(ring: ExtrudeFeature) -> BRepFace:
+    """
+    Returns:
+        BRepFace: The face of the hole of an extruded ring.
+    """
+    return min(ring.sideFaces, key=lambda face: face.geometry.radius)
 
 
 def helix_point(zOffset: float, radius: float, pitch: float, resolution: int, pointIndex: int) -> Point3D:
@@ -606,10 +886,9 @@ def helix_point(zOffset: float, radius: float, pitch: float, resolution: int, po
 
 
 def displayFaces(name: str, faces: BRepFaces):
-    futil.log(f"{name} has {faces.count} faces")
+    log.info("%s has %s faces", name, faces.count)
     for face in faces:
-        futil.log(f"{face}")
-        futil.log(f"{face.geometry.surfaceType}")
+        log.info("%s %s", face, face.geometry.surfaceType)
 
 
 def getColorForFace(face: BRepFace) -> Appearance:
@@ -647,7 +926,7 @@ def getColor(r, g, b) -> Appearance:
 
 def createColor(name: str, r, g, b) -> Appearance:
     app = Application.get()
-    futil.log(f"Creating new color: {name}")
+    log.debug("Creating new color: %s", name)
     existingColor = app.materialLibraries[3].appearances.itemByName("Oak")
     newColor: Appearance = Design.cast(app.activeProduct).appearances.addByCopy(existingColor, name)
     colorProp = ColorProperty.cast(newColor.appearanceProperties.itemByName("Color"))
@@ -671,6 +950,7 @@ def cutSketch(sketch: Sketch, targetOccurence: Occurrence, height: float):
     extrudes.add(cutterInput)
 
 
+@prof.profiled()
 def exportStepFile(design: Design, export_path: str):
     exportManager = design.exportManager
     stepOptions = exportManager.createSTEPExportOptions(export_path, design.rootComponent)
@@ -0,0 +1,107 @@
+from adsk.core import Matrix3D, Point3D, Vector3D
+from adsk.fusion import Component, Design, Occurrence, TriangleMeshQualityOptions
+
+from ...lib.common import api_profiler as prof
+from ...lib.common import nnws_log
+from ...lib.common.plate_packing import Footprint, PackingPlan, footprintFromBox, footprintFromPoints, packParts
+from ...lib.common.step_export import solidBodies
+
+# Print plates of accessories. The footprint of every part comes from the bounding boxes of its bodies or from the
+# convex hull of their coarse meshes, the packing is done by lib/common/plate_packing.py, and every plate is a
+# component holding an occurrence of the part component per copy, turned and moved to its place, resting on the bed.
+# The parts are built at the origin, their bodies in their own component, like the accessories of the dialog.
+
+log = nnws_log.getLogger(__name__)
+
+
+def partFootprint(component: Component, hull: bool = True) -> tuple:
+    """
+    Args:
+        component (Component): The component of the part.
+        hull (bool, optional): Uses the convex hull of the meshes instead of the bounding boxes. Defaults to True.
+
+    Returns:
+        tuple: The Footprint of the visible solid bodies of the part and the Z of their bottom, in cm.
+    """
+    bodies = solidBodies(component.bRepBodies)
+    if not bodies:
+        raise ValueError(f"{component.name} has no visible solid body to print")
+
+    boxes = [body.boundingBox for body in bodies]
+    floor = min(box.minPoint.z for box in boxes)
+    if not hull:
+        return (
+            footprintFromBox(
+                component.name,
+                min(box.minPoint.x for box in boxes),
+                min(box.minPoint.y for box in boxes),
+                max(box.maxPoint.x for box in boxes),
+                max(box.maxPoint.y for box in boxes),
+            ),
+            floor,
+        )
+
+    points = []
+    for body in bodies:
+        calculator = body.meshManager.createMeshCalculator()
+        calculator.setQuality(TriangleMeshQualityOptions.LowQualityTriangleMesh)
+        coordinates = calculator.calculate().nodeCoordinatesAsDouble
+        points.extend(zip(coordinates[0::3], coordinates[1::3]))
+    return footprintFromPoints(component.name, points), floor
+
+
+def packComponents(components: list, counts: list, bedWidth: float, bedDepth: float, spacing: float, hull: bool = True) -> tuple:
+    """
+    Packs copies of parts on print plates.
+
+    Args:
+        components (list): The component of every part.
+        counts (list): The number of copies of every part.
+        bedWidth (float): The X size of the bed, in cm.
+        bedDepth (float): The Y size of the bed, in cm.
+        spacing (float): The space between the parts, in cm.
+        hull (bool, optional): See partFootprint. Defaults to True.
+
+    Raises:
+        ValueError: When a part doesn't fit on the bed.
+
+    Returns:
+        tuple: The PackingPlan, and the component and Z of the bottom of every part of the plan.
+    """
+    footprints: list[Footprint] = []
+    parts = []
+    for component, count in zip(components, counts):
+        footprint, floor = partFootprint(component, hull)
+        footprints.extend([footprint] * count)
+        parts.extend([(component, floor)] * count)
+    return packParts(footprints, bedWidth, bedDepth, spacing), parts
+
+
+@prof.profiled()
+def buildPlates(design: Design, plan: PackingPlan, parts: list, name: str = "Plate") -> list:
+    """
+    Builds a component per plate, with an occurrence of the part component for every copy.
+
+    Args:
+        design (Design): The design of the parts.
+        plan (PackingPlan): The plates.
+        parts (list): The component and Z of the bottom of every part of the plan, see packComponents.
+        name (str, optional): The name of the plates, numbered. Defaults to "Plate".
+
+    Returns:
+        list: The occurrence of every plate.
+    """
+    zAxis = Vector3D.create(0, 0, 1)
+    origin = Point3D.create(0, 0, 0)
+    plates = []
+    for index in range(plan.plateCount):
+        plate: Occurrence = design.rootComponent.occurrences.addNewComponent(Matrix3D.create())
+        plate.component.name = f"{name} {index + 1}"
+        for placement in plan.plate(index):
+            component, floor = parts[placement.part]
+            transform = Matrix3D.create()
+            transform.setToRotation(placement.angle, zAxis, origin)
+            transform.translation = Vector3D.create(*placement.translation, -floor)
+            plate.component.occurrences.addExistingComponent(component, transform)
+        plates.append(plate)
+    return plates
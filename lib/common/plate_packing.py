@@ -0,0 +1,196 @@
+import math
+from dataclasses import dataclass
+
+from ...lib.common import nnws_log
+
+# Print plates of the accessory batches. Every part is reduced to the rectangle around its outline seen from the top,
+# turned to its smallest area, and the rectangles are packed on shelves, the tallest first, each one in the first
+# shelf with room left, on the first plate with room left. Plain Python, no adsk import, hundreds of parts take a
+# few milliseconds.
+
+log = nnws_log.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Footprint:
+    """
+    The outline of a part seen from the top, as the rectangle around it
+    name: The name of the part
+    width: The X size of the rectangle once the part is turned by angle, in cm
+    depth: The Y size of the rectangle once the part is turned by angle, in cm
+    angle: The rotation around Z aligning the rectangle with the axes, in radians
+    corners: The (x, y) corners of the rectangle, in the coordinates of the part
+    """
+
+    name: str
+    width: float
+    depth: float
+    angle: float
+    corners: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Placement:
+    """
+    A part on a plate
+    part: The index of the part, in the footprints given to packParts
+    plate: The index of the plate
+    angle: The rotation of the part around Z, in radians, applied first
+    translation: The (x, y) move of the turned part, in cm, its rectangle starts at the corner of the bed
+    """
+
+    part: int
+    plate: int
+    angle: float
+    translation: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class PackingPlan:
+    """
+    The plates of a batch of parts
+    bedWidth: The X size of the bed, in cm
+    bedDepth: The Y size of the bed, in cm
+    plateCount: The number of plates
+    placements: The Placement of every part, plate by plate
+    """
+
+    bedWidth: float
+    bedDepth: float
+    plateCount: int
+    placements: tuple
+
+    def plate(self, index: int) -> list:
+        """
+        Returns:
+            list: The Placement of the parts of a plate.
+        """
+        return [placement for placement in self.placements if placement.plate == index]
+
+    def summary(self) -> str:
+        return f"{len(self.placements)} parts on {self.plateCount} plates of {self.bedWidth * 10:.0f} x {self.bedDepth * 10:.0f} mm"
+
+
+def convexHull(points: list) -> list:
+    """
+    Returns:
+        list: The (x, y) corners of the convex hull of the points, counterclockwise, monotone chain.
+    """
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for point in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], point) <= 0:
+            lower.pop()
+        lower.append(point)
+    for point in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], point) <= 0:
+            upper.pop()
+        upper.append(point)
+    return lower[:-1] + upper[:-1]
+
+
+def _rotated(points, angle: float) -> list:
+    c, s = math.cos(angle), math.sin(angle)
+    return [(x * c - y * s, x * s + y * c) for x, y in points]
+
+
+def footprintFromBox(name: str, minX: float, minY: float, maxX: float, maxY: float) -> Footprint:
+    """
+    Returns:
+        Footprint: The footprint of a part from its bounding box, not turned.
+    """
+    return Footprint(name, maxX - minX, maxY - minY, 0.0, ((minX, minY), (maxX, minY), (maxX, maxY), (minX, maxY)))
+
+
+def footprintFromPoints(name: str, points: list) -> Footprint:
+    """
+    The smallest rectangle around the outline of a part, one of its sides is on a side of the convex hull.
+
+    Args:
+        name (str): The name of the part.
+        points (list): The (x, y) points of the part, the nodes of its mesh seen from the top.
+
+    Returns:
+        Footprint: The footprint of the part, turned to the smallest area.
+    """
+    hull = convexHull(points)
+    xs, ys = [x for x, _ in hull], [y for _, y in hull]
+    best = footprintFromBox(name, min(xs), min(ys), max(xs), max(ys))
+    for i in range(len(hull)):
+        (x1, y1), (x2, y2) = hull[i], hull[(i + 1) % len(hull)]
+        angle = -math.atan2(y2 - y1, x2 - x1)
+        turned = _rotated(hull, angle)
+        xs, ys = [x for x, _ in turned], [y for _, y in turned]
+        width, depth = max(xs) - min(xs), max(ys) - min(ys)
+        if width * depth < best.width * best.depth - 1e-9:
+            box = ((min(xs), min(ys)), (max(xs), min(ys)), (max(xs), max(ys)), (min(xs), max(ys)))
+            best = Footprint(name, width, depth, angle, tuple(_rotated(box, -angle)))
+    return best
+
+
+def packParts(footprints: list, bedWidth: float, bedDepth: float, spacing: float = 0.5, margin: float = 0.0) -> PackingPlan:
+    """
+    Packs parts on as few plates as the shelves allow.
+
+    Args:
+        footprints (list): The Footprint of every part, a part printed several times is given several times.
+        bedWidth (float): The X size of the bed, in cm.
+        bedDepth (float): The Y size of the bed, in cm.
+        spacing (float, optional): The space between the parts, in cm. Defaults to 0.5.
+        margin (float, optional): The space kept free on every side of the bed, in cm. Defaults to 0.
+
+    Raises:
+        ValueError: When a part doesn't fit on the bed.
+
+    Returns:
+        PackingPlan: The placement of every part.
+    """
+    # the spacing is added to every part, the last one of a shelf doesn't need it
+    width = bedWidth - 2 * margin + spacing
+    depth = bedDepth - 2 * margin + spacing
+
+    parts = []
+    for index, footprint in enumerate(footprints):
+        w, d = footprint.width + spacing, footprint.depth + spacing
+        # the long side along the shelves, the shelves are then as low as possible, and turned anyway when it only fits so
+        fitsTurned = d <= width and w <= depth
+        turned = fitsTurned and (d > w or w > width or d > depth)
+        if turned:
+            w, d = d, w
+        if w > width or d > depth:
+            raise ValueError(f"{footprint.name} ({footprint.width * 10:.1f} x {footprint.depth * 10:.1f} mm) doesn't fit on the bed")
+        parts.append((d, w, index, footprint.angle + (math.pi / 2 if turned else 0.0)))
+    parts.sort(key=lambda part: (-part[0], -part[1], part[2]))
+
+    # a shelf is [plate, y, height, used width], a plate is its used depth
+    shelves = []
+    plates = []
+    placements = []
+    for d, w, index, angle in parts:
+        shelf = next((shelf for shelf in shelves if shelf[2] >= d and shelf[3] + w <= width), None)
+        if shelf is None:
+            plate = next((plate for plate, used in enumerate(plates) if used + d <= depth), None)
+            if plate is None:
+                plate = len(plates)
+                plates.append(0.0)
+            shelf = [plate, plates[plate], d, 0.0]
+            plates[plate] += d
+            shelves.append(shelf)
+
+        corners = _rotated(footprints[index].corners, angle)
+        minX, minY = min(x for x, _ in corners), min(y for _, y in corners)
+        translation = (margin + shelf[3] - minX, margin + shelf[1] - minY)
+        placements.append(Placement(index, shelf[0], angle, translation))
+        shelf[3] += w
+
+    placements.sort(key=lambda placement: (placement.plate, placement.part))
+    plan = PackingPlan(bedWidth, bedDepth, len(plates), tuple(placements))
+    if log.isDebug:
+        log.debug("Plate packing: %s", plan.summary())
+    return plan
@@ -0,0 +1,183 @@
+import math
+from dataclasses import dataclass
+
+from ...lib.common.accessory_parameters import SHELF_MAX_X_COUNT, ShelfParameters
+
+# NNWS constants
+from ...lib.common.nnws_constants import (
+    ACC_EXTENSION_WIDTH_CM,
+    ACC_INTERNAL_SKETCH_RADIUS_CM,
+    ACC_LEDGER_WIDTH_CM,
+    ACC_SHELF_WIDTH_CM,
+    GRIDFINITY_SIZE_CM,
+    MIN_SHELF_SIZE_CM,
+)
+
+# Geometry of the shelf support frame and the sizes it can be built with, without Fusion. generateShelf builds the
+# frame from a ShelfFit, the dialog and the constraints read the same fit, so a size that can't be built or filleted
+# is known before any geometry is attempted. A ShelfSizingTable holds the fits of a range of lengths and insert counts
+# and suggests the nearest sizes that can be built with the fillet. Plain Python, no adsk import.
+
+# Below this width on the sides of the shelf, the fillet of the shelf can't be calculated
+MIN_SHELF_FILLET_SIDE_WIDTH_CM = 0.75
+
+# Fillet of the top and bottom edges of the frame
+SHELF_EDGE_FILLET_RADIUS_CM = 0.1
+
+# The frame is a rounded rectangle with a hole, HOLE_OFFSET from its sides, and a ledge, LEDGE_OFFSET from its sides
+SHELF_LEDGE_OFFSET_CM = ACC_LEDGER_WIDTH_CM
+SHELF_HOLE_OFFSET_CM = SHELF_LEDGE_OFFSET_CM + ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM
+SHELF_HOLE_FILLET_RADIUS_CM = ACC_INTERNAL_SKETCH_RADIUS_CM
+SHELF_LEDGE_FILLET_RADIUS_CM = ACC_SHELF_WIDTH_CM - ACC_LEDGER_WIDTH_CM + ACC_INTERNAL_SKETCH_RADIUS_CM
+SHELF_OUTER_FILLET_RADIUS_CM = ACC_INTERNAL_SKETCH_RADIUS_CM + SHELF_HOLE_OFFSET_CM
+
+# The sketch fillets under this radius are skipped
+MIN_SKETCH_FILLET_RADIUS_CM = 0.01
+
+# Step of the lengths of the sizing table and of the suggested sizes, 1 mm
+SHELF_SIZE_STEP_CM = 0.1
+
+# Lengths of the sizing table of the dialog, up to one more grid unit than the largest insert count
+SHELF_TABLE_MAX_LENGTH_CM = (SHELF_MAX_X_COUNT + 1) * GRIDFINITY_SIZE_CM
+
+
+@dataclass(frozen=True, slots=True)
+class ShelfFit:
+    """
+    The frame of a shelf support of a length for a number of inserts
+    xCount: The number of inserts
+    length: The length of the shelf
+    numFits: The number of grid units fitting in the length
+    sideWidth: The width of the shelf on each side of the outer inserts
+    outerFilletRadius: The radius of the back corners of the frame
+    sideFilletRadius: The radius of the front corners of the frame, 0 when they are not filleted
+    """
+
+    xCount: int
+    length: float
+    numFits: int
+    sideWidth: float
+    outerFilletRadius: float
+    sideFilletRadius: float
+
+    @property
+    def isAttached(self) -> bool:
+        """
+        Whether the frame reaches the attachments of the outer inserts, else they are separate bodies.
+        """
+        return self.sideWidth > -ACC_EXTENSION_WIDTH_CM / 2
+
+    @property
+    def edgeFillet(self) -> bool:
+        """
+        Whether the edges of the frame can be filleted, the shelf is generated without fillet otherwise.
+        """
+        return self.sideWidth >= MIN_SHELF_FILLET_SIDE_WIDTH_CM
+
+    @property
+    def minLength(self) -> float:
+        # the back corners, the front corners and the corners of the hole share the sides along the length
+        return max(2 * self.outerFilletRadius, 2 * self.sideFilletRadius, 2 * (SHELF_HOLE_OFFSET_CM + SHELF_HOLE_FILLET_RADIUS_CM))
+
+    @property
+    def minDepth(self) -> float:
+        return max(
+            self.outerFilletRadius + self.sideFilletRadius,
+            2 * (SHELF_HOLE_OFFSET_CM + SHELF_HOLE_FILLET_RADIUS_CM),
+            2 * (SHELF_LEDGE_OFFSET_CM + SHELF_LEDGE_FILLET_RADIUS_CM),
+        )
+
+    def sketchFits(self, depth: float) -> bool:
+        """
+        Returns:
+            bool: Whether the rounded rectangles of the frame, the hole and the ledge can be sketched for a depth, the
+            corners leave a straight part on every side.
+        """
+        return self.length > self.minLength and depth > self.minDepth
+
+    def isFeasible(self, depth: float) -> bool:
+        return self.isAttached and self.sketchFits(depth)
+
+
+def shelfFit(xCount: int, length: float) -> ShelfFit:
+    """
+    Returns:
+        ShelfFit: The frame of a shelf of a length for a number of inserts, as generateShelf builds it.
+    """
+    numFits = int(length // GRIDFINITY_SIZE_CM)
+    sideWidth = (length - max(xCount - 1, numFits - 1) * GRIDFINITY_SIZE_CM) / 2
+    sideFilletRadius = min(SHELF_OUTER_FILLET_RADIUS_CM, max(0.0, sideWidth - ACC_EXTENSION_WIDTH_CM / 2))
+    if sideFilletRadius <= MIN_SKETCH_FILLET_RADIUS_CM:
+        sideFilletRadius = 0.0
+    return ShelfFit(xCount, length, numFits, sideWidth, SHELF_OUTER_FILLET_RADIUS_CM, sideFilletRadius)
+
+
+class ShelfSizingTable:
+    """
+    The fits of the shelf lengths on a grid of SHELF_SIZE_STEP_CM, for a range of insert counts, computed once so the
+    dialog can check a size and suggest the nearest ones instantly. The lengths out of the table are computed on demand.
+    """
+
+    def __init__(self, xCounts=range(1, SHELF_MAX_X_COUNT + 1), minLength=MIN_SHELF_SIZE_CM, maxLength=SHELF_TABLE_MAX_LENGTH_CM):
+        """
+        Args:
+            xCounts (optional): The insert counts. Defaults to the counts of the dialog.
+            minLength (float, optional): The shortest length. Defaults to the minimum shelf size.
+            maxLength (float, optional): The longest length. Defaults to SHELF_TABLE_MAX_LENGTH_CM.
+        """
+        self.minStep = self._step(minLength)
+        self.maxStep = self._step(maxLength)
+        self.fits = {
+            (xCount, step): shelfFit(xCount, round(step * SHELF_SIZE_STEP_CM, 6))
+            for xCount in xCounts
+            for step in range(self.minStep, self.maxStep + 1)
+        }
+
+    @staticmethod
+    def _step(length: float) -> int:
+        return round(length / SHELF_SIZE_STEP_CM)
+
+    def fit(self, xCount: int, length: float) -> ShelfFit:
+        """
+        Returns:
+            ShelfFit: The fit of the length from the table when it is on the grid, computed otherwise.
+        """
+        step = self._step(length)
+        fit = self.fits.get((xCount, step))
+        onGrid = math.isclose(length, step * SHELF_SIZE_STEP_CM, abs_tol=1e-9)
+        return fit if fit is not None and onGrid else shelfFit(xCount, length)
+
+    def nearestLengths(self, xCount: int, length: float, depth: float) -> list:
+        """
+        Returns:
+            list: The nearest shorter and longer lengths of the table that can be built with the fillet for the depth,
+            the nearest first, empty when none.
+        """
+        step = self._step(length)
+        nearest = []
+        for steps in (range(step - 1, self.minStep - 1, -1), range(step + 1, self.maxStep + 1)):
+            for candidate in steps:
+                fit = self.fits.get((xCount, candidate))
+                if fit is not None and fit.edgeFillet and fit.isFeasible(depth):
+                    nearest.append(fit.length)
+                    break
+        return sorted(nearest, key=lambda candidate: abs(candidate - length))
+
+    def suggestion(self, params: ShelfParameters) -> str:
+        """
+        Returns:
+            str: The nearest sizes to use when the shelf can't be built or filleted, empty when it can.
+        """
+        fit = self.fit(params.insert.xCount, params.length)
+        lengthFits = fit.edgeFillet and fit.isAttached and params.length > fit.minLength
+        depthFits = params.depth > fit.minDepth
+        if lengthFits and depthFits:
+            return ""
+
+        depth = params.depth if depthFits else (self._step(fit.minDepth) + 1) * SHELF_SIZE_STEP_CM
+        sizes = [] if depthFits else [f"a depth of {depth * 10:g} mm"]
+        if not lengthFits:
+            lengths = self.nearestLengths(params.insert.xCount, params.length, depth)
+            if lengths:
+                sizes.append("a length of " + " or ".join(f"{length * 10:g} mm" for length in lengths))
+        return f"Nearest size with fillet: {', '.join(sizes)}." if sizes else ""
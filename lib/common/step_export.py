@@ -0,0 +1,177 @@
+import os
+
+from adsk.core import Matrix3D
+from adsk.fusion import Component, Design, Occurrence
+
+from ...lib.common import api_profiler as prof
+from ...lib.common import nnws_log
+
+# Explicit export sets of the STEP files. A part is exported from the component holding its visible solid bodies, without
+# copying them. Only the file per body mode copies each body to a temporary component, the only one exported, which is
+# deleted afterward. The instanced walls and insert plates are exported as assemblies, the bodies of a cell are copied
+# once and referenced by every cell.
+
+log = nnws_log.getLogger(__name__)
+
+
+def solidBodies(bodies) -> list:
+    """
+    Returns:
+        list: The visible solid bodies among the bodies.
+    """
+    return [body for body in bodies if body.isVisible and body.isSolid]
+
+
+def exportBodies(design: Design) -> list:
+    """
+    Returns:
+        list: The visible solid bodies of the design, those of the occurrences as proxies, in the order of the browser.
+    """
+    root = design.rootComponent
+    bodies = solidBodies(root.bRepBodies)
+    for occurrence in root.allOccurrences:
+        if occurrence.isVisible:
+            bodies.extend(solidBodies(occurrence.bRepBodies))
+    return bodies
+
+
+def instanceGroups(assembly: Component) -> list:
+    """
+    Groups the visible occurrences by component, the instanced cells of a wall or an insert plate share one component.
+
+    Args:
+        assembly (Component): The root component, or a component whose cells are direct occurrences like a wall tile.
+
+    Returns:
+        list: A (component, occurrences) tuple per component with visible solid bodies, in the order of the browser.
+    """
+    groups = []
+    for occurrence in assembly.allOccurrences:
+        if not occurrence.isVisible:
+            continue
+        component = occurrence.component
+        # the API returns a new object for every access, they are compared, not hashed
+        group = next((group for group in groups if group[0] == component), None)
+        if group:
+            group[1].append(occurrence)
+        elif solidBodies(component.bRepBodies):
+            groups.append((component, [occurrence]))
+    return groups
+
+
+def bodyFileNames(bodies: list) -> list:
+    """
+    Returns:
+        list: A file name per body, its name without spaces, numbered when several bodies have the same name.
+    """
+    names = [body.name.replace(" ", "_") for body in bodies]
+    seen = {}
+    fileNames = []
+    for name in names:
+        seen[name] = seen.get(name, 0) + 1
+        fileNames.append(name if names.count(name) == 1 else f"{name}_{seen[name]}")
+    return fileNames
+
+
+def exportComponent(design: Design) -> Component:
+    """
+    Returns:
+        Component: The component of the only visible occurrence holding visible solid bodies, like the wall section
+        and its patterns, the root component when the bodies are in the root component or in several occurrences.
+    """
+    root = design.rootComponent
+    holders = [occurrence for occurrence in root.allOccurrences if occurrence.isVisible and solidBodies(occurrence.bRepBodies)]
+    if len(holders) == 1 and not solidBodies(root.bRepBodies):
+        return holders[0].component
+    return root
+
+
+def _createExportOccurrence(design: Design, name: str) -> Occurrence:
+    occurrence = design.rootComponent.occurrences.addNewComponent(Matrix3D.create())
+    occurrence.component.name = name
+    return occurrence
+
+
+def _exportComponent(design: Design, occurrence: Occurrence, path: str):
+    exportManager = design.exportManager
+    exportManager.execute(exportManager.createSTEPExportOptions(path, occurrence.component))
+
+
+@prof.profiled()
+def exportVisibleBodies(design: Design, exportPath: str, perBody: bool = False) -> list:
+    """
+    Exports the visible solid bodies of the design to STEP. A single file exports the component holding them, see
+    exportComponent, a file per body exports a copy of each body.
+
+    Args:
+        design (Design): The design to export.
+        exportPath (str): The STEP file. In per body mode, the name of each body is appended to its name.
+        perBody (bool, optional): Writes a file per body instead of a single file. Defaults to False.
+
+    Returns:
+        list: The paths of the files written, empty when the design has no visible solid body.
+    """
+    bodies = exportBodies(design)
+    if not bodies:
+        log.warning("Nothing exported to '%s', the design has no visible solid body", exportPath)
+        return []
+
+    if not perBody:
+        exportManager = design.exportManager
+        exportManager.execute(exportManager.createSTEPExportOptions(exportPath, exportComponent(design)))
+        return [exportPath]
+
+    stem, extension = os.path.splitext(exportPath)
+    # the parts keep the name of their component, the file name is used for the bodies of several components
+    components = {body.parentComponent.name for body in bodies}
+    occurrence = _createExportOccurrence(design, components.pop() if len(components) == 1 else os.path.basename(stem))
+    try:
+        paths = []
+        for body, fileName in zip(bodies, bodyFileNames(bodies)):
+            copy = body.copyToComponent(occurrence)
+            path = f"{stem}_{fileName}{extension}"
+            _exportComponent(design, occurrence, path)
+            copy.deleteMe()
+            paths.append(path)
+        return paths
+    finally:
+        occurrence.deleteMe()
+
+
+@prof.profiled()
+def exportInstances(design: Design, exportPath: str, assembly: Component = None) -> str:
+    """
+    Exports the visible solid bodies of the design to a STEP assembly that keeps the instances: the bodies of a
+    component are copied once, to an export component placed at every visible occurrence of the component.
+
+    Args:
+        design (Design): The design to export.
+        exportPath (str): The STEP file.
+        assembly (Component, optional): The component to export, see instanceGroups. Defaults to the root component.
+
+    Returns:
+        str: The path of the file written, None when the component has no visible solid body.
+    """
+    assembly = assembly or design.rootComponent
+    rootBodies = solidBodies(assembly.bRepBodies)
+    groups = instanceGroups(assembly)
+    if not rootBodies and not groups:
+        log.warning("Nothing exported to '%s', the component has no visible solid body", exportPath)
+        return None
+
+    occurrence = _createExportOccurrence(design, os.path.basename(os.path.splitext(exportPath)[0]))
+    try:
+        for body in rootBodies:
+            body.copyToComponent(occurrence)
+        occurrences = occurrence.component.occurrences
+        for component, instances in groups:
+            cell = occurrences.addNewComponent(instances[0].transform2)
+            cell.component.name = component.name
+            for body in solidBodies(component.bRepBodies):
+                body.copyToComponent(cell.component)
+            for instance in instances[1:]:
+                occurrences.addExistingComponent(cell.component, instance.transform2)
+        _exportComponent(design, occurrence, exportPath)
+        return exportPath
+    finally:
+        occurrence.deleteMe()
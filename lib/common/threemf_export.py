@@ -0,0 +1,127 @@
+import zipfile
+from xml.sax.saxutils import quoteattr
+
+from adsk.core import Matrix3D
+from adsk.fusion import Component, Design, TriangleMeshQualityOptions
+
+from ...lib.common import api_profiler as prof
+from ...lib.common import nnws_log
+from ...lib.common.step_export import instanceGroups, solidBodies
+
+# 3MF files of the instanced parts. The bodies of a component are meshed once into a 3MF object, every occurrence of
+# the component is a build item referencing the object with the transform of the occurrence, so a wall of N cells
+# holds a single cell mesh. The package is written here, the meshes come from the API.
+
+# The API lengths are in cm, the 3MF model is in mm
+MM_PER_CM = 10
+
+MODEL_PATH = "3D/3dmodel.model"
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>"
+)
+RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Target="/{MODEL_PATH}" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>"
+)
+
+log = nnws_log.getLogger(__name__)
+
+
+def _number(value: float) -> str:
+    # a micron is below the printers resolution
+    return f"{value:.4f}".rstrip("0").rstrip(".")
+
+
+def meshXml(bodies: list, quality: int) -> str:
+    """
+    Meshes bodies into a single 3MF mesh.
+
+    Args:
+        bodies (list): The bodies, in the coordinates of their component.
+        quality (int): The TriangleMeshQualityOptions of the meshes.
+
+    Returns:
+        str: The mesh element, in mm.
+    """
+    vertices = []
+    triangles = []
+    for body in bodies:
+        calculator = body.meshManager.createMeshCalculator()
+        calculator.setQuality(quality)
+        mesh = calculator.calculate()
+        first = len(vertices)
+        coordinates = mesh.nodeCoordinatesAsDouble
+        for i in range(0, len(coordinates), 3):
+            x, y, z = (_number(c * MM_PER_CM) for c in coordinates[i : i + 3])
+            vertices.append(f'<vertex x="{x}" y="{y}" z="{z}"/>')
+        indices = mesh.nodeIndices
+        for i in range(0, len(indices), 3):
+            v1, v2, v3 = (first + index for index in indices[i : i + 3])
+            triangles.append(f'<triangle v1="{v1}" v2="{v2}" v3="{v3}"/>')
+    return f"<mesh><vertices>{''.join(vertices)}</vertices><triangles>{''.join(triangles)}</triangles></mesh>"
+
+
+def transformAttribute(transform: Matrix3D) -> str:
+    """
+    Returns:
+        str: The 3MF transform of a matrix, the 3MF matrices apply to row vectors so the rotation is transposed.
+    """
+    m = transform.asArray()
+    values = [m[0], m[4], m[8], m[1], m[5], m[9], m[2], m[6], m[10], m[3] * MM_PER_CM, m[7] * MM_PER_CM, m[11] * MM_PER_CM]
+    return " ".join(_number(value) for value in values)
+
+
+@prof.profiled()
+def exportInstances3MF(
+    design: Design,
+    exportPath: str,
+    assembly: Component = None,
+    quality: int = TriangleMeshQualityOptions.NormalQualityTriangleMesh,
+) -> str:
+    """
+    Exports the visible solid bodies of the design to a 3MF file that keeps the instances: an object per component,
+    a build item per visible occurrence.
+
+    Args:
+        design (Design): The design to export.
+        exportPath (str): The 3MF file.
+        assembly (Component, optional): The component to export, see instanceGroups. Defaults to the root component.
+        quality (int, optional): The TriangleMeshQualityOptions of the meshes. Defaults to the normal quality.
+
+    Returns:
+        str: The path of the file written, None when the component has no visible solid body.
+    """
+    assembly = assembly or design.rootComponent
+    objects = []
+    items = []
+
+    rootBodies = solidBodies(assembly.bRepBodies)
+    if rootBodies:
+        objects.append(f'<object id="1" name={quoteattr(assembly.name)} type="model">{meshXml(rootBodies, quality)}</object>')
+        items.append('<item objectid="1"/>')
+    for component, occurrences in instanceGroups(assembly):
+        objectId = len(objects) + 1
+        mesh = meshXml(solidBodies(component.bRepBodies), quality)
+        objects.append(f'<object id="{objectId}" name={quoteattr(component.name)} type="model">{mesh}</object>')
+        items.extend(f'<item objectid="{objectId}" transform="{transformAttribute(o.transform2)}"/>' for o in occurrences)
+
+    if not objects:
+        log.warning("Nothing exported to '%s', the component has no visible solid body", exportPath)
+        return None
+
+    model = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="en-US" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+        f"<resources>{''.join(objects)}</resources><build>{''.join(items)}</build></model>"
+    )
+    with zipfile.ZipFile(exportPath, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", CONTENT_TYPES)
+        package.writestr("_rels/.rels", RELATIONSHIPS)
+        package.writestr(MODEL_PATH, model)
+    return exportPath
@@ -1,5 +1,4 @@
 import math
-from enum import Enum
 
 from adsk.core import Matrix3D, ObjectCollection, Point3D, ValueInput, Vector3D
 from adsk.fusion import (
@@ -8,21 +7,22 @@ from adsk.fusion import (
     ExtrudeFeature,
     ExtrudeFeatureInput,
     FeatureOperations,
-    MoveFeature,
     Occurrence,
     PatternDistanceType,
     RectangularPatternFeature,
     Sketch,
 )
 
-from ...lib import fusion360utils as futil
+from ...lib.common import api_profiler as prof
+from ...lib.common import nnws_log
+from ...lib.common.hex_grid import hexPointXY
 from ...lib.common.nnws_constants import GRIDFINITY_SIZE_CM
 from ...lib.common.nnws_util import wrapInCollection
 
-# Hex pattern, haven't tested anything else
-WALL_NB_SIDES = 6
+log = nnws_log.getLogger(__name__)
 
 
+@prof.profiled()
 def circPatternSketch(targetOccurence: Occurrence, featureType: FeatureOperations, sketch: Sketch, extrudeHeight: float, patternCount: int, axis):
     profile = sketch.profiles.item(0)
     extrudes = targetOccurence.features.extrudeFeatures
@@ -46,41 +46,8 @@ def createDeltaVector(p1, p2):
     return Vector3D.create(dx, dy, dz)
 
 
-def calculateOffsetAngle(nbSides: int):
-    return math.pi / 2 if nbSides % 2 == 0 else math.pi / nbSides + math.pi / 2
-
-
 def createHexPoint(radius: float, index: int, offset: int, offset_angle: float) -> Point3D:
-    # futil.log(f'offset angle: {offset_angle}')
-    angle = 2 * math.pi * index / WALL_NB_SIDES + offset_angle
-    x = math.cos(angle) * radius
-    y = math.sin(angle) * radius
-    # futil.log(f'angle: {angle}')
-    if offset != 0:
-        # futil.log(f'offset: {offset}')
-        # futil.log(f'x: {x}')
-        # futil.log(f'y: {y}')
-
-        positiveOffset: bool = offset >= 0
-        offsetValue = offset * GRIDFINITY_SIZE_CM
-        # futil.log(f'offsetValue: {offsetValue}')
-        new_x = x + offsetValue
-        futil.log(f"new_x: {new_x}")
-        hyp = math.hypot(y, new_x)
-        # hyp = math.sqrt(y * y + new_x * new_x)
-
-        # if not positiveOffset:
-        #     hyp = -hyp
-        futil.log(f"hyp: {hyp}")
-        angle = math.asin(y / hyp)
-        if not positiveOffset:
-            angle = -angle
-        futil.log(f"new angle: {angle}")
-
-        x = math.cos(angle) * radius + offsetValue
-        futil.log(f"final x: {x}")
-
-    return Point3D.create(x, y, 0)
+    return Point3D.create(*hexPointXY(radius, index, offset, offset_angle), 0)
 
 
 # pretty close!
@@ -110,16 +77,7 @@ def createHexPoint(radius: float, index: int, offset: int, offset_angle: float)
 #     return Point3D.create(x, y, 0)
 
 
-# This is based on the assumption that the hexagon is created in a counter clockwise direction with createExteriorContainer
-class HexPointIndex(Enum):
-    TOP = 0
-    TOP_LEFT = 1
-    BOTTOM_LEFT = 2
-    BOTTOM = 3
-    BOTTOM_RIGHT = 4
-    TOP_RIGHT = 5
-
-
+@prof.profiled()
 def patternBodies(rootComponent: Component, xAxis, bodies: ObjectCollection, width: int) -> RectangularPatternFeature:
     quantityOne = ValueInput.createByReal(width)
     distanceOne = ValueInput.createByReal(GRIDFINITY_SIZE_CM)
@@ -130,11 +88,69 @@ def patternBodies(rootComponent: Component, xAxis, bodies: ObjectCollection, wid
     return rectangularPatterns.add(rectangularPatternInput)
 
 
-def copyBodies(rootComponent: Component, bodies: ObjectCollection, toPoint: Vector3D) -> MoveFeature:
+@prof.profiled()
+def copyBodies(rootComponent: Component, bodies: ObjectCollection, toPoint: Vector3D) -> ObjectCollection:
+    """
+    Copies bodies and moves the copies. The bodies stay in place, a move of the seed of a pattern would take its cell
+    out of the patterned row.
+
+    Args:
+        rootComponent (Component): The component of the bodies.
+        bodies (ObjectCollection): The bodies to copy.
+        toPoint (Vector3D): The move of the copies.
+
+    Returns:
+        ObjectCollection: The copies, at their new position.
+    """
+    copies = ObjectCollection.create()
+    for body in rootComponent.features.copyPasteBodies.add(bodies).bodies:
+        copies.add(body)
     transform = Matrix3D.create()
     transform.translation = toPoint
     moveFeature = rootComponent.features.moveFeatures
-    moveFeatureInput = moveFeature.createInput2(bodies)
+    moveFeatureInput = moveFeature.createInput2(copies)
     moveFeatureInput.isGroup = True
     moveFeatureInput.transform = transform
-    return moveFeature.add(moveFeatureInput)
+    moveFeature.add(moveFeatureInput)
+    return copies
+
+
+def latticeOffsets(rowOrigins: list, widths: list) -> list:
+    """
+    The positions of the cells of a lattice, row by row, each row starting at its origin and going along X.
+
+    Args:
+        rowOrigins (list): The Vector3D origin of every row.
+        widths (list): The number of cells of every row.
+
+    Returns:
+        list: The Vector3D offset of every cell, the first one is the origin of the first row.
+    """
+    offsets = []
+    for origin, width in zip(rowOrigins, widths):
+        for i in range(width):
+            offsets.append(Vector3D.create(origin.x + i * GRIDFINITY_SIZE_CM, origin.y, origin.z))
+    return offsets
+
+
+@prof.profiled()
+def instanceComponent(parentComponent: Component, component: Component, offsets: list) -> list:
+    """
+    Places an occurrence of a component at each offset. The occurrences reference the same component, its bodies are
+    built once whatever the number of cells, instead of a B-rep copy per cell with a pattern.
+
+    Args:
+        parentComponent (Component): The component the occurrences are added to.
+        component (Component): The component of the cell.
+        offsets (list): The Vector3D translation of every occurrence.
+
+    Returns:
+        list: The added occurrences.
+    """
+    occurrences = parentComponent.occurrences
+    instances = []
+    for offset in offsets:
+        transform = Matrix3D.create()
+        transform.translation = offset
+        instances.append(occurrences.addExistingComponent(component, transform))
+    return instances
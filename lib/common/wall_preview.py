@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+
+from adsk.core import Matrix3D
+from adsk.fusion import Component, CustomGraphicsCoordinates, CustomGraphicsGroup, TriangleMeshQualityOptions
+
+from ...lib.common import api_profiler as prof
+
+# Preview of the wall as custom graphics. Fusion rolls back what a preview built before the next preview, so the
+# section and its row patterns can't be kept in the design and edited when a spinner changes, the whole B-rep wall was
+# rebuilt on every step. The triangles of the section are kept in Python instead, meshed once per notch option for the
+# life of the dialog, and every preview draws them at each cell of the lattice. A size change then costs a graphics
+# mesh per cell and no modeling feature, the B-rep wall is only built by the execute.
+
+
+@dataclass(frozen=True, slots=True)
+class SectionMesh:
+    """
+    The triangles of the visible bodies of a wall section, in the lists the custom graphics take
+    coordinates: The x, y, z of every node, in cm
+    indices: The three node indices of every triangle
+    normals: The x, y, z of every normal
+    normalIndices: The normal index of every triangle corner
+    """
+
+    coordinates: list
+    indices: list
+    normals: list
+    normalIndices: list
+
+
+def meshBodies(bodies: list, quality: int = TriangleMeshQualityOptions.LowQualityTriangleMesh) -> SectionMesh:
+    """
+    Meshes bodies into a single mesh.
+
+    Args:
+        bodies (list): The BRepBody to mesh.
+        quality (int, optional): The TriangleMeshQualityOptions of the meshes. Defaults to the low quality, enough for a preview.
+
+    Returns:
+        SectionMesh: The triangles of all the bodies.
+    """
+    coordinates, indices, normals, normalIndices = [], [], [], []
+    for body in bodies:
+        calculator = body.meshManager.createMeshCalculator()
+        calculator.setQuality(quality)
+        mesh = calculator.calculate()
+        nodeOffset = len(coordinates) // 3
+        normalOffset = len(normals) // 3
+        coordinates.extend(mesh.nodeCoordinatesAsDouble)
+        indices.extend(index + nodeOffset for index in mesh.nodeIndices)
+        normals.extend(mesh.normalVectorsAsDouble)
+        normalIndices.extend(index + normalOffset for index in mesh.normalIndices)
+    return SectionMesh(coordinates, indices, normals, normalIndices)
+
+
+class WallPreview:
+    """
+    The section meshes of the wall dialog, by notch option, kept between the previews.
+    """
+
+    def __init__(self):
+        self.meshes = {}
+
+    def sectionMesh(self, notch: bool) -> SectionMesh:
+        """
+        Returns:
+            SectionMesh: The kept mesh of the section, None when the section has to be built and meshed.
+        """
+        return self.meshes.get(notch)
+
+    def keep(self, notch: bool, bodies: list) -> SectionMesh:
+        """
+        Meshes the bodies of a section and keeps the mesh for the next previews.
+
+        Returns:
+            SectionMesh: The mesh of the section.
+        """
+        mesh = meshBodies(bodies)
+        self.meshes[notch] = mesh
+        return mesh
+
+    def clear(self):
+        self.meshes = {}
+
+
+@prof.profiled()
+def drawCells(component: Component, mesh: SectionMesh, offsets: list) -> CustomGraphicsGroup:
+    """
+    Draws a section mesh at each cell of a wall. The cells share the coordinates, each one is only a transform.
+
+    Args:
+        component (Component): The component the graphics are added to.
+        mesh (SectionMesh): The mesh of the section.
+        offsets (list): The Vector3D translation of every cell.
+
+    Returns:
+        CustomGraphicsGroup: The group of the cell meshes.
+    """
+    group = component.customGraphicsGroups.add()
+    coordinates = CustomGraphicsCoordinates.create(mesh.coordinates)
+    for offset in offsets:
+        cell = group.addMesh(coordinates, mesh.indices, mesh.normals, mesh.normalIndices)
+        transform = Matrix3D.create()
+        transform.translation = offset
+        cell.transform = transform
+    return group
@@ -0,0 +1,159 @@
+import math
+from dataclasses import dataclass
+
+from ...lib.common import nnws_log
+from ...lib.common.hex_grid import cellRadius, rowOriginsXY
+
+# NNWS constants
+from ...lib.common.nnws_constants import GRIDFINITY_SIZE_CM
+
+# Print bed tiling of the walls larger than the bed. The tiles are made of whole cells, so the seams follow the hex
+# edges and the tiles interlock like the cells of a wall. The rows are split in bands as deep as the bed allows, the
+# bands in tiles as wide as the bed allows, all of the same size as far as possible. Plain Python, no adsk import.
+
+log = nnws_log.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class WallTile:
+    """
+    A printable part of a wall
+    index: The number of the tile, the tiles of the top band first
+    cells: The (row, column) of every cell of the tile, in the rows of the wall
+    centers: The (x, y) center of every cell in the wall, in cm
+    width: The X size of the tile, in cm
+    depth: The Y size of the tile, in cm
+    """
+
+    index: int
+    cells: tuple
+    centers: tuple
+    width: float
+    depth: float
+
+    @property
+    def origin(self) -> tuple:
+        """
+        Returns:
+            tuple: The (x, y) center of the first cell, the position of the tile in the wall.
+        """
+        return self.centers[0]
+
+    @property
+    def offsets(self) -> list:
+        """
+        Returns:
+            list: The (x, y) center of every cell from the origin of the tile.
+        """
+        x0, y0 = self.origin
+        return [(x - x0, y - y0) for x, y in self.centers]
+
+
+@dataclass(frozen=True, slots=True)
+class TilingPlan:
+    """
+    The tiles of a wall on a print bed
+    bedWidth: The X size of the bed, in cm
+    bedDepth: The Y size of the bed, in cm
+    tiles: The WallTile of the wall
+    """
+
+    bedWidth: float
+    bedDepth: float
+    tiles: tuple
+
+    @property
+    def cellCount(self) -> int:
+        return sum(len(tile.cells) for tile in self.tiles)
+
+    def summary(self) -> str:
+        if not self.tiles:
+            return "Empty wall"
+        width = max(tile.width for tile in self.tiles)
+        depth = max(tile.depth for tile in self.tiles)
+        return (
+            f"{self.cellCount} cells in {len(self.tiles)} tiles of at most {width * 10:.1f} x {depth * 10:.1f} mm "
+            f"on a {self.bedWidth * 10:.0f} x {self.bedDepth * 10:.0f} mm bed"
+        )
+
+
+def bandSizes(count: int, maxSize: int) -> list:
+    """
+    Returns:
+        list: The sizes of the fewest bands of at most maxSize splitting count, as equal as possible.
+    """
+    bands = math.ceil(count / maxSize)
+    size, extra = divmod(count, bands)
+    return [size + 1 if i < extra else size for i in range(bands)]
+
+
+def _splitBand(cells: list, width: float) -> list:
+    # cells: (x, row, column, y) sorted by x, split in the fewest equal columns fitting the bed
+    left, right = cells[0][0], cells[-1][0]
+    columns = math.ceil((right - left + GRIDFINITY_SIZE_CM) / width)
+    while True:
+        step = (right - left + GRIDFINITY_SIZE_CM) / columns
+        groups = [[] for _ in range(columns)]
+        for cell in cells:
+            groups[min(int((cell[0] - left) / step), columns - 1)].append(cell)
+        groups = [group for group in groups if group]
+        if all(group[-1][0] - group[0][0] + GRIDFINITY_SIZE_CM <= width for group in groups):
+            return groups
+        columns += 1
+
+
+def planTiles(rows: list, bedWidth: float, bedDepth: float, margin: float = 0.0) -> TilingPlan:
+    """
+    Splits a wall in tiles fitting the print bed.
+
+    Args:
+        rows (list): The (width, offset) of every row of the wall, from the top, as in the wall pattern table.
+        bedWidth (float): The X size of the bed, in cm.
+        bedDepth (float): The Y size of the bed, in cm.
+        margin (float, optional): The space kept free on every side of the bed, in cm. Defaults to 0.
+
+    Raises:
+        ValueError: When a single cell doesn't fit on the bed.
+
+    Returns:
+        TilingPlan: The tiles of the wall.
+    """
+    width = bedWidth - 2 * margin
+    depth = bedDepth - 2 * margin
+    radius = cellRadius()
+    if width < GRIDFINITY_SIZE_CM or depth < 2 * radius:
+        raise ValueError(f"A wall cell ({GRIDFINITY_SIZE_CM * 10:.0f} x {radius * 20:.1f} mm) doesn't fit on the bed")
+
+    origins = rowOriginsXY(rows)
+    # the rows are 3/4 of a cell apart, the cells of a row overlap the cells of the next one by a corner
+    rowPitch = 1.5 * radius
+    maxRows = int((depth - 2 * radius) / rowPitch + 1e-9) + 1
+
+    tiles = []
+    firstRow = 0
+    for bandSize in bandSizes(len(rows), maxRows) if rows else []:
+        cells = []
+        for rowIndex in range(firstRow, firstRow + bandSize):
+            x, y = origins[rowIndex]
+            cells.extend((x + column * GRIDFINITY_SIZE_CM, rowIndex, column, y) for column in range(rows[rowIndex][0]))
+        firstRow += bandSize
+        if not cells:
+            continue
+        cells.sort()
+        for group in _splitBand(cells, width):
+            group.sort(key=lambda cell: (cell[1], cell[2]))
+            ys = [cell[3] for cell in group]
+            tiles.append(
+                WallTile(
+                    len(tiles),
+                    tuple((cell[1], cell[2]) for cell in group),
+                    tuple((cell[0], cell[3]) for cell in group),
+                    max(cell[0] for cell in group) - min(cell[0] for cell in group) + GRIDFINITY_SIZE_CM,
+                    max(ys) - min(ys) + 2 * radius,
+                )
+            )
+
+    plan = TilingPlan(bedWidth, bedDepth, tuple(tiles))
+    if log.isDebug:
+        log.debug("Wall tiling: %s", plan.summary())
+    return plan
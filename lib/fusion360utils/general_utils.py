@@ -56,6 +56,10 @@ def handle_error(name: str, show_message_box: bool = False):
                         and logged to the log file.                        
     """    
 
+    # The buffered NNWS debug records give the context of the error
+    from ..common import nnws_log
+    nnws_log.flush()
+
     log('===== Error =====', adsk.core.LogLevels.ErrorLogLevel)
     log(f'{name}\n{traceback.format_exc()}', adsk.core.LogLevels.ErrorLogLevel)
 
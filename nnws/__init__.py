@@ -0,0 +1,2 @@
+# Command line of the add-in without Fusion, planning and estimation of walls and accessory kits.
+# See __main__.py for the command line.
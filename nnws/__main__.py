@@ -0,0 +1,140 @@
+import argparse
+import importlib
+import json
+import os
+import sys
+
+# Entry point of the command line, run from the add-in folder with "python -m nnws", no Fusion needed.
+# The add-in uses relative imports, so it is imported as a package from its parent folder.
+if not __package__ or "." not in __package__:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, os.path.dirname(root))
+    config = importlib.import_module(f"{os.path.basename(root)}.config")
+    job_queue = importlib.import_module(f"{os.path.basename(root)}.lib.common.job_queue")
+    layout_planning = importlib.import_module(f"{os.path.basename(root)}.lib.common.layout_planning")
+    material_estimate = importlib.import_module(f"{os.path.basename(root)}.lib.common.material_estimate")
+else:
+    from .. import config
+    from ..lib.common import job_queue, layout_planning, material_estimate
+
+
+def _size(value: str) -> tuple:
+    # "8x4" -> (8, 4)
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got '{value}'")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive WIDTHxHEIGHT, got '{value}'")
+    return width, height
+
+
+def _accessory(value: str) -> dict:
+    # "Hook=4" -> a kit line
+    name, _, count = value.rpartition("=")
+    if not name or not count.isdigit():
+        raise argparse.ArgumentTypeError(f"expected ACCESSORY=COUNT, got '{value}'")
+    return {"accessory": name, "count": int(count)}
+
+
+def buildSpec(args) -> dict:
+    """
+    Returns:
+        dict: The spec file, with the walls and the accessories of the command line added.
+    """
+    spec = {}
+    if args.spec:
+        with open(args.spec, "r", encoding="utf-8") as file:
+            spec = json.load(file)
+    spec.setdefault("walls", [])
+    spec["walls"].extend({"width": width, "height": height, "notch": not args.no_notch} for width, height in args.wall)
+
+    kit = spec.get("kit")
+    if args.kit:
+        with open(args.kit, "r", encoding="utf-8") as file:
+            kit = json.load(file)
+    if args.accessory:
+        kit = kit or {}
+        kit["items"] = kit.get("items", []) + args.accessory
+    if kit:
+        spec["kit"] = kit
+    spec["plates"] = spec.get("plates", False) or args.plates
+    return spec
+
+
+def report(plan: dict) -> str:
+    lines = [f"Print bed {plan['bedSizeMm'][0]} x {plan['bedSizeMm'][1]} mm"]
+    for wall in plan["walls"]:
+        tiles = f" in {len(wall['tiles'])} tiles" if wall["tiles"] else ""
+        lines.append(f"{wall['name']}: {len(wall['cells'])} cells{tiles}, {wall['volumeCm3']:.1f} cm3, {wall['grams']:.1f} g")
+    kit = plan["kit"]
+    if kit:
+        lines.append(f"{kit['name']}: {kit['parts']} parts, {kit['grams']:.1f} g")
+        lines.extend(f"  {item['accessory']} x{item['count']}: {item['volumeCm3']:.1f} cm3, {item['grams']:.1f} g" for item in kit["items"])
+    totals = plan["totals"]
+    walls = f"{totals['cells']} wall cells ({totals['wallGrams']:.1f} g)"
+    lines.append(f"Total: {walls}, {totals['accessories']} accessories ({totals['kitGrams']:.1f} g)")
+    lines.append("Files:")
+    for part in plan["walls"] + ([kit] if kit else []):
+        lines.extend(f"  {name}" for name in part["files"])
+    return "\n".join(lines)
+
+
+def checkVolumes(path: str) -> int:
+    """
+    Returns:
+        int: 0 when the estimates of the reference set are within the tolerance of the volumes measured in Fusion.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        checks = material_estimate.compareVolumes(material_estimate.referenceSet(), json.load(file))
+    print(material_estimate.volumeReport(checks))
+    return 0 if all(abs(check.relativeError) <= material_estimate.VOLUME_TOLERANCE for check in checks) else 1
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="nnws", description="Plans NNWS walls and accessory kits without Fusion")
+    parser.add_argument("--spec", help="JSON spec of the walls and the kit, see lib/common/layout_planning.py")
+    parser.add_argument("--wall", action="append", type=_size, default=[], metavar="WxH", help="a wall of W cells by H rows")
+    parser.add_argument("--no-notch", action="store_true", help="walls of the command line without notches")
+    parser.add_argument("--kit", help="JSON kit of accessories, see lib/common/accessory_kit.py")
+    parser.add_argument("--accessory", action="append", type=_accessory, metavar="NAME=COUNT", help="copies of an accessory type")
+    parser.add_argument("--plates", action="store_true", help="pack the kit on print plates instead of a single file")
+    parser.add_argument("--bed", type=_size, default=config.PRINT_BED_SIZE_MM, metavar="WxD", help="print bed in mm")
+    parser.add_argument("--density", type=float, default=material_estimate.PLA_DENSITY_G_CM3, help="filament density in g/cm3")
+    parser.add_argument("--json", action="store_true", help="print the whole plan as JSON, with the cell positions")
+    parser.add_argument("--queue", metavar="FOLDER", help=f"write the job queue to FOLDER/{job_queue.QUEUE_FILE_NAME}")
+    parser.add_argument(
+        "--measure-volumes",
+        action="store_true",
+        help=f"add a job measuring the parts of the volume reference set to {material_estimate.MEASURED_VOLUMES_FILE_NAME}",
+    )
+    parser.add_argument("--check-volumes", metavar="PATH", help="compare the volume estimates with the volumes measured by the job")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.check_volumes:
+            return checkVolumes(args.check_volumes)
+        plan = layout_planning.planSpec(buildSpec(args), args.bed, args.density)
+    except (OSError, ValueError) as e:
+        print(f"nnws: {e}", file=sys.stderr)
+        return 1
+    if args.measure_volumes:
+        plan["jobs"].append(job_queue.volumesJob(material_estimate.referenceSet(), material_estimate.MEASURED_VOLUMES_FILE_NAME))
+
+    print(json.dumps(plan, indent=2) if args.json else report(plan))
+    if args.queue:
+        # the wall automation command reads the queue under its name in the folder it is run on
+        path = os.path.join(args.queue, job_queue.QUEUE_FILE_NAME)
+        try:
+            os.makedirs(args.queue, exist_ok=True)
+            job_queue.writeQueue(path, plan["jobs"])
+        except OSError as e:
+            print(f"nnws: {e}", file=sys.stderr)
+            return 1
+        if not args.json:
+            print(f"{len(plan['jobs'])} jobs written to {path}, run them with the wall automation command on its folder")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
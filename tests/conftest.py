@@ -0,0 +1,40 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# Headless tests of the add-in, run on the recording stand-in of the adsk API (fake_adsk) with "python -m pytest"
+# from the add-in folder. The add-in uses relative imports, so it is imported as a package from its parent folder.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if os.path.dirname(ROOT) not in sys.path:
+    sys.path.insert(0, os.path.dirname(ROOT))
+fake_adsk = importlib.import_module(f"{os.path.basename(ROOT)}.fake_adsk")
+
+
+@pytest.fixture
+def fake():
+    return fake_adsk
+
+
+@pytest.fixture
+def design():
+    """
+    An empty active design, the recorded operations cleared.
+    """
+    return fake_adsk.newDesign()
+
+
+@pytest.fixture
+def util():
+    return fake_adsk.importAddinModule("lib.common.nnws_util")
+
+
+@pytest.fixture
+def wall():
+    return fake_adsk.importAddinModule("commands.commandWall.entry")
+
+
+@pytest.fixture
+def accessories():
+    return fake_adsk.importAddinModule("commands.commandAccessories.entry")
@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+# Volumes of the boolean operations of the stand-in API. The generators are measured on them, a cut has to remove
+# the material it reaches, and only that.
+
+
+def _cylinder(fake, util, component, radius: float, height: float, z: float, operation: int):
+    return util.createCylinderFromPointXYPlane(component, radius, height, fake.core.Point3D.create(0, 0, z), operation)
+
+
+@pytest.fixture
+def disk(fake, util, design):
+    # a disk of radius 2 cm, 1 cm high, on the XY plane
+    _cylinder(fake, util, design.rootComponent, 2, 1, 0, fake.fusion.FeatureOperations.NewBodyFeatureOperation)
+    return design.rootComponent.bRepBodies.item(0)
+
+
+def test_new_body_has_the_volume_of_the_extrude(disk):
+    assert disk.volume == pytest.approx(math.pi * 4, rel=0.02)
+
+
+def test_cut_inside_removes_the_tool_volume(fake, util, design, disk):
+    before = disk.volume
+    _cylinder(fake, util, design.rootComponent, 1, 0.5, 0, fake.fusion.FeatureOperations.CutFeatureOperation)
+    assert before - disk.volume == pytest.approx(math.pi * 0.5, rel=0.02)
+
+
+def test_cut_touching_the_top_face_removes_nothing(fake, util, design, disk):
+    before = disk.volume
+    _cylinder(fake, util, design.rootComponent, 3, 1, 1, fake.fusion.FeatureOperations.CutFeatureOperation)
+    assert disk.volume == before
+
+
+def test_join_merges_the_touching_bodies(fake, util, design, disk):
+    before = disk.volume
+    _cylinder(fake, util, design.rootComponent, 0.5, 1, 1, fake.fusion.FeatureOperations.JoinFeatureOperation)
+    assert design.rootComponent.bRepBodies.count == 1
+    assert disk.volume - before == pytest.approx(math.pi * 0.25, rel=0.02)
+
+
+def test_cut_over_the_top_only_removes_the_joined_piece(fake, util, design, disk):
+    # like the thread overshoot cut, the cutter covers the whole body box over the top face
+    _cylinder(fake, util, design.rootComponent, 0.5, 1, 1, fake.fusion.FeatureOperations.JoinFeatureOperation)
+    before = disk.volume
+    _cylinder(fake, util, design.rootComponent, 3, 2, 1, fake.fusion.FeatureOperations.CutFeatureOperation)
+    assert before - disk.volume == pytest.approx(math.pi * 0.25, rel=0.02)
+
+
+@pytest.fixture
+def wallPattern(fake):
+    return fake.importAddinModule("lib.common.wall_pattern")
+
+
+def test_pattern_copies_keep_their_pieces(fake, util, design, disk, wallPattern):
+    root = design.rootComponent
+    _cylinder(fake, util, root, 0.5, 1, 1, fake.fusion.FeatureOperations.JoinFeatureOperation)
+    wallPattern.patternBodies(root, root.xConstructionAxis, util.wrapInCollection(disk), 2)
+    copy = root.bRepBodies.item(1)
+    before = copy.volume
+    center = copy.boundingBox.minPoint.x + 2
+    util.createCylinderFromPointXYPlane(
+        root, 3, 2, fake.core.Point3D.create(center, 0, 1), fake.fusion.FeatureOperations.CutFeatureOperation
+    )
+    assert before - copy.volume == pytest.approx(math.pi * 0.25, rel=0.02)
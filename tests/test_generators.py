@@ -0,0 +1,104 @@
+import dataclasses
+
+import pytest
+
+# Feature, body and volume counts of the generators on the stand-in API, the numbers the benchmarks and the commit
+# notes are measured with. A change of one of them is a change of the generated geometry, or of the stand-in.
+
+
+@pytest.fixture
+def estimate(fake):
+    return fake.importAddinModule("lib.common.material_estimate")
+
+
+def _bodies(design) -> list:
+    root = design.rootComponent
+    return list(root.bRepBodies) + [body for occurrence in root.allOccurrences for body in occurrence.component.bRepBodies]
+
+
+def _visibleVolume(design) -> float:
+    return sum(body.volume for body in _bodies(design) if body.isVisible)
+
+
+@pytest.mark.parametrize(
+    "width, notch, timeline, bodies, volume",
+    [
+        (1, True, 21, 2, 4.8579),
+        (3, True, 21, 6, 14.5737),
+        (1, False, 18, 2, 4.9128),
+    ],
+)
+def test_wall_row(fake, wall, design, width, notch, timeline, bodies, volume):
+    wall.internalGenerateWall(width, 1, notch)
+    assert design.timeline.count == timeline
+    assert len(_bodies(design)) == bodies
+    assert not [body for body in _bodies(design) if not body.isVisible]
+    assert fake.RECORDER.count("SweepFeatures.add") == 1
+    assert _visibleVolume(design) == pytest.approx(volume, rel=1e-3)
+
+
+@pytest.mark.parametrize("notch", [True, False])
+def test_wall_cell_matches_the_closed_form_volume(wall, design, estimate, notch):
+    wall.internalGenerateWall(1, 1, notch)
+    assert _visibleVolume(design) == pytest.approx(estimate.wallCellVolume(notch), rel=0.05)
+
+
+def test_wall_bodies_are_not_emptied(wall, design):
+    wall.internalGenerateWall(2, 2, True)
+    assert min(body.volume for body in _bodies(design)) > 0.5
+
+
+def test_instanced_wall_has_an_occurrence_per_cell(wall, design):
+    wall.internalGenerateWall(3, 2, True, instanced=True)
+    assert design.rootComponent.occurrences.count == 6
+    assert design.rootComponent.bRepBodies.count == 0
+
+
+@pytest.mark.parametrize("width, height", [(2, 2), (3, 2), (1, 3), (4, 4)])
+def test_patterned_wall_has_every_cell_of_the_instanced_wall(fake, wall, design, width, height):
+    # the section is two visible bodies, a cell of the patterned wall is two bodies
+    wall.internalGenerateWall(width, height, True)
+    patterned = sorted((round(body.boundingBox.minPoint.x, 3), round(body.boundingBox.minPoint.y, 3)) for body in _bodies(design))
+    assert len(patterned) == 2 * width * height
+
+    instanced = fake.newDesign()
+    wall.internalGenerateWall(width, height, True, instanced=True)
+    assert instanced.rootComponent.occurrences.count == width * height
+    cells = sorted(
+        (
+            round(body.boundingBox.minPoint.x + occurrence.transform.translation.x, 3),
+            round(body.boundingBox.minPoint.y + occurrence.transform.translation.y, 3),
+        )
+        for occurrence in instanced.rootComponent.occurrences
+        for body in occurrence.component.bRepBodies
+        if body.isVisible
+    )
+    assert cells == patterned
+
+
+@pytest.mark.parametrize(
+    "menu, timeline, bodies, volume",
+    [
+        ("MENU_MAIN_SCREW", 15, 1, 4.2402),
+        ("MENU_INSERT", 16, 1, 4.1059),
+        ("MENU_HOOK", 21, 2, 10.5181),
+        ("MENU_ANCHOR", 9, 1, 1.8114),
+        ("MENU_SHELF_INSERT", 15, 1, 16.9513),
+    ],
+)
+def test_accessory(fake, accessories, design, menu, timeline, bodies, volume):
+    selected = getattr(accessories, menu)
+    accessory_parameters = fake.importAddinModule("lib.common.accessory_parameters")
+    accessories.select(selected, accessory_parameters.defaultParameters(selected))
+    assert design.timeline.count == timeline
+    assert len(_bodies(design)) == bodies
+    assert min(body.volume for body in _bodies(design)) > 0
+    assert _visibleVolume(design) == pytest.approx(volume, rel=1e-3)
+
+
+@pytest.mark.parametrize("xCount, yCount", [(1, 3), (3, 3)])
+def test_insert_plate_has_every_insert(fake, accessories, design, xCount, yCount):
+    accessory_parameters = fake.importAddinModule("lib.common.accessory_parameters")
+    params = dataclasses.replace(accessory_parameters.defaultParameters(accessories.MENU_INSERT), xCount=xCount, yCount=yCount)
+    accessories.select(accessories.MENU_INSERT, params)
+    assert len(_bodies(design)) == xCount * yCount
@@ -0,0 +1,31 @@
+import pytest
+
+# The kit of the accessories dialog. The execute reads the options of the types shown in the dialog, the others take
+# the defaults, and no input is built.
+
+
+@pytest.fixture
+def dialog(fake, design, accessories):
+    command = fake.core.Command(None)
+    accessories.command_created(fake.core.CommandCreatedEventArgs(command))
+    return command.commandInputs
+
+
+def _setCount(accessories, inputs, accessory: str, count: int):
+    accessories.kitCountInputs(inputs)[list(accessories.ACCESSORY_GROUPS).index(accessory)].value = count
+
+
+def test_kit_reads_the_shown_groups_and_defaults_the_others(fake, accessories, dialog):
+    defaultParameters = fake.importAddinModule("lib.common.accessory_parameters").defaultParameters
+    accessories.dialogGroups.show(accessories.MENU_INSERT)
+    dialog.itemById(accessories.MENU_INSERT_X_COUNT).value = 3
+    _setCount(accessories, dialog, accessories.MENU_INSERT, 1)
+    _setCount(accessories, dialog, accessories.MENU_ANCHOR, 2)
+    groupCount = len(accessories.dialogGroups.groups)
+
+    kit = {item.accessory: item for item in accessories.readKit(dialog)}
+    assert len(accessories.dialogGroups.groups) == groupCount
+    assert not accessories.dialogGroups.isBuilt(accessories.MENU_ANCHOR)
+    assert kit[accessories.MENU_INSERT].params.xCount == 3
+    assert kit[accessories.MENU_ANCHOR].count == 2
+    assert kit[accessories.MENU_ANCHOR].params == defaultParameters(accessories.MENU_ANCHOR)
@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+# Profiled runs on the stand-in API. A kit profiles its accessories as phases of the kit run, from the dialog and from
+# the script.
+
+
+@pytest.fixture
+def prof(fake, design, tmp_path, monkeypatch):
+    prof = fake.importAddinModule("lib.common.api_profiler")
+    config = fake.importAddinModule("config")
+    monkeypatch.setattr(config, "PROFILE_OUTPUT_DIR", str(tmp_path))
+    prof.enable([fake.core, fake.fusion])
+    yield prof
+    prof.disable()
+
+
+def _profiles(tmp_path) -> list:
+    return sorted(name for name in os.listdir(tmp_path) if name.endswith(".txt"))
+
+
+def test_kit_accessories_are_phases_of_the_kit_run(fake, prof, accessories, tmp_path):
+    kitItem = fake.importAddinModule("lib.common.accessory_kit").KitItem
+    defaultParameters = fake.importAddinModule("lib.common.accessory_parameters").defaultParameters
+    items = [kitItem(accessory, 2, defaultParameters(accessory)) for accessory in (accessories.MENU_ANCHOR, accessories.MENU_INSERT)]
+    with prof.profiledRun("kit", str(tmp_path)):
+        accessories.generateKit(items)
+    assert not prof.profiler().phaseStack
+    assert not prof.profiler().running
+    assert prof.PHASE_SEPARATOR.join(["kit", "generateKit", accessories.MENU_ANCHOR]) in prof.profiler().phases
+    assert len(_profiles(tmp_path)) == 1
+
+
+def test_script_kit_writes_one_profile(prof, accessories, tmp_path):
+    kitPath = tmp_path / "anchors.json"
+    kitPath.write_text(json.dumps({"items": [{"accessory": accessories.MENU_ANCHOR, "count": 3}]}))
+    reports = accessories.scriptGenerateKit(str(kitPath))
+    assert [report.count for report in reports] == [3]
+    assert len(_profiles(tmp_path)) == 1
+
+
+def test_run_inside_a_phase_keeps_the_open_phases(prof, tmp_path):
+    with prof.phase("outer"):
+        with prof.profiledRun("run", str(tmp_path)):
+            pass
+        assert prof.profiler().phaseStack == ["outer"]